@@ -0,0 +1,106 @@
+#####################################################################
+# decode_items.py
+#
+# (c) Copyright 2021, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""
+Benchmark decoding of messages with many items.
+
+The decode time per item should stay constant when the number of items grows::
+
+    python benchmarks/decode_items.py
+"""
+
+import argparse
+import time
+
+import secsgem.secs.variables
+
+
+def build_message(count, text_length):
+    """
+    Encode a list with text items, similar to the body of a large S6F11.
+
+    :param count: number of items in the list
+    :type count: integer
+    :param text_length: number of characters per item
+    :type text_length: integer
+    :returns: encoded list
+    :rtype: bytes
+    """
+    array = secsgem.secs.variables.Array(secsgem.secs.variables.String)
+    array.set(["x" * text_length] * count)
+
+    return array.encode()
+
+
+def measure(data, buffer_type, repeat):
+    """
+    Get the best decode time of the encoded list.
+
+    :param data: encoded list
+    :type data: bytes
+    :param buffer_type: type to pass the data as (bytes, bytearray or memoryview)
+    :type buffer_type: type
+    :param repeat: number of measurements
+    :type repeat: integer
+    :returns: decode time in seconds
+    :rtype: float
+    """
+    data = buffer_type(data)
+    best = None
+
+    for _ in range(repeat):
+        array = secsgem.secs.variables.Array(secsgem.secs.variables.String)
+
+        start = time.perf_counter()
+        array.decode(data)
+        duration = time.perf_counter() - start
+
+        if best is None or duration < best:
+            best = duration
+
+    return best
+
+
+def main(argv=None):
+    """
+    Print decode times for growing item counts.
+
+    :param argv: command line arguments
+    :type argv: list
+    :returns: exit code
+    :rtype: integer
+    """
+    parser = argparse.ArgumentParser(description="Benchmark decoding of messages with many items.")
+    parser.add_argument("--counts", type=int, nargs="+", default=[1250, 2500, 5000, 10000, 20000],
+                        help="item counts to measure")
+    parser.add_argument("--text-length", type=int, default=100, help="characters per item")
+    parser.add_argument("--repeat", type=int, default=3, help="measurements per item count")
+    args = parser.parse_args(argv)
+
+    print(f"{'type':<10} {'items':>8} {'bytes':>10} {'seconds':>10} {'us/item':>8}")
+
+    for buffer_type in (bytes, bytearray, memoryview):
+        for count in args.counts:
+            data = build_message(count, args.text_length)
+            duration = measure(data, buffer_type, args.repeat)
+
+            print(f"{buffer_type.__name__:<10} {count:>8} {len(data):>10} {duration:>10.4f} "
+                  f"{duration / count * 1e6:>8.2f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    main()
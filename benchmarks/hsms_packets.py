@@ -0,0 +1,120 @@
+#####################################################################
+# hsms_packets.py
+#
+# (c) Copyright 2021, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""
+Benchmark encoding and decoding of hsms packets.
+
+Prints the time per packet for different data sizes::
+
+    python benchmarks/hsms_packets.py
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import secsgem.hsms
+
+
+def build_packet(size):
+    """
+    Create a stream/function packet.
+
+    :param size: number of data bytes
+    :type size: integer
+    :returns: packet
+    :rtype: :class:`secsgem.hsms.HsmsPacket`
+    """
+    header = secsgem.hsms.HsmsStreamFunctionHeader(1, 6, 11, True, 0)
+
+    return secsgem.hsms.HsmsPacket(header, b"\x00" * size)
+
+
+def measure(function, count):
+    """
+    Get the time per call of a function.
+
+    :param function: function to call
+    :type function: callable
+    :param count: number of calls
+    :type count: integer
+    :returns: time per call in seconds
+    :rtype: float
+    """
+    start = time.perf_counter()
+
+    for _ in range(count):
+        function()
+
+    return (time.perf_counter() - start) / count
+
+
+def memory_per_packet(message, count):
+    """
+    Get the memory allocated for each decoded packet.
+
+    :param message: encoded packet
+    :type message: memoryview
+    :param count: number of packets to keep
+    :type count: integer
+    :returns: bytes per packet
+    :rtype: float
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+
+    packets = [secsgem.hsms.HsmsPacket.decode(message) for _ in range(count)]
+
+    allocated = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    del packets
+
+    return allocated / count
+
+
+def main(argv=None):
+    """
+    Print encode and decode times for growing data sizes.
+
+    :param argv: command line arguments
+    :type argv: list
+    :returns: exit code
+    :rtype: integer
+    """
+    parser = argparse.ArgumentParser(description="Benchmark encoding and decoding of hsms packets.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[0, 16, 256, 4096, 65536],
+                        help="data sizes to measure")
+    parser.add_argument("--count", type=int, default=100000, help="packets per size")
+    args = parser.parse_args(argv)
+
+    print(f"{'bytes':>8} {'encode us':>10} {'decode us':>10} {'header us':>10} {'bytes/packet':>13}")
+
+    for size in args.sizes:
+        packet = build_packet(size)
+        message = memoryview(packet.encode())
+
+        encode = measure(packet.encode_buffers, args.count)
+        decode = measure(lambda message=message: secsgem.hsms.HsmsPacket.decode(message), args.count)
+        header = measure(lambda message=message: secsgem.hsms.HsmsPacket.decode_header(message), args.count)
+        memory = memory_per_packet(message, min(args.count, 10000))
+
+        print(f"{size:>8} {encode * 1e6:>10.2f} {decode * 1e6:>10.2f} {header * 1e6:>10.2f} {memory:>13.0f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    main()
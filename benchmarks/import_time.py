@@ -0,0 +1,103 @@
+#####################################################################
+# import_time.py
+#
+# (c) Copyright 2021, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""
+Benchmark the cold start of secsgem.
+
+Every measurement runs in a new interpreter, so nothing is imported before::
+
+    python benchmarks/import_time.py
+
+Use ``python -X importtime -c "import secsgem.gem"`` to find the modules causing a regression.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+STATEMENTS = {
+    "import secsgem.secs": "import secsgem.secs",
+    "import secsgem.hsms": "import secsgem.hsms",
+    "import secsgem.gem": "import secsgem.gem",
+    "first function lookup": "import secsgem.secs; secsgem.secs.functions.SecsS01F01",
+    "all functions": "import secsgem.secs; secsgem.secs.functions.secs_streams_functions",
+}
+""" Measured statements by name ."""
+
+SCRIPT = """
+import sys
+import time
+start = time.perf_counter()
+{statement}
+duration = time.perf_counter() - start
+print(duration, len([name for name in sys.modules if name.startswith("secsgem.")]))
+"""
+""" Script run in the new interpreter, prints the duration and the number of loaded secsgem modules ."""
+
+
+def measure(statement, count):
+    """
+    Get the durations of a statement in new interpreters.
+
+    :param statement: python statement to measure
+    :type statement: string
+    :param count: number of interpreters to start
+    :type count: integer
+    :returns: durations in seconds and number of loaded secsgem modules
+    :rtype: tuple(list, integer)
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    environment = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [root, os.environ.get("PYTHONPATH")])))
+
+    durations = []
+    modules = 0
+
+    for _ in range(count):
+        output = subprocess.run([sys.executable, "-c", SCRIPT.format(statement=statement)], env=environment,
+                                check=True, capture_output=True, text=True).stdout.split()
+
+        durations.append(float(output[0]))
+        modules = int(output[1])
+
+    return durations, modules
+
+
+def main(argv=None):
+    """
+    Print the cold start times.
+
+    :param argv: command line arguments
+    :type argv: list
+    :returns: exit code
+    :rtype: integer
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the cold start of secsgem.")
+    parser.add_argument("--count", type=int, default=10, help="interpreters started per statement")
+    args = parser.parse_args(argv)
+
+    print(f"{'statement':<24} {'min ms':>8} {'median ms':>10} {'modules':>8}")
+
+    for name, statement in STATEMENTS.items():
+        durations, modules = measure(statement, args.count)
+
+        print(f"{name:<24} {min(durations) * 1e3:>8.1f} {statistics.median(durations) * 1e3:>10.1f} {modules:>8}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    main()
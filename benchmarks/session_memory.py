@@ -0,0 +1,93 @@
+#####################################################################
+# session_memory.py
+#
+# (c) Copyright 2021, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""
+Benchmark the memory and time needed for each session.
+
+Creates many handlers without connecting them, like a host process serving many equipments::
+
+    python benchmarks/session_memory.py
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+import secsgem.gem
+
+HANDLERS = {
+    "equipment": secsgem.gem.GemEquipmentHandler,
+    "host": secsgem.gem.GemHostHandler,
+}
+""" Measured handler classes by name ."""
+
+
+def measure(handler_class, count):
+    """
+    Get the memory and time per handler.
+
+    :param handler_class: class of the handlers to create
+    :type handler_class: :class:`secsgem.gem.GemHandler` derived class
+    :param count: number of handlers to create
+    :type count: integer
+    :returns: bytes and seconds per handler
+    :rtype: tuple(float, float)
+    """
+    # the first handler loads modules and fills caches shared by all handlers
+    handler_class("127.0.0.1", 5000, False, 0, "warmup")
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+
+    handlers = [handler_class("127.0.0.1", 5000 + index, False, index, f"session{index}") for index in range(count)]
+
+    duration = time.perf_counter() - start
+    gc.collect()
+    allocated = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    del handlers
+
+    return allocated / count, duration / count
+
+
+def main(argv=None):
+    """
+    Print the memory and time per handler.
+
+    :param argv: command line arguments
+    :type argv: list
+    :returns: exit code
+    :rtype: integer
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the memory and time needed for each session.")
+    parser.add_argument("--count", type=int, default=500, help="handlers created per class")
+    args = parser.parse_args(argv)
+
+    print(f"{'handler':<12} {'bytes/session':>14} {'us/session':>11}")
+
+    for name, handler_class in HANDLERS.items():
+        memory, duration = measure(handler_class, args.count)
+
+        print(f"{name:<12} {memory:>14.0f} {duration * 1e6:>11.1f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    main()
@@ -16,10 +16,12 @@
 """Contains helper functions."""
 
 from .callbacks import CallbackHandler
+from .dispatcher import Dispatcher
 from .events import EventProducer
 from .fysom import Fysom
+from .timer_wheel import TimerWheel
 from .helpers import format_hex, function_name, indent_block, is_windows, is_errorcode_ewouldblock
 
 
-__all__ = ["CallbackHandler", "EventProducer", "Fysom", "format_hex", "function_name", "indent_block", "is_windows",
-           "is_errorcode_ewouldblock"]
+__all__ = ["CallbackHandler", "Dispatcher", "EventProducer", "Fysom", "TimerWheel", "format_hex", "function_name",
+           "indent_block", "is_windows", "is_errorcode_ewouldblock"]
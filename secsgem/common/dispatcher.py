@@ -0,0 +1,263 @@
+#####################################################################
+# dispatcher.py
+#
+# (c) Copyright 2021, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Ordered dispatching of callbacks to a pool of worker threads."""
+
+import collections
+import concurrent.futures
+import logging
+import threading
+import time
+
+
+class Dispatcher:
+    """
+    Bounded worker pool executing callbacks in order per key.
+
+    Callbacks dispatched with the same key, e.g. the handler of one peer, are executed one after another.
+    Callbacks for different keys run in parallel on the workers.
+
+    If ``queue_limit`` callbacks are waiting, :meth:`dispatch` blocks until a callback finished (``block=True``),
+    or rejects the callback immediately (``block=False``).
+    Threads which must never wait, e.g. the receiver thread of a connection, use :meth:`dispatch_nowait`.
+    A receiver waiting for space couldn't pass the responses to the callbacks waiting for them,
+    so the callbacks occupying the queue wouldn't finish until their requests time out.
+    Short work which must not be lost, e.g. expired timers, is queued regardless of the limit with
+    :meth:`dispatch_unbounded`.
+
+    **Example**::
+
+        >>> import threading
+        >>> import secsgem.common
+        >>>
+        >>> dispatcher = secsgem.common.Dispatcher(workers=2, queue_limit=100)
+        >>> done = threading.Event()
+        >>> dispatcher.dispatch("peer", done.set)
+        True
+        >>> done.wait(1)
+        True
+        >>> dispatcher.shutdown()
+    """
+
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, name="secsgem_dispatcher", workers=None, queue_limit=0, block=True, timeout=None):
+        """
+        Initialize a dispatcher.
+
+        :param name: prefix for the names of the worker threads
+        :type name: string
+        :param workers: number of worker threads, None for the default of :class:`concurrent.futures.ThreadPoolExecutor`
+        :type workers: integer
+        :param queue_limit: maximum number of waiting callbacks, 0 for no limit
+        :type queue_limit: integer
+        :param block: wait for space in the queue if it is full, reject the callback otherwise
+        :type block: boolean
+        :param timeout: maximum time to wait for space in the queue, None to wait forever
+        :type timeout: float
+        """
+        self.logger = logging.getLogger(self.__module__ + "." + self.__class__.__name__)
+
+        self.name = name
+        self.queue_limit = queue_limit
+        self.block = block
+        self.timeout = timeout
+
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+
+        self._lock = threading.Lock()
+        self._space = threading.Condition(self._lock)
+        self._queues = {}
+        self._depth = 0
+
+        self._counters = collections.Counter()
+        self._times = collections.Counter(wait=0.0, run=0.0, wait_max=0.0, run_max=0.0)
+
+    @classmethod
+    def get_default(cls):
+        """
+        Get the dispatcher shared by all handlers, which don't have an own dispatcher.
+
+        :returns: shared dispatcher
+        :rtype: :class:`secsgem.common.Dispatcher`
+        """
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls("secsgem_dispatcher")
+
+            return cls._default
+
+    def __repr__(self):
+        """Generate textual representation for an object of this class."""
+        return f"{self.__class__.__name__} {str(self.metrics)}"
+
+    @property
+    def queue_depth(self):
+        """Get the number of callbacks waiting or running."""
+        return self._depth
+
+    @property
+    def metrics(self):
+        """
+        Get the statistics of the dispatcher.
+
+        Wait time is the time from dispatching until the callback started,
+        run time is the time the callback took. Times are in seconds.
+
+        :returns: statistics
+        :rtype: dict
+        """
+        with self._lock:
+            completed = self._counters["completed"]
+
+            return {
+                "queue_depth": self._depth,
+                "max_queue_depth": self._counters["max_queue_depth"],
+                "dispatched": self._counters["dispatched"],
+                "completed": completed,
+                "failed": self._counters["failed"],
+                "rejected": self._counters["rejected"],
+                "wait_time_avg": self._times["wait"] / completed if completed else 0.0,
+                "wait_time_max": self._times["wait_max"],
+                "run_time_avg": self._times["run"] / completed if completed else 0.0,
+                "run_time_max": self._times["run_max"],
+            }
+
+    def in_worker(self):
+        """
+        Check if the current thread is one of the workers.
+
+        :returns: True if called from a worker thread
+        :rtype: boolean
+        """
+        return threading.current_thread().name.startswith(self.name)
+
+    def dispatch(self, key, callback, *args):
+        """
+        Run a callback in the worker pool.
+
+        Callbacks dispatched with the same key are executed one after another in the order they were dispatched.
+
+        :param key: key defining the order, usually the handler of the peer
+        :param callback: function to call
+        :type callback: callable
+        :returns: False if the callback was rejected because the queue is full
+        :rtype: boolean
+        """
+        return self._dispatch(key, callback, args, self.block)
+
+    def dispatch_nowait(self, key, callback, *args):
+        """
+        Run a callback in the worker pool, reject it immediately if the queue is full.
+
+        Callbacks dispatched with the same key are executed one after another in the order they were dispatched.
+
+        :param key: key defining the order, usually the handler of the peer
+        :param callback: function to call
+        :type callback: callable
+        :returns: False if the callback was rejected because the queue is full
+        :rtype: boolean
+        """
+        return self._dispatch(key, callback, args, False)
+
+    def dispatch_unbounded(self, key, callback, *args):
+        """
+        Run a callback in the worker pool, even if the queue is full.
+
+        The callback is never rejected and the caller never waits, e.g. for timeouts, which must not be lost
+        and must not stall the timer thread.
+
+        :param key: key defining the order, usually the handler of the peer
+        :param callback: function to call
+        :type callback: callable
+        :returns: True, as the callback is always accepted
+        :rtype: boolean
+        """
+        return self._dispatch(key, callback, args, False, False)
+
+    def _dispatch(self, key, callback, args, block, bounded=True):
+        with self._lock:
+            # don't wait for space in a worker, the worker might be the one freeing the space
+            if bounded and 0 < self.queue_limit <= self._depth:
+                if not block or self.in_worker() or \
+                        not self._space.wait_for(lambda: self._depth < self.queue_limit, self.timeout):
+                    self._counters["rejected"] += 1
+                    return False
+
+            self._depth += 1
+            self._counters["dispatched"] += 1
+            if self._depth > self._counters["max_queue_depth"]:
+                self._counters["max_queue_depth"] = self._depth
+
+            item = (callback, args, time.monotonic())
+
+            queue = self._queues.get(key)
+            if queue is not None:
+                queue.append(item)
+                return True
+
+            self._queues[key] = collections.deque([item])
+
+        self._executor.submit(self._run_queue, key)
+
+        return True
+
+    def shutdown(self, wait=True):
+        """
+        Stop the workers.
+
+        Already dispatched callbacks are executed before the workers are stopped.
+
+        :param wait: wait until the callbacks are finished
+        :type wait: boolean
+        """
+        self._executor.shutdown(wait=wait)
+
+    def _run_queue(self, key):
+        while True:
+            with self._lock:
+                queue = self._queues[key]
+
+                if not queue:
+                    del self._queues[key]
+                    return
+
+                callback, args, dispatched = queue.popleft()
+
+            started = time.monotonic()
+
+            try:
+                callback(*args)
+            except Exception:  # pylint: disable=broad-except
+                self.logger.exception('ignoring exception in dispatched callback')
+                failed = True
+            else:
+                failed = False
+
+            finished = time.monotonic()
+
+            with self._lock:
+                self._depth -= 1
+                self._space.notify()
+
+                self._counters["completed"] += 1
+                if failed:
+                    self._counters["failed"] += 1
+
+                self._times["wait"] += started - dispatched
+                self._times["run"] += finished - started
+                self._times["wait_max"] = max(self._times["wait_max"], started - dispatched)
+                self._times["run_max"] = max(self._times["run_max"], finished - started)
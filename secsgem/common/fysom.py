@@ -205,18 +205,35 @@ __version__ = '1.0'
 __maintainer__ = 'Mansour Behabadi'
 __email__ = 'mansour@oxplot.com'
 
+import functools
+
 
 class FysomError(Exception):  # pragma: no cover
     """Fysom Error."""
 
 
 class Fysom:  # pragma: no cover
-    """Fysom state machine."""
+    """
+    Fysom state machine.
+
+    The transition map is compiled once for each definition and shared by all machines with the same definition.
+    The event methods are created on access.
+    """
+
+    _compiled = {}
 
     def __init__(self, cfg):
         """Initialize state machine."""
         self._apply(cfg)
 
+    def __getattr__(self, name):
+        """Get the method for an event."""
+        # only called for attributes not found otherwise, e.g. callbacks that aren't set
+        if name in self.__dict__.get('_map', ()):
+            return functools.partial(self._trigger, name)
+
+        raise AttributeError(name)
+
     def isstate(self, state):
         """Get state."""
         return self.current == state
@@ -230,18 +247,27 @@ class Fysom:  # pragma: no cover
         """Check if transition is not possible."""
         return not self.can(event)
 
-    def _apply(self, cfg):
-        init = cfg['initial'] if 'initial' in cfg else None
-        if isinstance(init, (str, bytes)):
-            init = {'state': init}
-        events = cfg['events'] if 'events' in cfg else []
-        callbacks = cfg['callbacks'] if 'callbacks' in cfg else {}
+    @staticmethod
+    def _definition_key(init, events, autoforwards):
+        def states(src):
+            return (src, ) if isinstance(src, (str, bytes)) else tuple(src)
+
+        return (tuple(sorted(init.items())) if init else None,
+                tuple((event['name'], states(event['src']), event['dst']) for event in events),
+                tuple((autoforward['src'], autoforward['dst']) for autoforward in autoforwards))
+
+    @classmethod
+    def _compile(cls, init, events, autoforwards):
+        key = cls._definition_key(init, events, autoforwards)
+
+        compiled = cls._compiled.get(key)
+        if compiled is not None:
+            return compiled
+
         tmap = {}
-        self._map = tmap
-        self._autoforward = {}
-        if 'autoforward' in cfg:
-            for autoforward in cfg['autoforward']:
-                self._autoforward[autoforward['src']] = autoforward['dst']
+        autoforward_map = {}
+        for autoforward in autoforwards:
+            autoforward_map[autoforward['src']] = autoforward['dst']
 
         def add(event):
             sources = [event['src']] if isinstance(event['src'], (str, bytes)) else event['src']
@@ -251,15 +277,24 @@ class Fysom:  # pragma: no cover
                 tmap[event['name']][source] = event['dst']
 
         if init:
-            if 'event' not in init:
-                init['event'] = 'startup'
             add({'name': init['event'], 'src': 'none', 'dst': init['state']})
 
         for event in events:
             add(event)
 
-        for name in tmap:
-            setattr(self, name, self._build_event(name))
+        compiled = cls._compiled[key] = (tmap, autoforward_map)
+        return compiled
+
+    def _apply(self, cfg):
+        init = cfg['initial'] if 'initial' in cfg else None
+        if isinstance(init, (str, bytes)):
+            init = {'state': init}
+        if init and 'event' not in init:
+            init['event'] = 'startup'
+        events = cfg['events'] if 'events' in cfg else []
+        callbacks = cfg['callbacks'] if 'callbacks' in cfg else {}
+
+        self._map, self._autoforward = self._compile(init, events, cfg.get('autoforward', []))
 
         for name in callbacks:
             setattr(self, name, callbacks[name])
@@ -276,50 +311,47 @@ class Fysom:  # pragma: no cover
             self.src = src
             self.dst = dst
 
-    def _build_event(self, event):
-        def function(**kwargs):
-            evt = event
-
-            if hasattr(self, 'transition'):
-                raise FysomError(f"event {evt} inappropriate because previous transition did not complete")
-            if not self.can(evt):
-                raise FysomError(f"event {evt} inappropriate in current state {self.current}")
-            src = self.current
-            dst = self._map[evt][src]
-
-            transition_available = True
-
-            while transition_available:
-                event_object = self._EventObject(self, evt, src, dst)
-                for kwarg_name, kwarg in kwargs.items():
-                    setattr(event_object, kwarg_name, kwarg)
-
-                if self.current != dst:
-                    if self._before_event(event_object) is False:
-                        return
-
-                    def _tran():
-                        delattr(self, 'transition')
-                        self.current = dst
-                        self._enter_state(event_object)
-                        self._change_state(event_object)
-                        self._after_event(event_object)
-                    self.transition = _tran
-
-                if self._leave_state(event_object) is not False:
-                    if hasattr(self, 'transition'):
-                        self.transition()
-
-                if self.current in self._autoforward:
-                    src = dst
-                    dst = self._autoforward[src]
-                    evt = "autoforward" + src + "-" + dst
-
-                    transition_available = True
-                else:
-                    transition_available = False
-
-        return function
+    def _trigger(self, event, **kwargs):
+        evt = event
+
+        if hasattr(self, 'transition'):
+            raise FysomError(f"event {evt} inappropriate because previous transition did not complete")
+        if not self.can(evt):
+            raise FysomError(f"event {evt} inappropriate in current state {self.current}")
+        src = self.current
+        dst = self._map[evt][src]
+
+        transition_available = True
+
+        while transition_available:
+            event_object = self._EventObject(self, evt, src, dst)
+            for kwarg_name, kwarg in kwargs.items():
+                setattr(event_object, kwarg_name, kwarg)
+
+            if self.current != dst:
+                if self._before_event(event_object) is False:
+                    return
+
+                def _tran():
+                    delattr(self, 'transition')
+                    self.current = dst
+                    self._enter_state(event_object)
+                    self._change_state(event_object)
+                    self._after_event(event_object)
+                self.transition = _tran
+
+            if self._leave_state(event_object) is not False:
+                if hasattr(self, 'transition'):
+                    self.transition()
+
+            if self.current in self._autoforward:
+                src = dst
+                dst = self._autoforward[src]
+                evt = "autoforward" + src + "-" + dst
+
+                transition_available = True
+            else:
+                transition_available = False
 
     def _before_event(self, event):
         fnname = 'onbefore' + event.event
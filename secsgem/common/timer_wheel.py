@@ -0,0 +1,305 @@
+#####################################################################
+# timer_wheel.py
+#
+# (c) Copyright 2021, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Protocol timers of all connections on a single thread."""
+# pylint: disable=protected-access
+
+import collections
+import logging
+import math
+import threading
+import time
+
+
+class ScheduledTimer:
+    """Timer returned by :meth:`TimerWheel.schedule`, used to cancel it."""
+
+    __slots__ = ("deadline", "callback", "args", "_wheel", "_tick", "_slot")
+
+    def __init__(self, wheel, deadline, callback, args):
+        """
+        Initialize a timer.
+
+        :param wheel: wheel running the timer
+        :type wheel: :class:`secsgem.common.TimerWheel`
+        :param deadline: monotonic time the timer expires
+        :type deadline: float
+        :param callback: function called when the timer expires
+        :type callback: callable
+        :param args: arguments for the callback
+        :type args: tuple
+        """
+        self.deadline = deadline
+        self.callback = callback
+        self.args = args
+
+        self._wheel = wheel
+        self._tick = 0
+        self._slot = None
+
+    def __repr__(self):
+        """Generate textual representation for an object of this class."""
+        return f"{self.__class__.__name__} {{'remaining': {self.remaining:.3f}, 'active': {self.active}}}"
+
+    @property
+    def remaining(self):
+        """Get the time in seconds until the timer expires."""
+        return max(self.deadline - time.monotonic(), 0.0)
+
+    @property
+    def active(self):
+        """Check if the timer is waiting to expire."""
+        return self._slot is not None
+
+    def cancel(self):
+        """
+        Stop the timer, the callback is not called.
+
+        :returns: False if the timer expired or was cancelled already
+        :rtype: boolean
+        """
+        return self._wheel._cancel(self)
+
+
+class TimerWheel:
+    """
+    Hashed timer wheel running many timers on one thread.
+
+    Time is divided into ticks of ``resolution`` seconds, which are hashed into ``slots`` buckets.
+    Arming and cancelling a timer only adds it to or removes it from its bucket.
+    The thread of the wheel visits one bucket per tick and calls the callbacks of the expired timers.
+    Timers expire up to one tick late, but never early.
+
+    The callbacks run one after another on the thread of the wheel, so they must return quickly.
+    Callbacks waiting for the network should pass the work to a :class:`secsgem.common.Dispatcher`.
+
+    **Example**::
+
+        >>> import threading
+        >>> import secsgem.common
+        >>>
+        >>> wheel = secsgem.common.TimerWheel(resolution=0.01)
+        >>> expired = threading.Event()
+        >>> timer = wheel.schedule(0.05, expired.set)
+        >>> expired.wait(1)
+        True
+        >>> timer.cancel()
+        False
+        >>> wheel.shutdown()
+    """
+
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, name="secsgem_timer_wheel", resolution=0.05, slots=512):
+        """
+        Initialize a timer wheel.
+
+        :param name: name of the timer thread
+        :type name: string
+        :param resolution: duration of a tick in seconds
+        :type resolution: float
+        :param slots: number of buckets, timers further than ``slots`` ticks away are visited each round
+        :type slots: integer
+        """
+        self.logger = logging.getLogger(self.__module__ + "." + self.__class__.__name__)
+
+        self.name = name
+        self.resolution = resolution
+
+        # timers by bucket, dictionaries used as ordered sets
+        self._slots = [{} for _ in range(slots)]
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._start = time.monotonic()
+        self._next_tick = 0
+        self._pending = 0
+        self._thread = None
+
+        self._counters = collections.Counter()
+        self._times = collections.Counter(late_max=0.0)
+
+    @classmethod
+    def get_default(cls):
+        """
+        Get the timer wheel shared by all connections and handlers.
+
+        :returns: shared timer wheel
+        :rtype: :class:`secsgem.common.TimerWheel`
+        """
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls("secsgem_timer_wheel")
+
+            return cls._default
+
+    def __repr__(self):
+        """Generate textual representation for an object of this class."""
+        return f"{self.__class__.__name__} {str(self.metrics)}"
+
+    def __len__(self):
+        """Get the number of timers waiting to expire."""
+        return self._pending
+
+    @property
+    def metrics(self):
+        """
+        Get the statistics of the timer wheel.
+
+        Lateness is the time from the deadline of a timer until its callback started, in seconds.
+
+        :returns: statistics
+        :rtype: dict
+        """
+        with self._lock:
+            return {
+                "pending": self._pending,
+                "scheduled": self._counters["scheduled"],
+                "expired": self._counters["expired"],
+                "cancelled": self._counters["cancelled"],
+                "failed": self._counters["failed"],
+                "late_max": self._times["late_max"],
+            }
+
+    def schedule(self, delay, callback, *args):
+        """
+        Call a function after a delay.
+
+        :param delay: time to wait in seconds
+        :type delay: float
+        :param callback: function to call
+        :type callback: callable
+        :returns: timer, which can be cancelled
+        :rtype: :class:`secsgem.common.timer_wheel.ScheduledTimer`
+        """
+        deadline = time.monotonic() + max(delay, 0.0)
+        timer = ScheduledTimer(self, deadline, callback, args)
+
+        with self._lock:
+            # never expire before the deadline, the current tick may be visited already
+            timer._tick = max(math.ceil((deadline - self._start) / self.resolution), self._next_tick)
+            timer._slot = self._slots[timer._tick % len(self._slots)]
+            timer._slot[timer] = None
+
+            self._pending += 1
+            self._counters["scheduled"] += 1
+
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+            elif self._pending == 1:
+                self._wakeup.notify_all()
+
+        return timer
+
+    def shutdown(self, wait=True):
+        """
+        Stop the thread of the wheel, pending timers don't expire.
+
+        Scheduling a new timer restarts the thread.
+
+        :param wait: wait until the thread stopped
+        :type wait: boolean
+        """
+        with self._lock:
+            thread = self._thread
+
+            # the thread stops, when it isn't the thread of the wheel any more
+            self._thread = None
+            self._wakeup.notify_all()
+
+            for slot in self._slots:
+                for timer in slot:
+                    timer._slot = None
+
+                slot.clear()
+
+            self._pending = 0
+
+        if wait and thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def _cancel(self, timer):
+        with self._lock:
+            if timer._slot is None:
+                return False
+
+            del timer._slot[timer]
+            timer._slot = None
+
+            self._pending -= 1
+            self._counters["cancelled"] += 1
+
+        return True
+
+    def _collect(self):
+        # called with the lock held, get the expired timers or None if the wheel was stopped
+        while self._thread is threading.current_thread():
+            if not self._pending:
+                self._wakeup.wait()
+                continue
+
+            now = time.monotonic()
+            tick = math.floor((now - self._start) / self.resolution)
+
+            if tick < self._next_tick:
+                self._wakeup.wait(self._start + self._next_tick * self.resolution - now)
+                continue
+
+            expired = []
+
+            # each bucket is visited once per round, even if the thread fell behind by more than a round
+            for current in range(self._next_tick, min(tick + 1, self._next_tick + len(self._slots))):
+                slot = self._slots[current % len(self._slots)]
+
+                for timer in [timer for timer in slot if timer._tick <= tick]:
+                    del slot[timer]
+                    timer._slot = None
+                    expired.append(timer)
+
+            self._next_tick = tick + 1
+            self._pending -= len(expired)
+
+            if expired:
+                return expired
+
+        return None
+
+    def _run(self):
+        while True:
+            with self._lock:
+                expired = self._collect()
+
+            if expired is None:
+                return
+
+            for timer in sorted(expired, key=lambda timer: timer.deadline):
+                late = time.monotonic() - timer.deadline
+
+                try:
+                    timer.callback(*timer.args)
+                except Exception:  # pylint: disable=broad-except
+                    self.logger.exception('ignoring exception in timer callback')
+                    failed = True
+                else:
+                    failed = False
+
+                with self._lock:
+                    self._counters["expired"] += 1
+                    if failed:
+                        self._counters["failed"] += 1
+
+                    self._times["late_max"] = max(self._times["late_max"], late)
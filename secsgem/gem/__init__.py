@@ -29,8 +29,12 @@ from .equipment_constant import EquipmentConstant
 from .collection_event_report import CollectionEventReport
 from .collection_event_link import CollectionEventLink
 from .collection_event import CollectionEvent
+from .collection_event_pipeline import CollectionEventPipeline
+from .spool import Spool
 from .status_variable import StatusVariable
 from .data_value import DataValue
+from .value_cache import ValueCache
+from .variable_store import VariableStore, VariableSnapshot
 from .hosthandler import GemHostHandler
 
 __all__ = [
@@ -41,5 +45,6 @@ __all__ = [
     "CEID_CMD_STOP_DONE",
     "RCMD_START", "RCMD_STOP",
     "RemoteCommand", "Alarm", "EquipmentConstant", "CollectionEventReport", "CollectionEventLink",
-    "CollectionEvent", "StatusVariable", "DataValue",
+    "CollectionEvent", "CollectionEventPipeline", "Spool", "StatusVariable", "DataValue", "ValueCache",
+    "VariableStore", "VariableSnapshot",
 ]
@@ -0,0 +1,126 @@
+#####################################################################
+# collection_event_pipeline.py
+#
+# (c) Copyright 2021, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Ordered sending of collection event reports with multiple outstanding transactions."""
+
+import collections
+import concurrent.futures
+import functools
+import threading
+
+
+class CollectionEventPipeline:
+    """
+    Outbound pipeline for collection event reports (S6F11).
+
+    The reports are built and sent by the dispatcher of the handler in the order they were submitted.
+    Up to ``window`` reports are sent before the acknowledge of the first one is received,
+    so the event rate isn't limited by the round trip time to the host.
+    Reports exceeding the window are kept in the pipeline, the next one is sent when an acknowledge is received,
+    so no worker of the dispatcher waits for a slow host.
+    """
+
+    def __init__(self, handler, window=1):
+        """
+        Initialize a collection event pipeline.
+
+        :param handler: handler to send the reports with
+        :type handler: :class:`secsgem.gem.GemEquipmentHandler`
+        :param window: maximum number of reports waiting for their acknowledge
+        :type window: integer
+        """
+        self.handler = handler
+        self.window = window
+
+        self._lock = threading.Lock()
+        self._pending = collections.deque()
+        self._outstanding = 0
+
+    @property
+    def outstanding(self):
+        """Get the number of reports waiting for their acknowledge."""
+        return self._outstanding
+
+    @property
+    def pending(self):
+        """Get the number of built reports waiting for a free slot in the window."""
+        return len(self._pending)
+
+    def submit(self, build):
+        """
+        Queue a collection event report.
+
+        :param build: function returning the report to send, called in a worker thread
+        :type build: callable
+        :returns: future for the decoded acknowledge, None if the report was not acknowledged
+        :rtype: :class:`concurrent.futures.Future`
+        """
+        future = concurrent.futures.Future()
+
+        if not self.handler.dispatcher.dispatch(self, self._build, build, future):
+            self.handler.logger.warning("dispatcher queue full, collection event report rejected")
+            future.set_result(None)
+
+        return future
+
+    def _build(self, build, future):
+        if not future.set_running_or_notify_cancel():
+            return
+
+        try:
+            function = build()
+        except Exception as exc:  # pylint: disable=broad-except
+            future.set_exception(exc)
+            return
+
+        with self._lock:
+            self._pending.append((function, future))
+
+        self._send_pending()
+
+    def _send_pending(self):
+        # only called by the dispatcher with the pipeline as key, so the reports are sent in order
+        while True:
+            with self._lock:
+                if not self._pending or self._outstanding >= self.window:
+                    return
+
+                function, future = self._pending.popleft()
+                self._outstanding += 1
+
+            try:
+                request = self.handler.send_request(function)
+            except Exception as exc:  # pylint: disable=broad-except
+                self._release()
+                future.set_exception(exc)
+                continue
+
+            request.add_done_callback(functools.partial(self._on_acknowledge, future=future))
+
+    def _release(self):
+        with self._lock:
+            self._outstanding -= 1
+
+            return bool(self._pending)
+
+    def _on_acknowledge(self, request, future):
+        # sent by a worker, not by the receiver or timer thread completing the request
+        if self._release():
+            self.handler.dispatcher.dispatch_unbounded(self, self._send_pending)
+
+        try:
+            future.set_result(self.handler.secs_decode(request.result()))
+        except Exception as exc:  # pylint: disable=broad-except
+            future.set_exception(exc)
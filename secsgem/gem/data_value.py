@@ -33,6 +33,9 @@ class DataValue:
 
         If use_callbacks is disabled, you can set the value with the value property.
 
+        Values returned by the callback are reused for the number of seconds in the 'max_age' keyword argument,
+        see :meth:`secsgem.gem.equipmenthandler.GemEquipmentHandler.invalidate_values`.
+
         :param dvid: ID of the data value
         :type dvid: various
         :param name: long name of the data value
@@ -47,6 +50,7 @@ class DataValue:
         self.value_type = value_type
         self.use_callback = use_callback
         self.value = 0
+        self.max_age = None
 
         if isinstance(self.dvid, int):
             self.id_type = secsgem.secs.variables.U4
@@ -15,11 +15,15 @@
 #####################################################################
 """Handler for GEM equipment."""
 
+import concurrent.futures
+import functools
+import threading
 from datetime import datetime
 
 from dateutil.tz import tzlocal
 
 import secsgem.common
+import secsgem.hsms
 import secsgem.secs.variables
 import secsgem.secs.data_items
 
@@ -27,8 +31,11 @@ from .status_variable import StatusVariable
 from .collection_event import CollectionEvent
 from .collection_event_link import CollectionEventLink
 from .collection_event_report import CollectionEventReport
+from .collection_event_pipeline import CollectionEventPipeline
 from .equipment_constant import EquipmentConstant
 from .remote_command import RemoteCommand
+from .value_cache import ValueCache
+from .variable_store import VariableStore
 from .handler import GemHandler
 
 
@@ -41,6 +48,9 @@ SVID_EVENTS_ENABLED = 1003
 SVID_ALARMS_ENABLED = 1004
 SVID_ALARMS_SET = 1005
 
+INTERNAL_SVIDS = (SVID_CLOCK, SVID_CONTROL_STATE, SVID_EVENTS_ENABLED, SVID_ALARMS_ENABLED, SVID_ALARMS_SET)
+""" Status variables provided by the handler, not by the value request callbacks ."""
+
 CEID_EQUIPMENT_OFFLINE = 1
 CEID_CONTROL_STATE_LOCAL = 2
 CEID_CONTROL_STATE_REMOTE = 3
@@ -125,6 +135,24 @@ class GemEquipmentHandler(GemHandler):
         self._registered_reports = {}
         self._registered_collection_events = {}
 
+        # outbound collection event reports, window can be increased to send reports before the previous is acknowledged
+        self.collection_event_pipeline = CollectionEventPipeline(self)
+
+        # values of callback variables with max_age, reused until they are too old
+        self.value_cache = ValueCache()
+
+        # values pushed by the application with set_values, read as snapshots for each message
+        self.variable_store = VariableStore()
+
+        # spooling of messages to the host, disabled until a spool is set
+        self.spool = None
+        self.spool_streams_functions = {}
+        self.spool_max_transmit = 0
+        self.spool_transmit_batch = 100
+
+        self._spool_lock = threading.Lock()
+        self._spool_transmitting = False
+
         self.controlState = secsgem.common.Fysom({
             'initial': "INIT",
             'events': [
@@ -301,19 +329,57 @@ class GemEquipmentHandler(GemHandler):
 
         return dv.value_type(dv.value)
 
-    def _get_dv_value(self, dv):
+    def on_dv_values_request(self, dvs):
+        """
+        Get the values of multiple data values with a single request.
+
+        Called for all data values of a collection event, which use the callback.
+        Override in inherited class to read the values from the backend at once,
+        calls :meth:`on_dv_value_request` for each data value by default.
+
+        :param dvs: The data values requested
+        :type dvs: list of :class:`secsgem.gem.DataValue`
+        :returns: The values encoded in the corresponding types, in the order of the data values
+        :rtype: list of :class:`secsgem.secs.variables.Base`
+        """
+        return [self.on_dv_value_request(dv.id_type(dv.dvid), dv) for dv in dvs]
+
+    def _get_dv_value(self, dv, snapshot=None):
         """
         Get the data value depending on its configuation.
 
         :param dv: The data value requested
         :type dv: :class:`secsgem.gem.DataValue`
+        :param snapshot: values pushed by the application, the current values if not set
+        :type snapshot: :class:`secsgem.gem.VariableSnapshot`
         :returns: The value encoded in the corresponding type
         :rtype: :class:`secsgem.secs.variables.Base`
         """
         if dv.use_callback:
-            return self.on_dv_value_request(dv.id_type(dv.dvid), dv)
+            return self._get_dv_values([dv])[0]
 
-        return dv.value_type(dv.value)
+        if snapshot is None:
+            snapshot = self.variable_store.snapshot()
+
+        return dv.value_type(snapshot.get(("DV", dv.dvid), dv.value))
+
+    def _get_dv_values(self, dvs, snapshot=None):
+        """
+        Get the values of multiple data values, the callback values are requested at once.
+
+        :param dvs: The data values requested
+        :type dvs: list of :class:`secsgem.gem.DataValue`
+        :param snapshot: values pushed by the application, the current values if not set
+        :type snapshot: :class:`secsgem.gem.VariableSnapshot`
+        :returns: The values encoded in the corresponding types
+        :rtype: list of :class:`secsgem.secs.variables.Base`
+        """
+        if snapshot is None:
+            snapshot = self.variable_store.snapshot()
+
+        return self._get_batched_values(dvs, [("DV", dv.dvid) if dv.use_callback else None for dv in dvs],
+                                        functools.partial(self._get_dv_value, snapshot=snapshot),
+                                        self.on_dv_values_request)
 
     # status variables
 
@@ -344,12 +410,29 @@ class GemEquipmentHandler(GemHandler):
 
         return sv.value_type(sv.value)
 
-    def _get_sv_value(self, sv):
+    def on_sv_values_request(self, svs):
+        """
+        Get the values of multiple status variables with a single request.
+
+        Called for all status variables of a S1F3 request or a collection event, which use the callback.
+        Override in inherited class to read the values from the backend at once,
+        calls :meth:`on_sv_value_request` for each status variable by default.
+
+        :param svs: The status variables requested
+        :type svs: list of :class:`secsgem.gem.StatusVariable`
+        :returns: The values encoded in the corresponding types, in the order of the status variables
+        :rtype: list of :class:`secsgem.secs.variables.Base`
+        """
+        return [self.on_sv_value_request(sv.id_type(sv.svid), sv) for sv in svs]
+
+    def _get_sv_value(self, sv, snapshot=None):
         """
         Get the status variable value depending on its configuation.
 
         :param sv: The status variable requested
         :type sv: :class:`secsgem.gem.StatusVariable`
+        :param snapshot: values pushed by the application, the current values if not set
+        :type snapshot: :class:`secsgem.gem.VariableSnapshot`
         :returns: The value encoded in the corresponding type
         :rtype: :class:`secsgem.secs.variables.Base`
         """
@@ -368,9 +451,125 @@ class GemEquipmentHandler(GemHandler):
             return sv.value_type(secsgem.secs.data_items.SV, alarms)
 
         if sv.use_callback:
-            return self.on_sv_value_request(sv.id_type(sv.svid), sv)
+            return self._get_sv_values([sv])[0]
 
-        return sv.value_type(sv.value)
+        if snapshot is None:
+            snapshot = self.variable_store.snapshot()
+
+        return sv.value_type(snapshot.get(("SV", sv.svid), sv.value))
+
+    def _get_sv_values(self, svs, snapshot=None):
+        """
+        Get the values of multiple status variables, the callback values are requested at once.
+
+        :param svs: The status variables requested
+        :type svs: list of :class:`secsgem.gem.StatusVariable`
+        :param snapshot: values pushed by the application, the current values if not set
+        :type snapshot: :class:`secsgem.gem.VariableSnapshot`
+        :returns: The values encoded in the corresponding types
+        :rtype: list of :class:`secsgem.secs.variables.Base`
+        """
+        if snapshot is None:
+            snapshot = self.variable_store.snapshot()
+
+        return self._get_batched_values(
+            svs, [("SV", sv.svid) if sv.use_callback and sv.svid not in INTERNAL_SVIDS else None for sv in svs],
+            functools.partial(self._get_sv_value, snapshot=snapshot), self.on_sv_values_request)
+
+    def _get_batched_values(self, variables, keys, get_value, request_values):
+        """
+        Get the values of multiple variables, passing the variables using the callback to a single request.
+
+        Values of variables with a ``max_age`` are taken from the :attr:`value_cache` if they are recent enough.
+        These values are :class:`secsgem.secs.variables.Encoded`, the messages reuse their encoded data.
+
+        :param variables: The variables requested
+        :type variables: list
+        :param keys: cache key for each variable requested from the callback, None for the other variables
+        :type keys: list
+        :param get_value: function getting the value of a single variable not using the callback
+        :type get_value: callable
+        :param request_values: function requesting the values of the variables using the callback
+        :type request_values: callable
+        :returns: The values encoded in the corresponding types
+        :rtype: list of :class:`secsgem.secs.variables.Base`
+        """
+        values = {}
+        requested = []
+
+        for variable, key in zip(variables, keys):
+            if key is None or key in values:
+                continue
+
+            if variable.max_age is not None:
+                value = self.value_cache.get(key)
+                if value is not None:
+                    values[key] = value
+                    continue
+
+            values[key] = None
+            requested.append((key, variable))
+
+        if requested:
+            requested_values = request_values([variable for _, variable in requested])
+            if len(requested_values) != len(requested):
+                raise ValueError(f"{len(requested_values)} values returned for {len(requested)} requested variables")
+
+            for (key, variable), value in zip(requested, requested_values):
+                if variable.max_age is not None:
+                    value = self.value_cache.put(key, value, variable.max_age)
+
+                values[key] = value
+
+        return [get_value(variable) if key is None else values[key] for variable, key in zip(variables, keys)]
+
+    def invalidate_values(self, svids=None, dvids=None):
+        """
+        Remove cached values of status variables and data values.
+
+        The next request gets the values from the callbacks again, e.g. after the application knows they changed.
+        Without parameters, all cached values are removed.
+
+        :param svids: ids of the status variables to remove
+        :type svids: list
+        :param dvids: ids of the data values to remove
+        :type dvids: list
+        """
+        if svids is None and dvids is None:
+            self.value_cache.invalidate()
+            return
+
+        self.value_cache.invalidate([("SV", svid) for svid in svids or []] + [("DV", dvid) for dvid in dvids or []])
+
+    def set_values(self, svs=None, dvs=None):
+        """
+        Set the values of multiple status variables and data values at once.
+
+        Messages and reports contain either all or none of the new values, never a part of them.
+        The values are used for variables not using the callback, instead of their value property.
+
+        :param svs: values by status variable id
+        :type svs: dict
+        :param dvs: values by data value id
+        :type dvs: dict
+        :returns: version of the variable store with the new values
+        :rtype: integer
+        """
+        svs = svs or {}
+        dvs = dvs or {}
+
+        for svid in svs:
+            if svid not in self._status_variables:
+                raise ValueError(f"Unknown status variable {svid}")
+
+        for dvid in dvs:
+            if dvid not in self._data_values:
+                raise ValueError(f"Unknown data value {dvid}")
+
+        values = {("SV", svid): value for svid, value in svs.items()}
+        values.update({("DV", dvid): value for dvid, value in dvs.items()})
+
+        return self.variable_store.update(values)
 
     def _on_s01f03(self, handler, packet):
         """
@@ -384,19 +583,16 @@ class GemEquipmentHandler(GemHandler):
         del handler  # unused parameters
 
         message = self.secs_decode(packet)
-
-        responses = []
+        snapshot = self.variable_store.snapshot()
 
         if len(message) == 0:
-            for svid, sv in self._status_variables.items():
-                responses.append(self._get_sv_value(sv))
+            responses = self._get_sv_values(list(self._status_variables.values()), snapshot)
         else:
-            for svid in message:
-                if svid not in self._status_variables:
-                    responses.append(secsgem.secs.variables.Array(secsgem.secs.data_items.SV, []))
-                else:
-                    sv = self._status_variables[svid]
-                    responses.append(self._get_sv_value(sv))
+            svs = [self._status_variables.get(svid) for svid in message]
+            values = iter(self._get_sv_values([sv for sv in svs if sv is not None], snapshot))
+
+            responses = [secsgem.secs.variables.Array(secsgem.secs.data_items.SV, []) if sv is None else next(values)
+                         for sv in svs]
 
         return self.stream_function(1, 4)(responses)
 
@@ -465,19 +661,59 @@ class GemEquipmentHandler(GemHandler):
         """
         Triggers the supplied collection events.
 
+        Waits until the host acknowledged the reports.
+        Exceptions raised while building or sending a report are raised again,
+        after the reports of the other events were sent.
+
+        :param ceids: List of collection events
+        :type ceids: list of various
+        """
+        futures = self.trigger_collection_events_nowait(ceids)
+
+        concurrent.futures.wait(futures)
+
+        for future in futures:
+            future.result()
+
+    def trigger_collection_events_nowait(self, ceids):
+        """
+        Triggers the supplied collection events without waiting for the acknowledge.
+
+        The reports are built and sent by :attr:`collection_event_pipeline` in the order of the events.
+        The result of a future is the S6F12 received from the host,
+        None if the event is not enabled or the report was not acknowledged.
+
         :param ceids: List of collection events
         :type ceids: list of various
+        :returns: future for each collection event
+        :rtype: list of :class:`concurrent.futures.Future`
         """
         if not isinstance(ceids, list):
             ceids = [ceids]
 
+        futures = []
+
         for ceid in ceids:
-            if ceid in self._registered_collection_events:
-                if self._registered_collection_events[ceid].enabled:
-                    reports = self._build_collection_event(ceid)
+            if ceid in self._registered_collection_events and self._registered_collection_events[ceid].enabled:
+                futures.append(self.collection_event_pipeline.submit(
+                    functools.partial(self._build_collection_event_report, ceid)))
+            else:
+                future = concurrent.futures.Future()
+                future.set_result(None)
+                futures.append(future)
+
+        return futures
+
+    def _build_collection_event_report(self, ceid):
+        """
+        Build the report message for a collection event.
 
-                    self.send_and_waitfor_response(self.stream_function(6, 11)(
-                        {"DATAID": 1, "CEID": ceid, "RPT": reports}))
+        :param ceid: collection event to build
+        :type ceid: integer
+        :returns: collection event report
+        :rtype: :class:`secsgem.secs.functions.SecsS06F11`
+        """
+        return self.stream_function(6, 11)({"DATAID": 1, "CEID": ceid, "RPT": self._build_collection_event(ceid)})
 
     def _on_s02f33(self, handler, packet):
         """
@@ -665,22 +901,22 @@ class GemEquipmentHandler(GemHandler):
         :returns: collection event data
         :rtype: array
         """
-        reports = []
+        rptids = self._registered_collection_events[ceid].reports
+
+        # request the variables of all reports at once, variables in multiple reports only once
+        vids = list(dict.fromkeys(var for rptid in rptids for var in self._registered_reports[rptid].vars))
 
-        for rptid in self._registered_collection_events[ceid].reports:
-            report = self._registered_reports[rptid]
-            variables = []
-            for var in report.vars:
-                if var in self._status_variables:
-                    v = self._get_sv_value(self._status_variables[var])
-                    variables.append(v)
-                elif var in self._data_values:
-                    v = self._get_dv_value(self._data_values[var])
-                    variables.append(v)
+        svids = [var for var in vids if var in self._status_variables]
+        dvids = [var for var in vids if var not in self._status_variables and var in self._data_values]
 
-            reports.append({"RPTID": rptid, "V": variables})
+        # all pushed values of the reports from the same version of the variable store
+        snapshot = self.variable_store.snapshot()
 
-        return reports
+        values = dict(zip(svids, self._get_sv_values([self._status_variables[svid] for svid in svids], snapshot)))
+        values.update(zip(dvids, self._get_dv_values([self._data_values[dvid] for dvid in dvids], snapshot)))
+
+        return [{"RPTID": rptid, "V": [values[var] for var in self._registered_reports[rptid].vars if var in values]}
+                for rptid in rptids]
 
     # equipment constants
 
@@ -994,6 +1230,250 @@ class GemEquipmentHandler(GemHandler):
 
         return self.stream_function(5, 8)(result)
 
+    # spooling
+
+    def send_and_waitfor_response(self, packet):
+        """
+        Send the packet and wait for the response.
+
+        The packet is spooled instead, if spooling is active for its stream and function.
+
+        :param packet: packet to be sent
+        :type packet: :class:`secsgem.secs.functionbase.SecsStreamFunction`
+        :returns: Packet that was received, None if the packet was spooled
+        :rtype: :class:`secsgem.hsms.HsmsPacket`
+        """
+        if self._spool_message(packet):
+            return None
+
+        return super().send_and_waitfor_response(packet)
+
+    def send_request(self, packet, timeout=None):
+        """
+        Send the packet without waiting for the response.
+
+        The packet is spooled instead, if spooling is active for its stream and function.
+
+        :param packet: packet to be sent
+        :type packet: :class:`secsgem.secs.functionbase.SecsStreamFunction`
+        :param timeout: time to wait for the response in seconds, T3 if not set
+        :type timeout: float
+        :returns: future for the received packet, its result is None if the packet was spooled
+        :rtype: :class:`concurrent.futures.Future`
+        """
+        if self._spool_message(packet):
+            future = concurrent.futures.Future()
+            future.set_result(None)
+            return future
+
+        return super().send_request(packet, timeout)
+
+    def _is_spooled(self, stream, function):
+        """
+        Check if spooling is enabled for a stream and function.
+
+        :param stream: stream of the message
+        :type stream: integer
+        :param function: function of the message
+        :type function: integer
+        :returns: True if messages for the stream and function are spooled
+        :rtype: boolean
+        """
+        if stream not in self.spool_streams_functions:
+            return False
+
+        functions = self.spool_streams_functions[stream]
+
+        return not functions or function in functions
+
+    def _spool_message(self, packet):
+        """
+        Add a message to the spool, if the host is not communicating or older messages are spooled.
+
+        :param packet: packet to be sent
+        :type packet: :class:`secsgem.secs.functionbase.SecsStreamFunction`
+        :returns: True if the message was spooled or dropped because the spool is full
+        :rtype: boolean
+        """
+        if self.spool is None or not self._is_spooled(packet.stream, packet.function):
+            return False
+
+        if self.communicationState.isstate("COMMUNICATING") and len(self.spool) == 0:
+            return False
+
+        if not self.spool.append(packet.stream, packet.function, packet.encode(), packet.is_reply_required):
+            self.logger.warning("spool full, S%02dF%02d dropped", packet.stream, packet.function)
+
+        return True
+
+    def _on_s02f43(self, handler, packet):
+        """
+        Handle Stream 2, Function 43, Reset spooling streams and functions.
+
+        :param handler: handler the message was received on
+        :type handler: :class:`secsgem.hsms.handler.HsmsHandler`
+        :param packet: complete message received
+        :type packet: :class:`secsgem.hsms.HsmsPacket`
+        """
+        del handler  # unused parameters
+
+        message = self.secs_decode(packet)
+
+        streams_functions = {}
+        errors = []
+
+        for stream in message:
+            strid = stream.STRID.get()
+            fcnids = stream.FCNID.get()
+
+            if self.spool is None or strid == 1:
+                errors.append({"STRID": strid, "STRACK": secsgem.secs.data_items.STRACK.SPOOLING_NOT_ALLOWED,
+                               "FCNID": []})
+            elif strid not in self.secs_streams_functions:
+                errors.append({"STRID": strid, "STRACK": secsgem.secs.data_items.STRACK.STREAM_UNKNOWN, "FCNID": []})
+            elif [fcnid for fcnid in fcnids if fcnid not in self.secs_streams_functions[strid]]:
+                errors.append({"STRID": strid, "STRACK": secsgem.secs.data_items.STRACK.FUNCTION_UNKNOWN,
+                               "FCNID": [fcnid for fcnid in fcnids if fcnid not in self.secs_streams_functions[strid]]})
+            elif [fcnid for fcnid in fcnids if fcnid % 2 == 0]:
+                errors.append({"STRID": strid, "STRACK": secsgem.secs.data_items.STRACK.SECONDARY_FUNCTION,
+                               "FCNID": [fcnid for fcnid in fcnids if fcnid % 2 == 0]})
+            else:
+                streams_functions[strid] = set(fcnids)
+
+        if errors:
+            return self.stream_function(2, 44)({"RSPACK": secsgem.secs.data_items.RSPACK.REJECTED, "DATA": errors})
+
+        self.spool_streams_functions = streams_functions
+
+        return self.stream_function(2, 44)({"RSPACK": secsgem.secs.data_items.RSPACK.ACCEPTED, "DATA": []})
+
+    def _on_s06f23(self, handler, packet):
+        """
+        Handle Stream 6, Function 23, Request spooled data.
+
+        The acknowledge is sent by the transmission before the spooled messages,
+        if the transmission can't be queued on the dispatcher the request is denied as busy.
+
+        :param handler: handler the message was received on
+        :type handler: :class:`secsgem.hsms.handler.HsmsHandler`
+        :param packet: complete message received
+        :type packet: :class:`secsgem.hsms.HsmsPacket`
+        """
+        del handler  # unused parameters
+
+        message = self.secs_decode(packet)
+
+        if self.spool is None or len(self.spool) == 0:
+            return self.stream_function(6, 24)(secsgem.secs.data_items.RSDA.DENIED_NO_DATA)
+
+        with self._spool_lock:
+            if self._spool_transmitting:
+                return self.stream_function(6, 24)(secsgem.secs.data_items.RSDA.DENIED_BUSY)
+
+            if message.get() == secsgem.secs.data_items.RSDC.PURGE:
+                self.spool.purge()
+                return self.stream_function(6, 24)(secsgem.secs.data_items.RSDA.ACK)
+
+            self._spool_transmitting = True
+
+        # transmit in a separate queue, so messages from the host are handled during the transmission
+        if not self.dispatcher.dispatch(self.spool, self._transmit_spool, packet.header.system):
+            self.logger.warning("dispatcher queue full, spool transmission rejected")
+
+            with self._spool_lock:
+                self._spool_transmitting = False
+
+            return self.stream_function(6, 24)(secsgem.secs.data_items.RSDA.DENIED_BUSY)
+
+        return None
+
+    def _transmit_spool(self, system):
+        """
+        Send the spooled messages to the host, oldest first.
+
+        The messages are sent in batches as they were stored, without decoding them.
+        Transmission stops if a message wasn't acknowledged, the remaining messages stay spooled.
+
+        :param system: system bytes of the request for spooled data, acknowledged before the transmission
+        :type system: integer
+        """
+        try:
+            self.send_response(self.stream_function(6, 24)(secsgem.secs.data_items.RSDA.ACK), system)
+
+            transmitted = 0
+
+            while len(self.spool) > 0:
+                count = self.spool_transmit_batch
+                if self.spool_max_transmit > 0:
+                    count = min(count, self.spool_max_transmit - transmitted)
+                    if count <= 0:
+                        break
+
+                # send the whole batch before waiting for the replies
+                sent = [self._send_spooled(*message) for message in self.spool.peek(count)]
+                if not sent:
+                    break
+
+                # only the messages before the first failed one are removed from the spool
+                acknowledged = 0
+                failed = False
+
+                for transaction, packet in sent:
+                    if transaction is not None:
+                        if transaction.wait() is None:
+                            packet = None
+                        self.transactions.remove(transaction.system)
+
+                    if packet is None:
+                        failed = True
+                    elif not failed:
+                        acknowledged += 1
+
+                self.spool.remove(acknowledged)
+                transmitted += acknowledged
+
+                if failed:
+                    self.logger.warning("spool transmission stopped, %d messages remaining", len(self.spool))
+                    break
+        finally:
+            with self._spool_lock:
+                self._spool_transmitting = False
+
+    def _send_spooled(self, stream, function, reply_required, data):
+        """
+        Send a spooled message.
+
+        :param stream: stream of the message
+        :type stream: integer
+        :param function: function of the message
+        :type function: integer
+        :param reply_required: the message requires a reply
+        :type reply_required: boolean
+        :param data: encoded message body
+        :type data: bytes
+        :returns: transaction for the reply, None if no reply is required, and the sent packet, None if sending failed
+        :rtype: tuple
+        """
+        if reply_required:
+            transaction = self.transactions.allocate(self.connection.T3)
+            system = transaction.system
+        else:
+            transaction = None
+            system = self.get_next_system_counter()
+
+        packet = secsgem.hsms.HsmsPacket(
+            secsgem.hsms.HsmsStreamFunctionHeader(system, stream, function, reply_required, self.sessionID), data)
+
+        self._log_packet(">", packet)
+
+        if not self.connection.send_packet(packet):
+            self.logger.error("Sending packet failed")
+            if transaction is not None:
+                transaction.cancel()
+            return transaction, None
+
+        return transaction, packet
+
     # remote commands
 
     @property
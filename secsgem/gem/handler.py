@@ -88,6 +88,9 @@ class GemHandler(secsgem.secs.SecsHandler):
             ]
         })
 
+        # state changes by received messages (receiver thread) and timeouts (dispatcher) are checked under this lock
+        self._communicationStateLock = threading.RLock()
+
         self.waitCRATimer = None
         self.commDelayTimer = None
         self.establishCommunicationTimeout = 10
@@ -116,14 +119,18 @@ class GemHandler(secsgem.secs.SecsHandler):
     def enable(self):
         """Enable the connection."""
         self.connection.enable()
-        self.communicationState.enable()
+
+        with self._communicationStateLock:
+            self.communicationState.enable()
 
         self.logger.info("Connection enabled")
 
     def disable(self):
         """Disable the connection."""
         self.connection.disable()
-        self.communicationState.disable()
+
+        with self._communicationStateLock:
+            self.communicationState.disable()
 
         self.logger.info("Connection disabled")
 
@@ -134,38 +141,42 @@ class GemHandler(secsgem.secs.SecsHandler):
         :param packet: received data packet
         :type packet: :class:`secsgem.HsmsPacket`
         """
-        if self.communicationState.isstate('WAIT_CRA'):
-            if packet.header.stream == 1 and packet.header.function == 13:
-                if self.isHost:
-                    self.send_response(self.stream_function(1, 14)({"COMMACK": self.on_commack_requested(),
-                                                                    "MDLN": []}),
-                                       packet.header.system)
-                else:
-                    self.send_response(self.stream_function(1, 14)({"COMMACK": self.on_commack_requested(),
-                                                                    "MDLN": [self.MDLN, self.SOFTREV]}),
-                                       packet.header.system)
-
-                self.communicationState.s1f13received()
-            elif packet.header.stream == 1 and packet.header.function == 14:
-                self.communicationState.s1f14received()
-        elif self.communicationState.isstate('WAIT_DELAY'):
-            pass
-        elif self.communicationState.isstate('COMMUNICATING'):
-            threading.Thread(target=self._handle_stream_function, args=(packet, ),
-                             name=f"secsgem_gemHandler_callback_S{packet.header.stream}F{packet.header.function}"
-                             ).start()
+        with self._communicationStateLock:
+            if self.communicationState.isstate('WAIT_CRA'):
+                if packet.header.stream == 1 and packet.header.function == 13:
+                    if self.isHost:
+                        self.send_response(self.stream_function(1, 14)({"COMMACK": self.on_commack_requested(),
+                                                                        "MDLN": []}),
+                                           packet.header.system)
+                    else:
+                        self.send_response(self.stream_function(1, 14)({"COMMACK": self.on_commack_requested(),
+                                                                        "MDLN": [self.MDLN, self.SOFTREV]}),
+                                           packet.header.system)
+
+                    self.communicationState.s1f13received()
+                elif packet.header.stream == 1 and packet.header.function == 14:
+                    self.communicationState.s1f14received()
+            elif self.communicationState.isstate('WAIT_DELAY'):
+                pass
+            elif self.communicationState.isstate('COMMUNICATING'):
+                self._dispatch_stream_function(packet)
 
     def _on_hsms_select(self):
         """Selected received from hsms layer."""
-        self.communicationState.select()
+        with self._communicationStateLock:
+            self.communicationState.select()
 
     def _on_wait_cra_timeout(self):
-        """Linktest time timed out, so send linktest request."""
-        self.communicationState.communicationreqfail()
+        """Communication request wasn't answered in time (T3), so wait before requesting again."""
+        with self._communicationStateLock:
+            if self.communicationState.isstate('WAIT_CRA'):
+                self.communicationState.communicationreqfail()
 
     def _on_wait_comm_delay_timeout(self):
-        """Linktest time timed out, so send linktest request."""
-        self.communicationState.delayexpired()
+        """Communication delay timed out, so send the next communication request."""
+        with self._communicationStateLock:
+            if self.communicationState.isstate('WAIT_DELAY'):
+                self.communicationState.delayexpired()
 
     def _on_state_wait_cra(self, _):
         """
@@ -176,8 +187,11 @@ class GemHandler(secsgem.secs.SecsHandler):
         """
         self.logger.debug("connectionState -> WAIT_CRA")
 
-        self.waitCRATimer = threading.Timer(self.connection.T3, self._on_wait_cra_timeout)
-        self.waitCRATimer.start()
+        # handled on the dispatcher instead of the timer thread, the timeout checks the state under the state lock,
+        # as a received S1F13/S1F14 may have changed it in the meantime.
+        # queued regardless of the queue limit, a rejected timeout would leave the state in WAIT_CRA
+        self.waitCRATimer = self.timers.schedule(self.connection.T3, self.dispatcher.dispatch_unbounded, self,
+                                                 self._on_wait_cra_timeout)
 
         if self.isHost:
             self.send_stream_function(self.stream_function(1, 13)())
@@ -193,8 +207,9 @@ class GemHandler(secsgem.secs.SecsHandler):
         """
         self.logger.debug("connectionState -> WAIT_DELAY")
 
-        self.commDelayTimer = threading.Timer(self.establishCommunicationTimeout, self._on_wait_comm_delay_timeout)
-        self.commDelayTimer.start()
+        self.commDelayTimer = self.timers.schedule(self.establishCommunicationTimeout,
+                                                   self.dispatcher.dispatch_unbounded, self,
+                                                   self._on_wait_comm_delay_timeout)
 
     def _on_state_leave_wait_cra(self, _):
         """
@@ -237,9 +252,10 @@ class GemHandler(secsgem.secs.SecsHandler):
         # call parent handlers
         super().on_connection_closed(connection)
 
-        if self.communicationState.current == "COMMUNICATING":
-            # update communication state
-            self.communicationState.communicationfail()
+        with self._communicationStateLock:
+            if self.communicationState.current == "COMMUNICATING":
+                # update communication state
+                self.communicationState.communicationfail()
 
     def on_commack_requested(self):
         """
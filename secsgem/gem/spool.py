@@ -0,0 +1,372 @@
+#####################################################################
+# spool.py
+#
+# (c) Copyright 2021, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""
+Disk backed spool for messages, which couldn't be sent to the host.
+
+The spool is a directory of memory mapped segment files.
+Each segment contains length prefixed records with the encoded message,
+a record with length 0 marks the end of the written records.
+The position of the oldest record is stored in a separate file.
+It is written when a segment is removed, after a number of removed records, on flush and on close,
+so removing a record doesn't write to the disk.
+
+The records are not synced to disk for every message,
+after a crash of the operating system the newest records might be lost.
+After a crash of the process, records removed since the position was written last are loaded again.
+"""
+
+import mmap
+import os
+import re
+import struct
+import threading
+
+RECORD_HEADER = struct.Struct(">LBB")
+""" Record length including header, stream with reply bit and function ."""
+
+HEAD_STATE = struct.Struct(">QQ")
+""" Segment index and offset of the oldest record ."""
+
+REPLY_REQUIRED = 0x80
+""" Bit in the stream byte of the record, set if the message requires a reply ."""
+
+_SEGMENT_PATTERN = re.compile(r"^(\d{10})\.segment$")
+
+
+class _Segment:
+    """Segment file of the spool."""
+
+    def __init__(self, path, index, size=0):
+        self.index = index
+        self.path = os.path.join(path, f"{index:010d}.segment")
+
+        # records in the segment, starting at the head for the oldest segment
+        self.count = 0
+        self.end = 0
+
+        if size:
+            with open(self.path, "wb") as segment_file:
+                segment_file.truncate(size)
+
+        self._file = open(self.path, "r+b")  # pylint: disable=consider-using-with
+        self.map = mmap.mmap(self._file.fileno(), 0)
+
+    @property
+    def size(self):
+        return len(self.map)
+
+    def scan(self, offset):
+        """Count the records starting at offset and find the end of the written records."""
+        self.count = 0
+
+        while offset + RECORD_HEADER.size <= self.size:
+            length, _, _ = RECORD_HEADER.unpack_from(self.map, offset)
+            if length < RECORD_HEADER.size or offset + length > self.size:
+                break
+
+            offset += length
+            self.count += 1
+
+        self.end = offset
+
+    def record(self, offset):
+        """Read the record at offset, returns None if no record was written at offset."""
+        if offset + RECORD_HEADER.size > self.size:
+            return None
+
+        length, stream, function = RECORD_HEADER.unpack_from(self.map, offset)
+        if length < RECORD_HEADER.size:
+            return None
+
+        data = self.map[offset + RECORD_HEADER.size:offset + length]
+
+        return length, stream & ~REPLY_REQUIRED, function, bool(stream & REPLY_REQUIRED), data
+
+    def close(self):
+        self.map.close()
+        self._file.close()
+
+    def delete(self):
+        self.close()
+        os.remove(self.path)
+
+
+class Spool:
+    """
+    Disk backed queue of encoded messages.
+
+    Messages are appended to the newest segment and read from the oldest,
+    only the segments of the spool and not the messages are kept in memory.
+
+    **Example**::
+
+        >>> import tempfile
+        >>> import secsgem.gem
+        >>>
+        >>> spool = secsgem.gem.Spool(tempfile.mkdtemp(), max_messages=1000)
+        >>> spool.append(6, 11, b"\\x01\\x00")
+        True
+        >>> len(spool)
+        1
+        >>> spool.peek(10)
+        [(6, 11, True, b'\\x01\\x00')]
+        >>> spool.remove(1)
+        >>> len(spool)
+        0
+        >>> spool.close()
+    """
+
+    def __init__(self, path, max_messages=0, overwrite=False, segment_size=16 * 1024 * 1024, head_interval=1000):
+        """
+        Initialize a spool.
+
+        Messages already stored in the directory are loaded.
+
+        :param path: directory for the segment files
+        :type path: string
+        :param max_messages: maximum number of spooled messages, 0 for no limit
+        :type max_messages: integer
+        :param overwrite: drop the oldest message when the spool is full, drop the new message otherwise
+        :type overwrite: boolean
+        :param segment_size: size of the segment files in bytes
+        :type segment_size: integer
+        :param head_interval: number of removed messages after which the position of the oldest message is written
+        :type head_interval: integer
+        """
+        self.path = path
+        self.max_messages = max_messages
+        self.overwrite = overwrite
+        self.segment_size = segment_size
+        self.head_interval = head_interval
+
+        self._lock = threading.Lock()
+        self._segments = []
+        self._head = 0
+        self._count = 0
+
+        # messages removed since the head was written
+        self._unwritten = 0
+
+        os.makedirs(path, exist_ok=True)
+
+        self._load()
+
+    def __len__(self):
+        """Get the number of spooled messages."""
+        return self._count
+
+    def __repr__(self):
+        """Generate textual representation for an object of this class."""
+        return f"{self.__class__.__name__} {{'path': {self.path!r}, 'count': {self._count}, " \
+               f"'segments': {len(self._segments)}}}"
+
+    @property
+    def full(self):
+        """Check if the spool reached its maximum number of messages."""
+        return 0 < self.max_messages <= self._count
+
+    def append(self, stream, function, data, reply_required=True):
+        """
+        Add an encoded message to the spool.
+
+        :param stream: stream of the message
+        :type stream: integer
+        :param function: function of the message
+        :type function: integer
+        :param data: encoded message body
+        :type data: bytes
+        :param reply_required: the message requires a reply
+        :type reply_required: boolean
+        :returns: False if the spool is full and the message was dropped
+        :rtype: boolean
+        """
+        length = RECORD_HEADER.size + len(data)
+
+        with self._lock:
+            if self.full:
+                if not self.overwrite:
+                    return False
+
+                self._remove(1)
+
+            segment = self._segments[-1] if self._segments else None
+
+            if segment is None or segment.end + length > segment.size:
+                next_index = segment.index + 1 if segment is not None else 0
+                segment = _Segment(self.path, next_index, max(self.segment_size, length))
+                self._segments.append(segment)
+
+                if len(self._segments) == 1:
+                    self._head = 0
+                    self._write_head()
+
+            # write the data before the length, so a partially written record is never read
+            segment.map[segment.end + RECORD_HEADER.size:segment.end + length] = data
+            RECORD_HEADER.pack_into(segment.map, segment.end, length,
+                                    stream | (REPLY_REQUIRED if reply_required else 0), function)
+
+            segment.end += length
+            segment.count += 1
+            self._count += 1
+
+        return True
+
+    def peek(self, count):
+        """
+        Get the oldest messages without removing them.
+
+        :param count: maximum number of messages
+        :type count: integer
+        :returns: list of stream, function, reply required and encoded body for the messages
+        :rtype: list of tuples
+        """
+        result = []
+
+        with self._lock:
+            offset = self._head
+
+            for segment in self._segments:
+                while len(result) < count:
+                    record = segment.record(offset)
+                    if record is None:
+                        break
+
+                    length, stream, function, reply_required, data = record
+                    result.append((stream, function, reply_required, data))
+                    offset += length
+
+                if len(result) >= count:
+                    break
+
+                offset = 0
+
+        return result
+
+    def remove(self, count):
+        """
+        Remove the oldest messages, e.g. after they were transmitted.
+
+        :param count: number of messages to remove
+        :type count: integer
+        """
+        with self._lock:
+            self._remove(count)
+
+    def purge(self):
+        """Remove all messages."""
+        with self._lock:
+            for segment in self._segments:
+                segment.delete()
+
+            self._segments = []
+            self._head = 0
+            self._count = 0
+
+            self._write_head()
+
+    def flush(self):
+        """Write the newest segment and the position of the oldest message to disk."""
+        with self._lock:
+            if self._segments:
+                self._segments[-1].map.flush()
+
+            if self._unwritten:
+                self._write_head()
+
+    def close(self):
+        """Close the segment files."""
+        with self._lock:
+            if self._unwritten:
+                self._write_head()
+
+            for segment in self._segments:
+                segment.close()
+
+            self._segments = []
+
+    def _remove(self, count):
+        deleted = False
+
+        while count > 0 and self._segments:
+            segment = self._segments[0]
+
+            while count > 0 and segment.count > 0:
+                self._head += segment.record(self._head)[0]
+                segment.count -= 1
+                self._count -= 1
+                self._unwritten += 1
+                count -= 1
+
+            if segment.count > 0 or len(self._segments) == 1:
+                break
+
+            # oldest segment was completely transmitted
+            segment.delete()
+            self._segments.pop(0)
+            self._head = 0
+            deleted = True
+
+        if self._count == 0 and self._segments:
+            # start again at the beginning of the only segment
+            for segment in self._segments:
+                segment.delete()
+
+            self._segments = []
+            self._head = 0
+            deleted = True
+
+        # loading scans the oldest segment from an outdated head, but the head must not point to a deleted segment
+        if deleted or self._unwritten >= self.head_interval:
+            self._write_head()
+
+    def _write_head(self):
+        index = self._segments[0].index if self._segments else 0
+        path = os.path.join(self.path, "head")
+
+        with open(path + ".tmp", "wb") as head_file:
+            head_file.write(HEAD_STATE.pack(index, self._head))
+
+        os.replace(path + ".tmp", path)
+
+        self._unwritten = 0
+
+    def _load(self):
+        head_index, head_offset = 0, 0
+
+        try:
+            with open(os.path.join(self.path, "head"), "rb") as head_file:
+                head_index, head_offset = HEAD_STATE.unpack(head_file.read(HEAD_STATE.size))
+        except (OSError, struct.error):
+            pass
+
+        indices = sorted(int(match.group(1)) for match in map(_SEGMENT_PATTERN.match, os.listdir(self.path))
+                         if match is not None)
+
+        for index in indices:
+            segment = _Segment(self.path, index)
+
+            if index < head_index:
+                # segment was transmitted, but not removed
+                segment.delete()
+                continue
+
+            if not self._segments and index == head_index:
+                self._head = head_offset
+
+            segment.scan(self._head if not self._segments else 0)
+
+            self._segments.append(segment)
+            self._count += segment.count
@@ -33,6 +33,9 @@ class StatusVariable:
 
         If use_callbacks is disabled, you can set the value with the value property.
 
+        Values returned by the callback are reused for the number of seconds in the 'max_age' keyword argument,
+        see :meth:`secsgem.gem.equipmenthandler.GemEquipmentHandler.invalidate_values`.
+
         :param svid: ID of the status variable
         :type svid: various
         :param name: long name of the status variable
@@ -50,6 +53,7 @@ class StatusVariable:
         self.value_type = value_type
         self.use_callback = use_callback
         self.value = 0
+        self.max_age = None
 
         if isinstance(self.svid, int):
             self.id_type = secsgem.secs.variables.U4
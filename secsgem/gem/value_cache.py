@@ -0,0 +1,150 @@
+#####################################################################
+# value_cache.py
+#
+# (c) Copyright 2021, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Reuse of variable values requested from the application callbacks."""
+
+import collections
+import copy
+import threading
+import time
+
+import secsgem.secs
+
+
+class ValueCache:
+    """
+    Values of status variables and data values, reused until they are older than their maximum age.
+
+    Cached values are encoded once, all messages sent until the value expires reuse the encoded data.
+    The values are returned as :class:`secsgem.secs.variables.Encoded`,
+    the variables passed to the cache aren't changed.
+
+    **Example**::
+
+        >>> import secsgem.gem
+        >>> import secsgem.secs
+        >>>
+        >>> cache = secsgem.gem.ValueCache()
+        >>> cache.get(("SV", 10)) is None
+        True
+        >>> cache.put(("SV", 10), secsgem.secs.variables.U4(123), 1.0)
+        <U4 123 >
+        >>> cache.get(("SV", 10))
+        <U4 123 >
+        >>> cache.metrics["hits"], cache.metrics["misses"]
+        (1, 1)
+    """
+
+    def __init__(self):
+        """Initialize an empty value cache."""
+        self._lock = threading.Lock()
+
+        # value, encoded data and monotonic expiry time by key
+        self._entries = {}
+
+        self._counters = collections.Counter()
+
+    def __repr__(self):
+        """Generate textual representation for an object of this class."""
+        return f"{self.__class__.__name__} {str(self.metrics)}"
+
+    def __len__(self):
+        """Get the number of cached values, including expired values not removed yet."""
+        return len(self._entries)
+
+    @property
+    def metrics(self):
+        """
+        Get the statistics of the cache.
+
+        Misses include the expired values.
+
+        :returns: statistics
+        :rtype: dict
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self._counters["hits"],
+                "misses": self._counters["misses"],
+                "expired": self._counters["expired"],
+                "invalidated": self._counters["invalidated"],
+            }
+
+    def get(self, key):
+        """
+        Get a cached value.
+
+        :param key: key of the value, e.g. ("SV", svid)
+        :returns: cached value, None if it isn't cached or expired
+        :rtype: :class:`secsgem.secs.variables.Encoded`
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None:
+                value, encoded, expires = entry
+
+                if expires > time.monotonic():
+                    self._counters["hits"] += 1
+                    return value if encoded is None else secsgem.secs.variables.Encoded(value, encoded)
+
+                del self._entries[key]
+                self._counters["expired"] += 1
+
+            self._counters["misses"] += 1
+
+        return None
+
+    def put(self, key, value, max_age):
+        """
+        Store a value.
+
+        :param key: key of the value, e.g. ("SV", svid)
+        :param value: value encoded in the corresponding type
+        :type value: :class:`secsgem.secs.variables.Base`
+        :param max_age: time in seconds the value is reused
+        :type max_age: float
+        :returns: the cached value
+        :rtype: :class:`secsgem.secs.variables.Encoded`
+        """
+        encoded = None
+
+        if isinstance(value, secsgem.secs.variables.Base):
+            # the application may change the variable afterwards, the cached value must stay as it was encoded
+            value = copy.deepcopy(value)
+            encoded = value.encode()
+
+        with self._lock:
+            self._entries[key] = (value, encoded, time.monotonic() + max_age)
+
+        return value if encoded is None else secsgem.secs.variables.Encoded(value, encoded)
+
+    def invalidate(self, keys=None):
+        """
+        Remove cached values, the next request gets the values from the callback again.
+
+        :param keys: keys of the values to remove, all values if not set
+        :type keys: list
+        """
+        with self._lock:
+            if keys is None:
+                self._counters["invalidated"] += len(self._entries)
+                self._entries.clear()
+                return
+
+            for key in keys:
+                if self._entries.pop(key, None) is not None:
+                    self._counters["invalidated"] += 1
@@ -0,0 +1,212 @@
+#####################################################################
+# variable_store.py
+#
+# (c) Copyright 2021, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Values of status variables and data values pushed by the application."""
+
+import collections
+import threading
+
+
+class VariableSnapshot:
+    """Values of a :class:`VariableStore` at one point in time, not changed by later updates."""
+
+    __slots__ = ("version", "_values", "_versions")
+
+    def __init__(self, version, values, versions):
+        """
+        Initialize a snapshot.
+
+        :param version: version of the store
+        :type version: integer
+        :param values: values by key, not changed afterwards
+        :type values: dict
+        :param versions: version of the last update by key, not changed afterwards
+        :type versions: dict
+        """
+        self.version = version
+
+        self._values = values
+        self._versions = versions
+
+    def __repr__(self):
+        """Generate textual representation for an object of this class."""
+        return f"{self.__class__.__name__} {{'version': {self.version}, 'values': {str(self._values)}}}"
+
+    def __contains__(self, key):
+        """Check if the snapshot contains a value for the key."""
+        return key in self._values
+
+    def __len__(self):
+        """Get the number of values in the snapshot."""
+        return len(self._values)
+
+    def get(self, key, default=None):
+        """
+        Get a value.
+
+        :param key: key of the value, e.g. ("SV", svid)
+        :param default: value returned if the key isn't in the snapshot
+        :returns: value of the key
+        """
+        return self._values.get(key, default)
+
+    def version_of(self, key):
+        """
+        Get the version of the store, when the value of a key was last updated.
+
+        :param key: key of the value, e.g. ("SV", svid)
+        :returns: version of the last update, 0 if the key isn't in the snapshot
+        :rtype: integer
+        """
+        return self._versions.get(key, 0)
+
+
+class VariableStore:
+    """
+    Thread safe store for variable values, updated atomically and read as consistent snapshots.
+
+    Each update increments the version of the store, the updated values get this version.
+    Readers take a :class:`VariableSnapshot`, which contains the values of a single version.
+    The snapshot is copied once after an update, all readers until the next update share it without locking.
+
+    **Example**::
+
+        >>> import secsgem.gem
+        >>>
+        >>> store = secsgem.gem.VariableStore()
+        >>> store.update({("SV", 10): 123, ("SV", 11): "idle"})
+        1
+        >>> snapshot = store.snapshot()
+        >>> store.update({("SV", 10): 456})
+        2
+        >>> snapshot.get(("SV", 10)), snapshot.version
+        (123, 1)
+        >>> store.snapshot().get(("SV", 10)), store.snapshot().version_of(("SV", 11))
+        (456, 1)
+    """
+
+    def __init__(self):
+        """Initialize an empty variable store."""
+        self._lock = threading.Lock()
+
+        self._values = {}
+        self._versions = {}
+        self._version = 0
+
+        # shared by all readers until the next update, None if it has to be copied
+        self._snapshot = VariableSnapshot(0, {}, {})
+
+        self._counters = collections.Counter()
+
+    def __repr__(self):
+        """Generate textual representation for an object of this class."""
+        return f"{self.__class__.__name__} {str(self.metrics)}"
+
+    def __len__(self):
+        """Get the number of stored values."""
+        return len(self._values)
+
+    @property
+    def version(self):
+        """Get the version of the last update."""
+        return self._version
+
+    @property
+    def metrics(self):
+        """
+        Get the statistics of the store.
+
+        :returns: statistics
+        :rtype: dict
+        """
+        with self._lock:
+            return {
+                "version": self._version,
+                "values": len(self._values),
+                "updates": self._counters["updates"],
+                "snapshots": self._counters["snapshots"],
+            }
+
+    def update(self, values):
+        """
+        Set multiple values at once, readers get all or none of the new values.
+
+        :param values: values by key, e.g. {("SV", svid): value}
+        :type values: dict
+        :returns: version of the update
+        :rtype: integer
+        """
+        with self._lock:
+            self._version += 1
+
+            self._values.update(values)
+            self._versions.update(dict.fromkeys(values, self._version))
+
+            self._snapshot = None
+            self._counters["updates"] += 1
+
+            return self._version
+
+    def remove(self, keys):
+        """
+        Remove values.
+
+        :param keys: keys of the values to remove
+        :type keys: list
+        :returns: version of the update
+        :rtype: integer
+        """
+        with self._lock:
+            self._version += 1
+
+            for key in keys:
+                self._values.pop(key, None)
+                self._versions.pop(key, None)
+
+            self._snapshot = None
+            self._counters["updates"] += 1
+
+            return self._version
+
+    def get(self, key, default=None):
+        """
+        Get the current value of a key.
+
+        Use :meth:`snapshot` to read multiple values consistently.
+
+        :param key: key of the value, e.g. ("SV", svid)
+        :param default: value returned if the key isn't stored
+        :returns: value of the key
+        """
+        return self.snapshot().get(key, default)
+
+    def snapshot(self):
+        """
+        Get the values of the current version.
+
+        :returns: snapshot of the store
+        :rtype: :class:`secsgem.gem.VariableSnapshot`
+        """
+        snapshot = self._snapshot
+
+        if snapshot is not None:
+            return snapshot
+
+        with self._lock:
+            if self._snapshot is None:
+                self._snapshot = VariableSnapshot(self._version, dict(self._values), dict(self._versions))
+                self._counters["snapshots"] += 1
+
+            return self._snapshot
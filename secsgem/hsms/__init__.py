@@ -17,6 +17,8 @@
 
 from .connectionmanager import HsmsConnectionManager
 from .handler import HsmsHandler
+from .async_handler import AsyncHsmsHandler
+from .async_connection import AsyncHsmsConnection
 from .packet import HsmsPacket
 from .stream_function_header import HsmsStreamFunctionHeader
 from .separate_req_header import HsmsSeparateReqHeader
@@ -28,7 +30,10 @@ from .deselect_req_header import HsmsDeselectReqHeader
 from .select_rsp_header import HsmsSelectRspHeader
 from .select_req_header import HsmsSelectReqHeader
 from .header import HsmsHeader
+from .transactions import HsmsTransaction, HsmsTransactionTable, gather
 
-__all__ = ["HsmsConnectionManager", "HsmsHandler", "HsmsPacket", "HsmsStreamFunctionHeader", "HsmsSeparateReqHeader",
-           "HsmsRejectReqHeader", "HsmsLinktestRspHeader", "HsmsLinktestReqHeader", "HsmsDeselectRspHeader",
-           "HsmsDeselectReqHeader", "HsmsSelectRspHeader", "HsmsSelectReqHeader", "HsmsHeader"]
+__all__ = ["HsmsConnectionManager", "HsmsHandler", "AsyncHsmsHandler", "AsyncHsmsConnection", "HsmsPacket",
+           "HsmsStreamFunctionHeader", "HsmsSeparateReqHeader", "HsmsRejectReqHeader", "HsmsLinktestRspHeader",
+           "HsmsLinktestReqHeader", "HsmsDeselectRspHeader", "HsmsDeselectReqHeader", "HsmsSelectRspHeader",
+           "HsmsSelectReqHeader", "HsmsHeader", "HsmsTransaction", "HsmsTransactionTable",
+           "gather"]
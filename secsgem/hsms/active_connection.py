@@ -17,9 +17,9 @@
 
 import socket
 import threading
-import time
 
 from .connection import HsmsConnection
+from .lifecycle import HsmsConnectionLifecycle
 
 
 class HsmsActiveConnection(HsmsConnection):  # pragma: no cover
@@ -49,9 +49,10 @@ class HsmsActiveConnection(HsmsConnection):  # pragma: no cover
         # initially not enabled
         self.enabled = False
 
-        # reconnect thread required for active connection
+        # thread of the current connection attempt and timer for the next attempt (T5)
         self.connectionThread = None
-        self.stopConnectionThread = False
+        self.connectTimer = None
+        self._connectLock = threading.Lock()
 
         # flag if this is the first connection since enable
         self.firstConnection = True
@@ -63,7 +64,7 @@ class HsmsActiveConnection(HsmsConnection):  # pragma: no cover
         This is required to initiate the reconnect if the connection is still enabled
         """
         if self.enabled:
-            self.__start_connect_thread()
+            self.__schedule_connect()
 
     def enable(self):
         """
@@ -79,8 +80,8 @@ class HsmsActiveConnection(HsmsConnection):  # pragma: no cover
             # mark connection as enabled
             self.enabled = True
 
-            # start the connection thread
-            self.__start_connect_thread()
+            # start the first connection attempt
+            self.__schedule_connect()
 
     def disable(self):
         """
@@ -90,40 +91,54 @@ class HsmsActiveConnection(HsmsConnection):  # pragma: no cover
         """
         # only stop if enabled
         if self.enabled:
-            # mark connection as disabled
-            self.enabled = False
+            # mark connection as disabled and stop waiting for the next attempt
+            with self._connectLock:
+                self.enabled = False
+
+                if self.connectTimer is not None:
+                    self.connectTimer.cancel()
 
-            # stop connection thread if it is running
-            if self.connectionThread and self.connectionThread.is_alive():
-                self.stopConnectionThread = True
+                self.connectTimer = None
 
-            # wait for connection thread to stop
-            while self.stopConnectionThread:
-                time.sleep(0.2)
+            # wait for the running connection attempt
+            self._join_thread(self.connectionThread)
 
             # disconnect super class
             self.disconnect()
 
-    def __idle(self, timeout):
+    def __schedule_connect(self):
+        """Start the next connection attempt, after T5 if this is not the first connection."""
+        with self._connectLock:
+            # disabled in the meantime
+            if not self.enabled:
+                return
+
+            # wait for timeout if this is not the first connection
+            if self.firstConnection:
+                self.firstConnection = False
+                self.__start_connect_thread()
+                return
+
+            self.connectTimer = self.timers.schedule(self.T5, self.__on_connect_timer)
+
+    def __on_connect_timer(self):
         """
-        Wait until timeout elapsed or connection thread is stopped.
+        Connect separation time (T5) elapsed, try to connect again.
 
-        :param timeout: number of seconds to wait
-        :type timeout: float
-        :returns: False if thread was stopped
-        :rtype: boolean
+        .. warning:: Do not call this directly, will be called from the timer thread.
         """
-        for _ in range(int(timeout) * 5):
-            time.sleep(0.2)
+        with self._connectLock:
+            # disabled in the meantime
+            if self.connectTimer is None or not self.enabled:
+                return
 
-            # check if connection was disabled
-            if self.stopConnectionThread:
-                self.stopConnectionThread = False
-                return False
+            self.connectTimer = None
 
-        return True
+            # started with the lock held, so disable either waits for the thread or it isn't started
+            self.__start_connect_thread()
 
     def __start_connect_thread(self):
+        # called with the connect lock held
         self.connectionThread = threading.Thread(
             target=self.__connect_thread,
             name=f"secsgem_HsmsActiveConnection_connectThread_{self.remoteAddress}")
@@ -131,21 +146,13 @@ class HsmsActiveConnection(HsmsConnection):  # pragma: no cover
 
     def __connect_thread(self):
         """
-        Thread function to (re)connect active connection to remote host.
+        Thread function for a connection attempt to the remote host.
 
         .. warning:: Do not call this directly, for internal use only.
         """
-        # wait for timeout if this is not the first connection
-        if not self.firstConnection:
-            if not self.__idle(self.T5):
-                return
-
-        self.firstConnection = False
-
-        # try to connect to remote
-        while not self.__connect():
-            if not self.__idle(self.T5):
-                return
+        # try again after T5 if the attempt failed
+        if not self.__connect():
+            self.__schedule_connect()
 
     def __connect(self):
         """
@@ -158,15 +165,18 @@ class HsmsActiveConnection(HsmsConnection):  # pragma: no cover
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
 
         # setup socket
-        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        self._setup_socket()
 
         self.logger.debug("connecting to %s:%d", self.remoteAddress, self.remotePort)
 
+        self.lifecycle.enter(HsmsConnectionLifecycle.CONNECTING)
+
         # try to connect socket
         try:
             self.sock.connect((self.remoteAddress, self.remotePort))
         except socket.error:
             self.logger.debug("connecting to %s:%d failed", self.remoteAddress, self.remotePort)
+            self.lifecycle.enter(HsmsConnectionLifecycle.NOT_CONNECTED)
             return False
 
         # make socket nonblocking
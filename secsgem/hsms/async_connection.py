@@ -0,0 +1,372 @@
+#####################################################################
+# async_connection.py
+#
+# (c) Copyright 2021, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Hsms connection running on an asyncio event loop."""
+
+import asyncio
+import logging
+import socket
+
+from .packet import HsmsPacket
+from .receive_buffer import HsmsReceiveBuffer
+
+
+class AsyncHsmsProtocol(asyncio.Protocol):
+    """
+    Protocol framing the hsms messages of a stream transport.
+
+    Decoded packets are passed to the owning :class:`secsgem.hsms.async_connection.AsyncHsmsConnection`.
+    """
+
+    def __init__(self, connection):
+        """
+        Initialize a hsms protocol.
+
+        :param connection: connection the protocol belongs to
+        :type connection: :class:`secsgem.hsms.async_connection.AsyncHsmsConnection`
+        """
+        self.connection = connection
+        self.transport = None
+        self.receiveBuffer = HsmsReceiveBuffer(connection.receive_block_size, connection.max_message_size)
+
+    def connection_made(self, transport):
+        """Handle transport was connected."""
+        self.transport = transport
+
+        sock = transport.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+
+        self.connection.on_protocol_connected(self)
+
+    def data_received(self, data):
+        """Handle data received from the transport."""
+        self.receiveBuffer.append(data)
+
+        try:
+            packets = [HsmsPacket.decode(message) for message in self.receiveBuffer.messages()]
+        except ValueError:
+            self.connection.logger.exception("invalid data received, closing connection")
+            self.transport.close()
+            return
+
+        self.connection.on_protocol_data(self, packets, len(self.receiveBuffer) > 0)
+
+    def connection_lost(self, exc):
+        """Handle transport was closed."""
+        self.connection.on_protocol_closed(self, exc)
+
+
+class AsyncHsmsConnection:
+    """
+    Connection class used for active and passive hsms connections on an asyncio event loop.
+
+    No threads are used, all timers are scheduled on the event loop.
+    Active connections reconnect after T5, passive connections listen for one remote at a time.
+    """
+
+    receive_block_size = 64 * 1024
+    """ Initial size of the receive buffer ."""
+
+    max_message_size = 64 * 1024 * 1024
+    """ Maximum length of an inbound message, longer messages close the connection ."""
+
+    T3 = 45.0
+    """ Reply Timeout ."""
+
+    T5 = 10.0
+    """ Connect Separation Time ."""
+
+    T6 = 5.0
+    """ Control Transaction Timeout ."""
+
+    T7 = 10.0
+    """ Not Selected Timeout ."""
+
+    T8 = 5.0
+    """ Network Intercharacter Timeout ."""
+
+    def __init__(self, active, address, port, session_id=0, delegate=None, bind_ip=''):
+        """
+        Initialize a asyncio hsms connection.
+
+        :param active: Is the connection active (*True*) or passive (*False*)
+        :type active: boolean
+        :param address: IP address of remote host
+        :type address: string
+        :param port: TCP port of remote host
+        :type port: integer
+        :param session_id: session / device ID to use for connection
+        :type session_id: integer
+        :param delegate: target for messages
+        :type delegate: inherited from :class:`secsgem.hsms.async_handler.AsyncHsmsHandler`
+        :param bind_ip: IP address to listen on for passive connections
+        :type bind_ip: string
+        """
+        self.logger = logging.getLogger(self.__module__ + "." + self.__class__.__name__)
+
+        self.active = active
+        self.remoteAddress = address
+        self.remotePort = port
+        self.sessionID = session_id
+        self.delegate = delegate
+        self._bind_ip = bind_ip
+
+        self.loop = None
+
+        self.enabled = False
+        self.connected = False
+        self.disconnecting = False
+
+        self._protocol = None
+        self._server = None
+        self._closed_waiter = None
+
+        self._connect_timer = None
+        self._t8_timer = None
+
+        # the event loop only keeps weak references to tasks
+        self._tasks = set()
+
+    def _serialize_data(self):
+        """
+        Return data for serialization.
+
+        :returns: data to serialize for this object
+        :rtype: dict
+        """
+        return {
+            'active': self.active,
+            'remoteAddress': self.remoteAddress,
+            'remotePort': self.remotePort,
+            'sessionID': self.sessionID,
+            'connected': self.connected}
+
+    def __str__(self):
+        """Get the contents of this object as a string."""
+        return f"{('Active' if self.active else 'Passive')} connection to {self.remoteAddress}:{str(self.remotePort)}" \
+               f" sessionID={str(self.sessionID)}"
+
+    @property
+    def local_port(self):
+        """Get the TCP port the passive connection is listening on."""
+        if self._server is None or not self._server.sockets:
+            return None
+
+        return self._server.sockets[0].getsockname()[1]
+
+    async def enable(self):
+        """
+        Enable the connection.
+
+        Active connections start connecting to the remote, passive connections start listening.
+        """
+        if self.enabled:
+            return
+
+        self.loop = asyncio.get_event_loop()
+        self.enabled = True
+
+        if self.active:
+            self._connect()
+        else:
+            # listen on IPv4 only, like the threaded passive connection
+            self._server = await self.loop.create_server(self._create_protocol, self._bind_ip or "0.0.0.0",
+                                                        self.remotePort, family=socket.AF_INET)
+
+    async def disable(self):
+        """
+        Disable the connection.
+
+        Stops all connection attempts, stops listening and closes the connection.
+        """
+        if not self.enabled:
+            return
+
+        self.enabled = False
+
+        if self._connect_timer is not None:
+            self._connect_timer.cancel()
+            self._connect_timer = None
+
+        await self.disconnect()
+
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def disconnect(self):
+        """Close the current connection and wait until it is closed."""
+        protocol = self._protocol
+
+        if protocol is None or self.disconnecting:
+            return
+
+        self.disconnecting = True
+
+        closed = self.loop.create_future()
+        self._closed_waiter = closed
+
+        self._notify("on_connection_before_closed")
+        protocol.transport.close()
+
+        await closed
+
+    def send_packet(self, packet):
+        """
+        Send a packet to the remote host.
+
+        The data is queued in the transport, so this never blocks.
+
+        :param packet: packet to be transmitted
+        :type packet: :class:`secsgem.hsms.HsmsPacket`
+        :returns: True if the packet was queued
+        :rtype: boolean
+        """
+        if self._protocol is None or self._protocol.transport.is_closing():
+            return False
+
+        self._protocol.transport.writelines(packet.encode_buffers())
+
+        return True
+
+    def create_task(self, coroutine):
+        """
+        Run a coroutine as task on the event loop of the connection.
+
+        A reference to the task is kept until it is done, so it can't be garbage collected while running.
+
+        :param coroutine: coroutine to run
+        :returns: created task
+        :rtype: :class:`asyncio.Task`
+        """
+        task = self.loop.create_task(coroutine)
+
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+        return task
+
+    def _create_protocol(self):
+        return AsyncHsmsProtocol(self)
+
+    def _connect(self):
+        """Start a connection attempt to the remote host."""
+        self._connect_timer = None
+
+        if not self.enabled:
+            return
+
+        self.logger.debug("connecting to %s:%d", self.remoteAddress, self.remotePort)
+
+        task = self.create_task(self.loop.create_connection(self._create_protocol, self.remoteAddress,
+                                                            self.remotePort))
+        task.add_done_callback(self._on_connect_done)
+
+    def _on_connect_done(self, task):
+        if task.cancelled():
+            return
+
+        if task.exception() is not None:
+            self.logger.debug("connecting to %s:%d failed", self.remoteAddress, self.remotePort)
+            self._schedule_connect()
+
+    def _schedule_connect(self):
+        """Schedule the next connection attempt after T5."""
+        if self.enabled and self.active and self._connect_timer is None:
+            self._connect_timer = self.loop.call_later(self.T5, self._connect)
+
+    def _notify(self, name, *args):
+        if self.delegate and hasattr(self.delegate, name) and callable(getattr(self.delegate, name)):
+            try:
+                getattr(self.delegate, name)(self, *args)
+            except Exception:  # pylint: disable=broad-except
+                self.logger.exception('ignoring exception for %s handler', name)
+
+    def on_protocol_connected(self, protocol):
+        """
+        Handle new transport connected.
+
+        .. warning:: Do not call this directly, will be called from the protocol.
+        """
+        if self._protocol is not None or not self.enabled:
+            # only one connection at a time
+            protocol.transport.close()
+            return
+
+        self._protocol = protocol
+        self.connected = True
+
+        self._notify("on_connection_established")
+
+    def on_protocol_data(self, protocol, packets, partial):
+        """
+        Handle packets received by the protocol.
+
+        :param protocol: protocol that received the data
+        :param packets: decoded packets
+        :type packets: list of :class:`secsgem.hsms.HsmsPacket`
+        :param partial: True if an incomplete message remains in the buffer
+
+        .. warning:: Do not call this directly, will be called from the protocol.
+        """
+        if protocol is not self._protocol:
+            return
+
+        # restart intercharacter timeout if message is incomplete
+        if self._t8_timer is not None:
+            self._t8_timer.cancel()
+            self._t8_timer = None
+
+        if partial:
+            self._t8_timer = self.loop.call_later(self.T8, self._on_t8_timeout, protocol)
+
+        for packet in packets:
+            self._notify("on_connection_packet_received", packet)
+
+    def _on_t8_timeout(self, protocol):
+        self._t8_timer = None
+
+        self.logger.warning("T8 timeout, closing connection")
+        protocol.transport.close()
+
+    def on_protocol_closed(self, protocol, exc):
+        """
+        Handle transport was closed.
+
+        .. warning:: Do not call this directly, will be called from the protocol.
+        """
+        del exc  # unused parameter
+
+        if protocol is not self._protocol:
+            return
+
+        if self._t8_timer is not None:
+            self._t8_timer.cancel()
+            self._t8_timer = None
+
+        self._notify("on_connection_closed")
+
+        self._protocol = None
+        self.connected = False
+        self.disconnecting = False
+
+        waiter = self._closed_waiter
+        self._closed_waiter = None
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+        self._schedule_connect()
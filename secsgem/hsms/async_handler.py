@@ -0,0 +1,584 @@
+#####################################################################
+# async_handler.py
+#
+# (c) Copyright 2021, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Contains class to create model for hsms endpoints running on an asyncio event loop."""
+
+import logging
+import random
+
+import secsgem.common
+
+from .connection import HSMS_STYPES
+from .async_connection import AsyncHsmsConnection
+from .packet import HsmsPacket
+from .select_req_header import HsmsSelectReqHeader
+from .select_rsp_header import HsmsSelectRspHeader
+from .deselect_req_header import HsmsDeselectReqHeader
+from .deselect_rsp_header import HsmsDeselectRspHeader
+from .linktest_req_header import HsmsLinktestReqHeader
+from .linktest_rsp_header import HsmsLinktestRspHeader
+from .reject_req_header import HsmsRejectReqHeader
+from .separate_req_header import HsmsSeparateReqHeader
+from .stream_function_header import HsmsStreamFunctionHeader
+from .connectionstatemachine import ConnectionStateMachine, STATE_NOT_CONNECTED, STATE_CONNECTED_NOT_SELECTED
+
+
+class AsyncHsmsHandler:
+    """
+    Baseclass for creating Host/Equipment models on an asyncio event loop.
+
+    This layer contains the HSMS functionality, like :class:`secsgem.hsms.HsmsHandler`, but without any threads.
+    All handlers created in one event loop share this loop for receiving, sending and timers,
+    so a single thread can serve many sessions.
+
+    Override :meth:`_on_hsms_packet_received` to handle incoming primary messages.
+    """
+
+    def __init__(self, address, port, active, session_id, name, connection=None):
+        """
+        Initialize asyncio hsms handler.
+
+        :param address: IP address of remote host
+        :type address: string
+        :param port: TCP port of remote host
+        :type port: integer
+        :param active: Is the connection active (*True*) or passive (*False*)
+        :type active: boolean
+        :param session_id: session / device ID to use for connection
+        :type session_id: integer
+        :param name: Name of the underlying configuration
+        :type name: string
+        :param connection: custom connection object, created if not passed
+        :type connection: :class:`secsgem.hsms.async_connection.AsyncHsmsConnection`
+
+        **Example**::
+
+            import asyncio
+            import secsgem.hsms
+
+            async def main():
+                client = secsgem.hsms.AsyncHsmsHandler("10.211.55.33", 5000, True, 0, "test")
+
+                await client.enable()
+                await client.waitfor_selected(10)
+
+                response = await client.send_linktest_req()
+
+                await client.disable()
+
+            asyncio.run(main())
+
+        """
+        self._eventProducer = secsgem.common.EventProducer()
+        self._eventProducer.targets += self
+
+        self.logger = logging.getLogger(self.__module__ + "." + self.__class__.__name__)
+        self.communicationLogger = logging.getLogger("hsms_communication")
+
+        self.address = address
+        self.port = port
+        self.active = active
+        self.sessionID = session_id
+        self.name = name
+
+        self.connected = False
+
+        # system id counter
+        self.systemCounter = random.randint(0, (2 ** 32) - 1)
+
+        # repeating linktest variables
+        self.linktestTimer = None
+        self.linktestTimeout = 30
+
+        # not selected timer
+        self._t7_timer = None
+
+        # futures waiting for responses, by system id
+        self._systemFutures = {}
+
+        # futures waiting for selection
+        self._selectedWaiters = []
+
+        # binary trace of sent and received packets, see secsgem.hsms.trace.HsmsTraceWriter
+        self.trace = None
+
+        # hsms connection state fsm
+        self.connectionState = ConnectionStateMachine({"on_enter_CONNECTED": self._on_state_connect,
+                                                       "on_exit_CONNECTED": self._on_state_disconnect,
+                                                       "on_enter_CONNECTED_SELECTED": self._on_state_select})
+
+        if connection is None:
+            connection = AsyncHsmsConnection(self.active, self.address, self.port, self.sessionID, self)
+        else:
+            connection.delegate = self
+
+        self.connection = connection
+
+    @property
+    def events(self):
+        """Property for event handling."""
+        return self._eventProducer
+
+    def __repr__(self):
+        """Generate textual representation for an object of this class."""
+        return f"{self.__class__.__name__} {str(self._serialize_data())}"
+
+    def _serialize_data(self):
+        """
+        Return data for serialization.
+
+        :returns: data to serialize for this object
+        :rtype: dict
+        """
+        return {'address': self.address, 'port': self.port, 'active': self.active, 'sessionID': self.sessionID,
+                'name': self.name, 'connected': self.connected}
+
+    def get_next_system_counter(self):
+        """
+        Return the next System.
+
+        :returns: System for the next command
+        :rtype: integer
+        """
+        self.systemCounter += 1
+
+        if self.systemCounter > ((2 ** 32) - 1):
+            self.systemCounter = 0
+
+        return self.systemCounter
+
+    async def enable(self):
+        """Enable the connection."""
+        await self.connection.enable()
+
+    async def disable(self):
+        """Disable the connection."""
+        await self.connection.disable()
+
+    async def waitfor_selected(self, timeout=None):
+        """
+        Wait until the connection is selected. Returns immediately if the connection is selected.
+
+        :param timeout: seconds to wait before aborting
+        :type timeout: float
+        :returns: True if selected, False if timed out
+        :rtype: bool
+        """
+        if self.connectionState.is_CONNECTED_SELECTED():
+            return True
+
+        loop = self.connection.loop
+        waiter = loop.create_future()
+        self._selectedWaiters.append(waiter)
+
+        timer = None
+        if timeout is not None:
+            timer = loop.call_later(timeout, self._complete_future, waiter, False)
+
+        try:
+            return await waiter
+        finally:
+            if timer is not None:
+                timer.cancel()
+            self._selectedWaiters.remove(waiter)
+
+    @staticmethod
+    def _complete_future(future, result):
+        if not future.done():
+            future.set_result(result)
+
+    def _start_linktest_timer(self):
+        self.linktestTimer = self.connection.loop.call_later(self.linktestTimeout, self._on_linktest_timer)
+
+    def _on_linktest_timer(self):
+        """Linktest time timed out, so send linktest request."""
+        self.connection.create_task(self.send_linktest_req())
+
+        # restart the timer
+        self._start_linktest_timer()
+
+    def _on_t7_timeout(self):
+        """Connection wasn't selected in time."""
+        self._t7_timer = None
+
+        if self.connectionState.state != STATE_CONNECTED_NOT_SELECTED:
+            return
+
+        self.logger.warning("T7 timeout, connection not selected")
+
+        self.connectionState.timeoutT7()
+        self.connection.create_task(self.connection.disconnect())
+
+    def _on_state_connect(self):
+        """Handle connection state model got event connect."""
+        # start linktest timer
+        self._start_linktest_timer()
+
+        # start not selected timer
+        self._t7_timer = self.connection.loop.call_later(self.connection.T7, self._on_t7_timeout)
+
+        # start select process if connection is active
+        if self.active:
+            self.connection.create_task(self._send_select_req_task())
+
+    async def _send_select_req_task(self):
+        response = await self.send_select_req()
+        if response is None:
+            self.logger.warning("select request failed")
+
+    def _on_state_disconnect(self):
+        """Handle connection state model got event disconnect."""
+        # stop timers
+        if self.linktestTimer:
+            self.linktestTimer.cancel()
+
+        self.linktestTimer = None
+
+        if self._t7_timer:
+            self._t7_timer.cancel()
+
+        self._t7_timer = None
+
+    def _on_state_select(self):
+        """Handle connection state model got event select."""
+        if self._t7_timer:
+            self._t7_timer.cancel()
+
+        self._t7_timer = None
+
+        for waiter in self._selectedWaiters:
+            self._complete_future(waiter, True)
+
+        # send event
+        self.events.fire('hsms_selected', {'connection': self})
+
+        # notify hsms handler of selection
+        if hasattr(self, '_on_hsms_select') and callable(getattr(self, '_on_hsms_select')):
+            self._on_hsms_select()
+
+    def on_connection_established(self, _):
+        """Handle connection was established event."""
+        self.connected = True
+
+        # update connection state
+        self.connectionState.connect()
+
+        self.events.fire("hsms_connected", {'connection': self})
+
+    def on_connection_before_closed(self, _):
+        """Handle connection is about to be closed event."""
+        # send separate request
+        self.send_separate_req()
+
+    def on_connection_closed(self, _):
+        """Handle connection was closed event."""
+        # update connection state
+        self.connected = False
+        if self.connectionState.state != STATE_NOT_CONNECTED:
+            self.connectionState.disconnect()
+
+        # release everybody waiting for a response
+        for future in self._systemFutures.values():
+            self._complete_future(future, None)
+
+        self.events.fire("hsms_disconnected", {'connection': self})
+
+    def _complete_system(self, packet):
+        future = self._systemFutures.get(packet.header.system)
+
+        if future is not None:
+            self._complete_future(future, packet)
+
+    def __handle_hsms_requests(self, packet):
+        self._log_packet("<", packet)
+
+        # check if it is a select request
+        if packet.header.sType == 0x01:
+            # if we are disconnecting send reject else send response
+            if self.connection.disconnecting:
+                self.send_reject_rsp(packet.header.system, packet.header.sType, 4)
+            else:
+                self.send_select_rsp(packet.header.system)
+
+                # update connection state
+                if self.connectionState.state == STATE_CONNECTED_NOT_SELECTED:
+                    self.connectionState.select()
+
+        # check if it is a select response
+        elif packet.header.sType == 0x02:
+            # update connection state
+            if self.connectionState.state == STATE_CONNECTED_NOT_SELECTED:
+                self.connectionState.select()
+
+            self._complete_system(packet)
+
+        # check if it is a deselect request
+        elif packet.header.sType == 0x03:
+            # if we are disconnecting send reject else send response
+            if self.connection.disconnecting:
+                self.send_reject_rsp(packet.header.system, packet.header.sType, 4)
+            else:
+                self.send_deselect_rsp(packet.header.system)
+                # update connection state
+                if self.connectionState.is_CONNECTED_SELECTED():
+                    self.connectionState.deselect()
+
+        # check if it is a deselect response
+        elif packet.header.sType == 0x04:
+            # update connection state
+            if self.connectionState.is_CONNECTED_SELECTED():
+                self.connectionState.deselect()
+
+            self._complete_system(packet)
+
+        # check if it is a linktest request
+        elif packet.header.sType == 0x05:
+            # if we are disconnecting send reject else send response
+            if self.connection.disconnecting:
+                self.send_reject_rsp(packet.header.system, packet.header.sType, 4)
+            else:
+                self.send_linktest_rsp(packet.header.system)
+
+        # check if it is a separate request
+        elif packet.header.sType == 0x09:
+            self.connection.create_task(self.connection.disconnect())
+
+        else:
+            self._complete_system(packet)
+
+    def on_connection_packet_received(self, _, packet):
+        """
+        Packet received by connection.
+
+        :param packet: received data packet
+        :type packet: :class:`secsgem.hsms.HsmsPacket`
+        """
+        if packet.header.sType > 0:
+            self.__handle_hsms_requests(packet)
+            return
+
+        self._log_packet("<", packet)
+
+        if not self.connectionState.is_CONNECTED_SELECTED():
+            self.logger.warning("received message when not selected")
+
+            self.send_reject_rsp(packet.header.system, packet.header.sType, 4)
+            return
+
+        # someone is waiting for this message
+        if packet.header.system in self._systemFutures:
+            self._complete_system(packet)
+        # redirect packet to hsms handler
+        elif hasattr(self, '_on_hsms_packet_received') and callable(getattr(self, '_on_hsms_packet_received')):
+            self._on_hsms_packet_received(packet)
+        # just log if nobody is interested
+        else:
+            self.logger.warning("packet unhandled")
+
+    async def _send_and_wait(self, packet, timeout):
+        """
+        Send a packet and wait for the packet with the same system.
+
+        :param packet: packet to be sent
+        :type packet: :class:`secsgem.hsms.HsmsPacket`
+        :param timeout: seconds to wait for the response
+        :type timeout: float
+        :returns: received response or None if the timeout elapsed
+        :rtype: :class:`secsgem.hsms.HsmsPacket`
+        """
+        system_id = packet.header.system
+        loop = self.connection.loop
+
+        future = loop.create_future()
+        self._systemFutures[system_id] = future
+
+        try:
+            if not self.connection.send_packet(packet):
+                self.logger.error("Sending packet failed")
+                return None
+
+            timer = loop.call_later(timeout, self._complete_future, future, None)
+            try:
+                return await future
+            finally:
+                timer.cancel()
+        finally:
+            del self._systemFutures[system_id]
+
+    def send_stream_function(self, packet):
+        """
+        Send the packet without waiting for a response.
+
+        :param packet: packet to be sent
+        :type packet: :class:`secsgem.secs.functionbase.SecsStreamFunction`
+        :returns: True if the packet was queued
+        :rtype: boolean
+        """
+        out_packet = HsmsPacket(
+            HsmsStreamFunctionHeader(self.get_next_system_counter(), packet.stream, packet.function,
+                                     packet.is_reply_required, self.sessionID),
+            packet.encode())
+
+        self._log_packet(">", out_packet, packet)
+
+        return self.connection.send_packet(out_packet)
+
+    async def send_and_waitfor_response(self, packet):
+        """
+        Send the packet and wait for the response.
+
+        :param packet: packet to be sent
+        :type packet: :class:`secsgem.secs.functionbase.SecsStreamFunction`
+        :returns: Packet that was received or None if T3 elapsed
+        :rtype: :class:`secsgem.hsms.HsmsPacket`
+        """
+        out_packet = HsmsPacket(HsmsStreamFunctionHeader(self.get_next_system_counter(), packet.stream,
+                                                         packet.function, True, self.sessionID),
+                                packet.encode())
+
+        self._log_packet(">", out_packet, packet)
+
+        return await self._send_and_wait(out_packet, self.connection.T3)
+
+    def send_response(self, function, system):
+        """
+        Send response function for system.
+
+        :param function: function to be sent
+        :type function: :class:`secsgem.secs.functionbase.SecsStreamFunction`
+        :param system: system to reply to
+        :type system: integer
+        """
+        out_packet = HsmsPacket(HsmsStreamFunctionHeader(system, function.stream, function.function, False,
+                                                         self.sessionID),
+                                function.encode())
+
+        self._log_packet(">", out_packet, function)
+
+        return self.connection.send_packet(out_packet)
+
+    def _send_control(self, packet):
+        self._log_packet(">", packet)
+        return self.connection.send_packet(packet)
+
+    async def _send_control_and_wait(self, packet):
+        self._log_packet(">", packet)
+        return await self._send_and_wait(packet, self.connection.T6)
+
+    async def send_select_req(self):
+        """
+        Send a Select Request to the remote host and wait for the response.
+
+        :returns: Response packet or None if T6 elapsed
+        :rtype: :class:`secsgem.hsms.HsmsPacket`
+        """
+        return await self._send_control_and_wait(HsmsPacket(HsmsSelectReqHeader(self.get_next_system_counter())))
+
+    def send_select_rsp(self, system_id):
+        """
+        Send a Select Response to the remote host.
+
+        :param system_id: System of the request to reply for
+        :type system_id: integer
+        """
+        return self._send_control(HsmsPacket(HsmsSelectRspHeader(system_id)))
+
+    async def send_linktest_req(self):
+        """
+        Send a Linktest Request to the remote host and wait for the response.
+
+        :returns: Response packet or None if T6 elapsed
+        :rtype: :class:`secsgem.hsms.HsmsPacket`
+        """
+        return await self._send_control_and_wait(HsmsPacket(HsmsLinktestReqHeader(self.get_next_system_counter())))
+
+    def send_linktest_rsp(self, system_id):
+        """
+        Send a Linktest Response to the remote host.
+
+        :param system_id: System of the request to reply for
+        :type system_id: integer
+        """
+        return self._send_control(HsmsPacket(HsmsLinktestRspHeader(system_id)))
+
+    async def send_deselect_req(self):
+        """
+        Send a Deselect Request to the remote host and wait for the response.
+
+        :returns: Response packet or None if T6 elapsed
+        :rtype: :class:`secsgem.hsms.HsmsPacket`
+        """
+        return await self._send_control_and_wait(HsmsPacket(HsmsDeselectReqHeader(self.get_next_system_counter())))
+
+    def send_deselect_rsp(self, system_id):
+        """
+        Send a Deselect Response to the remote host.
+
+        :param system_id: System of the request to reply for
+        :type system_id: integer
+        """
+        return self._send_control(HsmsPacket(HsmsDeselectRspHeader(system_id)))
+
+    def send_reject_rsp(self, system_id, s_type, reason):
+        """
+        Send a Reject Response to the remote host.
+
+        :param system_id: System of the request to reply for
+        :type system_id: integer
+        :param s_type: s_type of rejected message
+        :type s_type: integer
+        :param reason: reason for rejection
+        :type reason: integer
+        """
+        return self._send_control(HsmsPacket(HsmsRejectReqHeader(system_id, s_type, reason)))
+
+    def send_separate_req(self):
+        """Send a Separate Request to the remote host."""
+        system_id = self.get_next_system_counter()
+
+        if not self._send_control(HsmsPacket(HsmsSeparateReqHeader(system_id))):
+            return None
+
+        return system_id
+
+    # helpers
+
+    def _log_packet(self, direction, packet, function=None):
+        """
+        Write a sent or received packet to the trace and the communication log.
+
+        :param direction: "<" for received and ">" for sent packets
+        :type direction: string
+        :param packet: sent or received packet
+        :type packet: :class:`secsgem.hsms.HsmsPacket`
+        :param function: stream/function object of the packet, if available
+        :type function: :class:`secsgem.secs.functionbase.SecsStreamFunction`
+        """
+        if self.trace is not None:
+            self.trace.write(direction, packet)
+
+        if not self.communicationLogger.isEnabledFor(logging.INFO):
+            return
+
+        if packet.header.sType > 0:
+            self.communicationLogger.info("%s %s\n  %s", direction, packet, HSMS_STYPES[packet.header.sType],
+                                          extra=self._get_log_extra())
+        elif function is None:
+            self.communicationLogger.info("%s %s", direction, packet, extra=self._get_log_extra())
+        else:
+            self.communicationLogger.info("%s %s\n%s", direction, packet, function, extra=self._get_log_extra())
+
+    def _get_log_extra(self):
+        return {"address": self.address, "port": self.port, "sessionID": self.sessionID, "remoteName": self.name}
@@ -15,17 +15,19 @@
 #####################################################################
 """Contains objects and functions to create and handle hsms connection."""
 
+import concurrent.futures
 import logging
 import select
-import struct
-import time
+import socket
 import threading
+import time
 
 import secsgem.common
 
+from .lifecycle import HsmsConnectionLifecycle
 from .packet import HsmsPacket
-
-# TODO: timeouts (T7, T8)
+from .receive_buffer import HsmsReceiveBuffer
+from .writer import HsmsWriter
 
 HSMS_STYPES = {
     1: "Select.req",
@@ -46,8 +48,26 @@ class HsmsConnection:  # pragma: no cover
     select_timeout = 0.5
     """ Timeout for select calls ."""
 
-    send_block_size = 1024 * 1024
-    """ Block size for outbound data ."""
+    tcp_nodelay = True
+    """ Send packets immediately instead of collecting small packets (TCP_NODELAY) ."""
+
+    send_buffer_size = None
+    """ Size of the socket send buffer (SO_SNDBUF), None for the system default ."""
+
+    receive_buffer_size = None
+    """ Size of the socket receive buffer (SO_RCVBUF), None for the system default ."""
+
+    bulk_message_size = 64 * 1024
+    """ Minimum data size of messages written after all other queued messages ."""
+
+    receive_block_size = 64 * 1024
+    """ Minimum free space in the receive buffer for each read ."""
+
+    max_message_size = 64 * 1024 * 1024
+    """ Maximum length of an inbound message, longer messages close the connection ."""
+
+    join_timeout = 10.0
+    """ Maximum time to wait for a background thread to stop ."""
 
     T3 = 45.0
     """ Reply Timeout ."""
@@ -58,6 +78,12 @@ class HsmsConnection:  # pragma: no cover
     T6 = 5.0
     """ Control Transaction Timeout ."""
 
+    T7 = 10.0
+    """ Not Selected Timeout ."""
+
+    T8 = 5.0
+    """ Network Intercharacter Timeout ."""
+
     def __init__(self, active, address, port, session_id=0, delegate=None):
         """
         Initialize a hsms connection.
@@ -85,13 +111,32 @@ class HsmsConnection:  # pragma: no cover
         # connection socket
         self.sock = None
 
+        # writer thread for the socket
+        self.writer = None
+
         # buffer for received data
-        self.receiveBuffer = b""
+        self.receiveBuffer = HsmsReceiveBuffer(self.receive_block_size, self.max_message_size)
+
+        # protocol timers, shared with all other connections
+        self.timers = secsgem.common.TimerWheel.get_default()
+
+        # intercharacter timer (T8), running while a message is incomplete
+        self.intercharacterTimer = None
+
+        # monotonic time data was received last, to detect idle links
+        self.lastReceived = None
 
         # receiving thread flags
         self.threadRunning = False
         self.stopThread = False
 
+        self.receiverThread = None
+        self._receiverStarted = threading.Event()
+        self._stopEvent = threading.Event()
+
+        # phases of the connection
+        self.lifecycle = HsmsConnectionLifecycle()
+
         # connected flag
         self.connected = False
 
@@ -117,6 +162,33 @@ class HsmsConnection:  # pragma: no cover
         return f"{('Active' if self.active else 'Passive')} connection to {self.remoteAddress}:{str(self.remotePort)}" \
                f" sessionID={str(self.sessionID)}"
 
+    def _setup_socket(self):
+        """Apply the socket options of the connection to the socket."""
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+
+        if self.tcp_nodelay:
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        if self.send_buffer_size is not None:
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.send_buffer_size)
+
+        if self.receive_buffer_size is not None:
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.receive_buffer_size)
+
+    def _start_writer(self):
+        """Start the thread writing the outbound packets to the socket."""
+        self.writer = HsmsWriter(self.sock, f"secsgem_hsmsConnection_writer_{self.remoteAddress}:{self.remotePort}",
+                                 self.select_timeout, self.bulk_message_size)
+        self.writer.start()
+
+    def _stop_writer(self):
+        """Stop the writer thread after the queued packets were written."""
+        if self.writer is None:
+            return
+
+        self.writer.stop(self.join_timeout)
+        self.writer = None
+
     def _start_receiver(self):
         """
         Start the thread for receiving and handling incoming messages.
@@ -128,18 +200,33 @@ class HsmsConnection:  # pragma: no cover
             :class:`secsgem.hsms.connections.HsmsPassiveConnection`,
             :class:`secsgem.hsms.connections.HsmsMultiPassiveConnection`
         """
+        self.lifecycle.enter(HsmsConnectionLifecycle.STARTING)
+
         # mark connection as connected
         self.connected = True
 
+        self._receiverStarted.clear()
+        self._stopEvent.clear()
+
+        self._start_writer()
+
         # start data receiving thread
-        threading.Thread(target=self.__receiver_thread, args=(),
-                         name=f"secsgem_hsmsConnection_receiver_{self.remoteAddress}:{self.remotePort}").start()
+        self.receiverThread = threading.Thread(
+            target=self.__receiver_thread, args=(),
+            name=f"secsgem_hsmsConnection_receiver_{self.remoteAddress}:{self.remotePort}")
+        self.receiverThread.start()
 
         # wait until thread is running
-        while not self.threadRunning:
-            pass
+        self._receiverStarted.wait()
+
+        self._notify_connection_established()
+
+    def _notify_connection_established(self):
+        """Notify the delegate that the connection was established."""
+        self.lifecycle.enter(HsmsConnectionLifecycle.CONNECTED)
+
+        self.lastReceived = time.monotonic()
 
-        # send event
         if self.delegate and hasattr(self.delegate, 'on_connection_established') \
                 and callable(getattr(self.delegate, 'on_connection_established')):
             try:
@@ -156,54 +243,75 @@ class HsmsConnection:  # pragma: no cover
         if not self.threadRunning:
             return
 
+        self.lifecycle.enter(HsmsConnectionLifecycle.DISCONNECTING)
+
         # set disconnecting flag to avoid another select
         self.disconnecting = True
 
         # set flag to stop the thread
         self.stopThread = True
+        self._stopEvent.set()
 
-        # wait until thread stopped
-        while self.threadRunning:
-            pass
+        # wait until thread stopped, unless disconnect was called from the receiver itself
+        self._join_thread(self.receiverThread)
 
         # clear disconnecting flag, no selects coming any more
         self.disconnecting = False
 
-    def send_packet(self, packet):
+    def _join_thread(self, thread):
         """
-        Send the ASCII coded packet to the remote host.
+        Wait for a background thread to stop.
+
+        Returns immediately if called from the thread itself, waits at most :attr:`join_timeout` seconds.
 
-        :param packet: encoded data to be transmitted
-        :type packet: string / byte array
+        :param thread: thread to wait for
+        :type thread: :class:`threading.Thread`
         """
-        # encode the packet
-        data = packet.encode()
+        if thread is None or thread is threading.current_thread():
+            return
 
-        # split data into blocks
-        blocks = [data[i: i + self.send_block_size] for i in range(0, len(data), self.send_block_size)]
+        thread.join(self.join_timeout)
 
-        for block in blocks:
-            retry = True
+        if thread.is_alive():
+            self.logger.warning("thread %s didn't stop within %.1f seconds", thread.name, self.join_timeout)
 
-            # not sent yet, retry
-            while retry:
-                # wait until socket is writable
-                while not select.select([], [self.sock], [], self.select_timeout)[1]:
-                    pass
+    def send_packet(self, packet, priority=None):
+        """
+        Send a packet to the remote host and wait until it was written.
+
+        :param packet: packet to be transmitted
+        :type packet: :class:`secsgem.hsms.HsmsPacket`
+        :param priority: priority of the packet, a PRIORITY constant of :class:`secsgem.hsms.writer.HsmsWriter`,
+            determined from the packet if not set
+        :type priority: integer
+        :returns: True if the packet was written to the socket
+        :rtype: boolean
+        """
+        return self.send_packet_nowait(packet, priority).result()
 
-                try:
-                    # send packet
-                    self.sock.send(block)
+    def send_packet_nowait(self, packet, priority=None):
+        """
+        Queue a packet for the writer thread of the connection.
+
+        Queued packets are written by priority, control messages before replies, primary messages and bulk messages.
+        Each packet is written completely before the next one.
+
+        :param packet: packet to be transmitted
+        :type packet: :class:`secsgem.hsms.HsmsPacket`
+        :param priority: priority of the packet, a PRIORITY constant of :class:`secsgem.hsms.writer.HsmsWriter`,
+            determined from the packet if not set
+        :type priority: integer
+        :returns: future with the result True if the packet was written, False if writing failed
+        :rtype: :class:`concurrent.futures.Future`
+        """
+        writer = self.writer
 
-                    # retry will be cleared if send succeeded
-                    retry = False
-                except OSError as exc:
-                    if not secsgem.common.is_errorcode_ewouldblock(exc.errno):
-                        # raise if not EWOULDBLOCK
-                        return False
-                    # it is EWOULDBLOCK, so retry sending
+        if writer is None:
+            future = concurrent.futures.Future()
+            future.set_result(False)
+            return future
 
-        return True
+        return writer.submit(packet, priority)
 
     def _process_receive_buffer(self):
         """
@@ -212,37 +320,71 @@ class HsmsConnection:  # pragma: no cover
         .. warning:: Do not call this directly, will be called from
         :func:`secsgem.hsmsConnections.hsmsConnection.__receiver_thread` method.
         """
-        # check if enough data in input buffer
-        if len(self.receiveBuffer) < 4:
-            return False
-
-        # unpack length from input buffer
-        length = struct.unpack(">L", self.receiveBuffer[0:4])[0] + 4
+        for message in self.receiveBuffer.messages():
+            # decode received packet
+            self._dispatch_packet(HsmsPacket.decode(message))
 
-        # check if enough data in input buffer
-        if len(self.receiveBuffer) < length:
-            return False
-
-        # extract and remove packet from input buffer
-        data = self.receiveBuffer[0:length]
-        self.receiveBuffer = self.receiveBuffer[length:]
-
-        # decode received packet
-        response = HsmsPacket.decode(data)
+    def _dispatch_packet(self, packet):
+        """
+        Pass a received packet to the delegate.
 
+        :param packet: received packet
+        :type packet: :class:`secsgem.hsms.HsmsPacket`
+        """
         # redirect packet to hsms handler
         if self.delegate and hasattr(self.delegate, 'on_connection_packet_received') \
                 and callable(getattr(self.delegate, 'on_connection_packet_received')):
             try:
-                self.delegate.on_connection_packet_received(self, response)
+                self.delegate.on_connection_packet_received(self, packet)
             except Exception:  # pylint: disable=broad-except
                 self.logger.exception('ignoring exception for on_connection_packet_received handler')
 
-        # return True if more data is available
+    def _receive_data(self):
+        """
+        Receive the available data from the socket and handle the complete messages.
+
+        :returns: False if the socket was closed by the remote
+        :rtype: boolean
+        """
+        try:
+            # receive data from socket directly into the input buffer, check if socket was closed
+            if self.receiveBuffer.recv_from(self.sock, self.receive_block_size) == 0:
+                return False
+        except OSError as exc:
+            if not secsgem.common.is_errorcode_ewouldblock(exc.errno):
+                raise exc
+        else:
+            self.lastReceived = time.monotonic()
+
+        # handle data in input buffer
+        self._process_receive_buffer()
+
+        # restart intercharacter timeout if message is incomplete
+        self._stop_intercharacter_timer()
+
         if len(self.receiveBuffer) > 0:
-            return True
+            self.intercharacterTimer = self.timers.schedule(self.T8, self._on_t8_timeout)
+
+        return True
+
+    def _stop_intercharacter_timer(self):
+        """Stop the intercharacter timer (T8)."""
+        timer = self.intercharacterTimer
+        if timer is not None:
+            timer.cancel()
+
+        self.intercharacterTimer = None
 
-        return False
+    def _on_t8_timeout(self):
+        """
+        Close the connection after the remote stopped sending in the middle of a message.
+
+        .. warning:: Do not call this directly, will be called from the timer thread.
+        """
+        self.logger.warning("T8 timeout, closing connection")
+
+        # the receiver thread closes the connection
+        self.stopThread = True
 
     def __receiver_thread_read_data(self):
         # check if shutdown requested
@@ -252,29 +394,12 @@ class HsmsConnection:  # pragma: no cover
 
             # check if disconnection was started
             if self.disconnecting:
-                time.sleep(0.2)
+                self._stopEvent.wait(0.2)
                 continue
 
-            if select_result[0]:
-                try:
-                    # get data from socket
-                    recv_data = self.sock.recv(1024)
-
-                    # check if socket was closed
-                    if len(recv_data) == 0:
-                        self.connected = False
-                        self.stopThread = True
-                        continue
-
-                    # add received data to input buffer
-                    self.receiveBuffer += recv_data
-                except OSError as exc:
-                    if not secsgem.common.is_errorcode_ewouldblock(exc.errno):
-                        raise exc
-
-                # handle data in input buffer
-                while self._process_receive_buffer():
-                    pass
+            if select_result[0] and not self._receive_data():
+                self.connected = False
+                self.stopThread = True
 
     def __receiver_thread(self):
         """
@@ -284,12 +409,31 @@ class HsmsConnection:  # pragma: no cover
         :func:`secsgem.hsmsConnections.hsmsConnection._startReceiver` method.
         """
         self.threadRunning = True
+        self._receiverStarted.set()
 
         try:
             self.__receiver_thread_read_data()
         except Exception:  # pylint: disable=broad-except
             self.logger.exception('exception')
 
+        self._close_connection()
+
+        # reset thread flags
+        self.threadRunning = False
+        self.stopThread = False
+
+        # notify inherited classes of disconnection
+        self._on_hsms_connection_close({'connection': self})
+
+    def _close_connection(self):
+        """
+        Close the socket and notify the delegate.
+
+        .. warning:: Do not call this directly, used internally.
+        """
+        if self.lifecycle.phase != HsmsConnectionLifecycle.DISCONNECTING:
+            self.lifecycle.enter(HsmsConnectionLifecycle.DISCONNECTING)
+
         # notify listeners of disconnection
         if self.delegate and hasattr(self.delegate, 'on_connection_before_closed') \
                 and callable(getattr(self.delegate, 'on_connection_before_closed')):
@@ -298,6 +442,11 @@ class HsmsConnection:  # pragma: no cover
             except Exception:  # pylint: disable=broad-except
                 self.logger.exception('ignoring exception for on_connection_before_closed handler')
 
+        self._stop_intercharacter_timer()
+
+        # write the queued packets, e.g. a separate request, before closing the socket
+        self._stop_writer()
+
         # close the socket
         self.sock.close()
 
@@ -309,13 +458,10 @@ class HsmsConnection:  # pragma: no cover
             except Exception:  # pylint: disable=broad-except
                 self.logger.exception('ignoring exception for on_connection_closed handler')
 
-        # reset all flags
+        # reset connection flag
         self.connected = False
-        self.threadRunning = False
-        self.stopThread = False
 
         # clear receive buffer
-        self.receiveBuffer = b""
+        self.receiveBuffer.clear()
 
-        # notify inherited classes of disconnection
-        self._on_hsms_connection_close({'connection': self})
+        self.lifecycle.enter(HsmsConnectionLifecycle.NOT_CONNECTED)
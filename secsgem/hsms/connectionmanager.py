@@ -26,8 +26,13 @@ from .multi_passive_server import HsmsMultiPassiveServer
 class HsmsConnectionManager:
     """High level class that handles multiple active and passive connections and the model for them."""
 
-    def __init__(self):
-        """Initialize a hsms connection manager."""
+    def __init__(self, reactor=False):
+        """
+        Initialize a hsms connection manager.
+
+        :param reactor: serve passive connections with a single I/O thread per port
+        :type reactor: boolean
+        """
         self._eventProducer = secsgem.common.EventProducer()
 
         self.logger = logging.getLogger(self.__module__ + "." + self.__class__.__name__)
@@ -38,6 +43,8 @@ class HsmsConnectionManager:
 
         self.stopping = False
 
+        self.reactor = reactor
+
         self._testServerObject = None
 
     @property
@@ -102,7 +109,7 @@ class HsmsConnectionManager:
         for requiredPort in required_ports:
             if requiredPort not in self.servers:
                 self.logger.debug("starting server on port %d", requiredPort)
-                self.servers[requiredPort] = HsmsMultiPassiveServer(requiredPort)
+                self.servers[requiredPort] = HsmsMultiPassiveServer(requiredPort, reactor=self.reactor)
                 self.servers[requiredPort].start()
 
     def add_peer(self, name, address, port, active, session_id, connection_handler=HsmsHandler):
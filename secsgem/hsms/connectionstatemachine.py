@@ -15,20 +15,62 @@
 #####################################################################
 """Contains the state machine for the connection state."""
 
-from transitions.extensions import HierarchicalMachine as Machine
-from transitions.extensions.nesting import NestedState
-NestedState.separator = '_'
+from transitions import MachineError
+
+SEPARATOR = "_"
+""" Separator between parent and child state names ."""
 
 STATE_NOT_CONNECTED = "NOT-CONNECTED"
 STATE_CONNECTED = "CONNECTED"
 STATE_NOT_SELECTED = "NOT-SELECTED"
-STATE_CONNECTED_NOT_SELECTED = f"{STATE_CONNECTED}{NestedState.separator}{STATE_NOT_SELECTED}"
+STATE_CONNECTED_NOT_SELECTED = f"{STATE_CONNECTED}{SEPARATOR}{STATE_NOT_SELECTED}"
 STATE_SELECTED = "SELECTED"
-STATE_CONNECTED_SELECTED = f"{STATE_CONNECTED}{NestedState.separator}{STATE_SELECTED}"
+STATE_CONNECTED_SELECTED = f"{STATE_CONNECTED}{SEPARATOR}{STATE_SELECTED}"
+
+
+def _trigger(event):
+    def trigger(self):
+        return self._trigger(event)  # pylint: disable=protected-access
+
+    trigger.__name__ = event
+    trigger.__doc__ = f"Trigger the {event} transition."
+
+    return trigger
 
 
 class ConnectionStateMachine:
-    """HSMS Connection state machine."""
+    """
+    HSMS Connection state machine.
+
+    The states and transitions are defined once for the class, an instance only stores its state and callbacks.
+    Callbacks are called with the names on_enter_<state> and on_exit_<state>,
+    leaving or entering a child state also leaves or enters the parent state if required.
+    """
+
+    __slots__ = ("state", "callbacks")
+
+    STATES = {
+        STATE_NOT_CONNECTED: (STATE_NOT_CONNECTED, ),
+        STATE_CONNECTED_NOT_SELECTED: (STATE_CONNECTED, STATE_CONNECTED_NOT_SELECTED),
+        STATE_CONNECTED_SELECTED: (STATE_CONNECTED, STATE_CONNECTED_SELECTED),
+    }
+    """ Path from the outermost state for each state ."""
+
+    TRANSITIONS = {
+        "connect": {STATE_NOT_CONNECTED: STATE_CONNECTED_NOT_SELECTED},  # transition 2
+        "disconnect": {STATE_CONNECTED_NOT_SELECTED: STATE_NOT_CONNECTED,
+                       STATE_CONNECTED_SELECTED: STATE_NOT_CONNECTED},  # transition 3
+        "select": {STATE_CONNECTED_NOT_SELECTED: STATE_CONNECTED_SELECTED},  # transition 4
+        "deselect": {STATE_CONNECTED_SELECTED: STATE_CONNECTED_NOT_SELECTED},  # transition 5
+        "timeoutT7": {STATE_CONNECTED_NOT_SELECTED: STATE_NOT_CONNECTED},  # transition 6
+    }
+    """ Destination state for each source state by event ."""
+
+    connect = _trigger("connect")
+    disconnect = _trigger("disconnect")
+    select = _trigger("select")
+    deselect = _trigger("deselect")
+    timeoutT7 = _trigger("timeoutT7")
 
     def __init__(self, callbacks=None):
         """
@@ -36,42 +78,52 @@ class ConnectionStateMachine:
 
         :param callbacks: callbacks for the state machine
         """
-        self.callbacks = {}
-
-        self.states = [STATE_NOT_CONNECTED,
-                       {
-                            'name': STATE_CONNECTED,
-                            'on_enter': self._on_enter_CONNECTED,
-                            'on_exit': self._on_exit_CONNECTED,
-                            'children': [
-                                STATE_NOT_SELECTED,
-                                {
-                                    'name': STATE_SELECTED,
-                                    'on_enter': self._on_enter_CONNECTED_SELECTED
-                                }
-                            ]
-                       }]
+        self.callbacks = callbacks or {}
 
         # transition 1
-        self.machine = Machine(model=self, states=self.states, initial=STATE_NOT_CONNECTED, auto_transitions=False)
+        self.state = STATE_NOT_CONNECTED
+
+    def __repr__(self):
+        """Generate textual representation for an object of this class."""
+        return f"{self.__class__.__name__} {self.state}"
+
+    def is_NOT_CONNECTED(self):  # pylint: disable=invalid-name
+        """Check if the state is NOT-CONNECTED."""
+        return self.state == STATE_NOT_CONNECTED
+
+    def is_CONNECTED_NOT_SELECTED(self):  # pylint: disable=invalid-name
+        """Check if the state is CONNECTED_NOT-SELECTED."""
+        return self.state == STATE_CONNECTED_NOT_SELECTED
+
+    def is_CONNECTED_SELECTED(self):  # pylint: disable=invalid-name
+        """Check if the state is CONNECTED_SELECTED."""
+        return self.state == STATE_CONNECTED_SELECTED
+
+    def _trigger(self, event):
+        destination = self.TRANSITIONS[event].get(self.state)
+
+        if destination is None:
+            raise MachineError(f"Can't trigger event {event} from state {self.state}!")
+
+        source_path = self.STATES[self.state]
+        destination_path = self.STATES[destination]
+
+        # states both paths start with aren't left or entered
+        common = 0
+        while common < min(len(source_path), len(destination_path)) \
+                and source_path[common] == destination_path[common]:
+            common += 1
 
-        if callbacks:
-            self.callbacks = callbacks
+        for state in reversed(source_path[common:]):
+            self._callback(f"on_exit_{state}")
 
-        self.machine.add_transition('connect', STATE_NOT_CONNECTED, STATE_CONNECTED_NOT_SELECTED)  # transition 2
-        self.machine.add_transition('disconnect', STATE_CONNECTED, STATE_NOT_CONNECTED)  # transition 3
-        self.machine.add_transition('select', STATE_CONNECTED_NOT_SELECTED, STATE_CONNECTED_SELECTED)  # transition 4
-        self.machine.add_transition('deselect', STATE_CONNECTED_SELECTED, STATE_CONNECTED_NOT_SELECTED)  # transition 5
-        self.machine.add_transition('timeoutT7', STATE_CONNECTED_NOT_SELECTED, STATE_NOT_CONNECTED)  # transition 6
+        self.state = destination
 
-    def _on_enter_CONNECTED(self):
-        if "on_enter_CONNECTED" in self.callbacks:
-            self.callbacks["on_enter_CONNECTED"]()
+        for state in destination_path[common:]:
+            self._callback(f"on_enter_{state}")
 
-    def _on_exit_CONNECTED(self):
-        if "on_exit_CONNECTED" in self.callbacks:
-            self.callbacks["on_exit_CONNECTED"]()
+        return True
 
-    def _on_enter_CONNECTED_SELECTED(self):
-        if "on_enter_CONNECTED_SELECTED" in self.callbacks:
-            self.callbacks["on_enter_CONNECTED_SELECTED"]()
+    def _callback(self, name):
+        if name in self.callbacks:
+            self.callbacks[name]()
@@ -25,6 +25,8 @@ class HsmsDeselectReqHeader(HsmsHeader):
     Header for message with SType 3.
     """
 
+    __slots__ = ()
+
     def __init__(self, system):
         """
         Initialize a hsms deselect request.
@@ -15,10 +15,13 @@
 #####################################################################
 """Contains class to create model for hsms endpoints."""
 
+import asyncio
+import collections
+import concurrent.futures
 import random
 import threading
+import time
 import logging
-import queue
 
 import secsgem.common
 
@@ -36,6 +39,7 @@ from .reject_req_header import HsmsRejectReqHeader
 from .separate_req_header import HsmsSeparateReqHeader
 from .stream_function_header import HsmsStreamFunctionHeader
 from .connectionstatemachine import ConnectionStateMachine
+from .transactions import HsmsTransactionTable
 
 
 class HsmsHandler:
@@ -97,18 +101,40 @@ class HsmsHandler:
 
         self.connected = False
 
-        # system id counter
-        self.systemCounter = random.randint(0, (2 ** 32) - 1)
+        # protocol timers, shared with all other handlers
+        self.timers = secsgem.common.TimerWheel.get_default()
+
+        # outstanding requests and system id counter
+        self.transactions = HsmsTransactionTable(timers=self.timers)
 
         # repeating linktest variables
         self.linktestTimer = None
         self.linktestTimeout = 30
 
+        # only send linktest requests after nothing was received for linktestIdleTime seconds
+        self.linktestOnIdle = False
+
+        # time without received data before a linktest request is sent in linktestOnIdle mode, linktestTimeout if None
+        self.linktestIdleTime = None
+
+        # spread the linktest requests of many sessions by up to this fraction of linktestTimeout (or linktestIdleTime)
+        self.linktestJitter = 0.1
+
+        # statistics of the linktest requests sent by the timer
+        self._linktestCounters = collections.Counter()
+        self._linktestTimes = collections.Counter(rtt=0.0, rtt_max=0.0, rtt_last=0.0)
+
+        # not selected timer (T7)
+        self.notSelectedTimer = None
+
         # select request thread for active connections, to avoid blocking state changes
         self.selectReqThread = None
 
-        # response queues
-        self._systemQueues = {}
+        # binary trace of sent and received packets, see secsgem.hsms.trace.HsmsTraceWriter
+        self.trace = None
+
+        # state changes by received control messages (receiver thread) and T7 (timer thread) are checked under this lock
+        self._connectionStateLock = threading.RLock()
 
         # hsms connection state fsm
         self.connectionState = ConnectionStateMachine({"on_enter_CONNECTED": self._on_state_connect,
@@ -139,6 +165,15 @@ class HsmsHandler:
         """Property for callback handling."""
         return self._callback_handler
 
+    @property
+    def systemCounter(self):  # pylint: disable=invalid-name
+        """Last allocated system id."""
+        return self.transactions.counter
+
+    @systemCounter.setter
+    def systemCounter(self, value):  # pylint: disable=invalid-name
+        self.transactions.counter = value
+
     def get_next_system_counter(self):
         """
         Return the next System.
@@ -146,23 +181,46 @@ class HsmsHandler:
         :returns: System for the next command
         :rtype: integer
         """
-        self.systemCounter += 1
-
-        if self.systemCounter > ((2 ** 32) - 1):
-            self.systemCounter = 0
-
-        return self.systemCounter
+        return self.transactions.next_system()
 
     def _send_select_req_thread(self):
         response = self.send_select_req()
         if response is None:
             self.logger.warning("select request failed")
 
-    def _start_linktest_timer(self):
-        self.linktestTimer = threading.Timer(self.linktestTimeout, self._on_linktest_timer)
-        self.linktestTimer.daemon = True  # kill thread automatically on main program termination
-        self.linktestTimer.name = "secsgem_hsmsHandler_linktestTimer"
-        self.linktestTimer.start()
+    @property
+    def linktest_metrics(self):
+        """
+        Get the statistics of the linktest requests sent by the linktest timer.
+
+        Round trip times are in seconds, measured from allocating the request until the response was received.
+        Skipped linktests weren't sent in :attr:`linktestOnIdle` mode, because data was received.
+        Idle time is the time since data was received last.
+
+        :returns: statistics
+        :rtype: dict
+        """
+        answered = self._linktestCounters["answered"]
+        last_received = self.connection.lastReceived
+
+        return {
+            "sent": self._linktestCounters["sent"],
+            "answered": answered,
+            "failed": self._linktestCounters["failed"],
+            "skipped": self._linktestCounters["skipped"],
+            "rtt_last": self._linktestTimes["rtt_last"] if answered else None,
+            "rtt_avg": self._linktestTimes["rtt"] / answered if answered else None,
+            "rtt_max": self._linktestTimes["rtt_max"] if answered else None,
+            "idle_time": None if last_received is None else time.monotonic() - last_received,
+        }
+
+    def _linktest_delay(self, interval=None):
+        # random delay, so linktests of sessions connected at the same time aren't sent at the same time
+        return (self.linktestTimeout if interval is None else interval) * (1 - self.linktestJitter * random.random())
+
+    def _start_linktest_timer(self, delay=None):
+        self.linktestTimer = self.timers.schedule(self._linktest_delay() if delay is None else delay,
+                                                  self._on_linktest_timer)
 
     def _on_state_connect(self):
         """
@@ -174,6 +232,9 @@ class HsmsHandler:
         # start linktest timer
         self._start_linktest_timer()
 
+        # start not selected timer
+        self.notSelectedTimer = self.timers.schedule(self.connection.T7, self._on_t7_timeout)
+
         # start select process if connection is active
         if self.active:
             self.selectReqThread = threading.Thread(target=self._send_select_req_thread,
@@ -188,12 +249,17 @@ class HsmsHandler:
         :param data: event attributes
         :type data: object
         """
-        # stop linktest timer
+        # stop timers
         if self.linktestTimer:
             self.linktestTimer.cancel()
 
         self.linktestTimer = None
 
+        if self.notSelectedTimer:
+            self.notSelectedTimer.cancel()
+
+        self.notSelectedTimer = None
+
     def _on_state_select(self):
         """
         Handle connection state model got event select.
@@ -201,6 +267,12 @@ class HsmsHandler:
         :param data: event attributes
         :type data: object
         """
+        # stop not selected timer
+        if self.notSelectedTimer:
+            self.notSelectedTimer.cancel()
+
+        self.notSelectedTimer = None
+
         # send event
         self.events.fire('hsms_selected', {'connection': self})
 
@@ -210,18 +282,66 @@ class HsmsHandler:
 
     def _on_linktest_timer(self):
         """Linktest time timed out, so send linktest request."""
-        # send linktest request and wait for response
-        self.send_linktest_req()
+        timer = self.linktestTimer
 
-        # restart the timer
-        self._start_linktest_timer()
+        if self.linktestOnIdle:
+            # jittered as well, so sessions which went quiet at the same time aren't probed at the same time
+            threshold = self._linktest_delay(self.linktestIdleTime)
+            idle = time.monotonic() - self.connection.lastReceived
+
+            # data was received in the meantime, check again when the link might be idle long enough
+            if idle < threshold:
+                self._linktestCounters["skipped"] += 1
+                self._start_linktest_timer(threshold - idle)
+                return
+
+        def on_finished(transaction):
+            self.transactions.remove(transaction.system)
+
+            if transaction.response is None:
+                self._linktestCounters["failed"] += 1
+            else:
+                rtt = transaction.age
+                self._linktestCounters["answered"] += 1
+                self._linktestTimes["rtt"] += rtt
+                self._linktestTimes["rtt_last"] = rtt
+                self._linktestTimes["rtt_max"] = max(self._linktestTimes["rtt_max"], rtt)
+
+            # restart the timer, unless the connection was closed in the meantime
+            if self.linktestTimer is timer:
+                self._start_linktest_timer()
+
+        # send linktest request, the timer thread doesn't wait for the response
+        transaction = self.transactions.allocate(self.connection.T6, on_finished)
+        self._linktestCounters["sent"] += 1
+
+        packet = HsmsPacket(HsmsLinktestReqHeader(transaction.system))
+        self._log_packet(">", packet)
+
+        self.connection.send_packet_nowait(packet).add_done_callback(
+            lambda future: future.result() or transaction.cancel())
+
+    def _on_t7_timeout(self):
+        """Connection wasn't selected in time."""
+        # a select request might be received at the same time
+        with self._connectionStateLock:
+            if not self.connectionState.is_CONNECTED_NOT_SELECTED():
+                return
+
+            self.logger.warning("T7 timeout, connection not selected")
+
+            self.connectionState.timeoutT7()
+
+        # closing the connection waits for the receiver thread, don't block the timer thread
+        secsgem.common.Dispatcher.get_default().dispatch_unbounded(self.connection, self.connection.disconnect)
 
     def on_connection_established(self, _):
         """Handle connection was established event."""
         self.connected = True
 
         # update connection state
-        self.connectionState.connect()
+        with self._connectionStateLock:
+            self.connectionState.connect()
 
         self.events.fire("hsms_connected", {'connection': self})
 
@@ -234,33 +354,37 @@ class HsmsHandler:
         """Handle connection was closed event."""
         # update connection state
         self.connected = False
-        self.connectionState.disconnect()
+        with self._connectionStateLock:
+            if not self.connectionState.is_NOT_CONNECTED():
+                self.connectionState.disconnect()
 
         self.events.fire("hsms_disconnected", {'connection': self})
 
     def __handle_hsms_requests(self, packet):
-        self.communicationLogger.info("< %s\n  %s", packet, HSMS_STYPES[packet.header.sType],
-                                      extra=self._get_log_extra())
+        self._log_packet("<", packet)
 
         # check if it is a select request
         if packet.header.sType == 0x01:
-            # if we are disconnecting send reject else send response
-            if self.connection.disconnecting:
-                self.send_reject_rsp(packet.header.system, packet.header.sType, 4)
-            else:
-                self.send_select_rsp(packet.header.system)
+            # the response and the state change can't be separated by T7
+            with self._connectionStateLock:
+                # if we are disconnecting or T7 closed the connection send reject else send response
+                if self.connection.disconnecting or self.connectionState.is_NOT_CONNECTED():
+                    self.send_reject_rsp(packet.header.system, packet.header.sType, 4)
+                else:
+                    self.send_select_rsp(packet.header.system)
 
-                # update connection state
-                self.connectionState.select()
+                    # update connection state
+                    self.connectionState.select()
 
         # check if it is a select response
         elif packet.header.sType == 0x02:
-            # update connection state
-            self.connectionState.select()
+            # update connection state, unless T7 closed the connection in the meantime
+            with self._connectionStateLock:
+                if self.connectionState.is_CONNECTED_NOT_SELECTED():
+                    self.connectionState.select()
 
-            if packet.header.system in self._systemQueues:
-                # send packet to request sender
-                self._systemQueues[packet.header.system].put_nowait(packet)
+            # send packet to request sender
+            self.transactions.complete(packet)
 
             # what to do if no sender for request waiting?
 
@@ -270,18 +394,19 @@ class HsmsHandler:
             if self.connection.disconnecting:
                 self.send_reject_rsp(packet.header.system, packet.header.sType, 4)
             else:
-                self.send_deselect_rsp(packet.header.system)
-                # update connection state
-                self.connectionState.deselect()
+                with self._connectionStateLock:
+                    self.send_deselect_rsp(packet.header.system)
+                    # update connection state
+                    self.connectionState.deselect()
 
         # check if it is a deselect response
         elif packet.header.sType == 0x04:
             # update connection state
-            self.connectionState.deselect()
+            with self._connectionStateLock:
+                self.connectionState.deselect()
 
-            if packet.header.system in self._systemQueues:
-                # send packet to request sender
-                self._systemQueues[packet.header.system].put_nowait(packet)
+            # send packet to request sender
+            self.transactions.complete(packet)
 
             # what to do if no sender for request waiting?
 
@@ -294,9 +419,8 @@ class HsmsHandler:
                 self.send_linktest_rsp(packet.header.system)
 
         else:
-            if packet.header.system in self._systemQueues:
-                # send packet to request sender
-                self._systemQueues[packet.header.system].put_nowait(packet)
+            # send packet to request sender
+            self.transactions.complete(packet)
 
             # what to do if no sender for request waiting?
 
@@ -310,54 +434,28 @@ class HsmsHandler:
         if packet.header.sType > 0:
             self.__handle_hsms_requests(packet)
         else:
-            if hasattr(self, 'secs_decode') and callable(getattr(self, 'secs_decode')):
-                message = self.secs_decode(packet)
-                self.communicationLogger.info("< %s\n%s", packet, message, extra=self._get_log_extra())
-            else:
-                self.communicationLogger.info("< %s", packet, extra=self._get_log_extra())
+            self._log_packet("<", packet)
 
             if not self.connectionState.is_CONNECTED_SELECTED():
                 self.logger.warning("received message when not selected")
 
                 out_packet = HsmsPacket(HsmsRejectReqHeader(packet.header.system, packet.header.sType, 4))
-                self.communicationLogger.info("> %s\n  %s", out_packet, HSMS_STYPES[out_packet.header.sType],
-                                              extra=self._get_log_extra())
+                self._log_packet(">", out_packet)
                 self.connection.send_packet(out_packet)
 
                 return
 
-            # someone is waiting for this message
-            if packet.header.system in self._systemQueues:
-                # send packet to request sender
-                self._systemQueues[packet.header.system].put_nowait(packet)
+            # someone is waiting for this message, send packet to request sender
+            if self.transactions.complete(packet):
+                return
+
             # redirect packet to hsms handler
-            elif hasattr(self, '_on_hsms_packet_received') and callable(getattr(self, '_on_hsms_packet_received')):
+            if hasattr(self, '_on_hsms_packet_received') and callable(getattr(self, '_on_hsms_packet_received')):
                 self._on_hsms_packet_received(packet)
             # just log if nobody is interested
             else:
                 self.logger.warning("packet unhandled")
 
-    def _get_queue_for_system(self, system_id):
-        """
-        Create a new queue to receive responses for a certain system.
-
-        :param system_id: system id to watch
-        :type system_id: int
-        :returns: queue to receive responses with
-        :rtype: queue.Queue
-        """
-        self._systemQueues[system_id] = queue.Queue()
-        return self._systemQueues[system_id]
-
-    def _remove_queue(self, system_id):
-        """
-        Remove queue for system id from list.
-
-        :param system_id: system id to remove
-        :type system_id: int
-        """
-        del self._systemQueues[system_id]
-
     def __repr__(self):
         """Generate textual representation for an object of this class."""
         return f"{self.__class__.__name__} {str(self._serialize_data())}"
@@ -392,7 +490,7 @@ class HsmsHandler:
                                      packet.is_reply_required, self.sessionID),
             packet.encode())
 
-        self.communicationLogger.info("> %s\n%s", out_packet, packet, extra=self._get_log_extra())
+        self._log_packet(">", out_packet, packet)
 
         return self.connection.send_packet(out_packet)
 
@@ -405,29 +503,70 @@ class HsmsHandler:
         :returns: Packet that was received
         :rtype: :class:`secsgem.hsms.HsmsPacket`
         """
-        system_id = self.get_next_system_counter()
+        transaction = self.transactions.allocate(self.connection.T3)
+
+        out_packet = HsmsPacket(HsmsStreamFunctionHeader(transaction.system, packet.stream, packet.function, True,
+                                                         self.sessionID),
+                                packet.encode())
+
+        return self._send_and_wait(transaction, out_packet, packet)
+
+    def send_request(self, packet, timeout=None):
+        """
+        Send the packet without waiting for the response.
+
+        The returned future is completed by the receiving thread, when the response arrives.
+        Its result is None if sending failed or the response timed out.
+        Cancelling the future releases the system bytes of the request.
+
+        **Example**::
+
+            futures = [handler.send_request(secsgem.secs.functions.SecsS01F03([1, 2])) for handler in handlers]
+            responses = secsgem.hsms.gather(futures)
 
-        response_queue = self._get_queue_for_system(system_id)
+        :param packet: packet to be sent
+        :type packet: :class:`secsgem.secs.functionbase.SecsStreamFunction`
+        :param timeout: time to wait for the response in seconds, T3 if not set
+        :type timeout: float
+        :returns: future for the received packet
+        :rtype: :class:`concurrent.futures.Future`
+        """
+        future = concurrent.futures.Future()
+
+        def on_finished(transaction):
+            self.transactions.remove(transaction.system)
+
+            if future.set_running_or_notify_cancel():
+                future.set_result(transaction.response)
 
-        out_packet = HsmsPacket(HsmsStreamFunctionHeader(system_id, packet.stream, packet.function, True,
+        transaction = self.transactions.allocate(self.connection.T3 if timeout is None else timeout, on_finished)
+
+        future.add_done_callback(lambda _: transaction.cancel())
+
+        out_packet = HsmsPacket(HsmsStreamFunctionHeader(transaction.system, packet.stream, packet.function, True,
                                                          self.sessionID),
                                 packet.encode())
 
-        self.communicationLogger.info("> %s\n%s", out_packet, packet, extra=self._get_log_extra())
+        self._log_packet(">", out_packet, packet)
 
         if not self.connection.send_packet(out_packet):
             self.logger.error("Sending packet failed")
-            self._remove_queue(system_id)
-            return None
+            transaction.cancel()
 
-        try:
-            response = response_queue.get(True, self.connection.T3)
-        except queue.Empty:
-            response = None
+        return future
 
-        self._remove_queue(system_id)
+    async def send_request_async(self, packet, timeout=None):
+        """
+        Send the packet and wait for the response in an asyncio event loop.
 
-        return response
+        :param packet: packet to be sent
+        :type packet: :class:`secsgem.secs.functionbase.SecsStreamFunction`
+        :param timeout: time to wait for the response in seconds, T3 if not set
+        :type timeout: float
+        :returns: Packet that was received, None if sending failed or the response timed out
+        :rtype: :class:`secsgem.hsms.HsmsPacket`
+        """
+        return await asyncio.wrap_future(self.send_request(packet, timeout))
 
     def send_response(self, function, system):
         """
@@ -442,7 +581,7 @@ class HsmsHandler:
                                                          self.sessionID),
                                 function.encode())
 
-        self.communicationLogger.info("> %s\n%s", out_packet, function, extra=self._get_log_extra())
+        self._log_packet(">", out_packet, function)
 
         return self.connection.send_packet(out_packet)
 
@@ -453,26 +592,9 @@ class HsmsHandler:
         :returns: System of the sent request
         :rtype: integer
         """
-        system_id = self.get_next_system_counter()
+        transaction = self.transactions.allocate(self.connection.T6)
 
-        response_queue = self._get_queue_for_system(system_id)
-
-        packet = HsmsPacket(HsmsSelectReqHeader(system_id))
-        self.communicationLogger.info("> %s\n  %s", packet, HSMS_STYPES[packet.header.sType],
-                                      extra=self._get_log_extra())
-
-        if not self.connection.send_packet(packet):
-            self._remove_queue(system_id)
-            return None
-
-        try:
-            response = response_queue.get(True, self.connection.T6)
-        except queue.Empty:
-            response = None
-
-        self._remove_queue(system_id)
-
-        return response
+        return self._send_and_wait(transaction, HsmsPacket(HsmsSelectReqHeader(transaction.system)))
 
     def send_select_rsp(self, system_id):
         """
@@ -482,8 +604,7 @@ class HsmsHandler:
         :type system_id: integer
         """
         packet = HsmsPacket(HsmsSelectRspHeader(system_id))
-        self.communicationLogger.info("> %s\n  %s", packet, HSMS_STYPES[packet.header.sType],
-                                      extra=self._get_log_extra())
+        self._log_packet(">", packet)
         return self.connection.send_packet(packet)
 
     def send_linktest_req(self):
@@ -493,26 +614,9 @@ class HsmsHandler:
         :returns: System of the sent request
         :rtype: integer
         """
-        system_id = self.get_next_system_counter()
-
-        response_queue = self._get_queue_for_system(system_id)
+        transaction = self.transactions.allocate(self.connection.T6)
 
-        packet = HsmsPacket(HsmsLinktestReqHeader(system_id))
-        self.communicationLogger.info("> %s\n  %s", packet, HSMS_STYPES[packet.header.sType],
-                                      extra=self._get_log_extra())
-
-        if not self.connection.send_packet(packet):
-            self._remove_queue(system_id)
-            return None
-
-        try:
-            response = response_queue.get(True, self.connection.T6)
-        except queue.Empty:
-            response = None
-
-        self._remove_queue(system_id)
-
-        return response
+        return self._send_and_wait(transaction, HsmsPacket(HsmsLinktestReqHeader(transaction.system)))
 
     def send_linktest_rsp(self, system_id):
         """
@@ -522,8 +626,7 @@ class HsmsHandler:
         :type system_id: integer
         """
         packet = HsmsPacket(HsmsLinktestRspHeader(system_id))
-        self.communicationLogger.info("> %s\n  %s", packet, HSMS_STYPES[packet.header.sType],
-                                      extra=self._get_log_extra())
+        self._log_packet(">", packet)
         return self.connection.send_packet(packet)
 
     def send_deselect_req(self):
@@ -533,26 +636,9 @@ class HsmsHandler:
         :returns: System of the sent request
         :rtype: integer
         """
-        system_id = self.get_next_system_counter()
+        transaction = self.transactions.allocate(self.connection.T6)
 
-        response_queue = self._get_queue_for_system(system_id)
-
-        packet = HsmsPacket(HsmsDeselectReqHeader(system_id))
-        self.communicationLogger.info("> %s\n  %s", packet, HSMS_STYPES[packet.header.sType],
-                                      extra=self._get_log_extra())
-
-        if not self.connection.send_packet(packet):
-            self._remove_queue(system_id)
-            return None
-
-        try:
-            response = response_queue.get(True, self.connection.T6)
-        except queue.Empty:
-            response = None
-
-        self._remove_queue(system_id)
-
-        return response
+        return self._send_and_wait(transaction, HsmsPacket(HsmsDeselectReqHeader(transaction.system)))
 
     def send_deselect_rsp(self, system_id):
         """
@@ -562,8 +648,7 @@ class HsmsHandler:
         :type system_id: integer
         """
         packet = HsmsPacket(HsmsDeselectRspHeader(system_id))
-        self.communicationLogger.info("> %s\n  %s", packet, HSMS_STYPES[packet.header.sType],
-                                      extra=self._get_log_extra())
+        self._log_packet(">", packet)
         return self.connection.send_packet(packet)
 
     def send_reject_rsp(self, system_id, s_type, reason):
@@ -578,8 +663,7 @@ class HsmsHandler:
         :type reason: integer
         """
         packet = HsmsPacket(HsmsRejectReqHeader(system_id, s_type, reason))
-        self.communicationLogger.info("> %s\n  %s", packet, HSMS_STYPES[packet.header.sType],
-                                      extra=self._get_log_extra())
+        self._log_packet(">", packet)
         return self.connection.send_packet(packet)
 
     def send_separate_req(self):
@@ -587,8 +671,7 @@ class HsmsHandler:
         system_id = self.get_next_system_counter()
 
         packet = HsmsPacket(HsmsSeparateReqHeader(system_id))
-        self.communicationLogger.info("> %s\n  %s", packet, HSMS_STYPES[packet.header.sType],
-                                      extra=self._get_log_extra())
+        self._log_packet(">", packet)
 
         if not self.connection.send_packet(packet):
             return None
@@ -597,5 +680,61 @@ class HsmsHandler:
 
     # helpers
 
+    def _send_and_wait(self, transaction, packet, function=None):
+        """
+        Send a request and wait for the response of its transaction.
+
+        :param transaction: transaction allocated for the request
+        :type transaction: :class:`secsgem.hsms.HsmsTransaction`
+        :param packet: packet to be sent
+        :type packet: :class:`secsgem.hsms.HsmsPacket`
+        :param function: stream/function object of the packet, if available
+        :type function: :class:`secsgem.secs.functionbase.SecsStreamFunction`
+        :returns: received response, None if sending failed or the response timed out
+        :rtype: :class:`secsgem.hsms.HsmsPacket`
+        """
+        self._log_packet(">", packet, function)
+
+        try:
+            if not self.connection.send_packet(packet):
+                self.logger.error("Sending packet failed")
+                return None
+
+            return transaction.wait()
+        finally:
+            self.transactions.remove(transaction.system)
+
+    def _log_packet(self, direction, packet, function=None):
+        """
+        Write a sent or received packet to the trace and the communication log.
+
+        The packet is only formatted, and decoded if required, when the communication log is enabled for info.
+
+        :param direction: "<" for received and ">" for sent packets
+        :type direction: string
+        :param packet: sent or received packet
+        :type packet: :class:`secsgem.hsms.HsmsPacket`
+        :param function: stream/function object of the packet, if available
+        :type function: :class:`secsgem.secs.functionbase.SecsStreamFunction`
+        """
+        if self.trace is not None:
+            self.trace.write(direction, packet)
+
+        if not self.communicationLogger.isEnabledFor(logging.INFO):
+            return
+
+        if packet.header.sType > 0:
+            self.communicationLogger.info("%s %s\n  %s", direction, packet, HSMS_STYPES[packet.header.sType],
+                                          extra=self._get_log_extra())
+            return
+
+        if function is None and hasattr(self, 'secs_decode') and callable(getattr(self, 'secs_decode')):
+            function = self.secs_decode(packet)
+
+        if function is None:
+            self.communicationLogger.info("%s %s", direction, packet, extra=self._get_log_extra())
+        else:
+            self.communicationLogger.info("%s %s\n%s", direction, packet, function, extra=self._get_log_extra())
+
     def _get_log_extra(self):
         return {"address": self.address, "port": self.port, "sessionID": self.sessionID, "remoteName": self.name}
@@ -17,6 +17,9 @@
 
 import struct
 
+HEADER = struct.Struct(">HBBBBL")
+""" Encoded hsms header, without the length ."""
+
 
 class HsmsHeader:
     """
@@ -25,6 +28,8 @@ class HsmsHeader:
     Base for different specific headers
     """
 
+    __slots__ = ("sessionID", "requireResponse", "stream", "function", "pType", "sType", "system")
+
     def __init__(self, system, session_id):
         """
         Initialize a hsms header.
@@ -85,4 +90,37 @@ requireResponse:False})
         if self.requireResponse:
             header_stream |= 0b10000000
 
-        return struct.pack(">HBBBBL", self.sessionID, header_stream, self.function, self.pType, self.sType, self.system)
+        return HEADER.pack(self.sessionID, header_stream, self.function, self.pType, self.sType, self.system)
+
+    @classmethod
+    def decode(cls, data, offset=0):
+        """
+        Decode a hsms header, without the data of the message.
+
+        :param data: encoded header
+        :type data: bytes-like object (bytes, bytearray or memoryview)
+        :param offset: position of the header in data
+        :type offset: integer
+        :returns: decoded header
+        :rtype: :class:`secsgem.hsms.HsmsHeader`
+
+        **Example**::
+
+            >>> import secsgem.hsms
+            >>>
+            >>> secsgem.hsms.HsmsHeader.decode(b"\\xff\\xff\\x00\\x00\\x00\\x05\\x00\\x00\\x00\\x02")
+            HsmsHeader({sessionID:0xffff, stream:00, function:00, pType:0x00, sType:0x05, system:0x00000002, \
+requireResponse:False})
+        """
+        session_id, header_stream, function, p_type, s_type, system = HEADER.unpack_from(data, offset)
+
+        header = cls.__new__(cls)
+        header.sessionID = session_id
+        header.requireResponse = header_stream & 0b10000000 != 0
+        header.stream = header_stream & 0b01111111
+        header.function = function
+        header.pType = p_type
+        header.sType = s_type
+        header.system = system
+
+        return header
@@ -0,0 +1,113 @@
+#####################################################################
+# lifecycle.py
+#
+# (c) Copyright 2021, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Lifecycle state of hsms connections."""
+
+import threading
+import time
+
+
+class HsmsConnectionLifecycle:
+    """
+    Phase of a connection and the time spent in each phase.
+
+    The connection moves through the phases
+    NOT_CONNECTED -> CONNECTING -> STARTING -> CONNECTED -> DISCONNECTING -> NOT_CONNECTED.
+    When a phase is left, the time spent in it is recorded.
+
+    **Example**::
+
+        >>> import secsgem.hsms.lifecycle
+        >>>
+        >>> lifecycle = secsgem.hsms.lifecycle.HsmsConnectionLifecycle()
+        >>> lifecycle.phase
+        'NOT_CONNECTED'
+        >>> lifecycle.enter(lifecycle.CONNECTING)
+        >>> lifecycle.enter(lifecycle.STARTING)
+        >>> lifecycle.get_duration(lifecycle.CONNECTING) >= 0
+        True
+        >>> lifecycle.get_duration(lifecycle.DISCONNECTING) is None
+        True
+    """
+
+    NOT_CONNECTED = "NOT_CONNECTED"
+    """ No connection and no connection attempt ."""
+
+    CONNECTING = "CONNECTING"
+    """ Connecting to the remote or waiting for the incoming connection ."""
+
+    STARTING = "STARTING"
+    """ Socket connected, receiver being started ."""
+
+    CONNECTED = "CONNECTED"
+    """ Connection established ."""
+
+    DISCONNECTING = "DISCONNECTING"
+    """ Connection is being closed ."""
+
+    def __init__(self):
+        """Initialize a lifecycle state."""
+        self._lock = threading.Lock()
+
+        self.phase = self.NOT_CONNECTED
+        self.since = time.monotonic()
+
+        self.durations = {}
+        self.counts = {}
+
+    def __repr__(self):
+        """Generate textual representation for an object of this class."""
+        return f"{self.__class__.__name__} {str(self._serialize_data())}"
+
+    def _serialize_data(self):
+        """
+        Return data for serialization.
+
+        :returns: data to serialize for this object
+        :rtype: dict
+        """
+        return {'phase': self.phase, 'elapsed': self.elapsed, 'durations': dict(self.durations)}
+
+    @property
+    def elapsed(self):
+        """Get the number of seconds spent in the current phase."""
+        return time.monotonic() - self.since
+
+    def enter(self, phase):
+        """
+        Change to a new phase and record the duration of the previous phase.
+
+        :param phase: new phase
+        :type phase: string
+        """
+        with self._lock:
+            now = time.monotonic()
+
+            self.durations[self.phase] = now - self.since
+            self.counts[phase] = self.counts.get(phase, 0) + 1
+
+            self.phase = phase
+            self.since = now
+
+    def get_duration(self, phase):
+        """
+        Get the time spent in a phase the last time it was left.
+
+        :param phase: phase to get the duration for
+        :type phase: string
+        :returns: duration in seconds, None if the phase wasn't left yet
+        :rtype: float
+        """
+        return self.durations.get(phase)
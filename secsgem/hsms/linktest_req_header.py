@@ -25,6 +25,8 @@ class HsmsLinktestReqHeader(HsmsHeader):
     Header for message with SType 5.
     """
 
+    __slots__ = ()
+
     def __init__(self, system):
         """
         Initialize a hsms linktest request.
@@ -25,6 +25,8 @@ class HsmsLinktestRspHeader(HsmsHeader):
     Header for message with SType 6.
     """
 
+    __slots__ = ()
+
     def __init__(self, system):
         """
         Initialize a hsms linktest response.
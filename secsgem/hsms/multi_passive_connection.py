@@ -15,9 +15,9 @@
 #####################################################################
 """Hsms multi passive connection."""
 
-import socket
-
 from .connection import HsmsConnection
+from .lifecycle import HsmsConnectionLifecycle
+from .writer import HsmsReactorWriter
 
 
 class HsmsMultiPassiveConnection(HsmsConnection):  # pragma: no cover
@@ -51,6 +51,9 @@ class HsmsMultiPassiveConnection(HsmsConnection):  # pragma: no cover
         # initially not enabled
         self.enabled = False
 
+        # reactor of the server in reactor mode
+        self.reactor = None
+
     def on_connected(self, sock, address):
         """
         Connect callback for :class:`secsgem.hsms.connections.HsmsMultiPassiveServer`.
@@ -64,13 +67,116 @@ class HsmsMultiPassiveConnection(HsmsConnection):  # pragma: no cover
 
         # setup socket
         self.sock = sock
-        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        self._setup_socket()
 
         # make socket nonblocking
         self.sock.setblocking(0)
 
-        # start the receiver thread
-        self._start_receiver()
+        if self.reactor is None:
+            # start the receiver thread
+            self._start_receiver()
+            return
+
+        self.lifecycle.enter(HsmsConnectionLifecycle.STARTING)
+        self.connected = True
+
+        self._start_writer()
+
+        # notify before any packet is dispatched, the dispatched work runs in order
+        self.reactor.dispatch(self, self._notify_connection_established)
+        self.reactor.add_reader(self.sock, self._on_readable)
+
+    def _start_writer(self):
+        """
+        Start writing the outbound packets to the socket.
+
+        In reactor mode the packets are written by the I/O thread of the reactor, no thread is started.
+        """
+        if self.reactor is None:
+            HsmsConnection._start_writer(self)
+            return
+
+        self.writer = HsmsReactorWriter(self.sock, self.reactor, self.bulk_message_size)
+        self.writer.start()
+
+    def _on_readable(self):
+        """
+        Receive data in reactor mode.
+
+        .. warning:: Do not call this directly, will be called from the I/O thread of the reactor.
+        """
+        try:
+            if self._receive_data():
+                return
+        except Exception:  # pylint: disable=broad-except
+            self.logger.exception('exception')
+
+        # connection closed by remote or invalid data, close after the pending packets were handled
+        if self.reactor.remove_reader(self.sock):
+            self.reactor.dispatch(self, self._close_connection)
+
+    def _on_t8_timeout(self):
+        """
+        Close the connection after the remote stopped sending in the middle of a message.
+
+        .. warning:: Do not call this directly, will be called from the timer thread.
+        """
+        if self.reactor is None:
+            HsmsConnection._on_t8_timeout(self)
+            return
+
+        self.logger.warning("T8 timeout, closing connection")
+
+        if self.reactor.remove_reader(self.sock):
+            self.reactor.dispatch(self, self._close_connection)
+
+    def _dispatch_packet(self, packet):
+        """
+        Pass a received packet to the delegate.
+
+        In reactor mode the delegate is called from the worker pool.
+
+        :param packet: received packet
+        :type packet: :class:`secsgem.hsms.HsmsPacket`
+        """
+        if self.reactor is None:
+            HsmsConnection._dispatch_packet(self, packet)
+            return
+
+        self.reactor.dispatch(self, HsmsConnection._dispatch_packet, self, packet)
+
+    def disconnect(self):
+        """Close connection."""
+        if self.reactor is None:
+            HsmsConnection.disconnect(self)
+            return
+
+        if not self.connected or self.disconnecting:
+            return
+
+        self.lifecycle.enter(HsmsConnectionLifecycle.DISCONNECTING)
+
+        # set disconnecting flag to avoid another select
+        self.disconnecting = True
+
+        # close only if the I/O thread didn't already close the connection
+        if self.reactor.remove_reader(self.sock):
+            self._close_connection()
+
+        # clear disconnecting flag, no selects coming any more
+        self.disconnecting = False
+
+    def _close_connection(self):
+        """
+        Close the socket and notify the delegate.
+
+        .. warning:: Do not call this directly, used internally.
+        """
+        HsmsConnection._close_connection(self)
+
+        # the server keeps accepting connections for this peer
+        if self.enabled:
+            self.lifecycle.enter(HsmsConnectionLifecycle.CONNECTING)
 
     def enable(self):
         """
@@ -79,6 +185,7 @@ class HsmsMultiPassiveConnection(HsmsConnection):  # pragma: no cover
         Starts the connection process to the passive remote.
         """
         self.enabled = True
+        self.lifecycle.enter(HsmsConnectionLifecycle.CONNECTING)
 
     def disable(self):
         """
@@ -89,3 +196,5 @@ class HsmsMultiPassiveConnection(HsmsConnection):  # pragma: no cover
         self.enabled = False
         if self.connected:
             self.disconnect()
+        else:
+            self.lifecycle.enter(HsmsConnectionLifecycle.NOT_CONNECTED)
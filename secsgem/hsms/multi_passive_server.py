@@ -23,6 +23,7 @@ import threading
 import secsgem.common
 
 from .multi_passive_connection import HsmsMultiPassiveConnection
+from .reactor import HsmsReactor
 
 
 class HsmsMultiPassiveServer:  # pragma: no cover
@@ -30,17 +31,30 @@ class HsmsMultiPassiveServer:  # pragma: no cover
     Server class for multiple passive (incoming) connection.
 
     The server creates a listening socket and waits for incoming connections on this socket.
+
+    In reactor mode a single I/O thread accepts the incoming connections and receives the data of all connections.
+    Received packets are handled by a fixed number of worker threads, packets of one connection are handled in order.
+    The number of threads doesn't depend on the number of connections.
     """
 
     select_timeout = 0.5
     """ Timeout for select calls ."""
 
-    def __init__(self, port=5000, bind_ip=''):
+    join_timeout = 10.0
+    """ Maximum time to wait for the listen thread to stop ."""
+
+    def __init__(self, port=5000, bind_ip='', reactor=False, workers=4):
         """
         Initialize a passive hsms server.
 
         :param port: TCP port to listen on
         :type port: integer
+        :param bind_ip: IP address to listen on
+        :type bind_ip: string
+        :param reactor: serve all connections from a single I/O thread
+        :type reactor: boolean
+        :param workers: number of threads handling received packets in reactor mode
+        :type workers: integer
 
         **Example**::
 
@@ -61,6 +75,16 @@ class HsmsMultiPassiveServer:  # pragma: no cover
 
         self.listenThread = None
 
+        self.reactor = HsmsReactor(f"secsgem_hsmsMultiPassiveServer_reactor_{port}", workers) if reactor else None
+
+    @property
+    def local_port(self):
+        """Get the TCP port the server is listening on."""
+        if self.listenSock is None:
+            return None
+
+        return self.listenSock.getsockname()[1]
+
     def create_connection(self, address, port=5000, session_id=0, delegate=None):
         """
         Create and remember connection for the server.
@@ -76,6 +100,7 @@ class HsmsMultiPassiveServer:  # pragma: no cover
         """
         connection = HsmsMultiPassiveConnection(address, port, session_id, delegate)
         connection.handler = self
+        connection.reactor = self.reactor
 
         self.connections[address] = connection
 
@@ -96,6 +121,13 @@ class HsmsMultiPassiveServer:  # pragma: no cover
         self.listenSock.listen(1)
         self.listenSock.setblocking(0)
 
+        if self.reactor is not None:
+            self.reactor.start()
+            self.reactor.add_reader(self.listenSock, self._on_accept)
+
+            self.logger.debug("listening")
+            return
+
         self.listenThread = threading.Thread(target=self._listen_thread, args=(),
                                              name=f"secsgem_hsmsMultiPassiveServer_listenThread_{self.port}")
         self.listenThread.start()
@@ -107,15 +139,30 @@ class HsmsMultiPassiveServer:  # pragma: no cover
         Stop the server. The background job waiting for incoming connections will be terminated.
 
         Optionally all connections received will be closed.
+        In reactor mode the connections are always closed, as they are served by the I/O thread of the server.
 
         :param terminate_connections: terminate all connection made by this server
         :type terminate_connections: boolean
         """
+        if self.reactor is not None:
+            self.reactor.remove_reader(self.listenSock)
+            self.listenSock.close()
+
+            for connection in self.connections.values():
+                connection.disconnect()
+
+            self.reactor.stop()
+
+            self.logger.debug("server stopped")
+            return
+
         self.stopThread = True
 
-        if self.listenThread.is_alive():
-            while self.threadRunning:
-                pass
+        if self.listenThread is not threading.current_thread():
+            self.listenThread.join(self.join_timeout)
+
+            if self.listenThread.is_alive():
+                self.logger.warning("listen thread didn't stop within %.1f seconds", self.join_timeout)
 
         self.listenSock.close()
 
@@ -165,6 +212,25 @@ class HsmsMultiPassiveServer:  # pragma: no cover
 
         new_connection.on_connected(sock, source_ip)
 
+    def _on_accept(self):
+        """
+        Accept incoming connections in reactor mode.
+
+        .. warning:: Do not call this directly, used internally.
+        """
+        while True:
+            try:
+                accept_result = self.listenSock.accept()
+            except OSError as exc:
+                if not secsgem.common.is_errorcode_ewouldblock(exc.errno):
+                    raise exc
+                return
+
+            self.logger.debug("connection from %s:%d", accept_result[1][0], accept_result[1][1])
+
+            # resolving the connection might block, so it is done by the workers
+            self.reactor.dispatch(self, self._initialize_connection_thread, accept_result)
+
     def _listen_thread(self):
         """
         Thread listening for incoming connections.
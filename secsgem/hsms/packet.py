@@ -17,7 +17,10 @@
 
 import struct
 
-from .header import HsmsHeader
+from .header import HsmsHeader, HEADER
+
+LENGTH = struct.Struct(">L")
+""" Length in front of the encoded header and data ."""
 
 
 class HsmsPacket:
@@ -27,6 +30,8 @@ class HsmsPacket:
     Contains all required data and functions.
     """
 
+    __slots__ = ("header", "data", "decoded")
+
     def __init__(self, header=None, data=b""):
         """
         Initialize a hsms packet.
@@ -51,6 +56,9 @@ sType:0x05, system:0x00000002, requireResponse:False}), 'data': ''})
 
         self.data = data
 
+        self.decoded = None
+        """ Decoded stream/function object, cached by :func:`secsgem.secs.handler.SecsHandler.secs_decode` ."""
+
     def __str__(self):
         """Generate string representation for an object of this class."""
         data = "'header': " + self.header.__str__()
@@ -77,18 +85,40 @@ sType:0x05, system:0x00000002, requireResponse:False}), 'data': ''})
             >>> secsgem.common.format_hex(packet.encode())
             '00:00:00:0a:ff:ff:00:00:00:05:00:00:00:02'
 
+        """
+        return b"".join(self.encode_buffers())
+
+    def encode_buffers(self):
+        """
+        Encode packet data to the parts of a hsms packet, without joining them.
+
+        The parts can be written with a single ``sendmsg`` without copying the data.
+
+        :returns: length, header and data of the packet
+        :rtype: tuple of bytes
+
+        **Example**::
+
+            >>> import secsgem.hsms
+            >>>
+            >>> packet = secsgem.hsms.HsmsPacket(secsgem.hsms.HsmsLinktestReqHeader(2))
+            >>> packet.encode_buffers()
+            (b'\\x00\\x00\\x00\\n', b'\\xff\\xff\\x00\\x00\\x00\\x05\\x00\\x00\\x00\\x02', b'')
+
         """
         headerdata = self.header.encode()
 
         length = len(headerdata) + len(self.data)
 
-        return struct.pack(">L", length) + headerdata + self.data
+        return LENGTH.pack(length), headerdata, self.data
 
     @staticmethod
     def decode(text):
         """
         Decode byte array hsms packet to HsmsPacket object.
 
+        :param text: encoded packet including the length bytes
+        :type text: bytes-like object (bytes, bytearray or memoryview)
         :returns: received packet object
         :rtype: :class:`secsgem.hsms.HsmsPacket`
 
@@ -106,17 +136,33 @@ sType:0x05, system:0x00000002, requireResponse:False}), 'data': ''})
             HsmsPacket({'header': HsmsHeader({sessionID:0xffff, stream:00, function:00, pType:0x00, sType:0x05, \
 system:0x00000002, requireResponse:False}), 'data': ''})
         """
-        data_length = len(text) - 14
-        data_length_text = str(data_length) + "s"
+        header = HsmsHeader.decode(text, LENGTH.size)
+
+        if len(text) == LENGTH.size + HEADER.size:
+            return HsmsPacket(header)
+
+        # the data is copied once, the buffer of the text is usually reused for the next message
+        return HsmsPacket(header, bytes(memoryview(text)[LENGTH.size + HEADER.size:]))
+
+    @staticmethod
+    def decode_header(text):
+        """
+        Decode only the header of a byte array hsms packet.
+
+        The data isn't touched, e.g. to route a message before its data is decoded.
 
-        res = struct.unpack(">LHBBBBL" + data_length_text, text)
+        :param text: encoded packet including the length bytes
+        :type text: bytes-like object (bytes, bytearray or memoryview)
+        :returns: header of the packet
+        :rtype: :class:`secsgem.hsms.HsmsHeader`
 
-        result = HsmsPacket(HsmsHeader(res[6], res[1]))
-        result.header.requireResponse = (((res[2] & 0b10000000) >> 7) == 1)
-        result.header.stream = res[2] & 0b01111111
-        result.header.function = res[3]
-        result.header.pType = res[4]
-        result.header.sType = res[5]
-        result.data = res[7]
+        **Example**::
 
-        return result
+            >>> import secsgem.hsms
+            >>>
+            >>> packetData = b"\\x00\\x00\\x00\\x0c\\x00\\x00\\x81\\x01\\x00\\x00\\x00\\x00\\x00\\x03\\x01\\x00"
+            >>> secsgem.hsms.HsmsPacket.decode_header(packetData)
+            HsmsHeader({sessionID:0x0000, stream:01, function:01, pType:0x00, sType:0x00, system:0x00000003, \
+requireResponse:True})
+        """
+        return HsmsHeader.decode(text, LENGTH.size)
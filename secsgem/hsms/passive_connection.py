@@ -18,11 +18,11 @@
 import select
 import socket
 import threading
-import time
 
 import secsgem.common
 
 from .connection import HsmsConnection
+from .lifecycle import HsmsConnectionLifecycle
 
 
 class HsmsPassiveConnection(HsmsConnection):  # pragma: no cover
@@ -60,7 +60,7 @@ class HsmsPassiveConnection(HsmsConnection):  # pragma: no cover
 
         # reconnect thread required for passive connection
         self.serverThread = None
-        self.stopServerThread = False
+        self._stopServerEvent = threading.Event()
         self.serverSock = None
 
     def _on_hsms_connection_close(self, data):
@@ -99,19 +99,19 @@ class HsmsPassiveConnection(HsmsConnection):  # pragma: no cover
 
             # stop connection thread if it is running
             if self.serverThread and self.serverThread.is_alive():
-                self.stopServerThread = True
+                self._stopServerEvent.set()
 
                 if self.serverSock:
                     self.serverSock.close()
 
                 # wait for connection thread to stop
-                while self.stopServerThread:
-                    time.sleep(0.2)
+                self._join_thread(self.serverThread)
 
             # disconnect super class
             self.disconnect()
 
     def __start_server_thread(self):
+        self._stopServerEvent.clear()
         self.serverThread = threading.Thread(target=self.__server_thread,
                                              name=f"secsgem_HsmsPassiveConnection_serverThread_{self.remoteAddress}")
         self.serverThread.start()
@@ -130,7 +130,9 @@ class HsmsPassiveConnection(HsmsConnection):  # pragma: no cover
         self.serverSock.bind((self._bind_ip, self.remotePort))
         self.serverSock.listen(1)
 
-        while not self.stopServerThread:
+        self.lifecycle.enter(HsmsConnectionLifecycle.CONNECTING)
+
+        while not self._stopServerEvent.is_set():
             try:
                 select_result = select.select([self.serverSock], [], [], self.select_timeout)
             except Exception:  # pylint: disable=broad-except
@@ -140,14 +142,19 @@ class HsmsPassiveConnection(HsmsConnection):  # pragma: no cover
                 # select timed out
                 continue
 
-            accept_result = self.serverSock.accept()
+            try:
+                accept_result = self.serverSock.accept()
+            except OSError:
+                # server socket closed by disable
+                continue
+
             if accept_result is None:
                 continue
 
             (self.sock, (_, _)) = accept_result
 
             # setup socket
-            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            self._setup_socket()
 
             # make socket nonblocking
             self.sock.setblocking(0)
@@ -159,4 +166,4 @@ class HsmsPassiveConnection(HsmsConnection):  # pragma: no cover
 
             return
 
-        self.stopServerThread = False
+        self.lifecycle.enter(HsmsConnectionLifecycle.NOT_CONNECTED)
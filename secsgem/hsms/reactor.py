@@ -0,0 +1,306 @@
+#####################################################################
+# reactor.py
+#
+# (c) Copyright 2021, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Single threaded I/O multiplexer for hsms sockets."""
+
+import logging
+import selectors
+import socket
+import threading
+
+import secsgem.common
+
+
+class HsmsReactor:
+    """
+    I/O loop serving many sockets from one thread.
+
+    Sockets are watched with :class:`selectors.DefaultSelector` (epoll on linux).
+    Read and write callbacks run in the I/O thread and must not block.
+    Work that may block is passed to a fixed size worker pool with :meth:`dispatch`,
+    work items for the same key are executed in order.
+
+    **Example**::
+
+        >>> import secsgem.hsms.reactor
+        >>>
+        >>> reactor = secsgem.hsms.reactor.HsmsReactor(workers=2)
+        >>> reactor.start()
+        >>> done = threading.Event()
+        >>> reactor.dispatch("key", done.set)
+        >>> done.wait(1)
+        True
+        >>> reactor.stop()
+    """
+
+    def __init__(self, name="secsgem_hsmsReactor", workers=4):
+        """
+        Initialize a reactor.
+
+        :param name: name of the I/O thread, also used as prefix for the worker threads
+        :type name: string
+        :param workers: number of threads handling dispatched work
+        :type workers: integer
+        """
+        self.logger = logging.getLogger(self.__module__ + "." + self.__class__.__name__)
+
+        self.name = name
+        self.workers = workers
+
+        self._selector = None
+        self._wakeupReceiveSock = None
+        self._wakeupSendSock = None
+
+        self._dispatcher = None
+        self._thread = None
+        self._running = False
+
+        self._lock = threading.Lock()
+        self._pending = []
+
+    @property
+    def running(self):
+        """Check if the I/O thread is running."""
+        return self._running
+
+    def start(self):
+        """Start the I/O thread and the workers."""
+        if self._running:
+            return
+
+        self._selector = selectors.DefaultSelector()
+
+        self._wakeupReceiveSock, self._wakeupSendSock = socket.socketpair()
+        self._wakeupReceiveSock.setblocking(0)
+        self._wakeupSendSock.setblocking(0)
+        self._selector.register(self._wakeupReceiveSock, selectors.EVENT_READ, None)
+
+        self._dispatcher = secsgem.common.Dispatcher(f"{self.name}_worker", self.workers)
+
+        self._running = True
+
+        self._thread = threading.Thread(target=self._run, name=self.name)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop the I/O thread and the workers.
+
+        Already dispatched work is executed before the workers are stopped.
+        """
+        if not self._running:
+            return
+
+        self.call_soon(self._stop)
+
+        if threading.current_thread() is not self._thread:
+            self._thread.join()
+
+        self._dispatcher.shutdown(wait=not self.in_worker())
+
+    def in_worker(self):
+        """
+        Check if the current thread is one of the workers.
+
+        :returns: True if called from a worker thread
+        :rtype: boolean
+        """
+        return threading.current_thread().name.startswith(f"{self.name}_worker")
+
+    def in_io_thread(self):
+        """
+        Check if the current thread is the I/O thread.
+
+        :returns: True if called from the I/O thread
+        :rtype: boolean
+        """
+        return threading.current_thread() is self._thread
+
+    def call_soon(self, callback, *args):
+        """
+        Run a callback in the I/O thread.
+
+        :param callback: function to call
+        :type callback: callable
+        """
+        with self._lock:
+            inline = threading.current_thread() is self._thread or not self._running
+
+            if not inline:
+                self._pending.append((callback, args))
+
+        if inline:
+            callback(*args)
+            return
+
+        try:
+            self._wakeupSendSock.send(b"\x00")
+        except OSError:
+            # wakeup buffer full, the I/O thread will wake up anyway
+            pass
+
+    def add_reader(self, sock, callback):
+        """
+        Start watching a socket for incoming data.
+
+        :param sock: socket to watch
+        :type sock: :class:`socket.socket`
+        :param callback: function called in the I/O thread when the socket is readable
+        :type callback: callable
+        """
+        self.call_soon(self._set_callback, sock, selectors.EVENT_READ, callback)
+
+    def remove_reader(self, sock):
+        """
+        Stop watching a socket for incoming data and wait until it was removed.
+
+        :param sock: socket to remove
+        :type sock: :class:`socket.socket`
+        :returns: False if the socket wasn't watched for incoming data
+        :rtype: boolean
+        """
+        return self._call_and_wait(self._set_callback, sock, selectors.EVENT_READ, None)
+
+    def add_writer(self, sock, callback):
+        """
+        Start watching a socket for free space in its send buffer.
+
+        :param sock: socket to watch
+        :type sock: :class:`socket.socket`
+        :param callback: function called in the I/O thread when the socket is writable
+        :type callback: callable
+        """
+        self.call_soon(self._set_callback, sock, selectors.EVENT_WRITE, callback)
+
+    def remove_writer(self, sock):
+        """
+        Stop watching a socket for free space and wait until it was removed.
+
+        :param sock: socket to remove
+        :type sock: :class:`socket.socket`
+        :returns: False if the socket wasn't watched for free space
+        :rtype: boolean
+        """
+        return self._call_and_wait(self._set_callback, sock, selectors.EVENT_WRITE, None)
+
+    def _call_and_wait(self, callback, *args):
+        result = []
+        done = threading.Event()
+
+        def call():
+            try:
+                result.append(callback(*args))
+            finally:
+                done.set()
+
+        self.call_soon(call)
+        done.wait()
+
+        return result[0] if result else None
+
+    def _set_callback(self, sock, event, callback):
+        # called in the I/O thread, returns True if the socket had a callback for the event
+        if self._selector is None or self._selector.get_map() is None:
+            return False
+
+        try:
+            key = self._selector.get_key(sock)
+        except (KeyError, ValueError):
+            key = None
+
+        callbacks = dict(key.data) if key is not None else {}
+        previous = callbacks.pop(event, None)
+
+        if callback is not None:
+            callbacks[event] = callback
+
+        events = 0
+        for watched in callbacks:
+            events |= watched
+
+        if key is None:
+            if callbacks:
+                self._selector.register(sock, events, callbacks)
+        elif callbacks:
+            self._selector.modify(sock, events, callbacks)
+        else:
+            self._selector.unregister(sock)
+
+        return previous is not None
+
+    def dispatch(self, key, callback, *args):
+        """
+        Run a callback in the worker pool.
+
+        Callbacks dispatched with the same key are executed one after another in the order they were dispatched.
+
+        :param key: key defining the order, usually the connection
+        :param callback: function to call
+        :type callback: callable
+        """
+        self._dispatcher.dispatch(key, callback, *args)
+
+    def _stop(self):
+        with self._lock:
+            self._running = False
+
+    def _run_pending(self):
+        with self._lock:
+            pending = self._pending
+            self._pending = []
+
+        for callback, args in pending:
+            try:
+                callback(*args)
+            except Exception:  # pylint: disable=broad-except
+                self.logger.exception('ignoring exception in reactor callback')
+
+    def _run(self):
+        """
+        Thread running the I/O loop.
+
+        .. warning:: Do not call this directly, used internally.
+        """
+        while self._running:
+            for key, events in self._selector.select():
+                if key.data is None:
+                    try:
+                        while self._wakeupReceiveSock.recv(4096):
+                            pass
+                    except OSError:
+                        pass
+                    continue
+
+                for event, callback in key.data.items():
+                    if not events & event:
+                        continue
+
+                    # skip callbacks removed by a previous callback
+                    current = self._selector.get_map().get(key.fd)
+                    if current is None or current.data is None or current.data.get(event) is not callback:
+                        continue
+
+                    try:
+                        callback()
+                    except Exception:  # pylint: disable=broad-except
+                        self.logger.exception('ignoring exception in socket callback')
+
+            self._run_pending()
+
+        self._run_pending()
+
+        self._selector.close()
+        self._wakeupReceiveSock.close()
+        self._wakeupSendSock.close()
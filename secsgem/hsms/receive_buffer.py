@@ -0,0 +1,186 @@
+#####################################################################
+# receive_buffer.py
+#
+# (c) Copyright 2021, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Receive buffer for hsms connections."""
+
+import struct
+
+HSMS_LENGTH = struct.Struct(">L")
+"""Length prefix in front of every hsms message."""
+
+HSMS_HEADER_LENGTH = 10
+"""Number of bytes in the hsms header."""
+
+
+class HsmsReceiveBuffer:
+    """
+    Growable buffer for incoming hsms data.
+
+    Data is received directly into a bytearray, allocated with the initial size on first use.
+    Complete messages are handed out as memoryview slices, so a message is never copied while it is received.
+    The buffer only grows if a single message doesn't fit and never beyond the maximum message size.
+
+    **Example**::
+
+        >>> import secsgem.hsms.receive_buffer
+        >>>
+        >>> buffer = secsgem.hsms.receive_buffer.HsmsReceiveBuffer()
+        >>> buffer.append(b"\\x00\\x00\\x00\\x0a\\xff\\xff\\x00\\x00\\x00\\x05\\x00\\x00\\x00\\x02")
+        >>> [bytes(message) for message in buffer.messages()]
+        [b'\\x00\\x00\\x00\\n\\xff\\xff\\x00\\x00\\x00\\x05\\x00\\x00\\x00\\x02']
+    """
+
+    def __init__(self, initial_size=64 * 1024, max_message_size=64 * 1024 * 1024):
+        """
+        Initialize a receive buffer.
+
+        :param initial_size: number of bytes allocated for the buffer when data is received the first time
+        :type initial_size: integer
+        :param max_message_size: maximum accepted length of a message (header and data, without length bytes)
+        :type max_message_size: integer
+        """
+        # allocated on first use, handlers that never connect don't hold a buffer
+        self._buffer = bytearray()
+        self._initial_size = initial_size
+        self._start = 0
+        self._end = 0
+
+        # number of bytes missing for the message at the start of the buffer, if its length is known
+        self._missing = 0
+
+        self.max_message_size = max_message_size
+
+    def __len__(self):
+        """Get the number of bytes available in the buffer."""
+        return self._end - self._start
+
+    @property
+    def capacity(self):
+        """Get the currently allocated size of the buffer."""
+        return len(self._buffer)
+
+    def clear(self):
+        """Drop all data from the buffer."""
+        self._start = 0
+        self._end = 0
+        self._missing = 0
+
+    def recv_from(self, sock, size):
+        """
+        Receive data from a socket directly into the buffer.
+
+        At least size bytes are reserved, but all free space in the buffer is filled if the socket has the data.
+        If the rest of a pending message is smaller, only the space for the message is reserved.
+
+        :param sock: socket to receive from
+        :type sock: :class:`socket.socket`
+        :param size: minimum number of bytes to reserve for receiving
+        :type size: integer
+        :returns: number of bytes received, 0 if the socket was closed
+        :rtype: integer
+        """
+        if 0 < self._missing < size:
+            size = self._missing
+
+        self._reserve(size)
+
+        received = sock.recv_into(memoryview(self._buffer)[self._end:])
+        self._end += received
+        self._missing = max(self._missing - received, 0)
+
+        return received
+
+    def append(self, data):
+        """
+        Add data to the buffer.
+
+        :param data: data to add
+        :type data: bytes-like object
+        """
+        length = len(data)
+
+        self._reserve(length)
+
+        self._buffer[self._end:self._end + length] = data
+        self._end += length
+        self._missing = max(self._missing - length, 0)
+
+    def messages(self):
+        """
+        Iterate all complete messages in the buffer.
+
+        Every message is a memoryview of the buffer containing the length bytes, header and data.
+        The view is released when the next message is requested, so it must not be kept by the caller.
+
+        :raises ValueError: if a length prefix is invalid or exceeds the maximum message size
+        :returns: generator of messages
+        :rtype: generator of memoryview
+        """
+        while True:
+            available = self._end - self._start
+
+            if available < HSMS_LENGTH.size:
+                break
+
+            length = HSMS_LENGTH.unpack_from(self._buffer, self._start)[0]
+
+            if length < HSMS_HEADER_LENGTH:
+                raise ValueError(f"Invalid hsms message length {length}")
+
+            if length > self.max_message_size:
+                raise ValueError(f"Hsms message length {length} exceeds maximum message size {self.max_message_size}")
+
+            message_length = length + HSMS_LENGTH.size
+
+            if available < message_length:
+                # make room for the complete message, so the rest can be received without moving data again
+                self._missing = message_length - available
+                self._reserve(self._missing)
+                break
+
+            message_start = self._start
+            self._start += message_length
+
+            with memoryview(self._buffer)[message_start:self._start] as message:
+                yield message
+
+        if self._start == self._end:
+            self.clear()
+
+    def _reserve(self, size):
+        """
+        Make sure the number of bytes is free at the end of the buffer.
+
+        :param size: number of bytes required
+        :type size: integer
+        """
+        if len(self._buffer) - self._end >= size:
+            return
+
+        used = self._end - self._start
+
+        # move pending data to the front
+        if self._start > 0:
+            self._buffer[:used] = self._buffer[self._start:self._end]
+            self._start = 0
+            self._end = used
+
+            if len(self._buffer) - self._end >= size:
+                return
+
+        # grow the buffer
+        new_size = max(used + size, self._initial_size,
+                       min(len(self._buffer) * 2, self.max_message_size + HSMS_LENGTH.size))
+        self._buffer.extend(bytes(new_size - len(self._buffer)))
@@ -25,6 +25,8 @@ class HsmsRejectReqHeader(HsmsHeader):
     Header for message with SType 7.
     """
 
+    __slots__ = ()
+
     def __init__(self, system, s_type, reason):
         """
         Initialize a hsms reject request.
@@ -25,6 +25,8 @@ class HsmsSelectReqHeader(HsmsHeader):
     Header for message with SType 1.
     """
 
+    __slots__ = ()
+
     def __init__(self, system):
         """
         Initialize a hsms select request.
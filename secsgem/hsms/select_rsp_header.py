@@ -25,6 +25,8 @@ class HsmsSelectRspHeader(HsmsHeader):
     Header for message with SType 2.
     """
 
+    __slots__ = ()
+
     def __init__(self, system):
         """
         Initialize a hsms select response.
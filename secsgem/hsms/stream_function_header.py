@@ -25,6 +25,8 @@ class HsmsStreamFunctionHeader(HsmsHeader):
     Header for message with SType 0.
     """
 
+    __slots__ = ()
+
     def __init__(self, system, stream, function, require_response, session_id):
         """
         Initialize a stream function secs header.
@@ -0,0 +1,218 @@
+#####################################################################
+# trace.py
+#
+# (c) Copyright 2021, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""
+Binary trace of the hsms communication.
+
+The trace file starts with :data:`TRACE_MAGIC`, followed by one record per packet.
+A record contains the timestamp as big-endian double, the direction character ("<" received, ">" sent)
+and the encoded packet including its length bytes.
+
+Trace files can be rendered as text with::
+
+    python -m secsgem.hsms.trace communication.trace
+"""
+
+import argparse
+import datetime
+import struct
+import sys
+import threading
+import time
+
+from .connection import HSMS_STYPES
+from .packet import HsmsPacket
+
+TRACE_MAGIC = b"SECSGEMTRACE\x01"
+""" Start of a trace file ."""
+
+RECORD_HEADER = struct.Struct(">dcL")
+""" Timestamp, direction and packet length of a record ."""
+
+
+class HsmsTraceWriter:
+    """
+    Writer for binary trace files.
+
+    Packets are written without decoding or formatting them.
+    The writer can be used from multiple threads.
+
+    **Example**::
+
+        >>> import os
+        >>> import tempfile
+        >>> import secsgem.hsms
+        >>> import secsgem.hsms.trace
+        >>>
+        >>> path = os.path.join(tempfile.mkdtemp(), "communication.trace")
+        >>> with secsgem.hsms.trace.HsmsTraceWriter(path) as trace:
+        ...     trace.write(">", secsgem.hsms.HsmsPacket(secsgem.hsms.HsmsLinktestReqHeader(2)), 1.5)
+        >>> [(timestamp, direction, packet.header.sType)
+        ...  for timestamp, direction, packet in secsgem.hsms.trace.HsmsTraceReader(path)]
+        [(1.5, '>', 5)]
+    """
+
+    def __init__(self, path):
+        """
+        Initialize a trace writer.
+
+        Packets are appended, if the file exists already.
+
+        :param path: path of the trace file
+        :type path: string
+        """
+        self.path = path
+
+        self._lock = threading.Lock()
+        self._file = open(path, "ab")  # pylint: disable=consider-using-with
+
+        if self._file.tell() == 0:
+            self._file.write(TRACE_MAGIC)
+
+    def __enter__(self):
+        """Enter the context, the writer is returned."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Leave the context and close the file."""
+        self.close()
+
+    def write(self, direction, packet, timestamp=None):
+        """
+        Write a packet to the trace.
+
+        :param direction: "<" for received and ">" for sent packets
+        :type direction: string
+        :param packet: packet to write
+        :type packet: :class:`secsgem.hsms.HsmsPacket`
+        :param timestamp: time of the packet, current time if not set
+        :type timestamp: float
+        """
+        if timestamp is None:
+            timestamp = time.time()
+
+        header = packet.header.encode()
+
+        record = RECORD_HEADER.pack(timestamp, direction.encode("ascii"), len(header) + len(packet.data))
+
+        with self._lock:
+            self._file.write(record)
+            self._file.write(header)
+            self._file.write(packet.data)
+
+    def flush(self):
+        """Write the buffered records to the file."""
+        with self._lock:
+            self._file.flush()
+
+    def close(self):
+        """Close the trace file."""
+        with self._lock:
+            self._file.close()
+
+
+class HsmsTraceReader:
+    """Reader for binary trace files, iterating (timestamp, direction, packet) tuples."""
+
+    def __init__(self, path):
+        """
+        Initialize a trace reader.
+
+        :param path: path of the trace file
+        :type path: string
+        """
+        self.path = path
+
+    def __iter__(self):
+        """Get an iterator over the records."""
+        with open(self.path, "rb") as trace_file:
+            if trace_file.read(len(TRACE_MAGIC)) != TRACE_MAGIC:
+                raise ValueError(f"{self.path} is not a trace file")
+
+            while True:
+                record = trace_file.read(RECORD_HEADER.size)
+                if len(record) < RECORD_HEADER.size:
+                    return
+
+                timestamp, direction, length = RECORD_HEADER.unpack(record)
+
+                data = trace_file.read(length)
+                if len(data) < length:
+                    return
+
+                yield timestamp, direction.decode("ascii"), HsmsPacket.decode(record[-4:] + data)
+
+
+def format_record(timestamp, direction, packet, streams_functions=None):
+    """
+    Format a trace record like the communication log.
+
+    :param timestamp: time of the packet
+    :type timestamp: float
+    :param direction: "<" for received and ">" for sent packets
+    :type direction: string
+    :param packet: packet to format
+    :type packet: :class:`secsgem.hsms.HsmsPacket`
+    :param streams_functions: stream/function classes to decode data messages, by stream and function
+    :type streams_functions: dict
+    :returns: formatted record
+    :rtype: string
+    """
+    time_text = datetime.datetime.fromtimestamp(timestamp).isoformat(sep=" ", timespec="microseconds")
+
+    if packet.header.sType > 0:
+        return f"{time_text} {direction} {packet}\n  {HSMS_STYPES[packet.header.sType]}"
+
+    function_class = None
+    if streams_functions is not None:
+        function_class = streams_functions.get(packet.header.stream, {}).get(packet.header.function)
+
+    if function_class is None:
+        return f"{time_text} {direction} {packet}\n  {packet.data.hex()}"
+
+    function = function_class()
+    function.decode(packet.data)
+
+    return f"{time_text} {direction} {packet}\n{function}"
+
+
+def main(argv=None):
+    """
+    Print a trace file as text.
+
+    :param argv: command line arguments
+    :type argv: list
+    :returns: exit code
+    :rtype: integer
+    """
+    parser = argparse.ArgumentParser(prog="python -m secsgem.hsms.trace",
+                                     description="Print a secsgem communication trace as text.")
+    parser.add_argument("path", help="trace file to print")
+    parser.add_argument("--raw", action="store_true", help="don't decode the stream/function data")
+    args = parser.parse_args(argv)
+
+    streams_functions = None
+    if not args.raw:
+        import secsgem.secs.functions  # pylint: disable=import-outside-toplevel
+        streams_functions = secsgem.secs.functions.secs_streams_functions
+
+    for timestamp, direction, packet in HsmsTraceReader(args.path):
+        print(format_record(timestamp, direction, packet, streams_functions))
+
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
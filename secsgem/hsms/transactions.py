@@ -0,0 +1,347 @@
+#####################################################################
+# transactions.py
+#
+# (c) Copyright 2021, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Correlation of responses to outstanding requests by system bytes."""
+
+import concurrent.futures
+import random
+import threading
+import time
+
+import secsgem.common
+
+
+class HsmsTransaction:
+    """
+    Outstanding request waiting for its response.
+
+    The transaction is a lightweight future, the waiting thread blocks on a single lock,
+    which is released when the response is received or the transaction is cancelled.
+    """
+
+    __slots__ = ("system", "created", "timeout", "response", "callback", "timer", "_done", "_finisher", "_waiter")
+
+    def __init__(self, system, timeout=None, callback=None):
+        """
+        Initialize a transaction.
+
+        :param system: system bytes of the request
+        :type system: integer
+        :param timeout: time to wait for the response in seconds, None to wait forever
+        :type timeout: float
+        :param callback: function called with the transaction, when it is finished
+        :type callback: callable
+        """
+        self.system = system
+        self.created = time.monotonic()
+        self.timeout = timeout
+        self.response = None
+        self.callback = callback
+
+        # timer cancelling the transaction when it expires, see HsmsTransactionTable.allocate
+        self.timer = None
+
+        self._done = False
+
+        # taken once by the first response or cancel, later ones don't wait for it
+        self._finisher = threading.Lock()
+
+        self._waiter = threading.Lock()
+        self._waiter.acquire()  # pylint: disable=consider-using-with
+
+    def __repr__(self):
+        """Generate textual representation for an object of this class."""
+        return f"{self.__class__.__name__} {{'system': {self.system}, 'age': {self.age:.3f}, " \
+               f"'done': {self.done}, 'expired': {self.expired}}}"
+
+    @property
+    def age(self):
+        """Get the time in seconds since the transaction was started."""
+        return time.monotonic() - self.created
+
+    @property
+    def expires(self):
+        """Get the monotonic time the transaction expires, None if it doesn't expire."""
+        if self.timeout is None:
+            return None
+
+        return self.created + self.timeout
+
+    @property
+    def expired(self):
+        """Check if the transaction timed out without a response."""
+        return not self.done and self.timeout is not None and self.age > self.timeout
+
+    @property
+    def done(self):
+        """Check if the response was received or the transaction was cancelled."""
+        return self._done
+
+    def set_response(self, packet):
+        """
+        Pass the response to the waiting thread.
+
+        Only the first response is accepted.
+
+        :param packet: received response
+        :type packet: :class:`secsgem.hsms.HsmsPacket`
+        :returns: False if the transaction was finished already
+        :rtype: boolean
+        """
+        return self._finish(packet)
+
+    def cancel(self):
+        """
+        Stop waiting for the response, the waiting thread receives None.
+
+        :returns: False if the transaction was finished already
+        :rtype: boolean
+        """
+        return self._finish(None)
+
+    def _finish(self, response):
+        if not self._finisher.acquire(blocking=False):  # pylint: disable=consider-using-with
+            return False
+
+        self.response = response
+        self._done = True
+
+        self._waiter.release()
+
+        if self.timer is not None:
+            self.timer.cancel()
+
+        if self.callback is not None:
+            self.callback(self)
+
+        return True
+
+    def wait(self, timeout=None):
+        """
+        Wait for the response.
+
+        :param timeout: time to wait in seconds, None to wait until the transaction expires
+        :type timeout: float
+        :returns: received response, None if it timed out
+        :rtype: :class:`secsgem.hsms.HsmsPacket`
+        """
+        if timeout is None and self.timeout is not None:
+            timeout = max(self.expires - time.monotonic(), 0)
+
+        if not self._waiter.acquire(timeout=-1 if timeout is None else timeout):  # pylint: disable=R1732
+            return None
+
+        # leave the lock released for other waiters
+        self._waiter.release()
+
+        return self.response
+
+
+class HsmsTransactionTable:
+    """
+    Outstanding transactions of a connection, by system bytes.
+
+    System bytes are allocated atomically and never reused while a transaction with the same system bytes is in flight,
+    so multiple threads can send requests concurrently.
+    Looking up a transaction for a received packet doesn't lock.
+
+    Transactions with a callback are cancelled by a timer of the :class:`secsgem.common.TimerWheel`, when they expire.
+
+    **Example**::
+
+        >>> import secsgem.hsms
+        >>>
+        >>> table = secsgem.hsms.HsmsTransactionTable(41)
+        >>> transaction = table.allocate(10)
+        >>> transaction.system
+        42
+        >>> table.complete(secsgem.hsms.HsmsPacket(secsgem.hsms.HsmsLinktestRspHeader(42)))
+        True
+        >>> transaction.wait().header.sType
+        6
+        >>> table.remove(42)
+        >>> len(table)
+        0
+    """
+
+    MAX_SYSTEM = (2 ** 32) - 1
+    """ Highest system bytes value, allocation wraps to 0 after it ."""
+
+    def __init__(self, counter=None, timers=None):
+        """
+        Initialize a transaction table.
+
+        :param counter: last allocated system bytes, random if not set
+        :type counter: integer
+        :param timers: timer wheel for the expiry of transactions with a callback, the shared wheel if not set
+        :type timers: :class:`secsgem.common.TimerWheel`
+        """
+        self.counter = random.randint(0, self.MAX_SYSTEM) if counter is None else counter
+        self.timers = secsgem.common.TimerWheel.get_default() if timers is None else timers
+
+        self._lock = threading.Lock()
+        self._transactions = {}
+
+    def __repr__(self):
+        """Generate textual representation for an object of this class."""
+        return f"{self.__class__.__name__} {self.in_flight()}"
+
+    def __len__(self):
+        """Get the number of transactions in flight."""
+        return len(self._transactions)
+
+    def __contains__(self, system):
+        """Check if a transaction with the system bytes is in flight."""
+        return system in self._transactions
+
+    def _next(self):
+        self.counter += 1
+
+        if self.counter > self.MAX_SYSTEM:
+            self.counter = 0
+
+        return self.counter
+
+    def next_system(self):
+        """
+        Allocate system bytes for a message not waiting for a response.
+
+        :returns: system bytes
+        :rtype: integer
+        """
+        with self._lock:
+            return self._next()
+
+    def allocate(self, timeout=None, callback=None):
+        """
+        Allocate system bytes and register a transaction waiting for their response.
+
+        The transaction must be removed with :meth:`remove` after the response was handled.
+
+        If a callback is passed, it is called with the transaction when the response is received,
+        or the transaction is cancelled, either explicitly or because it expired.
+
+        :param timeout: time to wait for the response in seconds, None to wait forever
+        :type timeout: float
+        :param callback: function called with the transaction, when it is finished
+        :type callback: callable
+        :returns: new transaction
+        :rtype: :class:`secsgem.hsms.HsmsTransaction`
+        """
+        with self._lock:
+            system = self._next()
+            while system in self._transactions:
+                system = self._next()
+
+            transaction = HsmsTransaction(system, timeout, callback)
+            self._transactions[system] = transaction
+
+        if callback is not None and timeout is not None:
+            transaction.timer = self.timers.schedule(timeout, transaction.cancel)
+
+        return transaction
+
+    def get(self, system):
+        """
+        Get the transaction in flight for system bytes.
+
+        :param system: system bytes
+        :type system: integer
+        :returns: transaction, None if no transaction is waiting for the system bytes
+        :rtype: :class:`secsgem.hsms.HsmsTransaction`
+        """
+        return self._transactions.get(system)
+
+    def complete(self, packet):
+        """
+        Pass a received packet to the transaction waiting for its system bytes.
+
+        :param packet: received packet
+        :type packet: :class:`secsgem.hsms.HsmsPacket`
+        :returns: True if a transaction was waiting for the packet
+        :rtype: boolean
+        """
+        transaction = self._transactions.get(packet.header.system)
+        if transaction is None:
+            return False
+
+        transaction.set_response(packet)
+        return True
+
+    def remove(self, system):
+        """
+        Remove the transaction for system bytes.
+
+        :param system: system bytes
+        :type system: integer
+        """
+        self._transactions.pop(system, None)
+
+    def in_flight(self):
+        """
+        Get the transactions in flight, oldest first.
+
+        :returns: transactions
+        :rtype: list of :class:`secsgem.hsms.HsmsTransaction`
+        """
+        return sorted(list(self._transactions.values()), key=lambda transaction: transaction.created)
+
+    def expired(self):
+        """
+        Get the transactions, which timed out without response and weren't removed yet.
+
+        :returns: transactions
+        :rtype: list of :class:`secsgem.hsms.HsmsTransaction`
+        """
+        return [transaction for transaction in self.in_flight() if transaction.expired]
+
+
+def gather(futures, timeout=None):
+    """
+    Wait for the results of multiple requests.
+
+    Requests not finished within the timeout are cancelled, which releases their system bytes.
+
+    **Example**::
+
+        >>> import concurrent.futures
+        >>> import secsgem.hsms
+        >>>
+        >>> finished = concurrent.futures.Future()
+        >>> finished.set_result("response")
+        >>> secsgem.hsms.gather([finished, concurrent.futures.Future()], 0.01)
+        ['response', None]
+
+    :param futures: futures of the requests, e.g. from :meth:`secsgem.hsms.HsmsHandler.send_request`
+    :type futures: list of :class:`concurrent.futures.Future`
+    :param timeout: time to wait for all results in seconds, None to wait until all requests are finished
+    :type timeout: float
+    :returns: results in the order of the futures, None for cancelled requests
+    :rtype: list
+    """
+    futures = list(futures)
+
+    concurrent.futures.wait(futures, timeout)
+
+    results = []
+    for future in futures:
+        future.cancel()
+
+        if future.cancelled():
+            results.append(None)
+        else:
+            results.append(future.result())
+
+    return results
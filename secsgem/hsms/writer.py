@@ -0,0 +1,482 @@
+#####################################################################
+# writer.py
+#
+# (c) Copyright 2021, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Writing of outbound packets to the socket of a connection."""
+
+import collections
+import concurrent.futures
+import logging
+import select
+import threading
+import time
+
+import secsgem.common
+
+
+class HsmsWriter:
+    """
+    Writer thread for the socket of a connection.
+
+    Packets are queued by the sending threads and written one after another by the writer,
+    so the blocks of concurrently sent packets can't interleave on the wire.
+    The length, header and data of a packet are written with a single ``sendmsg`` without joining them.
+
+    Queued packets are written by priority: control messages (select, linktest, separate, ...) first,
+    then replies, then primary messages and finally bulk messages with more than ``bulk_size`` bytes of data.
+    A packet is always written completely, so a control message can't overtake a bulk message already being written.
+    Packets of the same priority are written in the order they were queued,
+    alternating between the sessions sharing the connection.
+    """
+
+    PRIORITY_CONTROL = 0
+    """ Priority of hsms control messages ."""
+
+    PRIORITY_REPLY = 1
+    """ Priority of reply data messages ."""
+
+    PRIORITY_PRIMARY = 2
+    """ Priority of primary data messages ."""
+
+    PRIORITY_BULK = 3
+    """ Priority of data messages with more than bulk_size bytes ."""
+
+    PRIORITY_NAMES = ("control", "reply", "primary", "bulk")
+    """ Names of the priorities in the metrics ."""
+
+    def __init__(self, sock, name, select_timeout=0.5, bulk_size=64 * 1024):
+        """
+        Initialize a writer.
+
+        :param sock: non-blocking socket to write to
+        :type sock: :class:`socket.socket`
+        :param name: name of the writer thread
+        :type name: string
+        :param select_timeout: time to wait for the socket to become writable before checking for stop
+        :type select_timeout: float
+        :param bulk_size: minimum data size of bulk messages in bytes
+        :type bulk_size: integer
+        """
+        self.logger = logging.getLogger(self.__module__ + "." + self.__class__.__name__)
+
+        self.sock = sock
+        self.select_timeout = select_timeout
+        self.bulk_size = bulk_size
+
+        self._lock = threading.Condition()
+
+        # queued packets by priority, each by session to alternate between the sessions
+        self._queues = [collections.OrderedDict() for _ in self.PRIORITY_NAMES]
+        self._depth = 0
+
+        self._stopping = False
+        self._failed = False
+
+        self._counters = [collections.Counter(written=0, wait=0.0, wait_max=0.0) for _ in self.PRIORITY_NAMES]
+
+        self._name = name
+        self._thread = None
+
+    def __repr__(self):
+        """Generate textual representation for an object of this class."""
+        return f"{self.__class__.__name__} {str(self.metrics)}"
+
+    @property
+    def running(self):
+        """Check if the writer accepts packets."""
+        return self._thread is not None and self._thread.is_alive() and not self._stopping
+
+    @property
+    def queue_depth(self):
+        """Get the number of packets waiting to be written."""
+        return self._depth
+
+    @property
+    def metrics(self):
+        """
+        Get the statistics of the writer by priority.
+
+        Wait time is the time in seconds from queueing a packet until the writer started writing it.
+
+        :returns: statistics
+        :rtype: dict
+        """
+        with self._lock:
+            metrics = {"queue_depth": self._depth}
+
+            for priority, name in enumerate(self.PRIORITY_NAMES):
+                counters = self._counters[priority]
+
+                metrics[name] = {
+                    "queued": sum(len(queue) for queue in self._queues[priority].values()),
+                    "written": counters["written"],
+                    "wait_time_avg": counters["wait"] / counters["written"] if counters["written"] else 0.0,
+                    "wait_time_max": counters["wait_max"],
+                }
+
+            return metrics
+
+    def get_priority(self, packet):
+        """
+        Get the priority of a packet.
+
+        :param packet: packet to be written
+        :type packet: :class:`secsgem.hsms.HsmsPacket`
+        :returns: priority of the packet, one of the PRIORITY constants
+        :rtype: integer
+        """
+        if packet.header.sType != 0x00:
+            return self.PRIORITY_CONTROL
+
+        if len(packet.data) > self.bulk_size:
+            return self.PRIORITY_BULK
+
+        if packet.header.function % 2 == 0:
+            return self.PRIORITY_REPLY
+
+        return self.PRIORITY_PRIMARY
+
+    def start(self):
+        """Start the writer thread."""
+        self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """
+        Stop the writer after the queued packets were written.
+
+        Packets submitted after stopping aren't written, their result is False.
+
+        :param timeout: maximum time to wait for the writer thread
+        :type timeout: float
+        """
+        with self._lock:
+            self._stopping = True
+            self._lock.notify()
+
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread() and thread.is_alive():
+            thread.join(timeout)
+
+        # fail packets not written because the writer didn't stop in time
+        with self._lock:
+            while self._depth:
+                self._pop()[1].set_result(False)
+
+    def submit(self, packet, priority=None):
+        """
+        Queue a packet for writing.
+
+        :param packet: packet to be written
+        :type packet: :class:`secsgem.hsms.HsmsPacket`
+        :param priority: priority of the packet, determined from the packet if not set
+        :type priority: integer
+        :returns: future with the result True if the packet was written, False if writing failed
+        :rtype: :class:`concurrent.futures.Future`
+        """
+        future = concurrent.futures.Future()
+
+        if priority is None:
+            priority = self.get_priority(packet)
+
+        buffers = packet.encode_buffers()
+
+        with self._lock:
+            if self._stopping:
+                future.set_result(False)
+                return future
+
+            queue = self._queues[priority].get(packet.header.sessionID)
+            if queue is None:
+                queue = self._queues[priority][packet.header.sessionID] = collections.deque()
+
+            queue.append((buffers, future, time.monotonic(), priority))
+            self._depth += 1
+
+            self._lock.notify()
+
+        return future
+
+    def _pop(self):
+        # called with the lock held
+        for queues in self._queues:
+            if not queues:
+                continue
+
+            session, queue = next(iter(queues.items()))
+            item = queue.popleft()
+
+            # next packet of this priority is taken from the next session
+            if queue:
+                queues.move_to_end(session)
+            else:
+                del queues[session]
+
+            self._depth -= 1
+            return item
+
+        return None
+
+    def _take(self):
+        # called with the lock held, get the next packet to write and count its wait time
+        item = self._pop()
+
+        if item is not None:
+            _, _, queued, priority = item
+            wait = time.monotonic() - queued
+
+            counters = self._counters[priority]
+            counters["written"] += 1
+            counters["wait"] += wait
+            counters["wait_max"] = max(counters["wait_max"], wait)
+
+        return item
+
+    def _next(self):
+        with self._lock:
+            self._lock.wait_for(lambda: self._depth or self._stopping)
+
+            return self._take()
+
+    def _run(self):
+        while True:
+            item = self._next()
+            if item is None:
+                return
+
+            buffers, future, _, _ = item
+
+            if self._failed:
+                future.set_result(False)
+                continue
+
+            try:
+                result = self._write(buffers)
+            except Exception:  # pylint: disable=broad-except
+                self.logger.exception("writing packet failed")
+                result = False
+
+            if not result:
+                self._failed = True
+
+            future.set_result(result)
+
+    def _write(self, buffers):
+        """
+        Write the buffers of a packet completely.
+
+        :param buffers: length, header and data of the packet
+        :type buffers: tuple of bytes
+        :returns: False if the socket failed or the writer was stopped while the socket wasn't writable
+        :rtype: boolean
+        """
+        buffers = [memoryview(buffer) for buffer in buffers if buffer]
+
+        while True:
+            try:
+                if self._send(buffers):
+                    return True
+            except OSError:
+                return False
+
+            # wait until socket is writable
+            if not select.select([], [self.sock], [], self.select_timeout)[1] and self._stopping:
+                return False
+
+    def _send(self, buffers):
+        """
+        Write as much of the buffers as the socket accepts without waiting.
+
+        :param buffers: remaining parts of the packet, the written parts are removed
+        :type buffers: list of memoryview
+        :returns: True if the buffers were written completely, False if the socket isn't writable
+        :rtype: boolean
+        :raises OSError: the socket failed
+        """
+        while buffers:
+            try:
+                if hasattr(self.sock, "sendmsg"):
+                    sent = self.sock.sendmsg(buffers)
+                else:
+                    sent = self.sock.send(buffers[0])
+            except OSError as exc:
+                if not secsgem.common.is_errorcode_ewouldblock(exc.errno):
+                    raise
+
+                return False
+
+            # drop the written part, a partial write can end within any of the buffers
+            while sent:
+                if sent < len(buffers[0]):
+                    buffers[0] = buffers[0][sent:]
+                    break
+
+                sent -= len(buffers[0])
+                buffers.pop(0)
+
+        return True
+
+
+class HsmsReactorWriter(HsmsWriter):
+    """
+    Writer for a connection served by a :class:`secsgem.hsms.reactor.HsmsReactor`.
+
+    The packets are queued and ordered like in :class:`HsmsWriter`, but no thread is started for the connection.
+    The I/O thread of the reactor writes the queued packets as far as the socket accepts them.
+    If the send buffer of the socket is full, the socket is watched and writing continues when it is writable again.
+    """
+
+    def __init__(self, sock, reactor, bulk_size=64 * 1024):
+        """
+        Initialize a reactor writer.
+
+        :param sock: non-blocking socket to write to
+        :type sock: :class:`socket.socket`
+        :param reactor: reactor serving the socket
+        :type reactor: :class:`secsgem.hsms.reactor.HsmsReactor`
+        :param bulk_size: minimum data size of bulk messages in bytes
+        :type bulk_size: integer
+        """
+        HsmsWriter.__init__(self, sock, None, bulk_size=bulk_size)
+
+        self.reactor = reactor
+
+        # remaining buffers and future of the packet being written
+        self._current = None
+
+        # socket watched for free space, only used in the I/O thread
+        self._watching = False
+
+        self._started = False
+
+    @property
+    def running(self):
+        """Check if the writer accepts packets."""
+        return self._started and not self._stopping
+
+    def start(self):
+        """Start writing the queued packets from the I/O thread."""
+        self._started = True
+
+        self.reactor.call_soon(self._on_writable)
+
+    def stop(self, timeout=None):
+        """
+        Stop the writer after the queued packets were written.
+
+        Packets submitted after stopping aren't written, their result is False.
+
+        :param timeout: maximum time to wait for the queued packets
+        :type timeout: float
+        """
+        with self._lock:
+            self._stopping = True
+
+        if self._started:
+            self.reactor.call_soon(self._on_writable)
+
+            if not self.reactor.in_io_thread():
+                with self._lock:
+                    self._lock.wait_for(lambda: not self._depth and self._current is None, timeout)
+
+        with self._lock:
+            self._started = False
+
+        # the socket is closed after the writer stopped, runs after a write already started in the I/O thread
+        self.reactor.remove_writer(self.sock)
+
+        # fail packets not written because the socket didn't accept them in time
+        with self._lock:
+            if self._current is not None:
+                self._complete(self._current[1], False)
+                self._current = None
+
+            while self._depth:
+                self._pop()[1].set_result(False)
+
+    def submit(self, packet, priority=None):
+        """
+        Queue a packet for writing.
+
+        :param packet: packet to be written
+        :type packet: :class:`secsgem.hsms.HsmsPacket`
+        :param priority: priority of the packet, determined from the packet if not set
+        :type priority: integer
+        :returns: future with the result True if the packet was written, False if writing failed
+        :rtype: :class:`concurrent.futures.Future`
+        """
+        future = HsmsWriter.submit(self, packet, priority)
+
+        if self._started and not future.done():
+            self.reactor.call_soon(self._on_writable)
+
+        return future
+
+    @staticmethod
+    def _complete(future, result):
+        try:
+            future.set_result(result)
+        except concurrent.futures.InvalidStateError:
+            # already failed by stop
+            pass
+
+    def _on_writable(self):
+        """
+        Write the queued packets until the socket doesn't accept more data.
+
+        .. warning:: Do not call this directly, will be called from the I/O thread of the reactor.
+        """
+        while True:
+            with self._lock:
+                if not self._started:
+                    return
+
+                if self._current is None:
+                    item = self._take()
+
+                    if item is None:
+                        self._lock.notify_all()
+                        break
+
+                    buffers, future, _, _ = item
+
+                    if self._failed:
+                        future.set_result(False)
+                        continue
+
+                    self._current = ([memoryview(buffer) for buffer in buffers if buffer], future)
+
+                buffers, future = self._current
+
+            try:
+                written = self._send(buffers)
+            except OSError:
+                self._failed = True
+                written = None
+
+            if written is False:
+                if not self._watching:
+                    self._watching = True
+                    self.reactor.add_writer(self.sock, self._on_writable)
+
+                return
+
+            with self._lock:
+                self._current = None
+
+            self._complete(future, bool(written))
+
+        if self._watching:
+            self._watching = False
+            self.reactor.remove_writer(self.sock)
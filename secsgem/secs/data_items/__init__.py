@@ -13,115 +13,59 @@
 # MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
 # GNU Lesser General Public License for more details.
 #####################################################################
-"""Data items for functions."""
-from .base import DataItemBase
+"""
+Data items for functions.
 
-from .acka import ACKA
-from .ackc5 import ACKC5
-from .ackc6 import ACKC6
-from .ackc7 import ACKC7
-from .ackc10 import ACKC10
-from .alcd import ALCD
-from .aled import ALED
-from .alid import ALID
-from .altx import ALTX
-from .attrdata import ATTRDATA
-from .attrid import ATTRID
-from .attrreln import ATTRRELN
-from .bcequ import BCEQU
-from .binlt import BINLT
-from .ceed import CEED
-from .ceid import CEID
-from .colct import COLCT
-from .commack import COMMACK
-from .cpack import CPACK
-from .cpname import CPNAME
-from .cpval import CPVAL
-from .dataid import DATAID
-from .datalength import DATALENGTH
-from .datlc import DATLC
-from .drack import DRACK
-from .dsid import DSID
-from .dutms import DUTMS
-from .dvname import DVNAME
-from .dvval import DVVAL
-from .eac import EAC
-from .ecdef import ECDEF
-from .ecid import ECID
-from .ecmax import ECMAX
-from .ecmin import ECMIN
-from .ecname import ECNAME
-from .ecv import ECV
-from .edid import EDID
-from .erack import ERACK
-from .errcode import ERRCODE
-from .errtext import ERRTEXT
-from .exid import EXID
-from .exmessage import EXMESSAGE
-from .exrecvra import EXRECVRA
-from .extype import EXTYPE
-from .ffrot import FFROT
-from .fnloc import FNLOC
-from .grant5 import GRANT6
-from .grnt1 import GRNT1
-from .hcack import HCACK
-from .idtyp import IDTYP
-from .length import LENGTH
-from .lrack import LRACK
-from .maper import MAPER
-from .mapft import MAPFT
-from .mdack import MDACK
-from .mdln import MDLN
-from .mexp import MEXP
-from .mhead import MHEAD
-from .mid import MID
-from .mlcl import MLCL
-from .nulbc import NULBC
-from .objack import OBJACK
-from .objid import OBJID
-from .objspec import OBJSPEC
-from .objtype import OBJTYPE
-from .oflack import OFLACK
-from .onlack import ONLACK
-from .orloc import ORLOC
-from .ppbody import PPBODY
-from .ppgnt import PPGNT
-from .ppid import PPID
-from .praxi import PRAXI
-from .prdct import PRDCT
-from .rcmd import RCMD
-from .refp import REFP
-from .rowct import ROWCT
-from .rpsel import RPSEL
-from .rptid import RPTID
-from .rsinf import RSINF
-from .sdack import SDACK
-from .sdbin import SDBIN
-from .shead import SHEAD
-from .softrev import SOFTREV
-from .strp import STRP
-from .sv import SV
-from .svid import SVID
-from .svname import SVNAME
-from .text import TEXT
-from .tid import TID
-from .time import TIME
-from .timestamp import TIMESTAMP
-from .units import UNITS
-from .v import V
-from .vid import VID
-from .xdies import XDIES
-from .xypos import XYPOS
-from .ydies import YDIES
+The data item modules are loaded on first use of their class.
+"""
+import importlib
+
+_EXPORTS = {
+    "DataItemBase": "base", "ACKA": "acka", "ACKC5": "ackc5", "ACKC6": "ackc6", "ACKC7": "ackc7", "ACKC10": "ackc10",
+    "ALCD": "alcd", "ALED": "aled", "ALID": "alid", "ALTX": "altx", "ATTRDATA": "attrdata", "ATTRID": "attrid",
+    "ATTRRELN": "attrreln", "BCEQU": "bcequ", "BINLT": "binlt", "CEED": "ceed", "CEID": "ceid", "COLCT": "colct",
+    "COMMACK": "commack", "CPACK": "cpack", "CPNAME": "cpname", "CPVAL": "cpval", "DATAID": "dataid",
+    "DATALENGTH": "datalength", "DATLC": "datlc", "DRACK": "drack", "DSID": "dsid", "DUTMS": "dutms",
+    "DVNAME": "dvname", "DVVAL": "dvval", "EAC": "eac", "ECDEF": "ecdef", "ECID": "ecid", "ECMAX": "ecmax",
+    "ECMIN": "ecmin", "ECNAME": "ecname", "ECV": "ecv", "EDID": "edid", "ERACK": "erack", "ERRCODE": "errcode",
+    "ERRTEXT": "errtext", "EXID": "exid", "EXMESSAGE": "exmessage", "EXRECVRA": "exrecvra", "EXTYPE": "extype",
+    "FCNID": "fcnid", "FFROT": "ffrot", "FNLOC": "fnloc", "GRANT6": "grant5", "GRNT1": "grnt1", "HCACK": "hcack",
+    "IDTYP": "idtyp", "LENGTH": "length", "LRACK": "lrack", "MAPER": "maper", "MAPFT": "mapft", "MDACK": "mdack",
+    "MDLN": "mdln", "MEXP": "mexp", "MHEAD": "mhead", "MID": "mid", "MLCL": "mlcl", "NULBC": "nulbc",
+    "OBJACK": "objack", "OBJID": "objid", "OBJSPEC": "objspec", "OBJTYPE": "objtype", "OFLACK": "oflack",
+    "ONLACK": "onlack", "ORLOC": "orloc", "PPBODY": "ppbody", "PPGNT": "ppgnt", "PPID": "ppid", "PRAXI": "praxi",
+    "PRDCT": "prdct", "RCMD": "rcmd", "REFP": "refp", "ROWCT": "rowct", "RPSEL": "rpsel", "RPTID": "rptid",
+    "RSDA": "rsda", "RSDC": "rsdc", "RSINF": "rsinf", "RSPACK": "rspack", "SDACK": "sdack", "SDBIN": "sdbin",
+    "SHEAD": "shead", "SOFTREV": "softrev", "STRACK": "strack", "STRID": "strid", "STRP": "strp", "SV": "sv",
+    "SVID": "svid", "SVNAME": "svname", "TEXT": "text", "TID": "tid", "TIME": "time", "TIMESTAMP": "timestamp",
+    "UNITS": "units", "V": "v", "VID": "vid", "XDIES": "xdies", "XYPOS": "xypos", "YDIES": "ydies",
+}
+""" Module of each data item class ."""
 
 __all__ = [
     "DataItemBase", "ACKA", "ACKC5", "ACKC6", "ACKC7", "ACKC10", "ALCD", "ALED", "ALID", "ALTX", "ATTRDATA", "ATTRID",
     "ATTRRELN", "BCEQU", "BINLT", "CEED", "CEID", "COLCT", "COMMACK", "CPACK", "CPNAME", "CPVAL", "DATAID",
     "DATALENGTH", "DATLC", "DRACK", "DSID", "DUTMS", "DVNAME", "DVVAL", "EAC", "ECDEF", "ECID", "ECMAX", "ECMIN",
-    "ECNAME", "ECV", "EDID", "ERACK", "ERRCODE", "ERRTEXT", "EXID", "EXMESSAGE", "EXRECVRA", "EXTYPE", "FFROT",
-    "FNLOC", "GRANT6", "GRNT1", "HCACK", "IDTYP", "LENGTH", "LRACK", "MAPER", "MAPFT", "MDACK", "MDLN", "MEXP",
-    "MHEAD", "MID", "MLCL", "NULBC", "OBJACK", "OBJID", "OBJSPEC", "OBJTYPE", "OFLACK", "ONLACK", "ORLOC", "PPBODY",
-    "PPGNT", "PPID", "PRAXI", "PRDCT", "RCMD", "REFP", "ROWCT", "RPSEL", "RPTID", "RSINF", "SDACK", "SDBIN", "SHEAD",
-    "SOFTREV", "STRP", "SV", "SVID", "SVNAME", "TEXT", "TID", "TIME", "TIMESTAMP", "UNITS", "V", "VID", "XDIES",
-    "XYPOS", "YDIES"
+    "ECNAME", "ECV", "EDID", "ERACK", "ERRCODE", "ERRTEXT", "EXID", "EXMESSAGE", "EXRECVRA", "EXTYPE", "FCNID",
+    "FFROT", "FNLOC", "GRANT6", "GRNT1", "HCACK", "IDTYP", "LENGTH", "LRACK", "MAPER", "MAPFT", "MDACK", "MDLN",
+    "MEXP", "MHEAD", "MID", "MLCL", "NULBC", "OBJACK", "OBJID", "OBJSPEC", "OBJTYPE", "OFLACK", "ONLACK", "ORLOC",
+    "PPBODY", "PPGNT", "PPID", "PRAXI", "PRDCT", "RCMD", "REFP", "ROWCT", "RPSEL", "RPTID", "RSDA", "RSDC", "RSINF",
+    "RSPACK", "SDACK", "SDBIN", "SHEAD", "SOFTREV", "STRACK", "STRID", "STRP", "SV", "SVID", "SVNAME", "TEXT", "TID",
+    "TIME", "TIMESTAMP", "UNITS", "V", "VID", "XDIES", "XYPOS", "YDIES"
 ]
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+
+    # further lookups don't go through __getattr__
+    globals()[name] = value
+
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -13,60 +13,42 @@
 # MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
 # GNU Lesser General Public License for more details.
 #####################################################################
-"""Wrappers for SECS stream and functions."""
-import importlib
-import inspect
-import pathlib
+"""
+Wrappers for SECS stream and functions.
+
+The stream/function modules are loaded on first use of their class,
+using the static index generated by :mod:`secsgem.secs.functions.indexer`.
+"""
 import typing
 
 from .base import SecsStreamFunction
-
-
-def _load_function_classes() -> typing.Dict[str, SecsStreamFunction]:
-    # search for stream/function files in current path (sXXfYY.py)
-    module_path = pathlib.Path(__file__).parent
-    function_modules = module_path.glob("s[0-9][0-9]f[0-9][0-9].py")
-
-    function_classes = {}
-
-    # iterate all module paths
-    for function_module_path in function_modules:
-        # load the module
-        spec = importlib.util.spec_from_file_location(function_module_path.stem, function_module_path)
-        function_module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(function_module)
-
-        # get all stream function classes from the module
-        module_function_classes = {name: obj for name, obj in inspect.getmembers(function_module)
-                                   if inspect.isclass(obj)
-                                   and issubclass(obj, SecsStreamFunction)
-                                   and obj is not SecsStreamFunction}
-
-        # store found functions in
-        function_classes.update(module_function_classes)
-
-    return function_classes
-
+from ._index import FUNCTIONS
+from .registry import FUNCTIONS_BY_STREAM, StreamsFunctions, get_function_class, load_function_class
 
 __all__ = [
-    "SecsStreamFunction", "secs_streams_functions"
-]
+    "SecsStreamFunction", "StreamsFunctions", "secs_streams_functions", "get_function_class"
+] + list(FUNCTIONS)
 
-# load all available stream/function classes into a dictionary
-functions = _load_function_classes()
 
-# update this module to include all loaded function classes
-globals().update(functions)
+def __getattr__(name: str) -> typing.Any:
+    if name in FUNCTIONS:
+        value = load_function_class(name)
+    elif name == "functions":
+        # all available stream/function classes by name
+        value = {function_name: load_function_class(function_name) for function_name in FUNCTIONS}
+    elif name == "secs_streams_functions":
+        # the old style streams functions dictionary
+        value = {stream: {function: load_function_class(function_name)
+                          for function, function_name in stream_functions.items()}
+                 for stream, stream_functions in FUNCTIONS_BY_STREAM.items()}
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# add the loaded class names into the __all__ list
-__all__.extend(functions.keys())
+    # further lookups don't go through __getattr__
+    globals()[name] = value
 
-# build the old style streams functions dictionary
-secs_streams_functions = {}
+    return value
 
-for name, function in functions.items():
-    # pylint: disable=protected-access
-    if function._stream not in secs_streams_functions:
-        secs_streams_functions[function._stream] = {}
 
-    secs_streams_functions[function._stream][function._function] = function
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,141 @@
+#####################################################################
+# _index.py
+#
+# (c) Copyright 2021, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""
+Index of the stream/function classes.
+
+Generated by :mod:`secsgem.secs.functions.indexer`, don't edit.
+"""
+
+FUNCTIONS = {
+    "SecsS00F00": (0, 0, "s00f00"),
+    "SecsS01F00": (1, 0, "s01f00"),
+    "SecsS01F01": (1, 1, "s01f01"),
+    "SecsS01F02": (1, 2, "s01f02"),
+    "SecsS01F03": (1, 3, "s01f03"),
+    "SecsS01F04": (1, 4, "s01f04"),
+    "SecsS01F11": (1, 11, "s01f11"),
+    "SecsS01F12": (1, 12, "s01f12"),
+    "SecsS01F13": (1, 13, "s01f13"),
+    "SecsS01F14": (1, 14, "s01f14"),
+    "SecsS01F15": (1, 15, "s01f15"),
+    "SecsS01F16": (1, 16, "s01f16"),
+    "SecsS01F17": (1, 17, "s01f17"),
+    "SecsS01F18": (1, 18, "s01f18"),
+    "SecsS01F65": (1, 65, "s01f65"),
+    "SecsS02F00": (2, 0, "s02f00"),
+    "SecsS02F13": (2, 13, "s02f13"),
+    "SecsS02F14": (2, 14, "s02f14"),
+    "SecsS02F15": (2, 15, "s02f15"),
+    "SecsS02F16": (2, 16, "s02f16"),
+    "SecsS02F17": (2, 17, "s02f17"),
+    "SecsS02F18": (2, 18, "s02f18"),
+    "SecsS02F29": (2, 29, "s02f29"),
+    "SecsS02F30": (2, 30, "s02f30"),
+    "SecsS02F33": (2, 33, "s02f33"),
+    "SecsS02F34": (2, 34, "s02f34"),
+    "SecsS02F35": (2, 35, "s02f35"),
+    "SecsS02F36": (2, 36, "s02f36"),
+    "SecsS02F37": (2, 37, "s02f37"),
+    "SecsS02F38": (2, 38, "s02f38"),
+    "SecsS02F41": (2, 41, "s02f41"),
+    "SecsS02F42": (2, 42, "s02f42"),
+    "SecsS02F43": (2, 43, "s02f43"),
+    "SecsS02F44": (2, 44, "s02f44"),
+    "SecsS05F00": (5, 0, "s05f00"),
+    "SecsS05F01": (5, 1, "s05f01"),
+    "SecsS05F02": (5, 2, "s05f02"),
+    "SecsS05F03": (5, 3, "s05f03"),
+    "SecsS05F04": (5, 4, "s05f04"),
+    "SecsS05F05": (5, 5, "s05f05"),
+    "SecsS05F06": (5, 6, "s05f06"),
+    "SecsS05F07": (5, 7, "s05f07"),
+    "SecsS05F08": (5, 8, "s05f08"),
+    "SecsS05F09": (5, 9, "s05f09"),
+    "SecsS05F10": (5, 10, "s05f10"),
+    "SecsS05F11": (5, 11, "s05f11"),
+    "SecsS05F12": (5, 12, "s05f12"),
+    "SecsS05F13": (5, 13, "s05f13"),
+    "SecsS05F14": (5, 14, "s05f14"),
+    "SecsS05F15": (5, 15, "s05f15"),
+    "SecsS05F16": (5, 16, "s05f16"),
+    "SecsS05F17": (5, 17, "s05f17"),
+    "SecsS05F18": (5, 18, "s05f18"),
+    "SecsS06F00": (6, 0, "s06f00"),
+    "SecsS06F05": (6, 5, "s06f05"),
+    "SecsS06F06": (6, 6, "s06f06"),
+    "SecsS06F07": (6, 7, "s06f07"),
+    "SecsS06F08": (6, 8, "s06f08"),
+    "SecsS06F11": (6, 11, "s06f11"),
+    "SecsS06F12": (6, 12, "s06f12"),
+    "SecsS06F15": (6, 15, "s06f15"),
+    "SecsS06F16": (6, 16, "s06f16"),
+    "SecsS06F19": (6, 19, "s06f19"),
+    "SecsS06F20": (6, 20, "s06f20"),
+    "SecsS06F21": (6, 21, "s06f21"),
+    "SecsS06F22": (6, 22, "s06f22"),
+    "SecsS06F23": (6, 23, "s06f23"),
+    "SecsS06F24": (6, 24, "s06f24"),
+    "SecsS07F00": (7, 0, "s07f00"),
+    "SecsS07F01": (7, 1, "s07f01"),
+    "SecsS07F02": (7, 2, "s07f02"),
+    "SecsS07F03": (7, 3, "s07f03"),
+    "SecsS07F04": (7, 4, "s07f04"),
+    "SecsS07F05": (7, 5, "s07f05"),
+    "SecsS07F06": (7, 6, "s07f06"),
+    "SecsS07F17": (7, 17, "s07f17"),
+    "SecsS07F18": (7, 18, "s07f18"),
+    "SecsS07F19": (7, 19, "s07f19"),
+    "SecsS07F20": (7, 20, "s07f20"),
+    "SecsS09F00": (9, 0, "s09f00"),
+    "SecsS09F01": (9, 1, "s09f01"),
+    "SecsS09F03": (9, 3, "s09f03"),
+    "SecsS09F05": (9, 5, "s09f05"),
+    "SecsS09F07": (9, 7, "s09f07"),
+    "SecsS09F09": (9, 9, "s09f09"),
+    "SecsS09F11": (9, 11, "s09f11"),
+    "SecsS09F13": (9, 13, "s09f13"),
+    "SecsS10F00": (10, 0, "s10f00"),
+    "SecsS10F01": (10, 1, "s10f01"),
+    "SecsS10F02": (10, 2, "s10f02"),
+    "SecsS10F03": (10, 3, "s10f03"),
+    "SecsS10F04": (10, 4, "s10f04"),
+    "SecsS12F00": (12, 0, "s12f00"),
+    "SecsS12F01": (12, 1, "s12f01"),
+    "SecsS12F02": (12, 2, "s12f02"),
+    "SecsS12F03": (12, 3, "s12f03"),
+    "SecsS12F04": (12, 4, "s12f04"),
+    "SecsS12F05": (12, 5, "s12f05"),
+    "SecsS12F06": (12, 6, "s12f06"),
+    "SecsS12F07": (12, 7, "s12f07"),
+    "SecsS12F08": (12, 8, "s12f08"),
+    "SecsS12F09": (12, 9, "s12f09"),
+    "SecsS12F10": (12, 10, "s12f10"),
+    "SecsS12F11": (12, 11, "s12f11"),
+    "SecsS12F12": (12, 12, "s12f12"),
+    "SecsS12F13": (12, 13, "s12f13"),
+    "SecsS12F14": (12, 14, "s12f14"),
+    "SecsS12F15": (12, 15, "s12f15"),
+    "SecsS12F16": (12, 16, "s12f16"),
+    "SecsS12F17": (12, 17, "s12f17"),
+    "SecsS12F18": (12, 18, "s12f18"),
+    "SecsS12F19": (12, 19, "s12f19"),
+    "SecsS14F00": (14, 0, "s14f00"),
+    "SecsS14F01": (14, 1, "s14f01"),
+    "SecsS14F02": (14, 2, "s14f02"),
+    "SecsS14F03": (14, 3, "s14f03"),
+    "SecsS14F04": (14, 4, "s14f04"),
+}
+""" Stream, function and module by class name ."""
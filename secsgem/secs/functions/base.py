@@ -16,7 +16,8 @@
 """Base class for for SECS stream and functions."""
 
 import secsgem.common
-from ..variables import functions
+from ..variables import functions, List, Array
+from ..variables.codec import CompiledFormat
 
 
 class StructureDisplayingMeta(type):
@@ -161,14 +162,23 @@ class SecsStreamFunction(metaclass=StructureDisplayingMeta):
 
         return self.data.encode()
 
-    def decode(self, data):
+    def decode(self, data, lazy=False):
         """
         Update stream/function parameter data from the passed data.
 
+        If lazy is set, lists are only indexed and their items are decoded on first access.
+
         :param data: encoded data
         :type data: string
+        :param lazy: decode list items on first access
+        :type lazy: boolean
         """
-        if self.data is not None:
+        if self.data is None:
+            return
+
+        if lazy and isinstance(self.data, (List, Array)):
+            self.data.decode(data, lazy=True)
+        else:
             self.data.decode(data)
 
     def set(self, value):
@@ -189,6 +199,74 @@ class SecsStreamFunction(metaclass=StructureDisplayingMeta):
         """
         return self.data.get()
 
+    @classmethod
+    def _get_codec(cls):
+        """
+        Get the compiled data format of the class.
+
+        The data format is compiled on first use and cached for each class.
+
+        :returns: compiled data format
+        :rtype: :class:`secsgem.secs.variables.codec.CompiledFormat`
+        """
+        codec = cls.__dict__.get("_codec")
+        if codec is None or codec.data_format is not cls._data_format:
+            codec = CompiledFormat(cls._data_format)
+            cls._codec = codec
+
+        return codec
+
+    @classmethod
+    def encode_value(cls, value):
+        """
+        Encode a value directly to hsms data, without creating a stream/function object.
+
+        The result is the same as for `cls(value).encode()`.
+
+        **Example**::
+
+            >>> import secsgem.secs
+            >>>
+            >>> secsgem.secs.functions.SecsS01F04.encode_value([1, "Hello"])
+            b'\\x01\\x02\\xa5\\x01\\x01A\\x05Hello'
+
+        :param value: value of the stream/function parameters
+        :type value: various
+        :returns: encoded data
+        :rtype: bytes
+        """
+        if cls._data_format is None:
+            return b""
+
+        if value is None:
+            return cls().encode()
+
+        return cls._get_codec().encode(value)
+
+    @classmethod
+    def decode_value(cls, data):
+        """
+        Decode hsms data directly to a value, without creating a stream/function object.
+
+        The result is the same as for `cls().decode(data)` followed by `get()`.
+
+        **Example**::
+
+            >>> import secsgem.secs
+            >>>
+            >>> secsgem.secs.functions.SecsS01F04.decode_value(b'\\x01\\x02\\xa5\\x01\\x01A\\x05Hello')
+            [1, 'Hello']
+
+        :param data: encoded data
+        :type data: bytes
+        :returns: value of the stream/function parameters
+        :rtype: various
+        """
+        if cls._data_format is None:
+            return None
+
+        return cls._get_codec().decode(data)
+
     @classmethod
     def get_format(cls):
         """
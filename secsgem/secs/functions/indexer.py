@@ -0,0 +1,110 @@
+#####################################################################
+# indexer.py
+#
+# (c) Copyright 2021, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""
+Generator for the static index of the stream/function classes.
+
+The index is imported instead of loading all stream/function modules on import.
+Run this module after adding a stream/function module (sXXfYY.py)::
+
+    python -m secsgem.secs.functions.indexer
+"""
+
+import importlib
+import inspect
+import pathlib
+import typing
+
+from .base import SecsStreamFunction
+
+INDEX_PATH = pathlib.Path(__file__).parent / "_index.py"
+""" Path of the generated index module ."""
+
+INDEX_TEMPLATE = '''\
+#####################################################################
+# _index.py
+#
+# (c) Copyright 2021, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""
+Index of the stream/function classes.
+
+Generated by :mod:`secsgem.secs.functions.indexer`, don't edit.
+"""
+
+FUNCTIONS = {{
+{entries}
+}}
+""" Stream, function and module by class name ."""
+'''
+""" Source of the generated index module ."""
+
+
+def scan() -> typing.Dict[str, typing.Tuple[int, int, str]]:
+    """
+    Load all stream/function modules and get their classes.
+
+    :returns: stream, function and module name by class name
+    :rtype: dict
+    """
+    module_path = pathlib.Path(__file__).parent
+
+    index = {}
+
+    for function_module_path in sorted(module_path.glob("s[0-9][0-9]f[0-9][0-9].py")):
+        function_module = importlib.import_module(f".{function_module_path.stem}", __package__)
+
+        for name, obj in inspect.getmembers(function_module, inspect.isclass):
+            # skip classes imported from other modules
+            if not issubclass(obj, SecsStreamFunction) or obj.__module__ != function_module.__name__:
+                continue
+
+            index[name] = (obj._stream, obj._function, function_module_path.stem)  # pylint: disable=protected-access
+
+    return index
+
+
+def generate(index: typing.Dict[str, typing.Tuple[int, int, str]]) -> str:
+    """
+    Generate the source of the index module.
+
+    :param index: stream, function and module name by class name
+    :type index: dict
+    :returns: python source
+    :rtype: string
+    """
+    entries = "\n".join(f'    "{name}": ({stream}, {function}, "{module}"),'
+                        for name, (stream, function, module) in sorted(index.items()))
+
+    return INDEX_TEMPLATE.format(entries=entries)
+
+
+def main():
+    """Write the index module for the current stream/function modules."""
+    INDEX_PATH.write_text(generate(scan()), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
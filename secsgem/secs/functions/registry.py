@@ -0,0 +1,208 @@
+#####################################################################
+# registry.py
+#
+# (c) Copyright 2021, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Lookup of the stream/function classes."""
+
+import collections.abc
+import importlib
+import typing
+
+from .base import SecsStreamFunction
+from ._index import FUNCTIONS
+
+FUNCTIONS_BY_STREAM = {}
+""" Class names of the indexed stream/function classes by stream and function ."""
+
+for _name, (_stream, _function, _) in FUNCTIONS.items():
+    FUNCTIONS_BY_STREAM.setdefault(_stream, {})[_function] = _name
+
+_classes = {}
+
+
+def load_function_class(name: str) -> typing.Type[SecsStreamFunction]:
+    """
+    Get an indexed stream/function class by name, loading its module if required.
+
+    :param name: name of the class
+    :type name: string
+    :returns: stream/function class
+    :rtype: :class:`secsgem.secs.functions.SecsStreamFunction` derived class
+    """
+    function_class = _classes.get(name)
+
+    if function_class is None:
+        module = importlib.import_module(f".{FUNCTIONS[name][2]}", __package__)
+        function_class = _classes[name] = getattr(module, name)
+
+    return function_class
+
+
+def get_function_class(stream: int, function: int) -> typing.Optional[typing.Type[SecsStreamFunction]]:
+    """
+    Get the class for a stream and function, loading its module if required.
+
+    :param stream: stream of the class
+    :type stream: integer
+    :param function: function of the class
+    :type function: integer
+    :returns: stream/function class, None if unknown
+    :rtype: :class:`secsgem.secs.functions.SecsStreamFunction` derived class
+    """
+    name = FUNCTIONS_BY_STREAM.get(stream, {}).get(function)
+    if name is None:
+        return None
+
+    return load_function_class(name)
+
+
+class StreamsFunctions(collections.abc.MutableMapping):
+    """
+    Stream/function classes by stream and function, for a handler.
+
+    Behaves like a dictionary of dictionaries, but the indexed classes are shared by all instances.
+    Only classes added, replaced or removed are stored in the instance.
+
+    **Example**::
+
+        >>> import secsgem.secs
+        >>>
+        >>> streams_functions = secsgem.secs.functions.StreamsFunctions()
+        >>> streams_functions[1][1] is secsgem.secs.functions.SecsS01F01
+        True
+        >>> streams_functions[1][1] = secsgem.secs.functions.SecsS01F02
+        >>> streams_functions[1][1] is secsgem.secs.functions.SecsS01F02
+        True
+        >>> secsgem.secs.functions.StreamsFunctions()[1][1] is secsgem.secs.functions.SecsS01F01
+        True
+    """
+
+    def __init__(self):
+        """Initialize a stream/function lookup with the indexed classes."""
+        # changed classes by stream and function, None for removed functions
+        self._overlay = {}
+
+        # streams replaced or removed completely, the indexed classes are hidden
+        self._replaced = set()
+
+    def __repr__(self):
+        """Generate textual representation for an object of this class."""
+        return f"{self.__class__.__name__} {str({stream: dict(functions) for stream, functions in self.items()})}"
+
+    def get_class(self, stream, function):
+        """
+        Get the class for a stream and function.
+
+        :param stream: stream of the class
+        :type stream: integer
+        :param function: function of the class
+        :type function: integer
+        :returns: stream/function class, None if unknown
+        :rtype: :class:`secsgem.secs.functions.SecsStreamFunction` derived class
+        """
+        functions = self._overlay.get(stream)
+
+        if functions is not None and function in functions:
+            return functions[function]
+
+        if stream in self._replaced:
+            return None
+
+        return get_function_class(stream, function)
+
+    def _functions(self, stream):
+        if stream in self._replaced:
+            functions = {}
+        else:
+            functions = dict.fromkeys(FUNCTIONS_BY_STREAM.get(stream, ()), True)
+
+        functions.update(self._overlay.get(stream, {}))
+
+        return [function for function, function_class in functions.items() if function_class is not None]
+
+    def __contains__(self, stream):
+        """Check if the stream is available."""
+        return stream in self._overlay or (stream in FUNCTIONS_BY_STREAM and stream not in self._replaced)
+
+    def __getitem__(self, stream):
+        """Get the classes of a stream by function."""
+        if stream not in self:
+            raise KeyError(stream)
+
+        return _StreamFunctions(self, stream)
+
+    def __setitem__(self, stream, functions):
+        """Replace all classes of a stream."""
+        self._replaced.add(stream)
+        self._overlay[stream] = dict(functions)
+
+    def __delitem__(self, stream):
+        """Remove all classes of a stream."""
+        if stream not in self:
+            raise KeyError(stream)
+
+        self._replaced.add(stream)
+        self._overlay.pop(stream, None)
+
+    def __iter__(self):
+        """Iterate the available streams."""
+        streams = [stream for stream in FUNCTIONS_BY_STREAM if stream not in self._replaced]
+        streams.extend(stream for stream in self._overlay if stream not in streams)
+
+        return iter(streams)
+
+    def __len__(self):
+        """Get the number of available streams."""
+        return len(list(iter(self)))
+
+
+class _StreamFunctions(collections.abc.MutableMapping):
+    """Classes of a stream in :class:`StreamsFunctions` by function, changes are stored in the overlay."""
+
+    def __init__(self, streams_functions, stream):
+        self._streams_functions = streams_functions
+        self._stream = stream
+
+    def __repr__(self):
+        return str(dict(self))
+
+    def get(self, function, default=None):
+        function_class = self._streams_functions.get_class(self._stream, function)
+
+        return default if function_class is None else function_class
+
+    def __getitem__(self, function):
+        function_class = self._streams_functions.get_class(self._stream, function)
+
+        if function_class is None:
+            raise KeyError(function)
+
+        return function_class
+
+    def __setitem__(self, function, function_class):
+        # pylint: disable=protected-access
+        self._streams_functions._overlay.setdefault(self._stream, {})[function] = function_class
+
+    def __delitem__(self, function):
+        # pylint: disable=protected-access
+        if function not in self:
+            raise KeyError(function)
+
+        self._streams_functions._overlay.setdefault(self._stream, {})[function] = None
+
+    def __iter__(self):
+        return iter(self._streams_functions._functions(self._stream))  # pylint: disable=protected-access
+
+    def __len__(self):
+        return len(self._streams_functions._functions(self._stream))  # pylint: disable=protected-access
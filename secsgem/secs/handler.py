@@ -15,10 +15,10 @@
 #####################################################################
 """Handler for SECS commands. Used in combination with :class:`secsgem.HsmsHandler.HsmsConnectionManager`."""
 
+import concurrent.futures
 import logging
-import threading
-import copy
 
+import secsgem.common
 import secsgem.hsms
 
 from . import functions
@@ -57,7 +57,11 @@ class SecsHandler(secsgem.hsms.HsmsHandler):
         self._alarms = {}
         self._remoteCommands = {}
 
-        self.secs_streams_functions = copy.deepcopy(functions.secs_streams_functions)
+        # indexed classes are shared by all handlers, only changes are stored for this handler
+        self.secs_streams_functions = functions.StreamsFunctions()
+
+        # worker pool running the stream/function callbacks, in order for this handler
+        self.dispatcher = secsgem.common.Dispatcher.get_default()
 
     @staticmethod
     def _generate_sf_callback_name(stream, function):
@@ -235,10 +239,25 @@ class SecsHandler(secsgem.hsms.HsmsHandler):
         :param packet: received data packet
         :type packet: :class:`secsgem.hsms.HsmsPacket`
         """
-        # check if callbacks available for this stream and function
-        threading.Thread(
-            target=self._handle_stream_function, args=(packet, ),
-            name=f"secsgem_secsHandler_callback_S{packet.header.stream}F{packet.header.function}").start()
+        self._dispatch_stream_function(packet)
+
+    def _dispatch_stream_function(self, packet):
+        """
+        Pass a received stream/function to the dispatcher, which calls the callback.
+
+        If the dispatcher rejects the message because its queue is full, an abort is sent.
+        The receiver doesn't wait for space in the queue, as it passes the responses to the callbacks occupying it.
+
+        :param packet: received data packet
+        :type packet: :class:`secsgem.hsms.HsmsPacket`
+        """
+        if self.dispatcher.dispatch_nowait(self, self._handle_stream_function, packet):
+            return
+
+        self.logger.warning("dispatcher queue full, S%02dF%02d rejected", packet.header.stream,
+                            packet.header.function)
+        if packet.header.requireResponse:
+            self.send_response(self.stream_function(packet.header.stream, 0)(), packet.header.system)
 
     def disable_ceids(self):
         """Disable all Collection Events."""
@@ -296,6 +315,37 @@ class SecsHandler(secsgem.hsms.HsmsHandler):
 
         return self.request_svs([sv_id])[0]
 
+    def list_svs_nowait(self, svs=None):
+        """
+        Get list of available Service Variables without waiting for the response.
+
+        :returns: future for the available Service Variables
+        :rtype: :class:`concurrent.futures.Future`
+        """
+        self.logger.info("Get list of service variables")
+
+        if svs is None:
+            svs = []
+
+        return self._send_request_decoded(self.stream_function(1, 11)(svs))
+
+    def request_svs_nowait(self, svs):
+        """
+        Request contents of supplied Service Variables without waiting for the response.
+
+        **Example**::
+
+            responses = secsgem.hsms.gather([handler.request_svs_nowait([1, 2]) for handler in handlers], 10)
+
+        :param svs: Service Variables to request
+        :type svs: list
+        :returns: future for the values of requested Service Variables
+        :rtype: :class:`concurrent.futures.Future`
+        """
+        self.logger.info("Get value of service variables %s", svs)
+
+        return self._send_request_decoded(self.stream_function(1, 3)(svs))
+
     def list_ecs(self, ecs=None):
         """
         Get list of available Equipment Constants.
@@ -339,6 +389,33 @@ class SecsHandler(secsgem.hsms.HsmsHandler):
 
         return self.request_ecs([ec_id])
 
+    def list_ecs_nowait(self, ecs=None):
+        """
+        Get list of available Equipment Constants without waiting for the response.
+
+        :returns: future for the available Equipment Constants
+        :rtype: :class:`concurrent.futures.Future`
+        """
+        self.logger.info("Get list of equipment constants")
+
+        if ecs is None:
+            ecs = []
+
+        return self._send_request_decoded(self.stream_function(2, 29)(ecs))
+
+    def request_ecs_nowait(self, ecs):
+        """
+        Request contents of supplied Equipment Constants without waiting for the response.
+
+        :param ecs: Equipment Constants to request
+        :type ecs: list
+        :returns: future for the values of requested Equipment Constants
+        :rtype: :class:`concurrent.futures.Future`
+        """
+        self.logger.info("Get value of equipment constants %s", ecs)
+
+        return self._send_request_decoded(self.stream_function(2, 13)(ecs))
+
     def set_ecs(self, ecs):
         """
         Set contents of supplied Equipment Constants.
@@ -414,6 +491,34 @@ class SecsHandler(secsgem.hsms.HsmsHandler):
 
         return self.send_and_waitfor_response(self.stream_function(1, 1)())
 
+    def _send_request_decoded(self, function):
+        """
+        Send a request and decode the response, when it arrives.
+
+        Cancelling the returned future cancels the request.
+
+        :param function: function to be sent
+        :type function: :class:`secsgem.secs.functionbase.SecsStreamFunction`
+        :returns: future for the decoded response, None if the request failed
+        :rtype: :class:`concurrent.futures.Future`
+        """
+        decoded = concurrent.futures.Future()
+        request = self.send_request(function)
+
+        def on_response(_):
+            if request.cancelled() or not decoded.set_running_or_notify_cancel():
+                return
+
+            try:
+                decoded.set_result(self.secs_decode(request.result()))
+            except Exception as exc:  # pylint: disable=broad-except
+                decoded.set_exception(exc)
+
+        decoded.add_done_callback(lambda _: request.cancel())
+        request.add_done_callback(on_response)
+
+        return decoded
+
     def stream_function(self, stream, function):
         """
         Get class for stream and function.
@@ -425,20 +530,20 @@ class SecsHandler(secsgem.hsms.HsmsHandler):
         :return: matching stream and function class
         :rtype: secsSxFx class
         """
-        if stream not in self.secs_streams_functions:
-            self.logger.warning("unknown function S%02dF%02d", stream, function)
-            return None
+        function_class = self.secs_streams_functions.get(stream, {}).get(function)
 
-        if function not in self.secs_streams_functions[stream]:
+        if function_class is None:
             self.logger.warning("unknown function S%02dF%02d", stream, function)
-            return None
 
-        return self.secs_streams_functions[stream][function]
+        return function_class
 
     def secs_decode(self, packet):
         """
         Get object of decoded stream and function class, or None if no class is available.
 
+        The items of the object are decoded on first access.
+        The object is cached on the packet, so decoding the same packet again returns the same object.
+
         :param packet: packet to get object for
         :type packet: :class:`secsgem.hsms.HsmsPacket`
         :return: matching stream and function object
@@ -447,15 +552,17 @@ class SecsHandler(secsgem.hsms.HsmsHandler):
         if packet is None:
             return None
 
-        if packet.header.stream not in self.secs_streams_functions:
-            self.logger.warning("unknown function S%02dF%02d", packet.header.stream, packet.header.function)
+        function_class = self.stream_function(packet.header.stream, packet.header.function)
+        if function_class is None:
             return None
 
-        if packet.header.function not in self.secs_streams_functions[packet.header.stream]:
-            self.logger.warning("unknown function S%02dF%02d", packet.header.stream, packet.header.function)
-            return None
+        # reuse the object decoded for this packet before, e.g. for logging
+        if type(packet.decoded) is function_class:  # pylint: disable=unidiomatic-typecheck
+            return packet.decoded
+
+        function = function_class()
+        function.decode(packet.data, lazy=True)
 
-        function = self.secs_streams_functions[packet.header.stream][packet.header.function]()
-        function.decode(packet.data)
+        packet.decoded = function
 
         return function
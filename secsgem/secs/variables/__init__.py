@@ -13,26 +13,37 @@
 # MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
 # GNU Lesser General Public License for more details.
 #####################################################################
-"""SECS variable types."""
-
-from .base import Base  # noqa
-from .dynamic import Dynamic  # noqa
-
-from .array import Array  # noqa
-from .list_type import List  # noqa
-from .binary import Binary  # noqa
-from .boolean import Boolean  # noqa
-
-from .string import String  # noqa
-from .jis8 import JIS8  # noqa
-
-from .f4 import F4  # noqa
-from .f8 import F8  # noqa
-from .i1 import I1  # noqa
-from .i2 import I2  # noqa
-from .i4 import I4  # noqa
-from .i8 import I8  # noqa
-from .u1 import U1  # noqa
-from .u2 import U2  # noqa
-from .u4 import U4  # noqa
-from .u8 import U8  # noqa
+"""
+SECS variable types.
+
+The variable modules are loaded on first use of their class.
+"""
+import importlib
+
+_EXPORTS = {
+    "Base": "base", "Dynamic": "dynamic", "Encoded": "encoded",
+    "Array": "array", "List": "list_type", "Binary": "binary", "Boolean": "boolean",
+    "String": "string", "JIS8": "jis8",
+    "F4": "f4", "F8": "f8",
+    "I1": "i1", "I2": "i2", "I4": "i4", "I8": "i8",
+    "U1": "u1", "U2": "u2", "U4": "u4", "U8": "u8",
+}
+""" Module of each variable class ."""
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+
+    # further lookups don't go through __getattr__
+    globals()[name] = value
+
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -64,6 +64,7 @@ class Array(Base):
         self.item_decriptor = data_format
         self.count = count
         self.data = []
+        self._undecoded = {}
         if isinstance(data_format, list):
             self.name = list_type.List.get_name_from_format(data_format)
         elif hasattr(data_format, "__name__"):
@@ -107,7 +108,7 @@ class Array(Base):
 
         data = ""
 
-        for value in self.data:
+        for value in self:
             data += f"{secsgem.common.indent_block(value.__repr__())}\n"
 
         return f"<{self.text_code} [{len(self.data)}]\n{data}\n>"
@@ -118,14 +119,19 @@ class Array(Base):
 
     def __getitem__(self, key):
         """Get an item using the indexer operator."""
-        return self.data[key]
+        if isinstance(key, slice):
+            return [self._get_item(index) for index in range(len(self.data))[key]]
+
+        return self._get_item(key)
 
     def __iter__(self):
         """Get an iterator."""
-        return Array._SecsVarArrayIter(self.data)
+        return Array._SecsVarArrayIter(self)
 
     def __setitem__(self, key, value):
         """Set an item using the indexer operator."""
+        self._get_item(key)
+
         if isinstance(value, (type(self.data[key]), self.data[key].__class__.__bases__)):
             self.data[key] = value
         elif isinstance(value, Base):
@@ -133,6 +139,32 @@ class Array(Base):
         else:
             self.data[key].set(value)
 
+    def _get_item(self, index):
+        """
+        Get an item and decode it, if it wasn't decoded yet.
+
+        :param index: index of the item
+        :type index: integer
+        :returns: item variable
+        :rtype: Base based class
+        """
+        if not self._undecoded:
+            return self.data[index]
+
+        index = range(len(self.data))[index]
+
+        undecoded = self._undecoded.pop(index, None)
+        if undecoded is not None:
+            item = functions.generate(self.item_decriptor)
+            if isinstance(item, (list_type.List, Array)):
+                item.decode(*undecoded, lazy=True)
+            else:
+                item.decode(*undecoded)
+
+            self.data[index] = item
+
+        return self.data[index]
+
     def append(self, data):
         """
         Append data to the internal list.
@@ -159,6 +191,7 @@ class Array(Base):
                 raise ValueError(f"Value has invalid field count (expected: {self.count}, actual: {len(value)})")
 
         self.data = []
+        self._undecoded = {}
 
         for item in value:
             new_object = functions.generate(self.item_decriptor)
@@ -173,7 +206,7 @@ class Array(Base):
         :rtype: list
         """
         data = []
-        for item in self.data:
+        for item in self:
             data.append(item.get())
 
         return data
@@ -187,19 +220,24 @@ class Array(Base):
         """
         result = self.encode_item_header(len(self.data))
 
-        for item in self.data:
+        for item in self:
             result += item.encode()
 
         return result
 
-    def decode(self, data, start=0):
+    def decode(self, data, start=0, lazy=False):
         """
         Decode the secs byte data to the value.
 
+        If lazy is set, only the positions of the items are read.
+        The items are decoded when they are accessed the first time.
+
         :param data: encoded data bytes
         :type data: string
         :param start: start position of value the data
         :type start: integer
+        :param lazy: decode the items on first access
+        :type lazy: boolean
         :returns: new start position
         :rtype: integer
         """
@@ -207,10 +245,16 @@ class Array(Base):
 
         # list
         self.data = []
+        self._undecoded = {}
 
-        for _ in range(length):
-            new_object = functions.generate(self.item_decriptor)
-            text_pos = new_object.decode(data, text_pos)
-            self.data.append(new_object)
+        for index in range(length):
+            if lazy:
+                self._undecoded[index] = (data, text_pos)
+                self.data.append(None)
+                text_pos = functions.skip_item(data, text_pos)
+            else:
+                new_object = functions.generate(self.item_decriptor)
+                text_pos = new_object.decode(data, text_pos)
+                self.data.append(new_object)
 
         return text_pos
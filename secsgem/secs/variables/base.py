@@ -15,6 +15,32 @@
 #####################################################################
 """SECS variable base type."""
 
+ITEM_HEADER_FORMATS = tuple((format_byte >> 2, format_byte & 0b11) for format_byte in range(256))
+""" Format code and number of length bytes for each format byte ."""
+
+
+def parse_item_header(data, text_pos=0):
+    """
+    Parse an item header without copying the data.
+
+    :param data: encoded data
+    :type data: bytes-like object (bytes, bytearray or memoryview)
+    :param text_pos: start of item header in data
+    :type text_pos: integer
+    :returns: start position for next item, format code, length item of data
+    :rtype: (integer, integer, integer)
+    """
+    format_code, length_bytes = ITEM_HEADER_FORMATS[data[text_pos]]
+
+    if length_bytes == 1:
+        return text_pos + 2, format_code, data[text_pos + 1]
+    if length_bytes == 2:
+        return text_pos + 3, format_code, (data[text_pos + 1] << 8) | data[text_pos + 2]
+    if length_bytes == 3:
+        return text_pos + 4, format_code, (data[text_pos + 1] << 16) | (data[text_pos + 2] << 8) | data[text_pos + 3]
+
+    return text_pos + 1, format_code, 0
+
 
 class Base:
     """
@@ -72,7 +98,7 @@ class Base:
         Encode item header depending on the number of length bytes required.
 
         :param data: encoded data
-        :type data: string
+        :type data: bytes-like object (bytes, bytearray or memoryview)
         :param text_pos: start of item header in data
         :type text_pos: integer
         :returns: start position for next item, format code, length item of data
@@ -81,21 +107,7 @@ class Base:
         if len(data) == 0:
             raise ValueError(f"Decoding for {self.__class__.__name__} without any text")
 
-        # parse format byte
-        format_byte = bytearray(data)[text_pos]
-
-        format_code = (format_byte & 0b11111100) >> 2
-        length_bytes = (format_byte & 0b00000011)
-
-        text_pos += 1
-
-        # read 1-3 length bytes
-        length = 0
-        for _ in range(length_bytes):
-            length <<= 8
-            length += bytearray(data)[text_pos]
-
-            text_pos += 1
+        text_pos, format_code, length = parse_item_header(data, text_pos)
 
         if 0 <= self.format_code != format_code:
             raise ValueError(
@@ -19,6 +19,11 @@ import struct
 
 from .base import Base
 
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
 
 class BaseNumber(Base):
     """Secs base type for numeric data."""
@@ -31,6 +36,9 @@ class BaseNumber(Base):
     _bytes = 0
     _struct_code = ""
 
+    use_numpy = False
+    """ Decode into big-endian numpy arrays instead of lists, if numpy is installed ."""
+
     def __init__(self, value=None, count=-1):
         """
         Initialize a numeric secs variable.
@@ -73,36 +81,61 @@ class BaseNumber(Base):
 
     def __eq__(self, other):
         """Check equality with other object."""
+        value = self._value_list()
+
         if isinstance(other, Base):
             if other.is_dynamic:
-                return other.value.value == self.value
-            return other.value == self.value
+                other = other.value
+
+            if isinstance(other, BaseNumber):
+                return other._value_list() == value
+            return other.value == value
         if isinstance(other, list):
-            return other == self.value
-        return [other] == self.value
+            return other == value
+        return [other] == value
 
     def __hash__(self):
         """Get data item for hashing."""
         return hash(str(self.value))
 
-    def __check_single_item_support(self, value):
-        if isinstance(value, float) and self._base_type == int:
+    def _value_list(self):
+        """Get the value as list, also if it was decoded to a numpy array."""
+        if numpy is not None and isinstance(self.value, numpy.ndarray):
+            return self.value.tolist()
+
+        return self.value
+
+    @classmethod
+    def _numpy_dtype(cls):
+        """Get the big-endian numpy type matching the secs type."""
+        if cls._base_type is float:
+            kind = "f"
+        elif cls._min == 0:
+            kind = "u"
+        else:
+            kind = "i"
+
+        return f">{kind}{cls._bytes}"
+
+    @classmethod
+    def __check_single_item_support(cls, value):
+        if isinstance(value, float) and cls._base_type == int:
             return False
 
         if isinstance(value, bool):
             return True
 
         if isinstance(value, (int, float)):
-            if value < self._min or value > self._max:
+            if value < cls._min or value > cls._max:
                 return False
             return True
 
         if isinstance(value, (bytes, str)):
             try:
-                val = self._base_type(value)
+                val = cls._base_type(value)
             except ValueError:
                 return False
-            if val < self._min or val > self._max:
+            if val < cls._min or val > cls._max:
                 return False
             return True
         return False
@@ -114,61 +147,94 @@ class BaseNumber(Base):
         :param value: value to test
         :type value: any
         """
+        return self._supports_value(value, self.count)
+
+    @classmethod
+    def _supports_value(cls, value, count=-1):
+        """
+        Check if the type supports the provided value, without creating an instance.
+
+        :param value: value to test
+        :type value: any
+        :param count: number of items allowed
+        :type count: integer
+        """
+        if numpy is not None and isinstance(value, numpy.ndarray):
+            value = value.tolist()
+
         if isinstance(value, (list, tuple)):
-            if 0 <= self.count < len(value):
+            if 0 <= count < len(value):
                 return False
             for item in value:
-                if not self.__check_single_item_support(item):
+                if not cls.__check_single_item_support(item):
                     return False
             return True
         if isinstance(value, bytearray):
-            if 0 <= self.count < len(value):
+            if 0 <= count < len(value):
                 return False
             for item in value:
-                if item < self._min or item > self._max:
+                if item < cls._min or item > cls._max:
                     return False
             return True
-        return self.__check_single_item_support(value)
+        return cls.__check_single_item_support(value)
 
-    def set(self, value):
+    @classmethod
+    def _convert_value(cls, value, count=-1):
         """
-        Set the internal value to the provided value.
+        Convert a value to the internal list of numbers.
 
-        :param value: new value
+        :param value: value to convert
         :type value: list/integer/float
+        :param count: number of items allowed
+        :type count: integer
+        :returns: converted value
+        :rtype: list
         """
-        if isinstance(value, float) and self._base_type == int:
+        if numpy is not None and isinstance(value, numpy.ndarray):
+            value = value.tolist()
+
+        if isinstance(value, float) and cls._base_type == int:
             raise ValueError(f"Invalid value {value}")
 
         if isinstance(value, (list, tuple)):
-            if 0 <= self.count < len(value):
-                raise ValueError(f"Value longer than {self.count} chars")
+            if 0 <= count < len(value):
+                raise ValueError(f"Value longer than {count} chars")
 
             new_list = []
             for item in value:
-                item = self._base_type(item)
-                if item < self._min or item > self._max:
+                item = cls._base_type(item)
+                if item < cls._min or item > cls._max:
                     raise ValueError(f"Invalid value {item}")
 
                 new_list.append(item)
-            self.value = new_list
-        elif isinstance(value, bytearray):
-            if 0 <= self.count < len(value):
-                raise ValueError(f"Value longer than {self.count} chars")
+            return new_list
+
+        if isinstance(value, bytearray):
+            if 0 <= count < len(value):
+                raise ValueError(f"Value longer than {count} chars")
 
             new_list = []
             for item in value:
-                if item < self._min or item > self._max:
+                if item < cls._min or item > cls._max:
                     raise ValueError(f"Invalid value {item}")
                 new_list.append(item)
-            self.value = new_list
-        else:
-            new_value = self._base_type(value)
+            return new_list
+
+        new_value = cls._base_type(value)
 
-            if new_value < self._min or new_value > self._max:
-                raise ValueError(f"Invalid value {value}")
+        if new_value < cls._min or new_value > cls._max:
+            raise ValueError(f"Invalid value {value}")
 
-            self.value = [new_value]
+        return [new_value]
+
+    def set(self, value):
+        """
+        Set the internal value to the provided value.
+
+        :param value: new value
+        :type value: list/integer/float
+        """
+        self.value = self._convert_value(value, self.count)
 
     def get(self):
         """
@@ -191,10 +257,10 @@ class BaseNumber(Base):
         """
         result = self.encode_item_header(len(self.value) * self._bytes)
 
-        for value in self.value:
-            result += struct.pack(f">{self._struct_code}", value)
+        if numpy is not None and isinstance(self.value, numpy.ndarray):
+            return result + self.value.astype(self._numpy_dtype(), copy=False).tobytes()
 
-        return result
+        return result + struct.pack(f">{len(self.value)}{self._struct_code}", *self.value)
 
     def decode(self, data, start=0):
         """
@@ -209,19 +275,20 @@ class BaseNumber(Base):
         """
         (text_pos, _, length) = self.decode_item_header(data, start)
 
-        result = []
-
-        for _ in range(length // self._bytes):
-            result_text = data[text_pos:text_pos + self._bytes]
+        count = length // self._bytes
+        end = text_pos + count * self._bytes
 
-            if len(result_text) != self._bytes:
-                raise ValueError(
-                    f"No enough data found for {self.__class__.__name__} with length {length} at position {start} ")
+        if end > len(data):
+            raise ValueError(
+                f"No enough data found for {self.__class__.__name__} with length {length} at position {start} ")
 
-            result.append(struct.unpack(f">{self._struct_code}", result_text)[0])
+        if 0 <= self.count < count:
+            raise ValueError(f"Value longer than {self.count} chars")
 
-            text_pos += self._bytes
-
-        self.set(result)
+        # the values are in range of the type by definition, so they are not checked again
+        if self.use_numpy and numpy is not None:
+            self.value = numpy.frombuffer(data, dtype=self._numpy_dtype(), count=count, offset=text_pos)
+        else:
+            self.value = list(struct.unpack_from(f">{count}{self._struct_code}", data, text_pos))
 
-        return text_pos
+        return end
@@ -103,11 +103,12 @@ class BaseText(Base):
 
         return False
 
-    def __supports_value_listtypes(self, value):
-        if self.count > 0 and len(value) > self.count:
+    @classmethod
+    def __supports_value_listtypes(cls, value, count):
+        if count > 0 and len(value) > count:
             return False
         for item in value:
-            if not self.__check_single_item_support(item):
+            if not cls.__check_single_item_support(item):
                 return False
 
         return True
@@ -119,24 +120,36 @@ class BaseText(Base):
         :param value: value to test
         :type value: any
         """
+        return self._supports_value(value, self.count)
+
+    @classmethod
+    def _supports_value(cls, value, count=-1):
+        """
+        Check if the type supports the provided value, without creating an instance.
+
+        :param value: value to test
+        :type value: any
+        :param count: number of characters allowed
+        :type count: integer
+        """
         if isinstance(value, (list, tuple, bytearray)):
-            return self.__supports_value_listtypes(value)
+            return cls.__supports_value_listtypes(value, count)
 
         if isinstance(value, bytes):
-            if 0 < self.count < len(value):
+            if 0 < count < len(value):
                 return False
             return True
 
         if isinstance(value, (int, float, complex)):
-            if 0 < self.count < len(str(value)):
+            if 0 < count < len(str(value)):
                 return False
             return True
 
         if isinstance(value, str):
-            if 0 < self.count < len(value):
+            if 0 < count < len(value):
                 return False
             try:
-                value.encode(self.coding)
+                value.encode(cls.coding)
             except UnicodeEncodeError:
                 return False
 
@@ -144,33 +157,47 @@ class BaseText(Base):
 
         return None
 
-    def set(self, value):
+    @classmethod
+    def _convert_value(cls, value, count=-1):
         """
-        Set the internal value to the provided value.
+        Convert a value to the internal string.
 
-        :param value: new value
+        :param value: value to convert
         :type value: string/integer
+        :param count: number of characters allowed
+        :type count: integer
+        :returns: converted value
+        :rtype: string
         """
         if value is None:
-            raise ValueError(f"{self.__class__.__name__} can't be None")
+            raise ValueError(f"{cls.__name__} can't be None")
 
         if isinstance(value, bytes):
-            value = value.decode(self.coding)
+            value = value.decode(cls.coding)
         elif isinstance(value, bytearray):
-            value = bytes(value).decode(self.coding)
+            value = bytes(value).decode(cls.coding)
         elif isinstance(value, (list, tuple)):
-            value = str(bytes(bytearray(value)).decode(self.coding))
+            value = str(bytes(bytearray(value)).decode(cls.coding))
         elif isinstance(value, (int, float, complex)):
             value = str(value)
         elif isinstance(value, str):
-            value.encode(self.coding)  # try if it can be encoded as ascii (values 0-127)
+            value.encode(cls.coding)  # try if it can be encoded as ascii (values 0-127)
         else:
-            raise TypeError(f"Unsupported type {type(value).__name__} for {self.__class__.__name__}")
+            raise TypeError(f"Unsupported type {type(value).__name__} for {cls.__name__}")
+
+        if 0 < count < len(value):
+            raise ValueError(f"Value longer than {count} chars ({len(value)} chars)")
 
-        if 0 < self.count < len(value):
-            raise ValueError(f"Value longer than {self.count} chars ({len(value)} chars)")
+        return str(value)
+
+    def set(self, value):
+        """
+        Set the internal value to the provided value.
 
-        self.value = str(value)
+        :param value: new value
+        :type value: string/integer
+        """
+        self.value = self._convert_value(value, self.count)
 
     def get(self):
         """
@@ -211,7 +238,7 @@ class BaseText(Base):
         result = ""
 
         if length > 0:
-            result = data[text_pos:text_pos + length].decode(self.coding)
+            result = str(data[text_pos:text_pos + length], self.coding)
 
         self.set(result)
 
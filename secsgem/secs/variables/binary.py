@@ -107,27 +107,39 @@ class Binary(Base):
         :param value: value to test
         :type value: any
         """
+        return self._supports_value(value, self.count)
+
+    @classmethod
+    def _supports_value(cls, value, count=-1):
+        """
+        Check if the type supports the provided value, without creating an instance.
+
+        :param value: value to test
+        :type value: any
+        :param count: number of items allowed
+        :type count: integer
+        """
         if isinstance(value, (list, tuple)):
-            if self.count > 0 and len(value) > self.count:
+            if count > 0 and len(value) > count:
                 return False
             for item in value:
-                if not self.__check_single_item_support(item):
+                if not cls.__check_single_item_support(item):
                     return False
 
             return True
 
         if isinstance(value, bytearray):
-            if self.count > 0 and len(value) > self.count:
+            if count > 0 and len(value) > count:
                 return False
             return True
 
         if isinstance(value, bytes):
-            if self.count > 0 and len(value) > self.count:
+            if count > 0 and len(value) > count:
                 return False
             return True
 
         if isinstance(value, str):
-            if self.count > 0 and len(value) > self.count:
+            if count > 0 and len(value) > count:
                 return False
             try:
                 value.encode('ascii')
@@ -136,18 +148,20 @@ class Binary(Base):
 
             return True
 
-        return self.__check_single_item_support(value)
+        return cls.__check_single_item_support(value)
 
-    def set(self, value):
+    @classmethod
+    def _convert_value(cls, value, count=-1):
         """
-        Set the internal value to the provided value.
+        Convert a value to the internal bytearray.
 
-        :param value: new value
+        :param value: value to convert
         :type value: string/integer
+        :param count: number of bytes allowed
+        :type count: integer
+        :returns: converted value
+        :rtype: bytearray
         """
-        if value is None:
-            return
-
         if isinstance(value, bytes):
             value = bytearray(value)
         elif isinstance(value, str):
@@ -161,14 +175,26 @@ class Binary(Base):
                 value = bytearray([value])
             else:
                 raise ValueError(
-                    f"Value {value} of type {type(value).__name__} is out of range for {self.__class__.__name__}")
+                    f"Value {value} of type {type(value).__name__} is out of range for {cls.__name__}")
         else:
-            raise TypeError(f"Unsupported type {type(value).__name__} for {self.__class__.__name__}")
+            raise TypeError(f"Unsupported type {type(value).__name__} for {cls.__name__}")
+
+        if 0 < count < len(value):
+            raise ValueError(f"Value longer than {count} chars ({len(value)} chars)")
+
+        return value
+
+    def set(self, value):
+        """
+        Set the internal value to the provided value.
 
-        if 0 < self.count < len(value):
-            raise ValueError(f"Value longer than {self.count} chars ({len(value)} chars)")
+        :param value: new value
+        :type value: string/integer
+        """
+        if value is None:
+            return
 
-        self.value = value
+        self.value = self._convert_value(value, self.count)
 
     def get(self):
         """
@@ -213,7 +239,7 @@ class Binary(Base):
         result = None
 
         if length > 0:
-            result = data[text_pos:text_pos + length]
+            result = bytearray(data[text_pos:text_pos + length])
 
         self.set(result)
 
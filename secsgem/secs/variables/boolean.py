@@ -84,7 +84,8 @@ class Boolean(Base):
         """Get data item for hashing."""
         return hash(str(self.value))
 
-    def __check_single_item_support(self, value):
+    @classmethod
+    def __check_single_item_support(cls, value):
         if isinstance(value, bool):
             return True
 
@@ -94,7 +95,7 @@ class Boolean(Base):
             return False
 
         if isinstance(value, str):
-            if value.upper() in self._true_strings or value.upper() in self._false_strings:
+            if value.upper() in cls._true_strings or value.upper() in cls._false_strings:
                 return True
 
             return False
@@ -108,26 +109,39 @@ class Boolean(Base):
         :param value: value to test
         :type value: any
         """
+        return self._supports_value(value, self.count)
+
+    @classmethod
+    def _supports_value(cls, value, count=-1):
+        """
+        Check if the type supports the provided value, without creating an instance.
+
+        :param value: value to test
+        :type value: any
+        :param count: number of items allowed
+        :type count: integer
+        """
         if isinstance(value, (list, tuple)):
-            if 0 < self.count < len(value):
+            if 0 < count < len(value):
                 return False
             for item in value:
-                if not self.__check_single_item_support(item):
+                if not cls.__check_single_item_support(item):
                     return False
 
             return True
 
         if isinstance(value, bytearray):
-            if 0 < self.count < len(value):
+            if 0 < count < len(value):
                 return False
             for char in value:
                 if not 0 <= char <= 1:
                     return False
             return True
 
-        return self.__check_single_item_support(value)
+        return cls.__check_single_item_support(value)
 
-    def __convert_single_item(self, value):
+    @classmethod
+    def __convert_single_item(cls, value):
         if isinstance(value, bool):
             return value
 
@@ -138,35 +152,41 @@ class Boolean(Base):
             return bool(value)
 
         if isinstance(value, str):
-            if value.upper() in self._true_strings:
+            if value.upper() in cls._true_strings:
                 return True
 
-            if value.upper() in self._false_strings:
+            if value.upper() in cls._false_strings:
                 return False
 
             raise ValueError(f"Value {value} out of bounds")
 
         raise ValueError(f"Can't convert value {value}")
 
-    def set(self, value):
+    @classmethod
+    def _convert_value(cls, value, count=-1):
         """
-        Set the internal value to the provided value.
+        Convert a value to the internal list of booleans.
 
-        :param value: new value
+        :param value: value to convert
         :type value: list/boolean
+        :param count: number of items allowed
+        :type count: integer
+        :returns: converted value
+        :rtype: list
         """
         if isinstance(value, (list, tuple)):
-            if 0 <= self.count < len(value):
-                raise ValueError(f"Value longer than {self.count} chars")
+            if 0 <= count < len(value):
+                raise ValueError(f"Value longer than {count} chars")
 
             new_value = []
             for item in value:
-                new_value.append(self.__convert_single_item(item))
+                new_value.append(cls.__convert_single_item(item))
 
-            self.value = new_value
-        elif isinstance(value, bytearray):
-            if 0 <= self.count < len(value):
-                raise ValueError(f"Value longer than {self.count} chars")
+            return new_value
+
+        if isinstance(value, bytearray):
+            if 0 <= count < len(value):
+                raise ValueError(f"Value longer than {count} chars")
 
             new_value = []
             for char in value:
@@ -175,9 +195,18 @@ class Boolean(Base):
 
                 new_value.append(char)
 
-            self.value = new_value
-        else:
-            self.value = [self.__convert_single_item(value)]
+            return new_value
+
+        return [cls.__convert_single_item(value)]
+
+    def set(self, value):
+        """
+        Set the internal value to the provided value.
+
+        :param value: new value
+        :type value: list/boolean
+        """
+        self.value = self._convert_value(value, self.count)
 
     def get(self):
         """
@@ -224,7 +253,7 @@ class Boolean(Base):
         result = []
 
         for _ in range(length):
-            if bytearray(data)[text_pos] == 0:
+            if data[text_pos] == 0:
                 result.append(False)
             else:
                 result.append(True)
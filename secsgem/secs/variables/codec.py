@@ -0,0 +1,455 @@
+#####################################################################
+# codec.py
+#
+# (c) Copyright 2021, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Compiled en- and decoders for data formats."""
+
+import collections
+import inspect
+import struct
+
+from .base import Base, parse_item_header
+from .base_number import BaseNumber, numpy
+from .base_text import BaseText
+from .array import Array
+from .binary import Binary
+from .boolean import Boolean
+from .dynamic import Dynamic, ANYVALUE, DYNAMIC_TYPES  # noqa
+from .encoded import Encoded
+from .list_type import List
+from . import functions  # pylint: disable=cyclic-import
+
+
+class CompiledFormat:
+    """
+    Encoder and decoder for a data format working on plain python values.
+
+    The data format is translated once into nested functions.
+    Encoding and decoding with these functions doesn't create the variable objects,
+    the results are the same as with :func:`secsgem.secs.variables.functions.generate` and the
+    set/encode and decode/get methods of the variables.
+
+    **Example**::
+
+        >>> import secsgem.secs
+        >>>
+        >>> codec = secsgem.secs.variables.codec.CompiledFormat(
+        ...     [secsgem.secs.data_items.RPTID, [secsgem.secs.data_items.VID]])
+        >>> data = codec.encode({"RPTID": 1, "VID": [10, 11]})
+        >>> data
+        b'\\x01\\x02\\xa5\\x01\\x01\\x01\\x02\\xa5\\x01\\n\\xa5\\x01\\x0b'
+        >>> codec.decode(data)
+        {'RPTID': 1, 'VID': [10, 11]}
+    """
+
+    def __init__(self, data_format):
+        """
+        Initialize a compiled format.
+
+        :param data_format: data format to compile
+        :type data_format: list/Base based class
+        """
+        self.data_format = data_format
+
+        self._encoder, self._decoder = compile_format(data_format)
+
+    def encode(self, value):
+        """
+        Encode a value to secs data.
+
+        :param value: value matching the data format
+        :type value: various
+        :returns: encoded data bytes
+        :rtype: bytes
+        """
+        parts = []
+        self._encoder(value, parts)
+
+        return b"".join(parts)
+
+    def decode(self, data, start=0):
+        """
+        Decode secs data to a value.
+
+        :param data: encoded data bytes
+        :type data: bytes
+        :param start: start position of value the data
+        :type start: integer
+        :returns: decoded value
+        :rtype: various
+        """
+        return self._decoder(data, start)[0]
+
+
+def encode_item_header(format_code, length, name):
+    """
+    Encode an item header.
+
+    :param format_code: format code of the item
+    :type format_code: integer
+    :param length: number of bytes in data
+    :type length: integer
+    :param name: name of the item for error messages
+    :type name: string
+    :returns: encoded item header bytes
+    :rtype: bytes
+    """
+    if length < 0:
+        raise ValueError(f"Encoding {name} not possible, data length too small {length}")
+    if length > 0xFFFFFF:
+        raise ValueError(f"Encoding {name} not possible, data length too big {length}")
+
+    if length > 0xFFFF:
+        return bytes(((format_code << 2) | 3, length >> 16, (length >> 8) & 0xFF, length & 0xFF))
+    if length > 0xFF:
+        return bytes(((format_code << 2) | 2, length >> 8, length & 0xFF))
+
+    return bytes(((format_code << 2) | 1, length))
+
+
+def decode_item_header(data, text_pos, expected_format_code, name):
+    """
+    Decode an item header.
+
+    :param data: encoded data
+    :type data: bytes-like object (bytes, bytearray or memoryview)
+    :param text_pos: start of item header in data
+    :type text_pos: integer
+    :param expected_format_code: format code of the item, negative to accept any format
+    :type expected_format_code: integer
+    :param name: name of the item for error messages
+    :type name: string
+    :returns: start position for next item, format code, length item of data
+    :rtype: (integer, integer, integer)
+    """
+    if len(data) == 0:
+        raise ValueError(f"Decoding for {name} without any text")
+
+    text_pos, format_code, length = parse_item_header(data, text_pos)
+
+    if 0 <= expected_format_code != format_code:
+        raise ValueError(f"Decoding data for {name} ({expected_format_code}) has invalid format {format_code}")
+
+    return text_pos, format_code, length
+
+
+def compile_format(data_format):
+    """
+    Compile a data format to an encoder and a decoder function.
+
+    The encoder is called with the value and a list the encoded parts are appended to.
+    The decoder is called with the data and the start position and returns the value and the next position.
+
+    :param data_format: data format to compile
+    :type data_format: list/Base based class
+    :returns: encoder and decoder
+    :rtype: (function, function)
+    """
+    if isinstance(data_format, list):
+        if len(data_format) == 1:
+            return _compile_array(data_format[0])
+        return _compile_list(data_format)
+    if inspect.isclass(data_format):
+        if issubclass(data_format, Base):
+            return _compile_item(data_format)
+        raise TypeError(f"Can't generate item of class {data_format.__name__}")
+    raise TypeError(f"Can't handle item of class {data_format.__class__.__name__}")
+
+
+def _get_field_name(data_format):
+    if isinstance(data_format, list):
+        if len(data_format) == 1 and not isinstance(data_format[0], list):
+            return data_format[0].__name__
+        if len(data_format) == 1:
+            return List.get_name_from_format(data_format[0])
+        return List.get_name_from_format(data_format)
+
+    return data_format.__name__
+
+
+def _compile_list(data_format):
+    fields = collections.OrderedDict()
+    for item in data_format:
+        if isinstance(item, str):
+            continue
+
+        fields[_get_field_name(item)] = (item, ) + compile_format(item)
+
+    items = list(fields.items())
+    field_count = len(items)
+
+    def encode(value, parts):
+        if isinstance(value, dict):
+            for field_name in value:
+                if field_name not in fields:
+                    raise KeyError(field_name)
+
+            parts.append(encode_item_header(List.format_code, field_count, "List"))
+            for field_name, (item_format, encoder, _) in items:
+                if field_name in value:
+                    encoder(value[field_name], parts)
+                else:
+                    parts.append(functions.generate(item_format).encode())
+        elif isinstance(value, list):
+            if len(value) > field_count:
+                raise ValueError(f"Value has invalid field count (expected: {field_count}, actual: {len(value)})")
+
+            parts.append(encode_item_header(List.format_code, field_count, "List"))
+            for index, (_, (item_format, encoder, _)) in enumerate(items):
+                if index < len(value):
+                    encoder(value[index], parts)
+                else:
+                    parts.append(functions.generate(item_format).encode())
+        else:
+            raise ValueError(f"Invalid value type {type(value).__name__} for List")
+
+    def decode(data, start):
+        (text_pos, _, length) = decode_item_header(data, start, List.format_code, "List")
+
+        if length > field_count:
+            raise ValueError(f"Decoding data for List has invalid field count (expected: {field_count}, "
+                             f"actual: {length})")
+
+        result = {}
+        for index, (field_name, (item_format, _, decoder)) in enumerate(items):
+            if index < length:
+                result[field_name], text_pos = decoder(data, text_pos)
+            else:
+                result[field_name] = functions.generate(item_format).get()
+
+        return result, text_pos
+
+    return encode, decode
+
+
+def _compile_array(item_format):
+    item_encoder, item_decoder = compile_format(item_format)
+
+    def encode(value, parts):
+        if not isinstance(value, list):
+            raise ValueError(f"Invalid value type {type(value).__name__} for Array")
+
+        parts.append(encode_item_header(Array.format_code, len(value), "Array"))
+        for item in value:
+            item_encoder(item, parts)
+
+    def decode(data, start):
+        (text_pos, _, length) = decode_item_header(data, start, Array.format_code, "Array")
+
+        result = []
+        for _ in range(length):
+            item, text_pos = item_decoder(data, text_pos)
+            result.append(item)
+
+        return result, text_pos
+
+    return encode, decode
+
+
+def _compile_item(item_class):
+    if issubclass(item_class, Dynamic):
+        return _compile_dynamic(item_class)
+
+    sample = item_class()
+
+    return _compile_type(item_class, sample.count, item_class.__name__)
+
+
+def _compile_type(var_type, count, name):
+    if issubclass(var_type, BaseNumber):
+        return _compile_number(var_type, count, name)
+    if issubclass(var_type, BaseText):
+        return _compile_text(var_type, count, name)
+    if issubclass(var_type, Binary):
+        return _compile_binary(var_type, count, name)
+    if issubclass(var_type, Boolean):
+        return _compile_boolean(var_type, count, name)
+
+    def encode(value, parts):
+        item = var_type()
+        item.set(value)
+        parts.append(item.encode())
+
+    def decode(data, start):
+        item = var_type()
+        text_pos = item.decode(data, start)
+        return item.get(), text_pos
+
+    return encode, decode
+
+
+def _compile_number(var_type, count, name):
+    # pylint: disable=protected-access
+    format_code = var_type.format_code
+    item_bytes = var_type._bytes
+    struct_code = var_type._struct_code
+
+    def encode(value, parts):
+        values = var_type._convert_value(value, count)
+
+        parts.append(encode_item_header(format_code, len(values) * item_bytes, name))
+        parts.append(struct.pack(f">{len(values)}{struct_code}", *values))
+
+    def decode(data, start):
+        (text_pos, _, length) = decode_item_header(data, start, format_code, name)
+
+        item_count = length // item_bytes
+        end = text_pos + item_count * item_bytes
+
+        if end > len(data):
+            raise ValueError(f"No enough data found for {name} with length {length} at position {start} ")
+
+        if 0 <= count < item_count:
+            raise ValueError(f"Value longer than {count} chars")
+
+        if var_type.use_numpy and numpy is not None:
+            values = numpy.frombuffer(data, dtype=var_type._numpy_dtype(), count=item_count, offset=text_pos)
+        else:
+            values = list(struct.unpack_from(f">{item_count}{struct_code}", data, text_pos))
+
+        if len(values) == 1:
+            return values[0], end
+
+        return values, end
+
+    return encode, decode
+
+
+def _compile_text(var_type, count, name):
+    # pylint: disable=protected-access
+    format_code = var_type.format_code
+    coding = var_type.coding
+
+    def encode(value, parts):
+        text = var_type._convert_value(value, count)
+
+        parts.append(encode_item_header(format_code, len(text), name))
+        parts.append(text.encode(coding))
+
+    def decode(data, start):
+        (text_pos, _, length) = decode_item_header(data, start, format_code, name)
+
+        text = ""
+        if length > 0:
+            text = str(data[text_pos:text_pos + length], coding)
+
+        return var_type._convert_value(text, count), text_pos + length
+
+    return encode, decode
+
+
+def _compile_binary(var_type, count, name):
+    # pylint: disable=protected-access
+    format_code = var_type.format_code
+
+    def encode(value, parts):
+        data = bytearray()
+        if value is not None:
+            data = var_type._convert_value(value, count)
+
+        parts.append(encode_item_header(format_code, len(data), name))
+        parts.append(bytes(data))
+
+    def decode(data, start):
+        (text_pos, _, length) = decode_item_header(data, start, format_code, name)
+
+        value = bytearray()
+        if length > 0:
+            value = var_type._convert_value(bytes(data[text_pos:text_pos + length]), count)
+
+        if len(value) == 1:
+            return value[0], text_pos + length
+
+        return bytes(value), text_pos + length
+
+    return encode, decode
+
+
+def _compile_boolean(var_type, count, name):
+    # pylint: disable=protected-access
+    format_code = var_type.format_code
+
+    def encode(value, parts):
+        values = var_type._convert_value(value, count)
+
+        parts.append(encode_item_header(format_code, len(values), name))
+        parts.append(bytes(1 if item else 0 for item in values))
+
+    def decode(data, start):
+        (text_pos, _, length) = decode_item_header(data, start, format_code, name)
+
+        values = var_type._convert_value([data[text_pos + index] != 0 for index in range(length)], count)
+
+        if len(values) == 1:
+            return values[0], text_pos + length
+
+        return values, text_pos + length
+
+    return encode, decode
+
+
+def _compile_dynamic(item_class):
+    # pylint: disable=protected-access
+    sample = item_class()
+    types = sample.types
+    count = sample.count
+
+    codecs = {}
+
+    def get_codec(var_type):
+        codec = codecs.get(var_type)
+        if codec is None:
+            if var_type is Array:
+                codec = _compile_array(ANYVALUE)
+            else:
+                codec = _compile_type(var_type, count, var_type.__name__)
+            codecs[var_type] = codec
+
+        return codec
+
+    decoders = sample._decoders()
+
+    def encode(value, parts):
+        if isinstance(value, Base):
+            if isinstance(value, Dynamic):
+                value = value.value
+
+            checked = value.variable if isinstance(value, Encoded) else value
+
+            if not isinstance(checked, tuple(types)) and types:
+                raise ValueError(
+                    f"Unsupported type {checked.__class__.__name__} "
+                    f"for this instance of Dynamic, allowed {types}")
+
+            parts.append(value.encode())
+            return
+
+        matched_type = sample._match_type(value)
+
+        if matched_type is None:
+            raise ValueError(
+                f'Value "{value}" of type {value.__class__.__name__} not valid for SecsDynamic with {types}')
+
+        get_codec(matched_type)[0](value, parts)
+
+    def decode(data, start):
+        (_, format_code, _) = decode_item_header(data, start, -1, item_class.__name__)
+
+        var_type = decoders.get(format_code)
+        if var_type is None:
+            raise ValueError(f"Unsupported format {format_code} for this instance of Dynamic, allowed {types}")
+
+        return get_codec(var_type)[1](data, start)
+
+    return encode, decode
@@ -19,6 +19,7 @@ from .base import Base
 from .array import Array
 from .binary import Binary
 from .boolean import Boolean
+from .encoded import Encoded
 from .string import String
 from .u1 import U1
 from .u2 import U2
@@ -31,9 +32,26 @@ from .i8 import I8
 from .f4 import F4
 from .f8 import F8
 
+DYNAMIC_TYPES = [Array, Binary, Boolean, String, I8, I1, I2, I4, F8, F4, U8, U1, U2, U4]
+""" Types a :class:`Dynamic <secsgem.secs.variables.Dynamic>` can be decoded to ."""
+
+MATCH_TYPES = [Boolean, U1, U2, U4, U8, I1, I2, I4, I8, F4, F8, String, Binary]
+""" Types a value is matched against, in this order, if a :class:`Dynamic` allows all types ."""
+
 
 class Dynamic(Base):
-    """Variable with interchangable type."""
+    """
+    Variable with interchangable type.
+
+    The format code to type table and the candidate types for a python type are built once
+    for every set of allowed types and shared by all instances with these types.
+    """
+
+    _decoder_tables = {}
+    """ Format code to type tables by allowed types ."""
+
+    _candidate_tables = {}
+    """ Ordered candidate types by python type of the value and allowed types ."""
 
     def __init__(self, types, value=None, count=-1):
         """
@@ -90,15 +108,6 @@ class Dynamic(Base):
             return hash(self.value.value[0])
         return hash(self.value.value)
 
-    def __type_supported(self, typ):
-        if not self.types:
-            return True
-
-        if typ in self.types:
-            return True
-
-        return False
-
     def set(self, value):
         """
         Set the internal value to the provided value.
@@ -130,9 +139,12 @@ class Dynamic(Base):
 
                 self.value = value.value
             else:
-                if not isinstance(value, tuple(self.types)) and self.types:
+                # encoded variables are checked by the type of the wrapped variable
+                checked = value.variable if isinstance(value, Encoded) else value
+
+                if not isinstance(checked, tuple(self.types)) and self.types:
                     raise ValueError(
-                        f"Unsupported type {value.__class__.__name__} "
+                        f"Unsupported type {checked.__class__.__name__} "
                         f"for this instance of Dynamic, allowed {self.types}")
 
                 self.value = value
@@ -180,56 +192,63 @@ class Dynamic(Base):
         """
         (_, format_code, _) = self.decode_item_header(data, start)
 
-        if format_code == Array.format_code and self.__type_supported(Array):
-            self.value = Array(ANYVALUE)
-        elif format_code == Binary.format_code and self.__type_supported(Binary):
-            self.value = Binary(count=self.count)
-        elif format_code == Boolean.format_code and self.__type_supported(Boolean):
-            self.value = Boolean(count=self.count)
-        elif format_code == String.format_code and self.__type_supported(String):
-            self.value = String(count=self.count)
-        elif format_code == I8.format_code and self.__type_supported(I8):
-            self.value = I8(count=self.count)
-        elif format_code == I1.format_code and self.__type_supported(I1):
-            self.value = I1(count=self.count)
-        elif format_code == I2.format_code and self.__type_supported(I2):
-            self.value = I2(count=self.count)
-        elif format_code == I4.format_code and self.__type_supported(I4):
-            self.value = I4(count=self.count)
-        elif format_code == F8.format_code and self.__type_supported(F8):
-            self.value = F8(count=self.count)
-        elif format_code == F4.format_code and self.__type_supported(F4):
-            self.value = F4(count=self.count)
-        elif format_code == U8.format_code and self.__type_supported(U8):
-            self.value = U8(count=self.count)
-        elif format_code == U1.format_code and self.__type_supported(U1):
-            self.value = U1(count=self.count)
-        elif format_code == U2.format_code and self.__type_supported(U2):
-            self.value = U2(count=self.count)
-        elif format_code == U4.format_code and self.__type_supported(U4):
-            self.value = U4(count=self.count)
-        else:
+        var_type = self._decoders().get(format_code)
+
+        if var_type is None:
             raise ValueError(
                 f"Unsupported format {format_code} for this instance of Dynamic, allowed {self.types}")
 
+        if var_type is Array:
+            self.value = Array(ANYVALUE)
+        else:
+            self.value = var_type(count=self.count)
+
         return self.value.decode(data, start)
 
+    def _decoders(self):
+        """
+        Get the types the allowed format codes are decoded to.
+
+        :returns: types by format code
+        :rtype: dict
+        """
+        key = tuple(self.types)
+
+        decoders = self._decoder_tables.get(key)
+        if decoders is None:
+            decoders = {var_type.format_code: var_type for var_type in DYNAMIC_TYPES
+                        if not key or var_type in key}
+            self._decoder_tables[key] = decoders
+
+        return decoders
+
+    def _candidates(self, value_type):
+        """
+        Get the types a value of a python type might be stored in, the preferred types first.
+
+        :param value_type: python type of the value
+        :type value_type: type
+        :returns: candidate types
+        :rtype: tuple
+        """
+        key = (value_type, tuple(self.types))
+
+        candidates = self._candidate_tables.get(key)
+        if candidates is None:
+            # container types can't be matched from a plain value
+            var_types = [var_type for var_type in (self.types or MATCH_TYPES) if hasattr(var_type, "_supports_value")]
+
+            preferred = [var_type for var_type in var_types if issubclass(value_type, tuple(var_type.preferred_types))]
+            candidates = tuple(preferred + [var_type for var_type in var_types if var_type not in preferred])
+
+            self._candidate_tables[key] = candidates
+
+        return candidates
+
     def _match_type(self, value):
-        var_types = self.types
-        # if no types are set use internal order
-        if not self.types:
-            var_types = [Boolean, U1, U2, U4, U8, I1, I2, I4,
-                         I8, F4, F8, String, Binary]
-
-        # first try to find the preferred type for the kind of value
-        for var_type in var_types:
-            if isinstance(value, tuple(var_type.preferred_types)):
-                if var_type(count=self.count).supports_value(value):
-                    return var_type
-
-        # when no preferred type was found, then try to match any available type
-        for var_type in var_types:
-            if var_type(count=self.count).supports_value(value):
+        # first the preferred types for the kind of value, then any other available type
+        for var_type in self._candidates(type(value)):
+            if var_type._supports_value(value, self.count):  # pylint: disable=protected-access
                 return var_type
 
         return None
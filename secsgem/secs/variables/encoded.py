@@ -0,0 +1,93 @@
+#####################################################################
+# encoded.py
+#
+# (c) Copyright 2021, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""SECS variable with data encoded in advance."""
+
+from .base import Base
+
+
+class Encoded(Base):
+    """
+    Variable encoded once, the encoded data is reused by all messages containing it.
+
+    Wraps a variable of another type, which must not be changed afterwards.
+    :class:`Dynamic <secsgem.secs.variables.Dynamic>` items accept it, if they accept the type of the wrapped variable.
+    The value can't be changed, as it wouldn't match the encoded data any more.
+
+    **Example**::
+
+        >>> import secsgem.secs
+        >>>
+        >>> var = secsgem.secs.variables.Encoded(secsgem.secs.variables.U4(123))
+        >>> var
+        <U4 123 >
+        >>> var.encode()
+        b'\\xb1\\x04\\x00\\x00\\x00{'
+        >>> secsgem.secs.variables.Dynamic([secsgem.secs.variables.U4], var).encode() == var.encode()
+        True
+    """
+
+    def __init__(self, variable, data=None):
+        """
+        Initialize an encoded variable.
+
+        :param variable: variable to wrap
+        :type variable: :class:`secsgem.secs.variables.Base`
+        :param data: encoded data of the variable, encoded from the variable if not set
+        :type data: bytes
+        """
+        super().__init__()
+
+        self.variable = variable
+        self.value = variable.value
+        self.format_code = variable.format_code
+        self.data = variable.encode() if data is None else data
+
+    def __repr__(self):
+        """Generate textual representation for an object of this class."""
+        return repr(self.variable)
+
+    def __len__(self):
+        """Get the length of the wrapped variable."""
+        return len(self.variable)
+
+    def __eq__(self, other):
+        """Check if the wrapped variable is equal to the other object."""
+        if isinstance(other, Encoded):
+            return self.variable == other.variable
+
+        return self.variable == other
+
+    def __hash__(self):
+        """Get hash of the wrapped variable."""
+        return hash(self.variable)
+
+    def get(self):
+        """
+        Get the value of the wrapped variable.
+
+        :returns: value
+        :rtype: various
+        """
+        return self.variable.get()
+
+    def encode(self):
+        """
+        Get the data encoded in advance.
+
+        :returns: encoded data bytes
+        :rtype: bytes
+        """
+        return self.data
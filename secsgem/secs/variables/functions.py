@@ -67,3 +67,41 @@ def get_format(data_format, showname=False):
         raise TypeError(f"Can't generate data_format for class {data_format.__name__}")
 
     raise TypeError(f"Can't handle item of class {data_format.__class__.__name__}")
+
+
+def skip_item(data, start=0):
+    """
+    Get the end position of an encoded item without decoding it.
+
+    Only the item headers are read, lists are skipped including their children.
+
+    :param data: encoded data bytes
+    :type data: bytes
+    :param start: start position of the item in the data
+    :type start: integer
+    :returns: position after the item
+    :rtype: integer
+    """
+    if start >= len(data):
+        raise ValueError(f"No item found at position {start}")
+
+    format_byte = data[start]
+    length_bytes = format_byte & 0b11
+
+    text_pos = start + 1 + length_bytes
+    if text_pos > len(data):
+        raise ValueError(f"No enough data found for item header at position {start}")
+
+    length = int.from_bytes(data[start + 1:text_pos], "big")
+
+    if format_byte >> 2 == list_type.List.format_code:
+        for _ in range(length):
+            text_pos = skip_item(data, text_pos)
+
+        return text_pos
+
+    text_pos += length
+    if text_pos > len(data):
+        raise ValueError(f"No enough data found for item with length {length} at position {start}")
+
+    return text_pos
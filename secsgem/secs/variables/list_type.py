@@ -62,6 +62,8 @@ class List(Base):
         """
         super().__init__()
 
+        self._undecoded = {}
+
         self.name = "DATA"
 
         self.data = self._generate(data_format)
@@ -107,7 +109,7 @@ class List(Base):
         data = ""
 
         for field_name in self.data:
-            data += f"{secsgem.common.indent_block(self.data[field_name].__repr__())}\n"
+            data += f"{secsgem.common.indent_block(self._get_field(field_name).__repr__())}\n"
 
         return f"<{self.text_code} [{len(self.data)}]\n{data}\n>"
 
@@ -118,8 +120,8 @@ class List(Base):
     def __getitem__(self, index):
         """Get an item using the indexer operator."""
         if isinstance(index, int):
-            return self.data[list(self.data.keys())[index]]
-        return self.data[index]
+            return self._get_field(list(self.data.keys())[index])
+        return self._get_field(index)
 
     def __iter__(self):
         """Get an iterator."""
@@ -130,6 +132,8 @@ class List(Base):
         if isinstance(index, int):
             index = list(self.data.keys())[index]
 
+        self._undecoded.pop(index, None)
+
         if isinstance(value, (type(self.data[index]), self.data[index].__class__.__bases__)):
             self.data[index] = value
         elif isinstance(value, Base):
@@ -163,7 +167,7 @@ class List(Base):
     def __getattr__(self, item):
         """Get an item as member of the object."""
         try:
-            return self.data.__getitem__(item)
+            return self._get_field(item)
         except KeyError:
             raise AttributeError(item)  # pylint: disable=raise-missing-from
 
@@ -174,6 +178,8 @@ class List(Base):
             return
 
         if item in self.data:
+            self._undecoded.pop(item, None)
+
             if isinstance(value, (type(self.data[item]), self.data[item].__class__.__bases__)):
                 self.data[item] = value
             elif isinstance(value, Base):
@@ -184,6 +190,26 @@ class List(Base):
         else:
             self.__dict__.__setattr__(item, value)
 
+    def _get_field(self, field_name):
+        """
+        Get a field and decode it, if it wasn't decoded yet.
+
+        :param field_name: name of the field
+        :type field_name: str
+        :returns: field variable
+        :rtype: Base based class
+        """
+        field = self.data[field_name]
+
+        undecoded = self._undecoded.pop(field_name, None)
+        if undecoded is not None:
+            if isinstance(field, (List, array.Array)):
+                field.decode(*undecoded, lazy=True)
+            else:
+                field.decode(*undecoded)
+
+        return field
+
     @staticmethod
     def get_name_from_format(data_format):
         """
@@ -212,14 +238,14 @@ class List(Base):
         if isinstance(value, dict):
             for field_name in value:
                 self.data[field_name].set(value[field_name])
+                self._undecoded.pop(field_name, None)
         elif isinstance(value, list):
             if len(value) > len(self.data):
                 raise ValueError(f"Value has invalid field count (expected: {len(self.data)}, actual: {len(value)})")
 
-            counter = 0
-            for itemvalue in value:
-                self.data[list(self.data.keys())[counter]].set(itemvalue)
-                counter += 1
+            for field_name, itemvalue in zip(list(self.data.keys()), value):
+                self.data[field_name].set(itemvalue)
+                self._undecoded.pop(field_name, None)
         else:
             raise ValueError(f"Invalid value type {type(value).__name__} for {self.__class__.__name__}")
 
@@ -232,7 +258,7 @@ class List(Base):
         """
         data = {}
         for field_name in self.data:
-            data[field_name] = self.data[field_name].get()
+            data[field_name] = self._get_field(field_name).get()
 
         return data
 
@@ -246,26 +272,40 @@ class List(Base):
         result = self.encode_item_header(len(self.data))
 
         for field_name in self.data:
-            result += self.data[field_name].encode()
+            result += self._get_field(field_name).encode()
 
         return result
 
-    def decode(self, data, start=0):
+    def decode(self, data, start=0, lazy=False):
         """
         Decode the secs byte data to the value.
 
+        If lazy is set, only the positions of the fields are read.
+        The fields are decoded when they are accessed the first time.
+
         :param data: encoded data bytes
         :type data: string
         :param start: start position of value the data
         :type start: integer
+        :param lazy: decode the fields on first access
+        :type lazy: boolean
         :returns: new start position
         :rtype: integer
         """
         (text_pos, _, length) = self.decode_item_header(data, start)
 
+        self._undecoded.clear()
+
+        field_names = list(self.data.keys())
+
         # list
         for i in range(length):
-            field_name = list(self.data.keys())[i]
-            text_pos = self.data[field_name].decode(data, text_pos)
+            field_name = field_names[i]
+
+            if lazy:
+                self._undecoded[field_name] = (data, text_pos)
+                text_pos = functions.skip_item(data, text_pos)
+            else:
+                text_pos = self.data[field_name].decode(data, text_pos)
 
         return text_pos
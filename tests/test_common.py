@@ -31,3 +31,42 @@ class TestTopLevelFunctions(unittest.TestCase):
         self.assertEqual(secsgem.common.function_name(secsgem.common.is_windows), "is_windows")
         self.assertEqual(secsgem.common.function_name(self.test_is_windows), "TestTopLevelFunctions.test_is_windows")
 
+
+class TestFysom(unittest.TestCase):
+    def definition(self, callbacks=None):
+        return {
+            'initial': 'green',
+            'events': [
+                {'name': 'warn', 'src': 'green', 'dst': 'yellow'},
+                {'name': 'clear', 'src': ['yellow', 'red'], 'dst': 'green'},
+            ],
+            'callbacks': callbacks or {},
+        }
+
+    def testEvents(self):
+        entered = []
+
+        fsm = secsgem.common.Fysom(self.definition({'onyellow': lambda event: entered.append(event.src)}))
+
+        self.assertEqual(fsm.current, 'green')
+        self.assertTrue(fsm.can('warn'))
+
+        fsm.warn()
+
+        self.assertEqual(fsm.current, 'yellow')
+        self.assertEqual(entered, ['green'])
+
+        with self.assertRaises(secsgem.common.fysom.FysomError):
+            fsm.warn()
+
+        with self.assertRaises(AttributeError):
+            fsm.unknown()
+
+    def testDefinitionShared(self):
+        fsm = secsgem.common.Fysom(self.definition())
+        fsm1 = secsgem.common.Fysom(self.definition())
+
+        fsm.warn()
+
+        self.assertIs(fsm._map, fsm1._map)
+        self.assertEqual(fsm1.current, 'green')
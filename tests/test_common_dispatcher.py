@@ -0,0 +1,234 @@
+#####################################################################
+# test_common_dispatcher.py
+#
+# (c) Copyright 2021, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+
+import threading
+import time
+import unittest
+
+import secsgem.common
+import secsgem.hsms
+import secsgem.secs
+
+from test_connection import HsmsTestServer
+
+
+class TestDispatcher(unittest.TestCase):
+    def setUp(self):
+        self.dispatcher = secsgem.common.Dispatcher("test_dispatcher", workers=4)
+
+    def tearDown(self):
+        self.dispatcher.shutdown()
+
+    def testOrderPerKey(self):
+        results = {key: [] for key in range(5)}
+
+        for index in range(100):
+            for key in range(5):
+                self.dispatcher.dispatch(key, results[key].append, index)
+
+        self.dispatcher.shutdown()
+
+        self.assertTrue(all(result == list(range(100)) for result in results.values()))
+
+    def testKeysRunInParallel(self):
+        release = threading.Event()
+        done = threading.Event()
+
+        self.dispatcher.dispatch("blocked", release.wait, 2)
+        self.dispatcher.dispatch("other", done.set)
+
+        self.assertTrue(done.wait(1))
+        release.set()
+
+    def testException(self):
+        done = threading.Event()
+
+        self.dispatcher.dispatch("key", lambda: 1 / 0)
+        self.dispatcher.dispatch("key", done.set)
+
+        self.assertTrue(done.wait(1))
+        self.dispatcher.shutdown()
+
+        self.assertEqual(self.dispatcher.metrics["failed"], 1)
+
+    def testRejectWhenFull(self):
+        release = threading.Event()
+
+        self.dispatcher.queue_limit = 2
+        self.dispatcher.block = False
+
+        self.assertTrue(self.dispatcher.dispatch("key", release.wait, 2))
+        self.assertTrue(self.dispatcher.dispatch("key", release.wait, 2))
+        self.assertFalse(self.dispatcher.dispatch("key", release.wait, 2))
+
+        release.set()
+        self.dispatcher.shutdown()
+
+        self.assertEqual(self.dispatcher.metrics["rejected"], 1)
+        self.assertEqual(self.dispatcher.metrics["max_queue_depth"], 2)
+
+    def testBlockWhenFull(self):
+        self.dispatcher.queue_limit = 1
+        self.dispatcher.timeout = 2
+
+        self.dispatcher.dispatch("key", time.sleep, 0.1)
+
+        start = time.monotonic()
+        self.assertTrue(self.dispatcher.dispatch("key", time.sleep, 0))
+
+        self.assertGreater(time.monotonic() - start, 0.05)
+
+    def testBlockTimeout(self):
+        release = threading.Event()
+
+        self.dispatcher.queue_limit = 1
+        self.dispatcher.timeout = 0.05
+
+        self.dispatcher.dispatch("key", release.wait, 2)
+
+        self.assertFalse(self.dispatcher.dispatch("key", time.sleep, 0))
+        release.set()
+
+    def testNowaitWhenFull(self):
+        release = threading.Event()
+
+        self.dispatcher.queue_limit = 1
+
+        self.dispatcher.dispatch("key", release.wait, 2)
+
+        start = time.monotonic()
+        self.assertFalse(self.dispatcher.dispatch_nowait("key", time.sleep, 0))
+        self.assertLess(time.monotonic() - start, 0.5)
+
+        release.set()
+
+        self.assertEqual(self.dispatcher.metrics["rejected"], 1)
+
+    def testUnboundedWhenFull(self):
+        release = threading.Event()
+        done = threading.Event()
+
+        self.dispatcher.queue_limit = 1
+
+        self.dispatcher.dispatch("key", release.wait, 2)
+
+        start = time.monotonic()
+        self.assertTrue(self.dispatcher.dispatch_unbounded("key", done.set))
+        self.assertLess(time.monotonic() - start, 0.5)
+
+        release.set()
+
+        self.assertTrue(done.wait(1))
+        self.assertEqual(self.dispatcher.metrics["rejected"], 0)
+        self.assertEqual(self.dispatcher.metrics["max_queue_depth"], 2)
+
+    def testNoBlockingInWorker(self):
+        result = []
+        done = threading.Event()
+
+        self.dispatcher.queue_limit = 1
+
+        def dispatch_from_worker():
+            result.append(self.dispatcher.dispatch("key", time.sleep, 0))
+            done.set()
+
+        self.dispatcher.dispatch("key", dispatch_from_worker)
+
+        self.assertTrue(done.wait(1))
+        self.assertEqual(result, [False])
+
+    def testMetrics(self):
+        for _ in range(10):
+            self.dispatcher.dispatch("key", time.sleep, 0.001)
+
+        self.dispatcher.shutdown()
+
+        metrics = self.dispatcher.metrics
+
+        self.assertEqual(metrics["queue_depth"], 0)
+        self.assertEqual(metrics["dispatched"], 10)
+        self.assertEqual(metrics["completed"], 10)
+        self.assertGreater(metrics["run_time_avg"], 0)
+        self.assertGreaterEqual(metrics["run_time_max"], metrics["run_time_avg"])
+        self.assertIn("queue_depth", repr(self.dispatcher))
+
+
+class TestSecsHandlerDispatcher(unittest.TestCase):
+    def setUp(self):
+        self.server = HsmsTestServer()
+        self.client = secsgem.secs.SecsHandler("127.0.0.1", 5000, False, 0, "test", self.server)
+        self.client.dispatcher = secsgem.common.Dispatcher("test_dispatcher", workers=2, queue_limit=1, block=False)
+
+        self.server.start()
+        self.client.enable()
+        self.server.simulate_connect()
+
+        system_id = self.server.get_next_system_counter()
+        self.server.simulate_packet(secsgem.hsms.HsmsPacket(secsgem.hsms.HsmsSelectReqHeader(system_id)))
+        self.server.expect_packet(system_id=system_id)
+
+        self.release = threading.Event()
+
+    def tearDown(self):
+        self.release.set()
+        self.client.dispatcher.shutdown()
+
+        self.server.stop()
+        self.client.disable()
+
+    def handleS01F01(self, handler, packet):
+        self.release.wait(2)
+        handler.send_response(secsgem.secs.functions.SecsS01F02(), packet.header.system)
+
+    def testAbortWhenFull(self):
+        self.client.register_stream_function(1, 1, self.handleS01F01)
+
+        first = self.server.get_next_system_counter()
+        self.server.simulate_packet(self.server.generate_stream_function_packet(
+            first, secsgem.secs.functions.SecsS01F01()))
+
+        second = self.server.get_next_system_counter()
+        self.server.simulate_packet(self.server.generate_stream_function_packet(
+            second, secsgem.secs.functions.SecsS01F01()))
+
+        packet = self.server.expect_packet(system_id=second)
+
+        self.assertEqual((packet.header.stream, packet.header.function), (1, 0))
+
+        self.release.set()
+        packet = self.server.expect_packet(system_id=first)
+
+        self.assertEqual((packet.header.stream, packet.header.function), (1, 2))
+
+    def testReceiverDoesntBlock(self):
+        self.client.dispatcher.shutdown()
+        self.client.dispatcher = secsgem.common.Dispatcher("test_dispatcher", workers=2, queue_limit=1)
+
+        self.client.register_stream_function(1, 1, self.handleS01F01)
+
+        first = self.server.get_next_system_counter()
+        self.server.simulate_packet(self.server.generate_stream_function_packet(
+            first, secsgem.secs.functions.SecsS01F01()))
+
+        # blocking dispatcher without timeout, the receiver still answers with an abort
+        second = self.server.get_next_system_counter()
+        self.server.simulate_packet(self.server.generate_stream_function_packet(
+            second, secsgem.secs.functions.SecsS01F01()))
+
+        packet = self.server.expect_packet(system_id=second)
+
+        self.assertEqual((packet.header.stream, packet.header.function), (1, 0))
+        self.assertEqual(self.client.dispatcher.metrics["rejected"], 1)
@@ -0,0 +1,187 @@
+#####################################################################
+# test_common_timer_wheel.py
+#
+# (c) Copyright 2021, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+
+import threading
+import time
+import unittest
+
+import secsgem.common
+import secsgem.hsms
+
+from test_connection import HsmsTestServer
+
+
+class TestTimerWheel(unittest.TestCase):
+    def setUp(self):
+        self.wheel = secsgem.common.TimerWheel("test_timer_wheel", resolution=0.01, slots=16)
+
+    def tearDown(self):
+        self.wheel.shutdown()
+
+    def testNeverEarly(self):
+        expired = []
+        done = threading.Event()
+
+        start = time.monotonic()
+        self.wheel.schedule(0.05, lambda: (expired.append(time.monotonic() - start), done.set()))
+
+        self.assertTrue(done.wait(1))
+        self.assertGreaterEqual(expired[0], 0.05)
+
+    def testOrder(self):
+        expired = []
+        done = threading.Event()
+
+        self.wheel.schedule(0.06, done.set)
+        for delay in (0.05, 0.01, 0.03):
+            self.wheel.schedule(delay, expired.append, delay)
+
+        self.assertTrue(done.wait(1))
+        self.assertEqual(expired, [0.01, 0.03, 0.05])
+
+    def testLongerThanRound(self):
+        done = threading.Event()
+
+        # 16 slots of 10 ms, the timer is visited twice before it expires
+        start = time.monotonic()
+        self.wheel.schedule(0.4, done.set)
+
+        self.assertTrue(done.wait(2))
+        self.assertGreaterEqual(time.monotonic() - start, 0.4)
+
+    def testCancel(self):
+        expired = []
+        done = threading.Event()
+
+        timer = self.wheel.schedule(0.02, expired.append, "cancelled")
+        self.wheel.schedule(0.05, done.set)
+
+        self.assertTrue(timer.active)
+        self.assertTrue(timer.cancel())
+        self.assertFalse(timer.active)
+        self.assertFalse(timer.cancel())
+
+        self.assertTrue(done.wait(1))
+        self.assertEqual(expired, [])
+        self.assertEqual(self.wheel.metrics["cancelled"], 1)
+
+    def testException(self):
+        done = threading.Event()
+
+        self.wheel.schedule(0.01, lambda: 1 / 0)
+        self.wheel.schedule(0.02, done.set)
+
+        self.assertTrue(done.wait(1))
+        self.assertEqual(self.wheel.metrics["failed"], 1)
+
+    def testSingleThreadForManyTimers(self):
+        threads = threading.active_count()
+
+        timers = [self.wheel.schedule(10 + index / 1000, lambda: None) for index in range(1000)]
+
+        self.assertEqual(len(self.wheel), 1000)
+        self.assertLessEqual(threading.active_count(), threads + 1)
+
+        for timer in timers:
+            timer.cancel()
+
+        self.assertEqual(len(self.wheel), 0)
+
+    def testRestartAfterShutdown(self):
+        done = threading.Event()
+
+        self.wheel.schedule(0.01, lambda: None)
+        self.wheel.shutdown()
+
+        self.wheel.schedule(0.01, done.set)
+
+        self.assertTrue(done.wait(1))
+
+    def testRepr(self):
+        self.assertIn("pending", repr(self.wheel))
+        self.assertIn("remaining", repr(self.wheel.schedule(1, lambda: None)))
+
+
+class TestHsmsHandlerTimers(unittest.TestCase):
+    def setUp(self):
+        self.server = HsmsTestServer()
+
+        self.client = secsgem.hsms.HsmsHandler("127.0.0.1", 5000, False, 0, "test", self.server)
+
+        self.server.start()
+        self.client.enable()
+
+    def tearDown(self):
+        self.server.stop()
+        self.client.disable()
+
+    def testNotSelectedTimeout(self):
+        self.server.connection.T7 = 0.1
+
+        disconnected = threading.Event()
+        self.client.events.hsms_disconnected += lambda *_: disconnected.set()
+
+        self.server.simulate_connect()
+
+        self.assertTrue(disconnected.wait(2))
+        self.assertTrue(self.client.connectionState.is_NOT_CONNECTED())
+
+    def testSelectStopsNotSelectedTimer(self):
+        self.server.connection.T7 = 0.1
+
+        self.server.simulate_connect()
+
+        system_id = self.server.get_next_system_counter()
+        self.server.simulate_packet(secsgem.hsms.HsmsPacket(secsgem.hsms.HsmsSelectReqHeader(system_id)))
+
+        self.assertIsNone(self.client.notSelectedTimer)
+
+        time.sleep(0.2)
+
+        self.assertTrue(self.client.connectionState.is_CONNECTED_SELECTED())
+
+    def testSelectAfterNotSelectedTimeout(self):
+        self.server.simulate_connect()
+
+        # T7 expired, the connection isn't closed yet when the select request is received
+        self.client.connection.disconnect = lambda: None
+        self.client._on_t7_timeout()
+
+        system_id = self.server.get_next_system_counter()
+        self.server.simulate_packet(secsgem.hsms.HsmsPacket(secsgem.hsms.HsmsSelectReqHeader(system_id)))
+
+        packet = self.server.expect_packet(system_id=system_id)
+
+        self.assertEqual(packet.header.sType, 0x07)
+        self.assertTrue(self.client.connectionState.is_NOT_CONNECTED())
+
+        del self.client.connection.disconnect
+
+    def testUnansweredLinktestRepeated(self):
+        self.client.disable()
+
+        self.client.linktestTimeout = 0.05
+        self.client.enable()
+
+        # the linktest request isn't answered, the next one is sent after T6
+        self.server.connection.T6 = 0.1
+        self.server.simulate_connect()
+
+        first = self.server.expect_packet(s_type=0x05)
+        second = self.server.expect_packet(s_type=0x05)
+
+        self.assertNotEqual(first.header.system, second.header.system)
+        self.assertNotIn(first.header.system, self.client.transactions)
@@ -15,7 +15,9 @@
 #####################################################################
 """Contains class for connection test."""
 
+import concurrent.futures
 import logging
+import time
 
 import datetime
 
@@ -68,9 +70,12 @@ class HsmsTestConnection(object):
 
         self.packets = []
 
+        self.lastReceived = None
+
     def simulate_connect(self):
         # send connection enabled event
         if self.delegate and hasattr(self.delegate, 'on_connection_established') and callable(getattr(self.delegate, 'on_connection_established')):
+            self.lastReceived = time.monotonic()
             self.delegate.on_connection_established(self)
 
         self.connected = True
@@ -79,6 +84,8 @@ class HsmsTestConnection(object):
         self.disconnect()
 
     def simulate_packet(self, packet):
+        self.lastReceived = time.monotonic()
+
         if self.delegate and hasattr(self.delegate, 'on_connection_packet_received') and callable(getattr(self.delegate, 'on_connection_packet_received')):
             self.delegate.on_connection_packet_received(self, packet)
 
@@ -101,6 +108,12 @@ class HsmsTestConnection(object):
 
         return True
 
+    def send_packet_nowait(self, packet, priority=None):
+        future = concurrent.futures.Future()
+        future.set_result(self.send_packet(packet))
+
+        return future
+
     def disconnect(self):
         if self.connected:
             # notify listeners of disconnection
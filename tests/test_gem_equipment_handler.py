@@ -15,12 +15,16 @@
 #####################################################################
 
 import datetime
+import shutil
+import tempfile
 import threading
+import time
 import unittest.mock
 
 from dateutil.tz import tzlocal
 from dateutil.parser import parse
 
+import secsgem.common
 import secsgem.secs
 import secsgem.gem
 
@@ -592,6 +596,27 @@ class TestGemEquipmentHandlerPassiveControlState(unittest.TestCase):
         self.assertIsNotNone(SV10)
         self.assertEqual(SV10.get(), 123)
 
+    def testStatusVariableWithBatchCallback(self):
+        self.setupTestStatusVariables(True)
+        self.establishCommunication()
+
+        requests = []
+
+        def on_sv_values_request(svs):
+            requests.append([sv.svid for sv in svs])
+            return [sv.value_type(sv.value) for sv in svs]
+
+        self.client.on_sv_values_request = on_sv_values_request
+
+        function = self.sendSVRequest(["SV2", "asdfg", 10, 1001])
+
+        self.assertEqual(requests, [["SV2", 10]])
+
+        self.assertEqual(function[0].get(), u"sample sv")
+        self.assertEqual(function[1].get(), [])
+        self.assertEqual(function[2].get(), 123)
+        self.assertEqual(len(function[3].get()), 16)
+
     def testStatusVariableInvalid(self):
         self.setupTestStatusVariables()        
         self.establishCommunication()
@@ -1220,6 +1245,151 @@ class TestGemEquipmentHandlerPassiveControlState(unittest.TestCase):
         self.assertEqual(function.RPT[0].V[0].get(), 31337)
         self.assertEqual(function.RPT[0].V[1].get(), 123)
 
+    def testCollectionEventRequestReportBatchCallback(self):
+        self.setupTestDataValues(True)
+        self.setupTestCollectionEvents()
+        self.setupTestStatusVariables(True)
+        self.establishCommunication()
+
+        requests = []
+
+        def on_sv_values_request(svs):
+            requests.append([sv.svid for sv in svs])
+            return [sv.value_type(sv.value) for sv in svs]
+
+        def on_dv_values_request(dvs):
+            requests.append([dv.dvid for dv in dvs])
+            return [dv.value_type(dv.value) for dv in dvs]
+
+        self.client.on_sv_values_request = on_sv_values_request
+        self.client.on_dv_values_request = on_dv_values_request
+
+        self.sendCEDefineReport(vid=[30, 10, "SV2"])
+        self.sendCELinkReport()
+        self.sendCEEnableReport()
+
+        function = self.sendCERequestReport()
+
+        self.assertEqual(requests, [[10, "SV2"], [30]])
+        self.assertEqual(function.RPT[0].V[0].get(), 31337)
+        self.assertEqual(function.RPT[0].V[1].get(), 123)
+        self.assertEqual(function.RPT[0].V[2].get(), u"sample sv")
+
+    def testBatchCallbackValueCount(self):
+        self.setupTestStatusVariables(True)
+
+        self.client.on_sv_values_request = lambda svs: []
+
+        with self.assertRaises(ValueError):
+            self.client._get_sv_values(list(self.client.status_variables.values()))
+
+    def testSetValues(self):
+        self.setupTestStatusVariables()
+        self.setupTestDataValues()
+        self.setupTestCollectionEvents()
+        self.establishCommunication()
+
+        version = self.client.set_values(svs={10: 456, "SV2": "pushed sv"}, dvs={30: 42})
+
+        self.assertEqual(self.client.variable_store.snapshot().version_of(("SV", 10)), version)
+
+        function = self.sendSVRequest([10, "SV2"])
+
+        self.assertEqual(function[0].get(), 456)
+        self.assertEqual(function[1].get(), u"pushed sv")
+
+        self.sendCEDefineReport(vid=[30, 10])
+        self.sendCELinkReport()
+        self.sendCEEnableReport()
+
+        function = self.sendCERequestReport()
+
+        self.assertEqual(function.RPT[0].V[0].get(), 42)
+        self.assertEqual(function.RPT[0].V[1].get(), 456)
+
+    def testSetValuesUnknown(self):
+        self.setupTestStatusVariables()
+
+        with self.assertRaises(ValueError):
+            self.client.set_values(svs={10: 1, 11: 2})
+
+        with self.assertRaises(ValueError):
+            self.client.set_values(dvs={30: 1})
+
+        self.assertEqual(len(self.client.variable_store), 0)
+
+    def testStatusVariableMaxAge(self):
+        self.setupTestStatusVariables(True)
+        self.client.status_variables[10].max_age = 60
+        self.establishCommunication()
+
+        requests = []
+
+        def on_sv_values_request(svs):
+            requests.append([sv.svid for sv in svs])
+            return [sv.value_type(sv.value) for sv in svs]
+
+        self.client.on_sv_values_request = on_sv_values_request
+
+        self.sendSVRequest([10, "SV2"])
+        self.client.status_variables[10].value = 456
+        function = self.sendSVRequest([10, "SV2"])
+
+        self.assertEqual(requests, [[10, "SV2"], ["SV2"]])
+        self.assertEqual(function[0].get(), 123)
+
+        self.client.invalidate_values(svids=[10])
+        function = self.sendSVRequest([10])
+
+        self.assertEqual(requests[-1], [10])
+        self.assertEqual(function[0].get(), 456)
+
+        metrics = self.client.value_cache.metrics
+        self.assertEqual(metrics["hits"], 1)
+        self.assertEqual(metrics["misses"], 2)
+        self.assertEqual(metrics["invalidated"], 1)
+
+    def testStatusVariableMaxAgeReusedVariable(self):
+        self.setupTestStatusVariables(True)
+        self.client.status_variables[10].max_age = 60
+        self.establishCommunication()
+
+        # the application returns the same variable for each request and changes it
+        variable = secsgem.secs.variables.U4(123)
+        self.client.on_sv_value_request = lambda svid, sv: variable
+
+        self.sendSVRequest([10])
+        variable.set(456)
+
+        function = self.sendSVRequest([10])
+
+        self.assertEqual(function[0].get(), 123)
+        self.assertNotIn("encode", variable.__dict__)
+        self.assertEqual(variable.encode(), secsgem.secs.variables.U4(456).encode())
+
+    def testDataValueMaxAgeExpired(self):
+        self.setupTestDataValues(True)
+        self.client.data_values[30].max_age = 0.05
+
+        requests = []
+
+        self.client.on_dv_value_request = lambda dvid, dv: requests.append(dvid) or dv.value_type(dv.value)
+
+        self.client._get_dv_value(self.client.data_values[30])
+        self.client._get_dv_value(self.client.data_values[30])
+
+        self.assertEqual(requests, [30])
+
+        time.sleep(0.1)
+        self.client._get_dv_value(self.client.data_values[30])
+
+        self.assertEqual(requests, [30, 30])
+        self.assertEqual(self.client.value_cache.metrics["expired"], 1)
+
+        self.client.invalidate_values()
+
+        self.assertEqual(len(self.client.value_cache), 0)
+
     def testCollectionEventTrigger(self):
         self.setupTestDataValues()
         self.setupTestCollectionEvents()
@@ -1253,6 +1423,245 @@ class TestGemEquipmentHandlerPassiveControlState(unittest.TestCase):
         self.assertEqual(function.RPT[0].RPTID.get(), 1000)
         self.assertEqual(function.RPT[0].V[0].get(), 31337)
 
+    def testCollectionEventTriggerCallbackException(self):
+        self.setupTestDataValues(True)
+        self.setupTestCollectionEvents()
+        self.establishCommunication()
+
+        self.sendCEDefineReport()
+        self.sendCELinkReport()
+        self.sendCEEnableReport()
+
+        def on_dv_value_request(dvid, dv):
+            raise RuntimeError("backend not available")
+
+        self.client.on_dv_value_request = on_dv_value_request
+
+        with self.assertRaises(RuntimeError):
+            self.client.trigger_collection_events(50)
+
+        self.assertEqual(self.client.collection_event_pipeline.outstanding, 0)
+
+    def testCollectionEventPipelineWindow(self):
+        self.setupTestDataValues()
+        self.setupTestCollectionEvents()
+        self.establishCommunication()
+
+        self.sendCEDefineReport()
+        self.sendCELinkReport()
+        self.sendCEEnableReport()
+
+        # a single worker, which isn't blocked by the full window
+        self.client.dispatcher = secsgem.common.Dispatcher("test_dispatcher", workers=1)
+        self.addCleanup(self.client.dispatcher.shutdown)
+
+        self.client.collection_event_pipeline.window = 2
+        self.client.systemCounter = 0
+
+        futures = self.client.trigger_collection_events_nowait([50, 50, 50, 51])
+
+        first = self.server.expect_packet(function=11)
+        second = self.server.expect_packet(function=11)
+
+        # third report is held back until the first one is acknowledged
+        time.sleep(0.1)
+        self.assertNotIn(11, [packet.header.function for packet in self.server.connection.packets])
+        self.assertEqual(self.client.collection_event_pipeline.outstanding, 2)
+        self.assertEqual(self.client.collection_event_pipeline.pending, 1)
+
+        done = threading.Event()
+        self.client.dispatcher.dispatch("other", done.set)
+        self.assertTrue(done.wait(1))
+
+        self.server.simulate_packet(self.server.generate_stream_function_packet(
+            first.header.system, secsgem.secs.functions.SecsS06F12(0)))
+
+        third = self.server.expect_packet(function=11)
+
+        self.server.simulate_packet(self.server.generate_stream_function_packet(
+            third.header.system, secsgem.secs.functions.SecsS06F12(0)))
+        self.server.simulate_packet(self.server.generate_stream_function_packet(
+            second.header.system, secsgem.secs.functions.SecsS06F12(1)))
+
+        self.assertEqual([first.header.system, second.header.system, third.header.system], [1, 2, 3])
+        self.assertEqual([future.result(1).get() for future in futures[:3]], [0, 1, 0])
+
+        # collection event 51 is not enabled
+        self.assertIsNone(futures[3].result(1))
+
+    def sendSpoolReset(self, streams_functions):
+        system_id = self.server.get_next_system_counter()
+        self.server.simulate_packet(self.server.generate_stream_function_packet(system_id, secsgem.secs.functions.SecsS02F43(streams_functions)))
+
+        packet = self.server.expect_packet(system_id=system_id)
+
+        self.assertIsNotNone(packet)
+        self.assertEqual(packet.header.stream, 2)
+        self.assertEqual(packet.header.function, 44)
+
+        return self.client.secs_decode(packet)
+
+    def sendSpoolRequest(self, rsdc):
+        system_id = self.server.get_next_system_counter()
+        self.server.simulate_packet(self.server.generate_stream_function_packet(system_id, secsgem.secs.functions.SecsS06F23(rsdc)))
+
+        packet = self.server.expect_packet(system_id=system_id)
+
+        self.assertIsNotNone(packet)
+        self.assertEqual(packet.header.stream, 6)
+        self.assertEqual(packet.header.function, 24)
+
+        return self.client.secs_decode(packet)
+
+    def setupSpool(self):
+        path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, path)
+
+        self.client.spool = secsgem.gem.Spool(path)
+        self.addCleanup(self.client.spool.close)
+
+    def testSpoolResetNotAllowed(self):
+        self.establishCommunication()
+
+        function = self.sendSpoolReset([{"STRID": 6, "FCNID": [11]}])
+
+        self.assertEqual(function.RSPACK.get(), secsgem.secs.data_items.RSPACK.REJECTED)
+        self.assertEqual(function.DATA[0].STRACK.get(), secsgem.secs.data_items.STRACK.SPOOLING_NOT_ALLOWED)
+
+    def testSpoolResetErrors(self):
+        self.setupSpool()
+        self.establishCommunication()
+
+        function = self.sendSpoolReset([{"STRID": 1, "FCNID": []}, {"STRID": 99, "FCNID": []},
+                                        {"STRID": 6, "FCNID": [11, 99]}, {"STRID": 5, "FCNID": [2]},
+                                        {"STRID": 10, "FCNID": []}])
+
+        self.assertEqual(function.RSPACK.get(), secsgem.secs.data_items.RSPACK.REJECTED)
+        self.assertEqual([(stream.STRID.get(), stream.STRACK.get(), stream.FCNID.get()) for stream in function.DATA],
+                         [(1, secsgem.secs.data_items.STRACK.SPOOLING_NOT_ALLOWED, []),
+                          (99, secsgem.secs.data_items.STRACK.STREAM_UNKNOWN, []),
+                          (6, secsgem.secs.data_items.STRACK.FUNCTION_UNKNOWN, [99]),
+                          (5, secsgem.secs.data_items.STRACK.SECONDARY_FUNCTION, [2])])
+        self.assertEqual(self.client.spool_streams_functions, {})
+
+    def testSpoolReset(self):
+        self.setupSpool()
+        self.establishCommunication()
+
+        function = self.sendSpoolReset([{"STRID": 6, "FCNID": [11]}, {"STRID": 5, "FCNID": []}])
+
+        self.assertEqual(function.RSPACK.get(), secsgem.secs.data_items.RSPACK.ACCEPTED)
+        self.assertEqual(self.client.spool_streams_functions, {6: {11}, 5: set()})
+
+        self.sendSpoolReset([])
+
+        self.assertEqual(self.client.spool_streams_functions, {})
+
+    def testSpoolRequestNoData(self):
+        self.setupSpool()
+        self.establishCommunication()
+
+        function = self.sendSpoolRequest(secsgem.secs.data_items.RSDC.TRANSMIT)
+
+        self.assertEqual(function.get(), secsgem.secs.data_items.RSDA.DENIED_NO_DATA)
+
+    def spoolCollectionEvents(self):
+        self.setupSpool()
+        self.setupTestDataValues()
+        self.setupTestCollectionEvents()
+        self.establishCommunication()
+
+        self.sendCEDefineReport()
+        self.sendCELinkReport()
+        self.sendCEEnableReport()
+        self.sendSpoolReset([{"STRID": 6, "FCNID": [11]}])
+
+        self.server.simulate_disconnect()
+
+        self.client.trigger_collection_events([50])
+        self.client.trigger_collection_events([50])
+
+        self.assertEqual(len(self.client.spool), 2)
+
+        self.establishCommunication()
+
+        # spooling continues until the spool is empty
+        self.client.trigger_collection_events([50])
+
+        self.assertEqual(len(self.client.spool), 3)
+
+    def testSpoolTransmit(self):
+        self.spoolCollectionEvents()
+
+        function = self.sendSpoolRequest(secsgem.secs.data_items.RSDC.TRANSMIT)
+
+        self.assertEqual(function.get(), secsgem.secs.data_items.RSDA.ACK)
+
+        for _ in range(3):
+            packet = self.server.expect_packet(function=11)
+
+            self.assertEqual(self.client.secs_decode(packet).CEID.get(), 50)
+
+            self.server.simulate_packet(self.server.generate_stream_function_packet(
+                packet.header.system, secsgem.secs.functions.SecsS06F12(0)))
+
+        for _ in range(100):
+            if len(self.client.spool) == 0 and not self.client._spool_transmitting:
+                break
+            time.sleep(0.01)
+
+        self.assertEqual(len(self.client.spool), 0)
+
+        # spooling stopped, the report is sent
+        futures = self.client.trigger_collection_events_nowait([50])
+
+        packet = self.server.expect_packet(function=11)
+        self.server.simulate_packet(self.server.generate_stream_function_packet(
+            packet.header.system, secsgem.secs.functions.SecsS06F12(0)))
+
+        self.assertEqual(futures[0].result(1).get(), 0)
+
+    def testSpoolTransmitRejected(self):
+        self.spoolCollectionEvents()
+
+        # the request is handled by the only slot of the queue, the transmission can't be queued
+        self.client.dispatcher = secsgem.common.Dispatcher("test_dispatcher", workers=2, queue_limit=1)
+        self.addCleanup(self.client.dispatcher.shutdown)
+
+        function = self.sendSpoolRequest(secsgem.secs.data_items.RSDC.TRANSMIT)
+
+        self.assertEqual(function.get(), secsgem.secs.data_items.RSDA.DENIED_BUSY)
+        self.assertFalse(self.client._spool_transmitting)
+        self.assertEqual(len(self.client.spool), 3)
+        self.assertEqual(self.client.dispatcher.metrics["rejected"], 1)
+
+    def testSpoolTransmitMax(self):
+        self.spoolCollectionEvents()
+
+        self.client.spool_max_transmit = 1
+
+        self.sendSpoolRequest(secsgem.secs.data_items.RSDC.TRANSMIT)
+
+        packet = self.server.expect_packet(function=11)
+        self.server.simulate_packet(self.server.generate_stream_function_packet(
+            packet.header.system, secsgem.secs.functions.SecsS06F12(0)))
+
+        for _ in range(100):
+            if not self.client._spool_transmitting:
+                break
+            time.sleep(0.01)
+
+        self.assertEqual(len(self.client.spool), 2)
+        self.assertNotIn(11, [packet.header.function for packet in self.server.connection.packets])
+
+    def testSpoolPurge(self):
+        self.spoolCollectionEvents()
+
+        function = self.sendSpoolRequest(secsgem.secs.data_items.RSDC.PURGE)
+
+        self.assertEqual(function.get(), secsgem.secs.data_items.RSDA.ACK)
+        self.assertEqual(len(self.client.spool), 0)
+
     def setupTestEquipmentConstants(self, use_callback = False):
         self.client.equipment_constants.update({
             20: secsgem.gem.EquipmentConstant(20, "sample1, numeric ECID, I4", 0, 500, 50, "degrees", secsgem.secs.variables.I4, use_callback),
@@ -15,8 +15,10 @@
 #####################################################################
 
 import threading
+import time
 import unittest
 
+import secsgem.common
 import secsgem.hsms
 import secsgem.secs
 import secsgem.gem
@@ -278,3 +280,53 @@ class TestGemHandlerPassive(unittest.TestCase, GemHandlerPassiveGroup):
     def tearDown(self):
         self.client.disable()
         self.server.stop()
+
+
+class TestGemHandlerTimeouts(unittest.TestCase):
+    def setUp(self):
+        self.server = HsmsTestServer()
+
+        self.client = secsgem.gem.GemHandler("127.0.0.1", 5000, False, 0, "test", self.server)
+        self.client.dispatcher = secsgem.common.Dispatcher("test_dispatcher", workers=1, queue_limit=1)
+
+        self.release = threading.Event()
+
+        self.server.start()
+        self.client.enable()
+
+    def tearDown(self):
+        self.release.set()
+
+        self.client.disable()
+        self.server.stop()
+
+        self.client.dispatcher.shutdown()
+
+    def testWaitCraTimeoutWithFullQueue(self):
+        self.server.connection.T3 = 0.1
+
+        # busy worker, the queue is full
+        self.client.dispatcher.dispatch("busy", self.release.wait, 5)
+
+        self.server.simulate_connect()
+
+        system_id = self.server.get_next_system_counter()
+        self.server.simulate_packet(secsgem.hsms.HsmsPacket(secsgem.hsms.HsmsSelectReqHeader(system_id)))
+
+        self.assertIsNotNone(self.server.expect_packet(function=13))
+
+        # the expired T3 doesn't block the timer thread
+        done = threading.Event()
+        self.client.timers.schedule(0.3, done.set)
+
+        self.assertTrue(done.wait(2))
+        self.assertEqual(self.client.communicationState.current, "WAIT_CRA")
+
+        # the timeout isn't lost
+        self.release.set()
+
+        end = time.monotonic() + 2
+        while self.client.communicationState.current != "WAIT_DELAY" and time.monotonic() < end:
+            time.sleep(0.01)
+
+        self.assertEqual(self.client.communicationState.current, "WAIT_DELAY")
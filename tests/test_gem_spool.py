@@ -0,0 +1,177 @@
+#####################################################################
+# test_gem_spool.py
+#
+# (c) Copyright 2021, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+
+import os
+import shutil
+import tempfile
+import unittest
+import unittest.mock
+
+import secsgem.gem
+
+
+class TestSpool(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def testAppendPeekRemove(self):
+        spool = secsgem.gem.Spool(self.path)
+
+        for index in range(5):
+            self.assertTrue(spool.append(6, 11, bytes([index]) * index, index % 2 == 0))
+
+        self.assertEqual(len(spool), 5)
+        self.assertEqual(spool.peek(2), [(6, 11, True, b""), (6, 11, False, b"\x01")])
+
+        spool.remove(2)
+
+        self.assertEqual(len(spool), 3)
+        self.assertEqual(spool.peek(10), [(6, 11, True, b"\x02\x02"), (6, 11, False, b"\x03" * 3),
+                                          (6, 11, True, b"\x04" * 4)])
+
+        spool.remove(3)
+
+        self.assertEqual(len(spool), 0)
+        self.assertEqual(spool.peek(10), [])
+
+        spool.close()
+
+    def testSegments(self):
+        spool = secsgem.gem.Spool(self.path, segment_size=64)
+
+        for index in range(20):
+            spool.append(5, 1, bytes([index]) * 10)
+
+        self.assertGreater(len([name for name in os.listdir(self.path) if name.endswith(".segment")]), 1)
+        self.assertEqual([data[0] for _, _, _, data in spool.peek(20)], list(range(20)))
+
+        spool.remove(15)
+
+        self.assertEqual([data[0] for _, _, _, data in spool.peek(20)], list(range(15, 20)))
+        self.assertEqual(len([name for name in os.listdir(self.path) if name.endswith(".segment")]), 2)
+
+        spool.close()
+
+    def testLargeMessage(self):
+        spool = secsgem.gem.Spool(self.path, segment_size=64)
+
+        spool.append(6, 11, b"\x01" * 1000)
+        spool.append(6, 11, b"\x02")
+
+        self.assertEqual(spool.peek(2), [(6, 11, True, b"\x01" * 1000), (6, 11, True, b"\x02")])
+
+        spool.close()
+
+    def testReopen(self):
+        spool = secsgem.gem.Spool(self.path, segment_size=64)
+
+        for index in range(20):
+            spool.append(6, 11, bytes([index]) * 10)
+
+        spool.remove(7)
+        spool.flush()
+        spool.close()
+
+        spool = secsgem.gem.Spool(self.path, segment_size=64)
+
+        self.assertEqual(len(spool), 13)
+        self.assertEqual([data[0] for _, _, _, data in spool.peek(20)], list(range(7, 20)))
+
+        spool.append(6, 11, b"\xff")
+
+        self.assertEqual(spool.peek(20)[-1], (6, 11, True, b"\xff"))
+
+        spool.close()
+
+    def testMaxMessages(self):
+        spool = secsgem.gem.Spool(self.path, max_messages=2)
+
+        self.assertTrue(spool.append(6, 11, b"\x01"))
+        self.assertTrue(spool.append(6, 11, b"\x02"))
+        self.assertTrue(spool.full)
+        self.assertFalse(spool.append(6, 11, b"\x03"))
+
+        self.assertEqual([data for _, _, _, data in spool.peek(10)], [b"\x01", b"\x02"])
+
+        spool.close()
+
+    def testMaxMessagesOverwrite(self):
+        spool = secsgem.gem.Spool(self.path, max_messages=2, overwrite=True)
+
+        for data in [b"\x01", b"\x02", b"\x03"]:
+            self.assertTrue(spool.append(6, 11, data))
+
+        self.assertEqual([data for _, _, _, data in spool.peek(10)], [b"\x02", b"\x03"])
+
+        spool.close()
+
+    def testHeadWrittenLazily(self):
+        spool = secsgem.gem.Spool(self.path, max_messages=10, overwrite=True, head_interval=100)
+
+        for index in range(10):
+            spool.append(6, 11, bytes([index]))
+
+        with unittest.mock.patch("os.replace", wraps=os.replace) as replace:
+            for index in range(10, 60):
+                spool.append(6, 11, bytes([index]))
+
+            self.assertEqual(replace.call_count, 0)
+
+            # not closed, the outdated head loads the removed messages again
+            reopened = secsgem.gem.Spool(self.path)
+            self.assertEqual([data[0] for _, _, _, data in reopened.peek(100)], list(range(60)))
+            reopened.close()
+
+            spool.flush()
+            self.assertEqual(replace.call_count, 1)
+
+        reopened = secsgem.gem.Spool(self.path)
+        self.assertEqual([data[0] for _, _, _, data in reopened.peek(100)], list(range(50, 60)))
+        reopened.close()
+
+        spool.close()
+
+    def testHeadWrittenAfterInterval(self):
+        spool = secsgem.gem.Spool(self.path, head_interval=5)
+
+        for index in range(20):
+            spool.append(6, 11, bytes([index]))
+
+        spool.remove(7)
+
+        reopened = secsgem.gem.Spool(self.path)
+        self.assertEqual(len(reopened), 13)
+        reopened.close()
+
+        spool.close()
+
+    def testPurge(self):
+        spool = secsgem.gem.Spool(self.path, segment_size=64)
+
+        for index in range(20):
+            spool.append(6, 11, bytes([index]) * 10)
+
+        spool.purge()
+
+        self.assertEqual(len(spool), 0)
+        self.assertEqual([name for name in os.listdir(self.path) if name.endswith(".segment")], [])
+
+        spool.close()
+
+        self.assertEqual(len(secsgem.gem.Spool(self.path)), 0)
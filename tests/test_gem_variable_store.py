@@ -0,0 +1,87 @@
+#####################################################################
+# test_gem_variable_store.py
+#
+# (c) Copyright 2021, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+
+import threading
+import unittest
+
+import secsgem.gem
+
+
+class TestVariableStore(unittest.TestCase):
+    def setUp(self):
+        self.store = secsgem.gem.VariableStore()
+
+    def testVersions(self):
+        self.assertEqual(self.store.update({"a": 1, "b": 2}), 1)
+        self.assertEqual(self.store.update({"a": 3}), 2)
+
+        snapshot = self.store.snapshot()
+
+        self.assertEqual(snapshot.version, 2)
+        self.assertEqual(snapshot.version_of("a"), 2)
+        self.assertEqual(snapshot.version_of("b"), 1)
+        self.assertEqual(snapshot.version_of("c"), 0)
+
+    def testSnapshotUnchanged(self):
+        self.store.update({"a": 1})
+        snapshot = self.store.snapshot()
+
+        self.store.update({"a": 2})
+        self.store.remove(["a"])
+
+        self.assertEqual(snapshot.get("a"), 1)
+        self.assertNotIn("a", self.store.snapshot())
+        self.assertEqual(self.store.get("a", "missing"), "missing")
+
+    def testSnapshotShared(self):
+        self.store.update({"a": 1})
+
+        self.assertIs(self.store.snapshot(), self.store.snapshot())
+
+        self.store.update({"a": 2})
+        self.store.snapshot()
+
+        self.assertEqual(self.store.metrics["updates"], 2)
+        self.assertEqual(self.store.metrics["snapshots"], 2)
+
+    def testConsistentWhileUpdating(self):
+        keys = list(range(500))
+        stop = threading.Event()
+
+        def writer():
+            value = 0
+            while not stop.is_set():
+                value += 1
+                self.store.update(dict.fromkeys(keys, value))
+
+        self.store.update(dict.fromkeys(keys, 0))
+
+        thread = threading.Thread(target=writer, name="TestVariableStore_writer")
+        thread.start()
+
+        try:
+            for _ in range(200):
+                snapshot = self.store.snapshot()
+
+                self.assertEqual(len({snapshot.get(key) for key in keys}), 1)
+                self.assertEqual(len({snapshot.version_of(key) for key in keys}), 1)
+        finally:
+            stop.set()
+            thread.join()
+
+    def testRepr(self):
+        self.assertIn("version", repr(self.store))
+        self.assertIn("version", repr(self.store.snapshot()))
@@ -0,0 +1,188 @@
+#####################################################################
+# test_hsms_async_handler.py
+#
+# (c) Copyright 2021, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+
+import asyncio
+import unittest
+
+import secsgem.hsms
+import secsgem.secs
+from secsgem.hsms.connectionstatemachine import STATE_NOT_CONNECTED, STATE_CONNECTED_NOT_SELECTED
+
+
+class EchoHandler(secsgem.hsms.AsyncHsmsHandler):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.received = []
+
+    def _on_hsms_packet_received(self, packet):
+        self.received.append(packet)
+
+        if packet.header.requireResponse:
+            self.send_response(secsgem.secs.functions.SecsS01F02(), packet.header.system)
+
+
+class TestAsyncHsmsHandler(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+        self.passive = EchoHandler("127.0.0.1", 0, False, 0, "passive")
+        self.active = None
+
+    def tearDown(self):
+        if self.active is not None:
+            self.run_async(self.active.disable())
+        self.run_async(self.passive.disable())
+
+        self.loop.close()
+        asyncio.set_event_loop(None)
+
+    def run_async(self, coroutine, timeout=5):
+        return self.loop.run_until_complete(asyncio.wait_for(coroutine, timeout))
+
+    def connect(self):
+        self.run_async(self.passive.enable())
+
+        self.active = EchoHandler("127.0.0.1", self.passive.connection.local_port, True, 0, "active")
+        self.run_async(self.active.enable())
+
+        self.assertTrue(self.run_async(self.active.waitfor_selected(2)))
+        self.assertTrue(self.run_async(self.passive.waitfor_selected(2)))
+
+    def testSelect(self):
+        self.connect()
+
+        self.assertTrue(self.active.connectionState.is_CONNECTED_SELECTED())
+        self.assertTrue(self.passive.connectionState.is_CONNECTED_SELECTED())
+
+    def testSendAndWaitforResponse(self):
+        self.connect()
+
+        response = self.run_async(self.active.send_and_waitfor_response(secsgem.secs.functions.SecsS01F01()))
+
+        self.assertIsNot(response, None)
+        self.assertEqual(response.header.stream, 1)
+        self.assertEqual(response.header.function, 2)
+        self.assertEqual(len(self.passive.received), 1)
+        self.assertEqual(self.active._systemFutures, {})
+
+    def testManyConcurrentRequests(self):
+        self.connect()
+
+        async def send_all():
+            return await asyncio.gather(*[self.active.send_and_waitfor_response(secsgem.secs.functions.SecsS01F01())
+                                          for _ in range(100)])
+
+        responses = self.run_async(send_all())
+
+        self.assertEqual(len(responses), 100)
+        self.assertTrue(all(response.header.function == 2 for response in responses))
+        self.assertEqual(len({response.header.system for response in responses}), 100)
+
+    def testReplyTimeout(self):
+        self.connect()
+
+        self.active.connection.T3 = 0.1
+        self.passive._on_hsms_packet_received = lambda packet: None
+
+        response = self.run_async(self.active.send_and_waitfor_response(secsgem.secs.functions.SecsS01F01()))
+
+        self.assertIs(response, None)
+        self.assertEqual(self.active._systemFutures, {})
+
+    def testLinktest(self):
+        self.connect()
+
+        response = self.run_async(self.active.send_linktest_req())
+
+        self.assertIsNot(response, None)
+        self.assertEqual(response.header.sType, 0x06)
+
+    def testLinktestTimer(self):
+        self.passive.linktestTimeout = 0.1
+        self.connect()
+
+        received = []
+        self.active.send_linktest_rsp = lambda system_id: received.append(system_id)
+
+        self.run_async(asyncio.sleep(0.35))
+
+        self.assertGreaterEqual(len(received), 2)
+
+    def testDeselect(self):
+        self.connect()
+
+        response = self.run_async(self.active.send_deselect_req())
+
+        self.assertEqual(response.header.sType, 0x04)
+        self.assertEqual(self.active.connectionState.state, STATE_CONNECTED_NOT_SELECTED)
+        self.assertEqual(self.passive.connectionState.state, STATE_CONNECTED_NOT_SELECTED)
+
+    def testSeparate(self):
+        self.connect()
+
+        self.run_async(self.active.disable())
+
+        async def wait_disconnected():
+            while self.passive.connected:
+                await asyncio.sleep(0.01)
+
+        self.run_async(wait_disconnected())
+
+        self.assertEqual(self.passive.connectionState.state, STATE_NOT_CONNECTED)
+
+    def testNotSelectedTimeout(self):
+        self.passive.connection.T7 = 0.1
+        self.run_async(self.passive.enable())
+
+        async def connect_raw():
+            reader, writer = await asyncio.open_connection("127.0.0.1", self.passive.connection.local_port)
+            data = await reader.read()
+            writer.close()
+            return data
+
+        # passive side closes the connection after T7 without any select
+        self.assertEqual(self.run_async(connect_raw()), secsgem.hsms.HsmsPacket(
+            secsgem.hsms.HsmsSeparateReqHeader(self.passive.systemCounter)).encode())
+
+    def testIntercharacterTimeout(self):
+        self.passive.connection.T8 = 0.1
+        self.run_async(self.passive.enable())
+
+        async def connect_raw():
+            reader, writer = await asyncio.open_connection("127.0.0.1", self.passive.connection.local_port)
+            # send only part of a message
+            writer.write(b"\x00\x00\x00\x0a\xff\xff")
+            data = await reader.read()
+            writer.close()
+            return data
+
+        # connection is closed without separate request
+        self.assertEqual(self.run_async(connect_raw()), b"")
+        self.assertFalse(self.passive.connected)
+
+    def testInvalidLength(self):
+        self.run_async(self.passive.enable())
+
+        async def connect_raw():
+            reader, writer = await asyncio.open_connection("127.0.0.1", self.passive.connection.local_port)
+            writer.write(b"\x00\x00\x00\x02\xff\xff")
+            data = await reader.read()
+            writer.close()
+            return data
+
+        self.assertEqual(self.run_async(connect_raw()), b"")
@@ -253,3 +253,25 @@ class TestConnectionStateMachine(unittest.TestCase):
 
         f.assert_called()
 
+    def testCallbackOrder(self):
+        calls = []
+
+        self.stateMachine2 = secsgem.hsms.connectionstatemachine.ConnectionStateMachine({
+            'on_enter_CONNECTED': lambda: calls.append(('enter', self.stateMachine2.state)),
+            'on_exit_CONNECTED': lambda: calls.append(('exit', self.stateMachine2.state)),
+            'on_enter_CONNECTED_SELECTED': lambda: calls.append(('select', self.stateMachine2.state))})
+        self.stateMachine2.connect()
+        self.stateMachine2.select()
+        self.stateMachine2.deselect()
+        self.stateMachine2.select()
+        self.stateMachine2.disconnect()
+
+        self.assertEqual(calls, [
+            ('enter', secsgem.hsms.connectionstatemachine.STATE_CONNECTED_NOT_SELECTED),
+            ('select', secsgem.hsms.connectionstatemachine.STATE_CONNECTED_SELECTED),
+            ('select', secsgem.hsms.connectionstatemachine.STATE_CONNECTED_SELECTED),
+            ('exit', secsgem.hsms.connectionstatemachine.STATE_CONNECTED_SELECTED)])
+
+    def testStateOnlyPerInstance(self):
+        self.assertFalse(hasattr(self.stateMachine, "__dict__"))
+        self.assertTrue(self.stateMachine.is_NOT_CONNECTED())
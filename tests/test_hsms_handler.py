@@ -15,7 +15,8 @@
 #####################################################################
 
 import threading
-import unittest
+import time
+import unittest.mock
 
 import secsgem.hsms
 
@@ -62,6 +63,84 @@ class TestHsmsHandlerPassive(unittest.TestCase):
         self.assertEqual(packet.header.sType, 0x05)
         self.assertEqual(packet.header.sessionID, 0xffff)
 
+    def testLinktestMetrics(self):
+        self.client.disable()
+
+        self.client.linktestTimeout = 0.1
+        self.client.enable()
+
+        self.server.simulate_connect()
+
+        packet = self.server.expect_packet(s_type=0x05)
+        self.server.simulate_packet(secsgem.hsms.HsmsPacket(secsgem.hsms.HsmsLinktestRspHeader(packet.header.system)))
+
+        metrics = self.client.linktest_metrics
+
+        self.assertEqual(metrics["answered"], 1)
+        self.assertEqual(metrics["failed"], 0)
+        self.assertGreaterEqual(metrics["rtt_last"], 0)
+        self.assertEqual(metrics["rtt_last"], metrics["rtt_max"])
+        self.assertLess(metrics["idle_time"], 1)
+
+    def testLinktestOnIdle(self):
+        self.client.disable()
+
+        self.client.linktestTimeout = 0.2
+        self.client.linktestOnIdle = True
+        self.client.enable()
+
+        self.server.simulate_connect()
+
+        # traffic on the link, no linktest required
+        for _ in range(10):
+            time.sleep(0.05)
+            self.server.simulate_packet(secsgem.hsms.HsmsPacket(secsgem.hsms.HsmsLinktestRspHeader(0)))
+
+        self.assertEqual([packet for packet in self.server.connection.packets if packet.header.sType == 0x05], [])
+        self.assertGreater(self.client.linktest_metrics["skipped"], 0)
+
+        # idle link, linktest is sent
+        self.assertIsNotNone(self.server.expect_packet(s_type=0x05))
+        self.assertEqual(self.client.linktest_metrics["sent"], 1)
+
+    def testLinktestIdleTime(self):
+        self.client.disable()
+
+        self.client.linktestTimeout = 0.1
+        self.client.linktestIdleTime = 0.5
+        self.client.linktestOnIdle = True
+        self.client.enable()
+
+        self.server.simulate_connect()
+
+        # link idle for longer than the interval, but not for the idle time
+        for _ in range(5):
+            time.sleep(0.2)
+            self.server.simulate_packet(secsgem.hsms.HsmsPacket(secsgem.hsms.HsmsLinktestRspHeader(0)))
+
+        self.assertEqual([packet for packet in self.server.connection.packets if packet.header.sType == 0x05], [])
+        self.assertGreater(self.client.linktest_metrics["skipped"], 0)
+
+        # idle link, linktest is sent
+        self.assertIsNotNone(self.server.expect_packet(s_type=0x05))
+        self.assertEqual(self.client.linktest_metrics["sent"], 1)
+
+    def testLinktestIdleTimeJitter(self):
+        self.client.linktestIdleTime = 10
+        self.client.linktestOnIdle = True
+        self.client.connection.lastReceived = time.monotonic()
+
+        # data was received just now, collect the delays until the link is checked again
+        with unittest.mock.patch.object(self.client, "_start_linktest_timer") as start_linktest_timer:
+            for _ in range(10):
+                self.client._on_linktest_timer()
+
+        delays = [call.args[0] for call in start_linktest_timer.call_args_list]
+
+        self.assertEqual(len(delays), 10)
+        self.assertGreater(max(delays) - min(delays), 0.01)
+        self.assertTrue(all(8.9 < delay <= 10 for delay in delays))
+
     def testSelect(self):
         self.server.simulate_connect()
 
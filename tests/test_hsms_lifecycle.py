@@ -0,0 +1,201 @@
+#####################################################################
+# test_hsms_lifecycle.py
+#
+# (c) Copyright 2021, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+
+import socket
+import threading
+import time
+import unittest
+
+from secsgem.hsms.active_connection import HsmsActiveConnection
+from secsgem.hsms.lifecycle import HsmsConnectionLifecycle
+from secsgem.hsms.passive_connection import HsmsPassiveConnection
+
+
+def free_port():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+
+    return port
+
+
+class Delegate(object):
+    def __init__(self):
+        self.established = threading.Event()
+        self.closed = threading.Event()
+
+    def on_connection_established(self, _):
+        self.established.set()
+
+    def on_connection_closed(self, _):
+        self.closed.set()
+
+
+class TestHsmsConnectionLifecycle(unittest.TestCase):
+    def testInitialPhase(self):
+        lifecycle = HsmsConnectionLifecycle()
+
+        self.assertEqual(lifecycle.phase, HsmsConnectionLifecycle.NOT_CONNECTED)
+        self.assertEqual(lifecycle.durations, {})
+
+    def testDurations(self):
+        lifecycle = HsmsConnectionLifecycle()
+
+        lifecycle.enter(HsmsConnectionLifecycle.CONNECTING)
+        time.sleep(0.05)
+        lifecycle.enter(HsmsConnectionLifecycle.STARTING)
+
+        self.assertEqual(lifecycle.phase, HsmsConnectionLifecycle.STARTING)
+        self.assertGreaterEqual(lifecycle.get_duration(HsmsConnectionLifecycle.CONNECTING), 0.05)
+        self.assertIsNone(lifecycle.get_duration(HsmsConnectionLifecycle.STARTING))
+
+    def testCounts(self):
+        lifecycle = HsmsConnectionLifecycle()
+
+        for _ in range(3):
+            lifecycle.enter(HsmsConnectionLifecycle.CONNECTING)
+            lifecycle.enter(HsmsConnectionLifecycle.NOT_CONNECTED)
+
+        self.assertEqual(lifecycle.counts[HsmsConnectionLifecycle.CONNECTING], 3)
+
+    def testRepr(self):
+        self.assertIn("NOT_CONNECTED", repr(HsmsConnectionLifecycle()))
+
+
+class TestHsmsConnectionPhases(unittest.TestCase):
+    def setUp(self):
+        port = free_port()
+
+        self.passiveDelegate = Delegate()
+        self.activeDelegate = Delegate()
+
+        self.passive = HsmsPassiveConnection("127.0.0.1", port, 0, self.passiveDelegate, "127.0.0.1")
+        self.active = HsmsActiveConnection("127.0.0.1", port, 0, self.activeDelegate)
+
+    def tearDown(self):
+        self.active.disable()
+        self.passive.disable()
+
+    def connect(self):
+        self.passive.enable()
+        self.assertTrue(self._wait_phase(self.passive, HsmsConnectionLifecycle.CONNECTING))
+
+        self.active.enable()
+
+        self.assertTrue(self.activeDelegate.established.wait(2))
+        self.assertTrue(self.passiveDelegate.established.wait(2))
+
+    @staticmethod
+    def _wait_phase(connection, phase):
+        end = time.time() + 2
+        while connection.lifecycle.phase != phase:
+            if time.time() > end:
+                return False
+            time.sleep(0.01)
+
+        return True
+
+    def testConnectPhases(self):
+        self.connect()
+
+        for connection in (self.active, self.passive):
+            self.assertEqual(connection.lifecycle.phase, HsmsConnectionLifecycle.CONNECTED)
+            self.assertIsNotNone(connection.lifecycle.get_duration(HsmsConnectionLifecycle.CONNECTING))
+            self.assertIsNotNone(connection.lifecycle.get_duration(HsmsConnectionLifecycle.STARTING))
+
+    def testDisconnectPhases(self):
+        self.connect()
+
+        self.active.disable()
+
+        self.assertTrue(self.passiveDelegate.closed.wait(2))
+        self.assertEqual(self.active.lifecycle.phase, HsmsConnectionLifecycle.NOT_CONNECTED)
+        self.assertIsNotNone(self.active.lifecycle.get_duration(HsmsConnectionLifecycle.DISCONNECTING))
+        self.assertTrue(self._wait_phase(self.passive, HsmsConnectionLifecycle.CONNECTING))
+
+    def testDisableDoesNotSpin(self):
+        self.connect()
+
+        wall = time.time()
+        cpu = time.process_time()
+
+        self.active.disable()
+        self.passive.disable()
+
+        wall = time.time() - wall
+        cpu = time.process_time() - cpu
+
+        self.assertFalse(self.active.receiverThread.is_alive())
+        self.assertFalse(self.active.connectionThread.is_alive())
+        self.assertLess(cpu, max(wall / 2, 0.05))
+
+    def testDisableWhileReconnecting(self):
+        self.active.T5 = 30
+        self.active.enable()
+
+        # connection attempt fails, the next attempt waits T5 on the timer wheel
+        self.assertTrue(self._wait_phase(self.active, HsmsConnectionLifecycle.NOT_CONNECTED))
+
+        start = time.time()
+        self.active.disable()
+
+        self.assertLess(time.time() - start, 1)
+        self.assertFalse(self.active.connectionThread.is_alive())
+        self.assertIsNone(self.active.connectTimer)
+
+    def testConnectTimerAfterDisable(self):
+        self.active.T5 = 30
+        self.active.enable()
+        self.assertTrue(self._wait_phase(self.active, HsmsConnectionLifecycle.NOT_CONNECTED))
+        self.active.connectionThread.join(2)
+
+        # timer fired while disable was running
+        timer = self.active.connectTimer
+        self.active.enabled = False
+        self.active._HsmsActiveConnection__on_connect_timer()
+        timer.cancel()
+
+        self.assertFalse(self.active.connectionThread.is_alive())
+        self.assertIs(self.active.connectTimer, timer)
+
+        self.active.disable()
+
+    def testReconnectAfterT5(self):
+        self.active.T5 = 0.1
+        self.active.enable()
+
+        # first attempt fails, passive connection is enabled before the next attempt
+        self.assertTrue(self._wait_phase(self.active, HsmsConnectionLifecycle.NOT_CONNECTED))
+        self.passive.enable()
+
+        self.assertTrue(self.activeDelegate.established.wait(2))
+
+    def testIncompleteMessageClosedAfterT8(self):
+        self.passive.T8 = 0.1
+        self.passive.enable()
+        self.assertTrue(self._wait_phase(self.passive, HsmsConnectionLifecycle.CONNECTING))
+
+        with socket.create_connection(("127.0.0.1", self.passive.remotePort)) as sock:
+            self.assertTrue(self.passiveDelegate.established.wait(2))
+
+            # length and part of the header of a linktest request
+            sock.sendall(b"\x00\x00\x00\x0a\xff\xff")
+
+            self.assertTrue(self.passiveDelegate.closed.wait(2))
+
+        # passive connection listens for the next connection
+        self.assertTrue(self._wait_phase(self.passive, HsmsConnectionLifecycle.CONNECTING))
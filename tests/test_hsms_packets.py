@@ -14,6 +14,8 @@
 # GNU Lesser General Public License for more details.
 #####################################################################
 
+import struct
+
 import secsgem.hsms
 
 import unittest
@@ -259,3 +261,32 @@ class TestHsmsPacket(unittest.TestCase):
         packet = secsgem.hsms.HsmsPacket.decode(b"\x00\x00\x00\n\x00d\x81\x01\x00\x00\x00\x00\x00{")
 
         assert str(packet) == "'header': {sessionID:0x0064, stream:01, function:01, pType:0x00, sType:0x00, system:0x0000007b, requireResponse:True}"
+
+    def testNoInstanceDict(self):
+        packet = secsgem.hsms.HsmsPacket(secsgem.hsms.HsmsStreamFunctionHeader(1, 1, 1, True, 0))
+
+        self.assertFalse(hasattr(packet, "__dict__"))
+        self.assertFalse(hasattr(packet.header, "__dict__"))
+
+    def testDecodeHeader(self):
+        header = secsgem.hsms.HsmsPacket.decode_header(
+            memoryview(b"\x00\x00\x00\x0c\x00\x01\x86\x0b\x00\x00\x00\x00\x00\x03\x01\x00"))
+
+        self.assertEqual((header.sessionID, header.stream, header.function, header.requireResponse, header.system),
+                         (1, 6, 11, True, 3))
+
+    def testDecodeReusedBuffer(self):
+        buffer = bytearray(b"\x00\x00\x00\x0c\x00\x01\x86\x0b\x00\x00\x00\x00\x00\x03\x01\x00")
+
+        with memoryview(buffer) as view:
+            packet = secsgem.hsms.HsmsPacket.decode(view)
+
+        # the data of the packet is not a view of the buffer
+        buffer[14:16] = b"\xff\xff"
+        buffer.extend(b"\x00" * 100)
+
+        self.assertEqual(packet.data, b"\x01\x00")
+        self.assertEqual(packet.header.function, 11)
+
+    def testDecodeTruncated(self):
+        self.assertRaises(struct.error, secsgem.hsms.HsmsPacket.decode, b"\x00\x00\x00\x0c\x00\x01\x86")
@@ -0,0 +1,235 @@
+#####################################################################
+# test_hsms_reactor.py
+#
+# (c) Copyright 2021, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+
+import socket
+import threading
+import time
+import unittest
+
+import secsgem.hsms
+from secsgem.hsms.connectionstatemachine import STATE_CONNECTED_SELECTED, STATE_NOT_CONNECTED
+from secsgem.hsms.multi_passive_server import HsmsMultiPassiveServer
+from secsgem.hsms.reactor import HsmsReactor
+from secsgem.hsms.receive_buffer import HsmsReceiveBuffer
+
+
+def wait_for(condition, timeout=2):
+    end = time.time() + timeout
+    while not condition():
+        if time.time() > end:
+            return False
+        time.sleep(0.01)
+
+    return True
+
+
+class TestHsmsReactor(unittest.TestCase):
+    def setUp(self):
+        self.reactor = HsmsReactor(workers=4)
+        self.reactor.start()
+
+    def tearDown(self):
+        self.reactor.stop()
+
+    def testDispatchInOrder(self):
+        results = {key: [] for key in range(10)}
+        done = threading.Event()
+
+        for index in range(100):
+            for key in range(10):
+                self.reactor.dispatch(key, results[key].append, index)
+
+        self.reactor.dispatch(0, done.set)
+
+        self.assertTrue(done.wait(2))
+        self.assertTrue(wait_for(lambda: all(len(result) == 100 for result in results.values())))
+        self.assertTrue(all(result == list(range(100)) for result in results.values()))
+
+    def testDispatchException(self):
+        done = threading.Event()
+
+        self.reactor.dispatch("key", lambda: 1 / 0)
+        self.reactor.dispatch("key", done.set)
+
+        self.assertTrue(done.wait(2))
+
+    def testReader(self):
+        receiver, sender = socket.socketpair()
+        received = []
+        done = threading.Event()
+
+        def on_readable():
+            received.append(receiver.recv(1024))
+            done.set()
+
+        self.reactor.add_reader(receiver, on_readable)
+        sender.send(b"data")
+
+        self.assertTrue(done.wait(2))
+        self.assertEqual(received, [b"data"])
+
+        self.assertTrue(self.reactor.remove_reader(receiver))
+        self.assertFalse(self.reactor.remove_reader(receiver))
+
+        receiver.close()
+        sender.close()
+
+    def testStopRunsPendingWork(self):
+        results = []
+
+        for index in range(10):
+            self.reactor.dispatch("key", results.append, index)
+
+        self.reactor.stop()
+
+        self.assertEqual(results, list(range(10)))
+        self.assertFalse(self.reactor.running)
+
+
+class TestHsmsMultiPassiveServerReactor(unittest.TestCase):
+    def setUp(self):
+        self.server = HsmsMultiPassiveServer(0, "127.0.0.1", reactor=True, workers=2)
+        self.handler = secsgem.hsms.HsmsHandler("127.0.0.1", 5000, False, 0, "test", self.server)
+
+        self.server.start()
+        self.handler.enable()
+
+        self.sock = None
+
+    def tearDown(self):
+        self.handler.disable()
+        self.server.stop()
+
+        if self.sock:
+            self.sock.close()
+
+    def connect(self):
+        self.sock = socket.create_connection(("127.0.0.1", self.server.local_port))
+        self.sock.settimeout(2)
+
+        self.assertTrue(wait_for(lambda: self.handler.connected))
+
+    def send(self, packet):
+        self.sock.sendall(packet.encode())
+
+    def receive(self):
+        buffer = HsmsReceiveBuffer()
+
+        while True:
+            messages = [secsgem.hsms.HsmsPacket.decode(message) for message in buffer.messages()]
+            if messages:
+                return messages[0]
+
+            data = self.sock.recv(1024)
+            if not data:
+                return None
+
+            buffer.append(data)
+
+    def select(self):
+        self.send(secsgem.hsms.HsmsPacket(secsgem.hsms.HsmsSelectReqHeader(1)))
+        response = self.receive()
+
+        self.assertEqual(response.header.sType, 0x02)
+        self.assertTrue(wait_for(lambda: self.handler.connectionState.state == STATE_CONNECTED_SELECTED))
+
+    def testSelect(self):
+        self.connect()
+        self.select()
+
+    def testLinktest(self):
+        self.connect()
+        self.select()
+
+        self.send(secsgem.hsms.HsmsPacket(secsgem.hsms.HsmsLinktestReqHeader(2)))
+        response = self.receive()
+
+        self.assertEqual(response.header.sType, 0x06)
+        self.assertEqual(response.header.system, 2)
+
+    def testNoReceiverThread(self):
+        self.connect()
+        self.select()
+
+        names = [thread.name for thread in threading.enumerate()]
+
+        self.assertFalse([name for name in names if name.startswith("secsgem_hsmsConnection_receiver")])
+        self.assertLessEqual(len([name for name in names if name.startswith(self.server.reactor.name)]), 3)
+
+    def testThreadCountWithManySessions(self):
+        handlers = [secsgem.hsms.HsmsHandler(f"127.0.0.{index}", 5000, False, 0, f"test{index}", self.server)
+                    for index in range(2, 6)]
+
+        for handler in handlers:
+            handler.enable()
+
+        self.connect()
+        self.select()
+
+        threads = threading.active_count()
+        socks = []
+
+        try:
+            for index in range(2, 6):
+                sock = socket.create_connection(("127.0.0.1", self.server.local_port),
+                                                source_address=(f"127.0.0.{index}", 0))
+                sock.settimeout(2)
+                socks.append(sock)
+
+                sock.sendall(secsgem.hsms.HsmsPacket(secsgem.hsms.HsmsSelectReqHeader(1)).encode())
+                self.assertEqual(sock.recv(14)[9], 0x02)
+
+            self.assertTrue(wait_for(lambda: all(connection.connected
+                                                 for connection in self.server.connections.values())))
+            self.assertEqual(threading.active_count(), threads)
+        finally:
+            for sock in socks:
+                sock.close()
+
+            for handler in handlers:
+                handler.disable()
+
+    def testRemoteClose(self):
+        self.connect()
+        self.select()
+
+        self.sock.close()
+        self.sock = None
+
+        self.assertTrue(wait_for(lambda: not self.handler.connected))
+        self.assertEqual(self.handler.connectionState.state, STATE_NOT_CONNECTED)
+
+    def testLocalDisconnect(self):
+        self.connect()
+        self.select()
+
+        self.handler.connection.disconnect()
+
+        response = self.receive()
+
+        self.assertEqual(response.header.sType, 0x09)
+        self.assertIs(self.receive(), None)
+        self.assertFalse(self.handler.connected)
+
+    def testReconnect(self):
+        self.connect()
+        self.select()
+
+        self.sock.close()
+        self.assertTrue(wait_for(lambda: not self.handler.connected))
+
+        self.connect()
+        self.select()
@@ -0,0 +1,151 @@
+#####################################################################
+# test_hsms_receive_buffer.py
+#
+# (c) Copyright 2021, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+
+import unittest
+
+import secsgem.hsms
+from secsgem.hsms.receive_buffer import HsmsReceiveBuffer
+
+
+class FakeSocket(object):
+    def __init__(self, data, chunk_size):
+        self.data = data
+        self.chunk_size = chunk_size
+        self.pos = 0
+
+    def recv_into(self, buffer, nbytes=0):
+        if nbytes == 0:
+            nbytes = len(buffer)
+
+        length = min(nbytes, self.chunk_size, len(self.data) - self.pos)
+        buffer[:length] = self.data[self.pos:self.pos + length]
+        self.pos += length
+
+        return length
+
+
+def stream_function_packet(system, data):
+    return secsgem.hsms.HsmsPacket(secsgem.hsms.HsmsStreamFunctionHeader(system, 6, 11, True, 0), data)
+
+
+class TestHsmsReceiveBuffer(unittest.TestCase):
+    def testEmpty(self):
+        buffer = HsmsReceiveBuffer()
+
+        self.assertEqual(len(buffer), 0)
+        self.assertEqual(list(buffer.messages()), [])
+
+    def testAllocatedOnFirstUse(self):
+        buffer = HsmsReceiveBuffer(1024)
+
+        self.assertEqual(buffer.capacity, 0)
+
+        buffer.append(b"\x00\x00")
+
+        self.assertEqual(buffer.capacity, 1024)
+
+    def testPartialLength(self):
+        buffer = HsmsReceiveBuffer()
+        buffer.append(b"\x00\x00")
+
+        self.assertEqual(list(buffer.messages()), [])
+        self.assertEqual(len(buffer), 2)
+
+    def testSingleMessage(self):
+        packet = secsgem.hsms.HsmsPacket(secsgem.hsms.HsmsLinktestReqHeader(2))
+
+        buffer = HsmsReceiveBuffer()
+        buffer.append(packet.encode())
+
+        messages = [secsgem.hsms.HsmsPacket.decode(message) for message in buffer.messages()]
+
+        self.assertEqual(len(messages), 1)
+        self.assertEqual(messages[0].header.sType, 5)
+        self.assertEqual(messages[0].header.system, 2)
+        self.assertEqual(len(buffer), 0)
+
+    def testMessagesExactLength(self):
+        data = b"".join(stream_function_packet(system, bytes([system]) * system).encode() for system in range(1, 20))
+
+        buffer = HsmsReceiveBuffer()
+        buffer.append(data)
+
+        for system, message in enumerate(buffer.messages(), 1):
+            self.assertEqual(len(message), 14 + system)
+
+            packet = secsgem.hsms.HsmsPacket.decode(message)
+            self.assertEqual(packet.header.system, system)
+            self.assertEqual(packet.data, bytes([system]) * system)
+
+    def testChunkedReceive(self):
+        packets = [stream_function_packet(system, bytes(range(256)) * system) for system in range(1, 30)]
+        sock = FakeSocket(b"".join(packet.encode() for packet in packets), 7)
+
+        buffer = HsmsReceiveBuffer(16)
+        received = []
+
+        while buffer.recv_from(sock, 16) > 0:
+            received += [secsgem.hsms.HsmsPacket.decode(message) for message in buffer.messages()]
+
+        self.assertEqual([packet.header.system for packet in received], list(range(1, 30)))
+        self.assertEqual([packet.data for packet in received], [packet.data for packet in packets])
+        self.assertEqual(len(buffer), 0)
+
+    def testLargeMessageGrowsOnce(self):
+        packet = stream_function_packet(1, b"\xaa" * 5 * 1024 * 1024)
+        sock = FakeSocket(packet.encode(), 64 * 1024)
+
+        buffer = HsmsReceiveBuffer(64 * 1024)
+        received = []
+
+        while buffer.recv_from(sock, 64 * 1024) > 0:
+            received += [secsgem.hsms.HsmsPacket.decode(message) for message in buffer.messages()]
+
+        self.assertEqual(len(received), 1)
+        self.assertEqual(received[0].data, packet.data)
+        self.assertLess(buffer.capacity, 2 * len(packet.encode()))
+
+    def testBufferReused(self):
+        buffer = HsmsReceiveBuffer(1024)
+
+        for system in range(100):
+            buffer.append(stream_function_packet(system, b"\x00" * 500).encode())
+            self.assertEqual(len(list(buffer.messages())), 1)
+
+        self.assertEqual(buffer.capacity, 1024)
+
+    def testMessageTooLarge(self):
+        buffer = HsmsReceiveBuffer(max_message_size=1024)
+        buffer.append(b"\x00\x00\x04\x01")
+
+        with self.assertRaises(ValueError):
+            list(buffer.messages())
+
+        self.assertLessEqual(buffer.capacity, 64 * 1024)
+
+    def testMessageTooShort(self):
+        buffer = HsmsReceiveBuffer()
+        buffer.append(b"\x00\x00\x00\x02\x00\x00")
+
+        with self.assertRaises(ValueError):
+            list(buffer.messages())
+
+    def testClear(self):
+        buffer = HsmsReceiveBuffer()
+        buffer.append(b"\x00\x00\x00")
+        buffer.clear()
+
+        self.assertEqual(len(buffer), 0)
@@ -0,0 +1,154 @@
+#####################################################################
+# test_hsms_trace.py
+#
+# (c) Copyright 2021, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+
+import contextlib
+import io
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+import unittest.mock
+
+import secsgem.hsms
+import secsgem.secs
+from secsgem.hsms.trace import HsmsTraceReader, HsmsTraceWriter, format_record, main
+
+from test_connection import HsmsTestServer
+
+
+class TestHsmsTrace(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "communication.trace")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def testRoundTrip(self):
+        packets = [
+            secsgem.hsms.HsmsPacket(secsgem.hsms.HsmsSelectReqHeader(1)),
+            secsgem.hsms.HsmsPacket(secsgem.hsms.HsmsStreamFunctionHeader(2, 1, 2, False, 0),
+                                    secsgem.secs.functions.SecsS01F02(["MDLN", "SOFTREV"]).encode()),
+        ]
+
+        with HsmsTraceWriter(self.path) as trace:
+            trace.write("<", packets[0], 1.0)
+            trace.write(">", packets[1], 2.0)
+
+        records = list(HsmsTraceReader(self.path))
+
+        self.assertEqual([(timestamp, direction) for timestamp, direction, _ in records], [(1.0, "<"), (2.0, ">")])
+        self.assertEqual([packet.encode() for _, _, packet in records], [packet.encode() for packet in packets])
+
+    def testAppend(self):
+        packet = secsgem.hsms.HsmsPacket(secsgem.hsms.HsmsLinktestReqHeader(1))
+
+        for _ in range(2):
+            with HsmsTraceWriter(self.path) as trace:
+                trace.write(">", packet)
+
+        self.assertEqual(len(list(HsmsTraceReader(self.path))), 2)
+
+    def testInvalidFile(self):
+        with open(self.path, "wb") as trace_file:
+            trace_file.write(b"invalid")
+
+        with self.assertRaises(ValueError):
+            list(HsmsTraceReader(self.path))
+
+    def testFormatRecord(self):
+        packet = secsgem.hsms.HsmsPacket(secsgem.hsms.HsmsStreamFunctionHeader(2, 1, 2, False, 0),
+                                         secsgem.secs.functions.SecsS01F02(["MDLN", "SOFTREV"]).encode())
+
+        text = format_record(0, "<", packet, secsgem.secs.functions.secs_streams_functions)
+
+        self.assertIn('<A "MDLN">', text)
+        self.assertIn(packet.data.hex(), format_record(0, "<", packet))
+
+    def testMain(self):
+        with HsmsTraceWriter(self.path) as trace:
+            trace.write("<", secsgem.hsms.HsmsPacket(secsgem.hsms.HsmsLinktestReqHeader(1)))
+            trace.write(">", secsgem.hsms.HsmsPacket(secsgem.hsms.HsmsStreamFunctionHeader(2, 1, 4, False, 0),
+                                                     secsgem.secs.functions.SecsS01F04([1, "text"]).encode()))
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.assertEqual(main([self.path]), 0)
+
+        self.assertIn("Linktest.req", output.getvalue())
+        self.assertIn('<A "text">', output.getvalue())
+
+
+class TestHsmsHandlerTrace(unittest.TestCase):
+    def setUp(self):
+        self.server = HsmsTestServer()
+        self.client = secsgem.secs.SecsHandler("127.0.0.1", 5000, False, 0, "test", self.server)
+
+        self.server.start()
+        self.client.enable()
+        self.server.simulate_connect()
+
+        system_id = self.server.get_next_system_counter()
+        self.server.simulate_packet(secsgem.hsms.HsmsPacket(secsgem.hsms.HsmsSelectReqHeader(system_id)))
+        self.server.expect_packet(system_id=system_id)
+
+    def tearDown(self):
+        self.server.stop()
+        self.client.disable()
+
+    def testTraceWritten(self):
+        self.client.trace = unittest.mock.Mock()
+
+        packet = self.server.generate_stream_function_packet(
+            self.server.get_next_system_counter(), secsgem.secs.functions.SecsS01F02(["MDLN", "SOFTREV"]))
+        self.server.simulate_packet(packet)
+
+        self.client.send_stream_function(secsgem.secs.functions.SecsS01F01())
+
+        written = [(call.args[0], call.args[1].header.stream, call.args[1].header.function)
+                   for call in self.client.trace.write.call_args_list]
+
+        self.assertIn(("<", 1, 2), written)
+        self.assertIn((">", 1, 1), written)
+
+    def testNoDecodeWhenLogDisabled(self):
+        logger = logging.getLogger("hsms_communication")
+        level = logger.level
+        logger.setLevel(logging.WARNING)
+
+        try:
+            with unittest.mock.patch.object(self.client, "secs_decode") as secs_decode:
+                self.server.simulate_packet(self.server.generate_stream_function_packet(
+                    self.server.get_next_system_counter(), secsgem.secs.functions.SecsS01F02(["MDLN", "SOFTREV"])))
+
+            secs_decode.assert_not_called()
+        finally:
+            logger.setLevel(level)
+
+    def testDecodeWhenLogEnabled(self):
+        logger = logging.getLogger("hsms_communication")
+        level = logger.level
+        logger.setLevel(logging.INFO)
+
+        try:
+            with self.assertLogs(logger, logging.INFO) as logs:
+                self.server.simulate_packet(self.server.generate_stream_function_packet(
+                    self.server.get_next_system_counter(), secsgem.secs.functions.SecsS01F02(["MDLN", "SOFTREV"])))
+        finally:
+            logger.setLevel(level)
+
+        self.assertIn('<A "MDLN">', logs.output[0])
@@ -0,0 +1,246 @@
+#####################################################################
+# test_hsms_transactions.py
+#
+# (c) Copyright 2021, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+
+import asyncio
+import threading
+import time
+import unittest
+
+import secsgem.common
+import secsgem.hsms
+import secsgem.secs
+
+from test_connection import HsmsTestServer
+
+
+class TestHsmsTransactionTable(unittest.TestCase):
+    def testWrapping(self):
+        table = secsgem.hsms.HsmsTransactionTable((2 ** 32) - 1)
+
+        self.assertEqual(table.next_system(), 0)
+
+    def testSkipInFlight(self):
+        table = secsgem.hsms.HsmsTransactionTable(0)
+
+        first = table.allocate()
+        table.counter = 0
+
+        self.assertEqual(first.system, 1)
+        self.assertEqual(table.allocate().system, 2)
+
+    def testConcurrentAllocation(self):
+        table = secsgem.hsms.HsmsTransactionTable()
+        systems = []
+
+        def allocate():
+            systems.extend(table.allocate().system for _ in range(1000))
+
+        threads = [threading.Thread(target=allocate) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(set(systems)), 8000)
+        self.assertEqual(len(table), 8000)
+
+    def testComplete(self):
+        table = secsgem.hsms.HsmsTransactionTable()
+        transaction = table.allocate(1)
+        packet = secsgem.hsms.HsmsPacket(secsgem.hsms.HsmsLinktestRspHeader(transaction.system))
+
+        threading.Timer(0.05, table.complete, (packet,)).start()
+
+        self.assertIs(transaction.wait(), packet)
+        self.assertTrue(transaction.done)
+        self.assertIs(transaction.wait(), packet)
+
+    def testCompleteUnknown(self):
+        table = secsgem.hsms.HsmsTransactionTable()
+
+        self.assertFalse(table.complete(secsgem.hsms.HsmsPacket(secsgem.hsms.HsmsLinktestRspHeader(1))))
+
+    def testFirstResponseWins(self):
+        transaction = secsgem.hsms.HsmsTransaction(1)
+        first = secsgem.hsms.HsmsPacket(secsgem.hsms.HsmsLinktestRspHeader(1))
+
+        self.assertTrue(transaction.set_response(first))
+        self.assertFalse(transaction.set_response(secsgem.hsms.HsmsPacket(secsgem.hsms.HsmsLinktestRspHeader(1))))
+        self.assertIs(transaction.wait(), first)
+
+    def testConcurrentFinish(self):
+        transaction = secsgem.hsms.HsmsTransaction(1)
+        barrier = threading.Barrier(8)
+        results = []
+
+        def finish(index):
+            barrier.wait()
+            if index % 2:
+                results.append(transaction.cancel())
+            else:
+                results.append(transaction.set_response(secsgem.hsms.HsmsPacket(
+                    secsgem.hsms.HsmsLinktestRspHeader(1))))
+
+        threads = [threading.Thread(target=finish, args=(index,)) for index in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results.count(True), 1)
+        self.assertTrue(transaction.done)
+        self.assertIs(transaction.wait(0), transaction.response)
+
+    def testTimeout(self):
+        table = secsgem.hsms.HsmsTransactionTable()
+        transaction = table.allocate(0.05)
+
+        self.assertIsNone(transaction.wait())
+        self.assertTrue(transaction.expired)
+        self.assertEqual(table.expired(), [transaction])
+
+        table.remove(transaction.system)
+
+        self.assertNotIn(transaction.system, table)
+
+    def testCallbackExpiry(self):
+        wheel = secsgem.common.TimerWheel("test_timer_wheel", resolution=0.01)
+        table = secsgem.hsms.HsmsTransactionTable(timers=wheel)
+        finished = threading.Event()
+
+        expiring = table.allocate(0.05, lambda transaction: finished.set())
+        answered = table.allocate(0.05, lambda transaction: None)
+        table.complete(secsgem.hsms.HsmsPacket(secsgem.hsms.HsmsLinktestRspHeader(answered.system)))
+
+        self.assertTrue(finished.wait(1))
+        self.assertIsNone(expiring.response)
+        self.assertFalse(answered.timer.active)
+        self.assertEqual(wheel.metrics["expired"], 1)
+
+        wheel.shutdown()
+
+    def testInFlight(self):
+        table = secsgem.hsms.HsmsTransactionTable()
+
+        first = table.allocate(10)
+        time.sleep(0.01)
+        second = table.allocate(10)
+
+        self.assertEqual(table.in_flight(), [first, second])
+        self.assertGreater(first.age, second.age)
+        self.assertEqual(table.expired(), [])
+        self.assertIn("'system'", repr(table))
+
+
+class TestHsmsHandlerTransactions(unittest.TestCase):
+    def setUp(self):
+        self.server = HsmsTestServer()
+        self.client = secsgem.hsms.HsmsHandler("127.0.0.1", 5000, False, 0, "test", self.server)
+
+        self.server.start()
+        self.client.enable()
+        self.server.simulate_connect()
+
+    def tearDown(self):
+        self.server.stop()
+        self.client.disable()
+
+    def testLinktestResponse(self):
+        result = []
+        thread = threading.Thread(target=lambda: result.append(self.client.send_linktest_req()))
+        thread.start()
+
+        packet = self.server.expect_packet(s_type=0x05)
+        self.assertIn(packet.header.system, self.client.transactions)
+
+        self.server.simulate_packet(secsgem.hsms.HsmsPacket(secsgem.hsms.HsmsLinktestRspHeader(packet.header.system)))
+        thread.join(1)
+
+        self.assertEqual(result[0].header.sType, 0x06)
+        self.assertEqual(len(self.client.transactions), 0)
+
+    def testSystemCounter(self):
+        self.client.systemCounter = 10
+
+        self.assertEqual(self.client.get_next_system_counter(), 11)
+        self.assertEqual(self.client.transactions.allocate().system, 12)
+
+
+class TestHsmsHandlerRequests(unittest.TestCase):
+    def setUp(self):
+        self.server = HsmsTestServer()
+        self.client = secsgem.secs.SecsHandler("127.0.0.1", 5000, False, 0, "test", self.server)
+
+        self.server.start()
+        self.client.enable()
+        self.server.simulate_connect()
+
+        system_id = self.server.get_next_system_counter()
+        self.server.simulate_packet(secsgem.hsms.HsmsPacket(secsgem.hsms.HsmsSelectReqHeader(system_id)))
+        self.server.expect_packet(system_id=system_id)
+
+    def tearDown(self):
+        self.server.stop()
+        self.client.disable()
+
+    def respond(self, function):
+        packet = self.server.expect_packet(function=function.function - 1)
+
+        self.server.simulate_packet(self.server.generate_stream_function_packet(packet.header.system, function))
+
+    def testSendRequest(self):
+        futures = [self.client.send_request(secsgem.secs.functions.SecsS01F01()) for _ in range(3)]
+
+        self.assertEqual(len(self.client.transactions), 3)
+
+        for _ in futures:
+            self.respond(secsgem.secs.functions.SecsS01F02(["MDLN", "SOFTREV"]))
+
+        responses = secsgem.hsms.gather(futures, 1)
+
+        self.assertEqual([(response.header.stream, response.header.function) for response in responses],
+                         [(1, 2)] * 3)
+        self.assertEqual(len(self.client.transactions), 0)
+
+    def testSendRequestTimeout(self):
+        future = self.client.send_request(secsgem.secs.functions.SecsS01F01(), 0.05)
+
+        self.assertIsNone(future.result(1))
+        self.assertEqual(len(self.client.transactions), 0)
+
+    def testGatherCancels(self):
+        future = self.client.send_request(secsgem.secs.functions.SecsS01F01())
+
+        self.assertEqual(secsgem.hsms.gather([future], 0.05), [None])
+        self.assertTrue(future.cancelled())
+        self.assertEqual(len(self.client.transactions), 0)
+
+    def testSendRequestAsync(self):
+        async def request():
+            return await self.client.send_request_async(secsgem.secs.functions.SecsS01F01())
+
+        threading.Timer(0.05, self.respond, (secsgem.secs.functions.SecsS01F02(["MDLN", "SOFTREV"]),)).start()
+
+        response = asyncio.run(request())
+
+        self.assertEqual((response.header.stream, response.header.function), (1, 2))
+
+    def testRequestSvsNowait(self):
+        future = self.client.request_svs_nowait([1, 2])
+
+        self.respond(secsgem.secs.functions.SecsS01F04([1, "text"]))
+
+        self.assertEqual(future.result(1).get(), [1, "text"])
@@ -0,0 +1,251 @@
+#####################################################################
+# test_hsms_writer.py
+#
+# (c) Copyright 2021, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+
+import socket
+import threading
+import time
+import unittest
+
+import secsgem.hsms
+
+from secsgem.hsms.connection import HsmsConnection
+from secsgem.hsms.reactor import HsmsReactor
+from secsgem.hsms.receive_buffer import HsmsReceiveBuffer
+from secsgem.hsms.writer import HsmsReactorWriter, HsmsWriter
+
+
+class TestHsmsWriter(unittest.TestCase):
+    def setUp(self):
+        self.sock, self.peer = socket.socketpair()
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 4096)
+        self.sock.setblocking(False)
+
+        self.writer = HsmsWriter(self.sock, "test_writer", 0.05)
+        self.writer.start()
+
+    def tearDown(self):
+        self.writer.stop(1)
+        self.sock.close()
+        self.peer.close()
+
+    def packet(self, system, size):
+        header = secsgem.hsms.HsmsStreamFunctionHeader(system, 1, 1, False, 0)
+        return secsgem.hsms.HsmsPacket(header, bytes([system % 256]) * size)
+
+    def receive(self, count):
+        buffer = HsmsReceiveBuffer(max_message_size=16 * 1024 * 1024)
+        packets = []
+
+        while len(packets) < count:
+            buffer.recv_from(self.peer, 64 * 1024)
+            packets.extend(secsgem.hsms.HsmsPacket.decode(message) for message in buffer.messages())
+
+        return packets
+
+    def testWrite(self):
+        future = self.writer.submit(self.packet(1, 100))
+
+        packet = self.receive(1)[0]
+
+        self.assertTrue(future.result(1))
+        self.assertEqual(packet.header.system, 1)
+        self.assertEqual(packet.data, b"\x01" * 100)
+
+    def testConcurrentLargePackets(self):
+        futures = []
+
+        def send(system):
+            futures.append(self.writer.submit(self.packet(system, 1024 * 1024 + system)))
+
+        threads = [threading.Thread(target=send, args=(system,)) for system in range(1, 5)]
+        for thread in threads:
+            thread.start()
+
+        packets = self.receive(4)
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(packet.header.system for packet in packets), [1, 2, 3, 4])
+        for packet in packets:
+            self.assertEqual(packet.data, bytes([packet.header.system]) * (1024 * 1024 + packet.header.system))
+
+        self.assertTrue(all(future.result(1) for future in futures))
+
+    def testSubmitAfterStop(self):
+        self.writer.stop(1)
+
+        self.assertFalse(self.writer.running)
+        self.assertFalse(self.writer.submit(self.packet(1, 10)).result(1))
+
+    def testFailedSocket(self):
+        self.peer.close()
+
+        self.assertFalse(self.writer.submit(self.packet(1, 1024 * 1024)).result(5))
+        self.assertFalse(self.writer.submit(self.packet(2, 10)).result(1))
+
+
+class TestHsmsReactorWriter(TestHsmsWriter):
+    def setUp(self):
+        self.sock, self.peer = socket.socketpair()
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 4096)
+        self.sock.setblocking(False)
+
+        self.reactor = HsmsReactor("test_reactor", workers=1)
+        self.reactor.start()
+
+        self.writer = HsmsReactorWriter(self.sock, self.reactor)
+        self.writer.start()
+
+    def tearDown(self):
+        TestHsmsWriter.tearDown(self)
+        self.reactor.stop()
+
+    def testNoThread(self):
+        names = [thread.name for thread in threading.enumerate()]
+
+        self.assertEqual([name for name in names if name.startswith("test_writer")], [])
+
+    def testStopWritesQueued(self):
+        futures = [self.writer.submit(self.packet(system, 64 * 1024)) for system in range(1, 4)]
+
+        stopper = threading.Thread(target=self.writer.stop, args=(5,))
+        stopper.start()
+
+        self.assertEqual([packet.header.system for packet in self.receive(3)], [1, 2, 3])
+
+        stopper.join()
+        self.assertTrue(all(future.result(1) for future in futures))
+        self.assertFalse(self.reactor.remove_writer(self.sock))
+
+
+class TestHsmsWriterPriority(unittest.TestCase):
+    def setUp(self):
+        self.sock, self.peer = socket.socketpair()
+        self.sock.setblocking(False)
+
+        # packets are queued before the writer is started
+        self.writer = HsmsWriter(self.sock, "test_writer", 0.05, bulk_size=100)
+
+    def tearDown(self):
+        self.writer.stop(1)
+        self.sock.close()
+        self.peer.close()
+
+    def receive(self, count):
+        buffer = HsmsReceiveBuffer()
+        packets = []
+
+        while len(packets) < count:
+            buffer.recv_from(self.peer, 64 * 1024)
+            packets.extend(secsgem.hsms.HsmsPacket.decode(message) for message in buffer.messages())
+
+        return packets
+
+    def data(self, system, function, size=0, session=0):
+        header = secsgem.hsms.HsmsStreamFunctionHeader(system, 7, function, function % 2 == 1, session)
+        return secsgem.hsms.HsmsPacket(header, b"\x00" * size)
+
+    def testGetPriority(self):
+        self.assertEqual(self.writer.get_priority(secsgem.hsms.HsmsPacket(secsgem.hsms.HsmsLinktestReqHeader(1))),
+                         HsmsWriter.PRIORITY_CONTROL)
+        self.assertEqual(self.writer.get_priority(self.data(1, 4)), HsmsWriter.PRIORITY_REPLY)
+        self.assertEqual(self.writer.get_priority(self.data(1, 3)), HsmsWriter.PRIORITY_PRIMARY)
+        self.assertEqual(self.writer.get_priority(self.data(1, 3, 101)), HsmsWriter.PRIORITY_BULK)
+        self.assertEqual(self.writer.get_priority(self.data(1, 6, 101)), HsmsWriter.PRIORITY_BULK)
+
+    def testOrder(self):
+        packets = [
+            self.data(1, 3, 1000),
+            self.data(2, 1),
+            self.data(3, 4),
+            secsgem.hsms.HsmsPacket(secsgem.hsms.HsmsLinktestReqHeader(4)),
+            self.data(5, 1),
+            self.data(6, 3, 1000),
+            self.data(7, 2),
+        ]
+
+        for packet in packets:
+            self.writer.submit(packet)
+
+        self.assertEqual(self.writer.queue_depth, 7)
+
+        self.writer.start()
+
+        self.assertEqual([packet.header.system for packet in self.receive(7)], [4, 3, 7, 2, 5, 1, 6])
+
+    def testPriorityOverride(self):
+        self.writer.submit(self.data(1, 1))
+        self.writer.submit(self.data(2, 3, 1000), HsmsWriter.PRIORITY_CONTROL)
+
+        self.writer.start()
+
+        self.assertEqual([packet.header.system for packet in self.receive(2)], [2, 1])
+
+    def testSessionFairness(self):
+        for system in range(1, 4):
+            self.writer.submit(self.data(system, 1, session=1))
+        for system in range(11, 14):
+            self.writer.submit(self.data(system, 1, session=2))
+
+        self.writer.start()
+
+        self.assertEqual([packet.header.system for packet in self.receive(6)], [1, 11, 2, 12, 3, 13])
+
+    def testMetrics(self):
+        self.writer.submit(self.data(1, 1))
+        self.writer.submit(self.data(2, 2))
+
+        self.assertEqual(self.writer.metrics["primary"]["queued"], 1)
+
+        time.sleep(0.05)
+        self.writer.start()
+        self.receive(2)
+
+        for _ in range(100):
+            if self.writer.metrics["primary"]["written"]:
+                break
+            time.sleep(0.01)
+
+        metrics = self.writer.metrics
+
+        self.assertEqual(metrics["queue_depth"], 0)
+        self.assertEqual(metrics["primary"]["written"], 1)
+        self.assertEqual(metrics["reply"]["written"], 1)
+        self.assertEqual(metrics["control"]["written"], 0)
+        self.assertGreaterEqual(metrics["primary"]["wait_time_max"], 0.05)
+        self.assertIn("'bulk'", repr(self.writer))
+
+
+class TestHsmsConnectionSocket(unittest.TestCase):
+    def testSocketOptions(self):
+        connection = HsmsConnection(True, "127.0.0.1", 5000)
+        connection.send_buffer_size = 65536
+        connection.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+
+        try:
+            connection._setup_socket()
+
+            self.assertTrue(connection.sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY))
+            self.assertTrue(connection.sock.getsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE))
+            self.assertGreaterEqual(connection.sock.getsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF), 65536)
+        finally:
+            connection.sock.close()
+
+    def testSendWithoutConnection(self):
+        connection = HsmsConnection(True, "127.0.0.1", 5000)
+
+        self.assertFalse(connection.send_packet(secsgem.hsms.HsmsPacket(secsgem.hsms.HsmsLinktestReqHeader(1))))
@@ -13,11 +13,17 @@
 # MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
 # GNU Lesser General Public License for more details.
 #####################################################################
+import os
+import subprocess
+import sys
 import unittest
 
 import pytest
 
+import secsgem.secs.variables
+
 from secsgem.secs.functions import *
+from secsgem.secs.functions import _index, indexer
 
 
 class testSecsFunctionNoData:
@@ -339,3 +345,150 @@ def test_stream_number(stream, cls):
 @pytest.mark.parametrize("function,cls", generate_function_list())
 def test_function_number(function, cls):
     assert function == cls._function
+
+
+class testCompiledFormat(unittest.TestCase):
+    def assertSameAsObjects(self, cls, value):
+        encoded = cls(value).encode()
+
+        self.assertEqual(cls.encode_value(value), encoded)
+
+        function = cls()
+        function.decode(encoded)
+
+        self.assertEqual(cls.decode_value(encoded), function.get())
+
+    def testS06F11(self):
+        self.assertSameAsObjects(SecsS06F11, {
+            "DATAID": 1,
+            "CEID": 1337,
+            "RPT": [
+                {"RPTID": 1000, "V": ["VAR", secsgem.secs.variables.U4(100), 1.5, True]},
+                {"RPTID": 1001, "V": [secsgem.secs.variables.String("x" * 300), secsgem.secs.variables.U2([1, 2, 3])]},
+            ]})
+
+    def testS01F04(self):
+        self.assertSameAsObjects(SecsS01F04, [1, "text", b"\x01\x02", -5, 1.25, 2 ** 40, True])
+
+    def testS02F33(self):
+        self.assertSameAsObjects(SecsS02F33, {
+            "DATAID": 10,
+            "DATA": [{"RPTID": 5, "VID": ["Hello", "Hallo"]}, {"RPTID": 6, "VID": [1, 2]}]})
+
+    def testS05F01(self):
+        self.assertSameAsObjects(SecsS05F01, {"ALCD": 0x81, "ALID": 5, "ALTX": "alarm"})
+
+    def testListAsList(self):
+        self.assertSameAsObjects(SecsS05F01, [0x81, 5, "alarm"])
+
+    def testEmptyArray(self):
+        self.assertSameAsObjects(SecsS01F03, [])
+
+    def testHeaderOnly(self):
+        self.assertEqual(SecsS01F01.encode_value(None), b"")
+        self.assertIsNone(SecsS01F01.decode_value(b""))
+
+    def testDecodeShortList(self):
+        encoded = b"\x01\x01\x21\x01\x81"
+
+        function = SecsS05F01()
+        function.decode(encoded)
+
+        self.assertEqual(SecsS05F01.decode_value(encoded), function.get())
+
+    def testDecodeLongList(self):
+        with self.assertRaises(ValueError):
+            SecsS05F01.decode_value(b"\x01\x04\x21\x01\x81\xa5\x01\x05\x41\x00\x41\x00")
+
+    def testDecodeInvalidFormat(self):
+        with self.assertRaises(ValueError):
+            SecsS05F01.decode_value(b"\x41\x00")
+
+    def testEncodeInvalidValue(self):
+        with self.assertRaises(ValueError):
+            SecsS05F01.encode_value({"ALCD": 0x81, "ALID": "text", "ALTX": "alarm"})
+
+    def testEncodeUnknownField(self):
+        with self.assertRaises(KeyError):
+            SecsS05F01.encode_value({"UNKNOWN": 1})
+
+    def testEncodeTooLong(self):
+        with self.assertRaises(ValueError):
+            SecsS01F16.encode_value([1, 2])
+
+
+@pytest.mark.parametrize("cls", [function for _, function in generate_function_list()])
+def test_compiled_format_defaults(cls):
+    if cls._data_format is None:
+        pytest.skip("header only")
+
+    try:
+        encoded = cls().encode()
+    except AttributeError:
+        pytest.skip("no default value")
+
+    function = cls()
+    function.decode(encoded)
+
+    assert cls.decode_value(encoded) == function.get()
+    assert cls.encode_value(function.get()) == encoded
+
+
+class TestFunctionIndex(unittest.TestCase):
+    def testIndexUpToDate(self):
+        # run "python -m secsgem.secs.functions.indexer" if this fails
+        self.assertEqual(indexer.scan(), _index.FUNCTIONS)
+        self.assertEqual(indexer.generate(_index.FUNCTIONS), indexer.INDEX_PATH.read_text(encoding="utf-8"))
+
+    def testGetFunctionClass(self):
+        self.assertIs(get_function_class(6, 11), SecsS06F11)
+        self.assertIsNone(get_function_class(6, 99))
+        self.assertIsNone(get_function_class(99, 1))
+
+    def testUnknownAttribute(self):
+        with self.assertRaises(AttributeError):
+            secsgem.secs.functions.SecsS99F99
+
+    def testLazyImport(self):
+        script = "import sys, secsgem.gem; " \
+                 "print(sorted(name for name in sys.modules " \
+                 "if name.startswith(('secsgem.secs.functions.s', 'secsgem.secs.data_items.'))))"
+
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        output = subprocess.run([sys.executable, "-c", script], cwd=root, check=True, capture_output=True,
+                                text=True).stdout
+
+        self.assertEqual(output.strip(), "[]")
+
+
+class TestStreamsFunctions(unittest.TestCase):
+    def testIndexed(self):
+        streams_functions = StreamsFunctions()
+
+        self.assertIn(6, streams_functions)
+        self.assertNotIn(99, streams_functions)
+        self.assertIs(streams_functions[6][11], SecsS06F11)
+        self.assertEqual(sorted(streams_functions), sorted(secs_streams_functions))
+        self.assertEqual(sorted(streams_functions[1]), sorted(secs_streams_functions[1]))
+
+    def testOverlay(self):
+        streams_functions = StreamsFunctions()
+
+        streams_functions[1].update({1: SecsS01F02, 99: SecsS01F03})
+        del streams_functions[1][3]
+        streams_functions[99] = {1: SecsS01F01}
+        del streams_functions[6]
+
+        self.assertIs(streams_functions[1][1], SecsS01F02)
+        self.assertIs(streams_functions[1][99], SecsS01F03)
+        self.assertNotIn(3, streams_functions[1])
+        self.assertEqual(dict(streams_functions[99]), {1: SecsS01F01})
+        self.assertNotIn(6, streams_functions)
+
+        # the indexed classes aren't changed
+        other = StreamsFunctions()
+
+        self.assertIs(other[1][1], SecsS01F01)
+        self.assertIs(other[1][3], SecsS01F03)
+        self.assertNotIn(99, other)
+        self.assertIs(other[6][11], SecsS06F11)
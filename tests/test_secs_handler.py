@@ -37,6 +37,18 @@ class TestSecsHandler(unittest.TestCase):
         self.assertEqual(function[0], "MDLN")
         self.assertEqual(function[1], "SOFTREV")
 
+    def testSecsDecodeCached(self):
+        server = HsmsTestServer()
+        client = secsgem.secs.SecsHandler("127.0.0.1", 5000, False, 0, "test", server)
+
+        packet = server.generate_stream_function_packet(0, secsgem.secs.functions.SecsS01F02(["MDLN", "SOFTREV"]))
+
+        function = client.secs_decode(packet)
+
+        self.assertIs(packet.decoded, function)
+        self.assertIs(client.secs_decode(packet), function)
+        self.assertEqual(function.get(), ["MDLN", "SOFTREV"])
+
     def testSecsDecodeNone(self):
         server = HsmsTestServer()
         client = secsgem.secs.SecsHandler("127.0.0.1", 5000, False, 0, "test", server)
@@ -89,6 +101,17 @@ class TestSecsHandler(unittest.TestCase):
 
         self.assertIs(function, None)
 
+    def testStreamFunctionCustom(self):
+        server = HsmsTestServer()
+        client = secsgem.secs.SecsHandler("127.0.0.1", 5000, False, 0, "test", server)
+        client1 = secsgem.secs.SecsHandler("127.0.0.1", 5000, False, 0, "test", server)
+
+        client.secs_streams_functions[1][1] = secsgem.secs.functions.SecsS01F02
+
+        self.assertIs(client.stream_function(1, 1), secsgem.secs.functions.SecsS01F02)
+        self.assertIs(client1.stream_function(1, 1), secsgem.secs.functions.SecsS01F01)
+        self.assertIs(secsgem.secs.functions.get_function_class(1, 1), secsgem.secs.functions.SecsS01F01)
+
 
 class TestSecsHandlerPassive(unittest.TestCase):
     def setUp(self):
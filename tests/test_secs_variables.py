@@ -21,7 +21,15 @@ import unittest
 
 import pytest
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 from secsgem.secs.variables import *
+from secsgem.secs.variables import codec as codec_module
+from secsgem.secs.variables.base_number import BaseNumber
+from secsgem.secs.variables.dynamic import ANYVALUE
 from secsgem.secs.variables.functions import generate, get_format
 from secsgem.secs.data_items import MDLN, OBJACK, SOFTREV, SVID
 
@@ -106,6 +114,23 @@ class TestSecsVar(unittest.TestCase):
         with self.assertRaises(ValueError):
             secsvar.decode_item_header(b"somerandomdata")
 
+    def testDecodeItemHeaderBufferTypes(self):
+        # dummy object, just to have format code set
+        secsvar = U4(1337)
+
+        for buffer_type in (bytes, bytearray, memoryview):
+            self.assertEqual(secsvar.decode_item_header(buffer_type(b"\x00\xB3\x01\x00\x00"), 1), (5, 0o54, 0x10000))
+
+    def testDecodeBufferTypes(self):
+        for secsvar in (U4(1), String("text"), Binary(b"\x01"), Boolean(True)):
+            encoded = secsvar.encode()
+
+            for buffer_type in (bytes, bytearray, memoryview):
+                decoded = secsvar.__class__()
+                decoded.decode(buffer_type(encoded))
+
+                self.assertEqual(decoded.get(), secsvar.get())
+
     def testGenerateWithNonSecsVarClass(self):
         with self.assertRaises(TypeError):
             generate(int)
@@ -404,6 +429,49 @@ class TestSecsVarDynamic(unittest.TestCase):
 
         self.assertEqual(secsvar.get(), None)
 
+    def testDecodeUnsupportedFormat(self):
+        secsvar = Dynamic([U1, U2])
+
+        with self.assertRaises(ValueError):
+            secsvar.decode(String("text").encode())
+
+    def testDecodersShared(self):
+        secsvar = Dynamic([U1, String])
+        secsvar1 = Dynamic([U1, String])
+
+        self.assertIs(secsvar._decoders(), secsvar1._decoders())
+        self.assertEqual(secsvar._decoders(), {U1.format_code: U1, String.format_code: String})
+
+    def testCandidatesPreferredFirst(self):
+        secsvar = Dynamic([String, U4, Boolean])
+
+        self.assertEqual(secsvar._candidates(int), (U4, String, Boolean))
+        self.assertEqual(secsvar._candidates(bool), (U4, Boolean, String))
+        self.assertEqual(secsvar._candidates(str), (String, U4, Boolean))
+
+    def testMatchTypeWithoutInstances(self):
+        secsvar = Dynamic([U1, U2], count=2)
+        original_init = U1.__init__
+
+        def fail(*args, **kwargs):
+            raise AssertionError("probe instance created")
+
+        U1.__init__ = fail
+        try:
+            self.assertIs(secsvar._match_type(200), U1)
+            self.assertIs(secsvar._match_type(300), U2)
+            self.assertIsNone(secsvar._match_type([1, 2, 3]))
+        finally:
+            U1.__init__ = original_init
+
+    def testAnyValueList(self):
+        secsvar = ANYVALUE()
+
+        secsvar.set([1, 2])
+
+        self.assertEqual(secsvar.value.__class__, U1)
+        self.assertEqual(secsvar.get(), [1, 2])
+
     def testEqualitySecsVarDynamic(self):
         secsvar = Dynamic([U1], 1)
         secsvar1 = Dynamic([U1], 1)
@@ -1851,6 +1919,190 @@ class TestSecsVarU4(unittest.TestCase):
         self.assertEqual(secsvar.get(), [123, 234, 345])
 
 
+class TestSecsVarNumberArrays(unittest.TestCase):
+    types = [
+        (U1, [0, 1, 255]), (U2, [0, 1, 65535]), (U4, [0, 1, 4294967295]), (U8, [0, 1, 18446744073709551615]),
+        (I1, [-128, 0, 127]), (I2, [-32768, 0, 32767]), (I4, [-2147483648, 0, 2147483647]),
+        (I8, [-9223372036854775808, 0, 9223372036854775807]), (F4, [-1.5, 0.0, 2.25]), (F8, [-1.5e300, 0.0, 2.5e-300]),
+    ]
+
+    def testRoundTripLarge(self):
+        for secs_type, values in self.types:
+            value = values * 40000
+
+            encoded = secs_type(value).encode()
+
+            secsvar = secs_type()
+            self.assertEqual(secsvar.decode(encoded), len(encoded))
+            self.assertEqual(secsvar.get(), value)
+
+    def testDecodeWithOffset(self):
+        encoded = b"\xff" + U2([1, 2, 3]).encode()
+
+        secsvar = U2()
+
+        self.assertEqual(secsvar.decode(encoded, 1), len(encoded))
+        self.assertEqual(secsvar.get(), [1, 2, 3])
+
+    def testDecodeMemoryview(self):
+        secsvar = I4()
+        secsvar.decode(memoryview(I4([1, -2, 3]).encode()))
+
+        self.assertEqual(secsvar.get(), [1, -2, 3])
+
+    def testDecodeTooManyItems(self):
+        secsvar = U1(count=2)
+
+        with self.assertRaises(ValueError):
+            secsvar.decode(U1([1, 2, 3]).encode())
+
+    def testDecodeTruncated(self):
+        secsvar = U4()
+
+        with self.assertRaises(ValueError):
+            secsvar.decode(U4([1, 2, 3]).encode()[:-1])
+
+    def testEncodeValueOutOfRange(self):
+        secsvar = U1([1, 2])
+        secsvar[1] = 256
+
+        with self.assertRaises(Exception):
+            secsvar.encode()
+
+
+@unittest.skipIf(numpy is None, "numpy not installed")
+class TestSecsVarNumberNumpy(unittest.TestCase):
+    def setUp(self):
+        BaseNumber.use_numpy = True
+
+    def tearDown(self):
+        BaseNumber.use_numpy = False
+
+    def testDecodeArray(self):
+        secsvar = F8()
+        secsvar.decode(F8([1.5, 2.5, 3.5]).encode())
+
+        self.assertIsInstance(secsvar.value, numpy.ndarray)
+        self.assertEqual(secsvar.value.dtype, numpy.dtype(">f8"))
+        self.assertEqual(secsvar.value.tolist(), [1.5, 2.5, 3.5])
+
+    def testDecodeTypes(self):
+        for secs_type, values in TestSecsVarNumberArrays.types:
+            secsvar = secs_type()
+            secsvar.decode(secs_type(values).encode())
+
+            self.assertEqual(secsvar, values)
+
+    def testEncodeArray(self):
+        secsvar = U4()
+        secsvar.decode(U4([1, 2, 3]).encode())
+
+        self.assertEqual(secsvar.encode(), U4([1, 2, 3]).encode())
+
+    def testSetArray(self):
+        secsvar = I2(numpy.array([1, -2, 3]))
+
+        self.assertEqual(secsvar.get(), [1, -2, 3])
+
+    def testSetArrayOutOfRange(self):
+        with self.assertRaises(ValueError):
+            U1(numpy.array([1, 256]))
+
+
+class TestSecsVarLazyDecode(unittest.TestCase):
+    data_format = [
+        "REPORT",
+        SVID,
+        [["VALUE", SVID, MDLN]],
+    ]
+
+    value = {"SVID": 1, "VALUE": [{"SVID": 2, "MDLN": "two"}, {"SVID": 3, "MDLN": "three"}]}
+
+    def testGet(self):
+        encoded = List(self.data_format, self.value).encode()
+
+        secsvar = List(self.data_format)
+        secsvar.decode(encoded, lazy=True)
+
+        self.assertEqual(secsvar.get(), self.value)
+
+    def testFieldsDecodedOnAccess(self):
+        encoded = List(self.data_format, self.value).encode()
+
+        secsvar = List(self.data_format)
+        secsvar.decode(encoded, lazy=True)
+
+        self.assertEqual(secsvar.VALUE.data, [None, None])
+        self.assertEqual(secsvar.VALUE[1].MDLN.get(), "three")
+        self.assertIsNone(secsvar.VALUE.data[0])
+
+    def testEncode(self):
+        encoded = List(self.data_format, self.value).encode()
+
+        secsvar = List(self.data_format)
+        secsvar.decode(encoded, lazy=True)
+
+        self.assertEqual(secsvar.encode(), encoded)
+
+    def testSetUndecoded(self):
+        secsvar = List(self.data_format)
+        secsvar.decode(List(self.data_format, self.value).encode(), lazy=True)
+
+        secsvar.SVID = 10
+        secsvar.VALUE[0] = {"SVID": 20, "MDLN": "twenty"}
+
+        self.assertEqual(secsvar.SVID.get(), 10)
+        self.assertEqual(secsvar.VALUE[0].get(), {"SVID": 20, "MDLN": "twenty"})
+        self.assertEqual(secsvar.VALUE[1].get(), {"SVID": 3, "MDLN": "three"})
+
+    def testArraySlice(self):
+        secsvar = Array(U1)
+        secsvar.decode(Array(U1, [1, 2, 3]).encode(), lazy=True)
+
+        self.assertEqual([item.get() for item in secsvar[1:]], [2, 3])
+        self.assertEqual(secsvar[-1].get(), 3)
+
+    def testTruncatedData(self):
+        encoded = List(self.data_format, self.value).encode()
+
+        with self.assertRaises(ValueError):
+            List(self.data_format).decode(encoded[:-2], lazy=True)
+
+
+class TestSecsVarEncoded(unittest.TestCase):
+    def testEncodeReusesData(self):
+        secsvar = Encoded(U4(123), b"\xb1\x04\x00\x00\x00\x7b")
+
+        self.assertEqual(secsvar.encode(), U4(123).encode())
+        self.assertEqual(secsvar.get(), 123)
+        self.assertEqual(secsvar, U4(123))
+
+    def testVariableUnchanged(self):
+        variable = U4(123)
+        secsvar = Encoded(variable)
+
+        self.assertNotIn("encode", variable.__dict__)
+
+        with self.assertRaises(NotImplementedError):
+            secsvar.set(456)
+
+    def testDynamic(self):
+        secsvar = Dynamic([U4, String], Encoded(U4(123)))
+
+        self.assertEqual(secsvar.encode(), U4(123).encode())
+
+        with self.assertRaises(ValueError):
+            Dynamic([String], Encoded(U4(123)))
+
+    def testCompiledFormat(self):
+        codec = codec_module.CompiledFormat([SVID])
+
+        self.assertEqual(codec.encode([Encoded(U4(1)), 2]), Array(SVID, [U4(1), 2]).encode())
+
+        with self.assertRaises(ValueError):
+            codec.encode([Encoded(F4(1.0))])
+
+
 class GoodBadLists(object):
     _type = None
     goodValues = []